@@ -0,0 +1,176 @@
+"""
+Rendering of monthly commission statements (commission.generate_statements).
+
+render_statement() turns one statement returned by
+real.estate.commission.statement.run.prepare_statements() into its CSV
+and/or PDF files. It is a top-level function of plain data in and out so
+the task can map it over a ProcessPoolExecutor. The PDF is written by hand
+in the standard Courier font (columns align, WinAnsi encoding): no
+rendering dependency in the worker image.
+"""
+import base64
+import csv
+import io
+
+CSV_HEADER = [
+    "Date",
+    "Reference",
+    "Type",
+    "Transaction Amount",
+    "Commission Amount",
+    "Payment Status",
+]
+PDF_PAGE_WIDTH = 595  # A4, points
+PDF_PAGE_HEIGHT = 842
+PDF_MARGIN = 50
+PDF_LINE_HEIGHT = 14
+PDF_FONT_SIZE = 9
+
+
+def statement_filename(run, statement, extension):
+    return (
+        f"commission_statement_{run['month']}_agent_{statement['agent_id']}"
+        f".{extension}"
+    )
+
+
+def _money(value):
+    return f"{value:,.2f}"
+
+
+def _summary(run, statement):
+    return [
+        f"Commission statement - {run['company_name']}",
+        f"Agent: {statement['agent_name']}",
+        f"Period: {run['date_from']} to {run['date_to']}",
+        f"Transactions: {statement['transaction_count']}",
+        f"Transaction amount: {_money(statement['transaction_amount'])}",
+        f"Total commission: {_money(statement['total_commission'])}",
+        f"Pending: {_money(statement['pending_commission'])}"
+        f"   Paid: {_money(statement['paid_commission'])}"
+        f"   Cancelled: {_money(statement['cancelled_commission'])}",
+    ]
+
+
+def render_csv(run, statement):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for line in statement["lines"]:
+        writer.writerow(
+            [
+                line["date"],
+                line["reference"],
+                line["type"],
+                f"{line['transaction_amount']:.2f}",
+                f"{line['commission_amount']:.2f}",
+                line["payment_status"],
+            ]
+        )
+    writer.writerow([])
+    writer.writerow(
+        [
+            "Total",
+            "",
+            "",
+            f"{statement['transaction_amount']:.2f}",
+            f"{statement['total_commission']:.2f}",
+            "",
+        ]
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def _pdf_text(value):
+    encoded = value.encode("cp1252", errors="replace")
+    return (
+        encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    )
+
+
+def render_pdf(run, statement):
+    rows = _summary(run, statement) + [""]
+    rows.append(
+        f"{'Date':<12}{'Reference':<22}{'Type':<8}{'Amount':>16}"
+        f"{'Commission':>14}  Status"
+    )
+    for line in statement["lines"]:
+        rows.append(
+            f"{line['date']:<12}{line['reference'][:21]:<22}{line['type']:<8}"
+            f"{_money(line['transaction_amount']):>16}"
+            f"{_money(line['commission_amount']):>14}  {line['payment_status']}"
+        )
+
+    per_page = (PDF_PAGE_HEIGHT - 2 * PDF_MARGIN) // PDF_LINE_HEIGHT
+    pages = [rows[i : i + per_page] for i in range(0, len(rows), per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) per page
+    objects = [
+        None,
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier"
+        b" /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page_rows in pages:
+        stream = [
+            b"BT",
+            b"/F1 %d Tf" % PDF_FONT_SIZE,
+            b"%d TL" % PDF_LINE_HEIGHT,
+            b"%d %d Td" % (PDF_MARGIN, PDF_PAGE_HEIGHT - PDF_MARGIN),
+        ]
+        for row in page_rows:
+            stream.append(b"(" + _pdf_text(row) + b") Tj T*")
+        stream.append(b"ET")
+        content = b"\n".join(stream)
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, len(objects) + 2)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+        len(page_ids),
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue()
+
+
+RENDERERS = {"csv": render_csv, "pdf": render_pdf}
+
+
+def render_statement(run, statement):
+    """
+    Files of one statement, ready for store_statement_files():
+    ``[{"statement_id", "format", "filename", "content" (base64)}]``.
+    """
+    return [
+        {
+            "statement_id": statement["statement_id"],
+            "format": extension,
+            "filename": statement_filename(run, statement, extension),
+            "content": base64.b64encode(
+                RENDERERS[extension](run, statement)
+            ).decode("ascii"),
+        }
+        for extension in run["formats"]
+    ]
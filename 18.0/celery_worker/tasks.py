@@ -1,10 +1,14 @@
 from celery import Celery
 from celery.signals import worker_init
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import urllib.parse
 import xmlrpc.client
 import os
 import sys
 
+from statement_render import render_statement
+
 
 def _build_redis_backend_url() -> str:
     """
@@ -37,8 +41,19 @@ app = Celery(
 # Configuração de filas
 app.conf.task_routes = {
     'process_event_task': {'queue': 'audit_events'},
+    'property.generate_image_renditions': {'queue': 'media_events'},
+    'export.run_job': {'queue': 'export_events'},
+    'lead.ingest_batch': {'queue': 'lead_events'},
+    'performance.warm_cache': {'queue': 'commission_events'},
+    'commission.generate_statements': {'queue': 'statement_events'},
 }
 
+# Statement rendering: processes per task and files sent back per XML-RPC call
+STATEMENT_RENDER_PROCESSES = int(
+    os.getenv('STATEMENT_RENDER_PROCESSES', os.cpu_count() or 1)
+)
+STATEMENT_UPLOAD_BATCH = 50
+
 # ---------------------------------------------------------------------------
 # OpenTelemetry Initialization
 # ---------------------------------------------------------------------------
@@ -226,5 +241,192 @@ def send_proposal_email_task(self, proposal_id, event_name='proposal.sent'):
         raise self.retry(exc=exc, countdown=2 ** self.request.retries)
 
 
+def _connect_odoo():
+    """Authenticate against Odoo XML-RPC; returns (db, uid, password, models)."""
+    url = os.environ['ODOO_URL']
+    db = os.environ['ODOO_DB']
+    username = os.environ['ODOO_USER']
+    password = os.environ['ODOO_PASSWORD']
+
+    common = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common')
+    models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object', allow_none=True)
+    uid = common.authenticate(db, username, password, {})
+    return db, uid, password, models
+
+
+@app.task(bind=True, max_retries=3, name='property.generate_image_renditions')
+def generate_image_renditions_task(self, attachment_id):
+    """
+    Build thumbnail/medium/large WebP+JPEG renditions of a property photo.
+
+    Enqueued after the upload transaction commits (media_events queue). The
+    resize itself runs in Odoo (Pillow) through ir.attachment's
+    generate_property_renditions(), which is idempotent, so retries are safe.
+    """
+    try:
+        db, uid, password, models = _connect_odoo()
+        models.execute_kw(
+            db, uid, password,
+            'ir.attachment',
+            'generate_property_renditions',
+            [[attachment_id]],
+        )
+        return f"Renditions generated for attachment {attachment_id}"
+
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@app.task(bind=True, max_retries=3, name='export.run_job')
+def run_export_job_task(self, job_id):
+    """
+    Produce the file of an export job (POST /api/v1/exports).
+
+    Each run_export_chunk() call appends one chunk of rows and commits, so no
+    Odoo worker is held for the whole export; the loop ends once the job is
+    done. A retried chunk is idempotent (the partial file is cut back to the
+    committed size). When retries are exhausted the job is marked failed.
+    """
+    try:
+        db, uid, password, models = _connect_odoo()
+        chunks = 0
+        while not models.execute_kw(
+            db, uid, password,
+            'real.estate.export.job',
+            'run_export_chunk',
+            [[job_id]],
+        ):
+            chunks += 1
+        return f"Export job {job_id} finished after {chunks + 1} chunks"
+
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            try:
+                db, uid, password, models = _connect_odoo()
+                models.execute_kw(
+                    db, uid, password,
+                    'real.estate.export.job',
+                    'mark_export_failed',
+                    [[job_id], str(exc)],
+                )
+            except Exception:
+                pass  # Do not mask the original error
+            raise
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@app.task(bind=True, max_retries=3, name='lead.ingest_batch')
+def ingest_lead_batch_task(self, intake_ids):
+    """
+    Create the leads of a portal webhook batch (POST /api/v1/leads/ingest).
+
+    The rows were committed to real.estate.lead.intake before this task was
+    sent; process_intake() creates their leads in one batch and skips rows
+    already processed, so retries are safe. Rows still pending after the
+    retries are picked up by the intake cron.
+    """
+    try:
+        db, uid, password, models = _connect_odoo()
+        created = models.execute_kw(
+            db, uid, password,
+            'real.estate.lead.intake',
+            'process_intake',
+            [intake_ids],
+        )
+        return f"{created} lead(s) created from {len(intake_ids)} intake row(s)"
+
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@app.task(bind=True, max_retries=3, name='performance.warm_cache')
+def warm_performance_cache_task(self, agent_ids, company_ids):
+    """
+    Refill the performance cache after a commission, assignment or agent
+    change (GET /api/v1/agents/<id>/performance and /agents/ranking).
+
+    Enqueued once the changing transaction committed and its cache entries
+    were dropped; warm_performance_cache() recomputes this month, last month
+    and the year to date, and overwrites whatever is cached, so retries and
+    duplicate tasks are harmless.
+    """
+    try:
+        db, uid, password, models = _connect_odoo()
+        stored = models.execute_kw(
+            db, uid, password,
+            'real.estate.agent',
+            'warm_performance_cache',
+            [agent_ids],
+            {'company_ids': company_ids},
+        )
+        return f"{stored} performance cache entries warmed"
+
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@app.task(bind=True, max_retries=3, name='commission.generate_statements')
+def generate_commission_statements_task(self, run_id):
+    """
+    Produce the monthly commission statements of a company
+    (POST /api/v1/commission-statements).
+
+    prepare_statements() computes every agent's statement in one aggregated
+    pass; the CSV/PDF files are rendered here in a process pool and sent back
+    in batches as attachments. The statement_events worker runs the solo
+    pool: prefork children are daemonic and cannot start the render
+    processes. A retry starts the run over. When retries are exhausted the
+    run is marked failed.
+    """
+    model = 'real.estate.commission.statement.run'
+    try:
+        db, uid, password, models = _connect_odoo()
+        data = models.execute_kw(
+            db, uid, password, model, 'prepare_statements', [[run_id]],
+        )
+        if not data:
+            return f"Statement run {run_id} already finished"
+
+        run, statements = data['run'], data['statements']
+        stored = 0
+        files = []
+        with ProcessPoolExecutor(max_workers=STATEMENT_RENDER_PROCESSES) as pool:
+            for rendered in pool.map(
+                render_statement, itertools.repeat(run), statements, chunksize=8,
+            ):
+                files.extend(rendered)
+                if len(files) >= STATEMENT_UPLOAD_BATCH:
+                    stored += models.execute_kw(
+                        db, uid, password, model, 'store_statement_files',
+                        [[run_id], files],
+                    )
+                    files = []
+        if files:
+            stored += models.execute_kw(
+                db, uid, password, model, 'store_statement_files',
+                [[run_id], files],
+            )
+        models.execute_kw(
+            db, uid, password, model, 'finish_statements', [[run_id]],
+        )
+        return (
+            f"Statement run {run_id}: {len(statements)} statement(s), "
+            f"{stored} file(s)"
+        )
+
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            try:
+                db, uid, password, models = _connect_odoo()
+                models.execute_kw(
+                    db, uid, password, model, 'mark_statements_failed',
+                    [[run_id], str(exc)],
+                )
+            except Exception:
+                pass  # Do not mask the original error
+            raise
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
 if __name__ == '__main__':
     app.start()
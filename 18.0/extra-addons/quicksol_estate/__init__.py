@@ -1,4 +1,5 @@
 from . import models
 from . import controllers
 from . import wizards  # Feature 015: Reassign wizard
+from . import cli  # odoo-bin rebuild_agent_performance
 from .hooks.post_init import post_init  # Feature 015: post-install hook
@@ -1,6 +1,6 @@
 {
     "name": "Real Estate Management - Kenlo Imóveis Edition",
-    "version": "18.0.5.0.0",  # Feature 020: RBAC Capabilities API
+    "version": "18.0.5.5.0",  # Daily agent performance rollups
     "category": "Real Estate",
     "summary": "Complete property management system following Kenlo Imóveis standards with RBAC",
     "description": """
@@ -85,6 +85,10 @@ Property Form Sections:
         "data/api_endpoints.xml",
         "data/user_auth_endpoints_data.xml",
         "data/lease_cron.xml",  # CHK002: Auto-expire leases cron job
+        "data/property_change_cron.xml",  # Property change feed log compaction
+        "data/portal_feed_cron.xml",  # Incremental portal listing feeds
+        "data/export_job_cron.xml",  # Async export job retention
+        "data/lead_intake_cron.xml",  # Portal lead intake fallback + retention
         # Feature 013: Property Proposals
         "security/proposal_record_rules.xml",
         "data/proposal_sequence.xml",
@@ -115,6 +119,7 @@ Property Form Sections:
         "views/owner_views.xml",
         "views/real_estate_menus.xml",
         "views/lead_filter_views.xml",  # FR-048: Saved search filters (REATIVADO)
+        "views/lead_portal_views.xml",  # Portal lead webhook integrations
         "views/res_users_views.xml",
         "views/proposal_views.xml",  # Feature 013: Proposal Kanban/List/Form
         # Feature 015: Service Pipeline (Atendimentos) views
@@ -0,0 +1 @@
+from . import rebuild_agent_performance
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import logging
+import optparse
+import sys
+from pathlib import Path
+
+import odoo
+from odoo import SUPERUSER_ID, api
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+
+class RebuildAgentPerformance(Command):
+    """Rebuild the daily agent performance rollups from commission transactions"""
+
+    name = "rebuild_agent_performance"
+
+    def run(self, args):
+        parser = odoo.tools.config.parser
+        parser.prog = f"{Path(sys.argv[0]).name} {self.name}"
+        group = optparse.OptionGroup(
+            parser,
+            "Rebuild agent performance",
+            "Recompute real_estate_agent_performance_daily in the database "
+            "given by -d.",
+        )
+        group.add_option(
+            "--agent-ids",
+            dest="agent_ids",
+            default="",
+            help="comma-separated agent ids to rebuild (default: every agent)",
+        )
+        parser.add_option_group(group)
+        opt = odoo.tools.config.parse_config(args, setup_logging=True)
+
+        dbname = odoo.tools.config["db_name"]
+        if not dbname:
+            sys.exit("Missing database name: use -d <database>")
+        agent_ids = None
+        if opt.agent_ids:
+            try:
+                agent_ids = [int(id_) for id_ in opt.agent_ids.split(",") if id_]
+            except ValueError:
+                sys.exit(f"Invalid --agent-ids: {opt.agent_ids}")
+
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            written = env["real.estate.agent.performance.daily"]._rebuild(agent_ids)
+        _logger.info("Agent performance rollups rebuilt: %d row(s)", written)
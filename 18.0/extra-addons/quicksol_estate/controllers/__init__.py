@@ -16,3 +16,7 @@ from . import (
     property_attachments_controller,
 )  # Feature 017: Property Attachments Upload API
 from . import capabilities_controller  # Feature 020: RBAC capabilities bootstrap API
+from . import portal_feed_controller  # Static per-company portal listing feeds
+from . import export_api  # Async export jobs (POST /api/v1/exports)
+from . import lead_intake_api  # Portal lead webhooks (POST /api/v1/leads/ingest)
+from . import commission_statement_api  # Monthly commission statements
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import json
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from urllib.parse import urlencode
 from odoo import http
 from odoo.http import request, Response
 from odoo.exceptions import UserError, ValidationError
 from .utils.auth import require_jwt
+from .utils.cursor import decode_cursor, encode_cursor
 from .utils.response import error_response, success_response
 from .utils.schema import SchemaValidator
 from odoo.addons.thedevkitchen_apigateway.middleware import (
@@ -1735,6 +1737,73 @@ class AgentApiController(http.Controller):
             _logger.exception("Error creating commission transaction")
             return error_response(500, f"Internal server error: {str(e)}")
 
+    @http.route(
+        "/api/v1/commission-transactions/batch",
+        type="http",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def calculate_commission_batch(self, **kwargs):
+        """
+        Calculate the commissions of many transactions at once and, unless
+        ``dry_run``, record them all in one insert (all or nothing).
+        """
+        from odoo.addons.quicksol_estate.services.commission_service import (
+            CommissionService,
+        )
+
+        try:
+            body = json.loads(request.httprequest.data.decode("utf-8"))
+            items = body.get("transactions") if isinstance(body, dict) else None
+            if not isinstance(items, list) or not items:
+                return error_response(
+                    400, "transactions must be a non-empty list of transactions"
+                )
+            if not all(isinstance(item, dict) for item in items):
+                return error_response(400, "Each transaction must be an object")
+            dry_run = bool(body.get("dry_run", False))
+
+            # Company isolation - every agent and prospector must belong to
+            # one of the user's companies
+            agent_ids = {item.get("agent_id") for item in items}
+            agent_ids.update(item.get("prospector_id") for item in items)
+            agents = (
+                request.env["real.estate.agent"]
+                .sudo()
+                .browse([id_ for id_ in agent_ids if isinstance(id_, int)])
+                .exists()
+            )
+            if agents.company_id - request.env.user.company_ids:
+                return error_response(
+                    403, "You do not have access to the company of every agent"
+                )
+
+            batch = CommissionService(request.env).calculate_batch(
+                items, dry_run=dry_run
+            )
+            return success_response(
+                {
+                    "dry_run": dry_run,
+                    "count": len(batch["results"]),
+                    "transaction_count": len(batch["transactions"]),
+                    "results": batch["results"],
+                },
+                status_code=200 if dry_run else 201,
+            )
+
+        except json.JSONDecodeError:
+            return error_response(400, "Invalid JSON in request body")
+        except (ValidationError, UserError) as e:
+            return error_response(400, str(e))
+        except Exception as e:
+            _logger.exception("Error calculating commission batch")
+            return error_response(500, f"Internal server error: {str(e)}")
+
     @http.route(
         "/api/v1/agents/<int:agent_id>/performance",
         type="http",
@@ -1790,6 +1859,17 @@ class AgentApiController(http.Controller):
                 agent_id=agent_id, date_from=date_from, date_to=date_to
             )
 
+            # Transactions are a paginated sub-resource, never cached
+            period = {
+                key: value
+                for key, value in (("start_date", start_date), ("end_date", end_date))
+                if value
+            }
+            transactions_link = f"/api/v1/agents/{agent_id}/performance/transactions"
+            if period:
+                transactions_link += f"?{urlencode(period)}"
+            performance_data["_links"] = {"transactions": transactions_link}
+
             return success_response(performance_data)
 
         except UserError as e:
@@ -1810,6 +1890,109 @@ class AgentApiController(http.Controller):
             _logger.exception("Error getting agent performance")
             return error_response(500, f"Internal server error: {str(e)}")
 
+    @http.route(
+        "/api/v1/agents/<int:agent_id>/performance/transactions",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def list_agent_performance_transactions(self, agent_id, **kwargs):
+        """
+        Commission transactions of an agent performance period, newest first,
+        keyset-paginated by (transaction_date, id): pass ``next_cursor`` back
+        as ``cursor`` while ``has_more`` is true.
+        """
+        from odoo.addons.quicksol_estate.services.performance_service import (
+            TRANSACTIONS_DEFAULT_LIMIT,
+            TRANSACTIONS_MAX_LIMIT,
+            PerformanceService,
+        )
+
+        try:
+            period = {}
+            dates = {}
+            for param in ("start_date", "end_date"):
+                value = kwargs.get(param)
+                if not value:
+                    continue
+                try:
+                    dates[param] = datetime.strptime(value, "%Y-%m-%d").date()
+                except ValueError:
+                    return error_response(
+                        400, f"Invalid {param} format: {value}. Use YYYY-MM-DD"
+                    )
+                period[param] = value
+            date_from = dates.get("start_date")
+            date_to = dates.get("end_date")
+            if date_from and date_to and date_from > date_to:
+                return error_response(400, "start_date cannot be after end_date")
+
+            try:
+                limit = int(kwargs.get("limit", TRANSACTIONS_DEFAULT_LIMIT))
+            except ValueError:
+                return error_response(400, "limit must be a positive integer")
+            if limit < 1:
+                return error_response(400, "limit must be a positive integer")
+            limit = min(limit, TRANSACTIONS_MAX_LIMIT)
+
+            after = None
+            cursor = kwargs.get("cursor")
+            if cursor:
+                try:
+                    after_date, after_id = decode_cursor(cursor)
+                except ValueError:
+                    return error_response(400, "Invalid cursor")
+                after = (after_date.date(), after_id)
+
+            service = PerformanceService(request.env)
+            transactions, has_more = service.list_agent_transactions(
+                agent_id, date_from, date_to, limit=limit, after=after
+            )
+
+            base_link = f"/api/v1/agents/{agent_id}/performance/transactions"
+            query = dict(period, limit=limit)
+            self_query = dict(query, cursor=cursor) if cursor else query
+            links = {
+                "self": f"{base_link}?{urlencode(self_query)}",
+                "performance": f"/api/v1/agents/{agent_id}/performance"
+                + (f"?{urlencode(period)}" if period else ""),
+            }
+            next_cursor = None
+            if has_more:
+                last = transactions[-1]
+                next_cursor = encode_cursor(
+                    date.fromisoformat(last["date"]), last["id"]
+                )
+                next_query = dict(query, cursor=next_cursor)
+                links["next"] = f"{base_link}?{urlencode(next_query)}"
+
+            return success_response(
+                {
+                    "success": True,
+                    "data": transactions,
+                    "count": len(transactions),
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                    "_links": links,
+                }
+            )
+
+        except UserError as e:
+            error_msg = str(e)
+            if "not found" in error_msg.lower():
+                return error_response(404, error_msg)
+            if "access denied" in error_msg.lower():
+                return error_response(403, error_msg)
+            return error_response(400, error_msg)
+        except Exception as e:
+            _logger.exception("Error listing agent performance transactions")
+            return error_response(500, f"Internal server error: {str(e)}")
+
     @http.route(
         "/api/v1/agents/ranking",
         type="http",
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from odoo import http
+from odoo.addons.thedevkitchen_apigateway.middleware import (
+    require_company,
+    require_session,
+)
+from odoo.http import request
+
+from .utils.auth import require_jwt
+from .utils.response import attachment_response, error_response, success_response
+from ..services import commission_statement_service
+
+_logger = logging.getLogger(__name__)
+
+# Profiles that see every agent's commissions in their company
+STATEMENT_GROUPS = (
+    "quicksol_estate.group_real_estate_owner",
+    "quicksol_estate.group_real_estate_manager",
+    "quicksol_estate.group_real_estate_financial",
+    "base.group_system",
+)
+
+
+def _can_generate_statements(user):
+    return any(user.has_group(group) for group in STATEMENT_GROUPS)
+
+
+def _serialize_run(run):
+    return {
+        "id": run.id,
+        "company_id": run.company_id.id,
+        "month": commission_statement_service.month_label(run.period_start),
+        "date_from": run.period_start.isoformat(),
+        "date_to": run.period_end.isoformat(),
+        "format": run.file_format,
+        "state": run.state,
+        "statement_count": len(run.statement_ids),
+        "error": run.error_message or None,
+        "created_at": run.create_date.isoformat() if run.create_date else None,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "links": [
+            {
+                "rel": "manifest",
+                "href": f"/api/v1/commission-statements/{run.id}/manifest",
+                "method": "GET",
+            },
+        ],
+    }
+
+
+def _serialize_file(run, file_format, attachment):
+    return {
+        "format": file_format,
+        "filename": attachment.name,
+        "mimetype": attachment.mimetype,
+        "size": attachment.file_size,
+        "checksum": attachment.checksum,
+        "href": f"/api/v1/commission-statements/{run.id}/files/{attachment.id}",
+    }
+
+
+class CommissionStatementApiController(http.Controller):
+    def _get_run(self, run_id):
+        run = (
+            request.env["real.estate.commission.statement.run"]
+            .sudo()
+            .browse(run_id)
+            .exists()
+        )
+        if not run or run.company_id not in request.env.user.company_ids:
+            return None
+        if not _can_generate_statements(request.env.user):
+            return None
+        return run
+
+    @http.route(
+        "/api/v1/commission-statements",
+        type="http",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def create_statement_run(self, **kwargs):
+        """
+        Queue the commission statements of every agent of the current
+        company for ``month`` (YYYY-MM); poll the manifest for the files.
+        """
+        try:
+            try:
+                body = json.loads(request.httprequest.data or "{}")
+                if not isinstance(body, dict):
+                    raise ValueError
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
+                return error_response(400, "Invalid JSON in request body")
+
+            if not _can_generate_statements(request.env.user):
+                return error_response(
+                    403,
+                    "Only owners, managers and financial users can generate "
+                    "commission statements",
+                )
+            try:
+                period_start, period_end = commission_statement_service.parse_month(
+                    body.get("month")
+                )
+            except ValueError as e:
+                return error_response(400, str(e))
+            file_format = body.get("format", "both")
+            formats = dict(commission_statement_service.FORMATS)
+            if file_format not in formats:
+                return error_response(
+                    400, f"format must be one of: {', '.join(formats)}"
+                )
+
+            company = request.env.company
+            run = (
+                request.env["real.estate.commission.statement.run"]
+                .sudo()
+                .create(
+                    {
+                        "name": f"{company.name} commission statements "
+                        f"{commission_statement_service.month_label(period_start)}",
+                        "user_id": request.env.user.id,
+                        "company_id": company.id,
+                        "period_start": period_start,
+                        "period_end": period_end,
+                        "file_format": file_format,
+                    }
+                )
+            )
+            run._enqueue()
+
+            return success_response(_serialize_run(run), status_code=202)
+
+        except Exception as e:
+            _logger.exception("Error creating commission statement run")
+            return error_response(500, f"Internal server error: {str(e)}")
+
+    @http.route(
+        "/api/v1/commission-statements/<int:run_id>/manifest",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def get_statement_manifest(self, run_id, **kwargs):
+        """
+        State of a statement run and, per agent, the statement totals and
+        the download links of its files (once rendered).
+        """
+        try:
+            run = self._get_run(run_id)
+            if not run:
+                return error_response(404, f"Statement run {run_id} not found")
+            data = _serialize_run(run)
+            statements = []
+            for statement in run.statement_ids:
+                files = [
+                    _serialize_file(run, file_format, attachment)
+                    for file_format, attachment in (
+                        ("csv", statement.csv_attachment_id),
+                        ("pdf", statement.pdf_attachment_id),
+                    )
+                    if attachment
+                ]
+                statements.append(
+                    {
+                        "agent_id": statement.agent_id.id,
+                        "agent_name": statement.agent_id.name,
+                        "transaction_count": statement.transaction_count,
+                        "transaction_amount": statement.transaction_amount,
+                        "total_commission": statement.total_commission,
+                        "pending_commission": statement.pending_commission,
+                        "paid_commission": statement.paid_commission,
+                        "cancelled_commission": statement.cancelled_commission,
+                        "files": files,
+                    }
+                )
+            data["statements"] = statements
+            return success_response(data)
+        except Exception as e:
+            _logger.exception(f"Error reading statement run {run_id}")
+            return error_response(500, f"Internal server error: {str(e)}")
+
+    @http.route(
+        "/api/v1/commission-statements/<int:run_id>/files/<int:attachment_id>",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def download_statement_file(self, run_id, attachment_id, **kwargs):
+        try:
+            run = self._get_run(run_id)
+            if not run:
+                return error_response(404, f"Statement run {run_id} not found")
+            attachments = (
+                run.statement_ids.csv_attachment_id
+                | run.statement_ids.pdf_attachment_id
+            )
+            attachment = attachments.filtered(lambda a: a.id == attachment_id)
+            if not attachment:
+                return error_response(
+                    404, f"File {attachment_id} not found in statement run {run_id}"
+                )
+            return attachment_response(attachment.sudo())
+        except Exception as e:
+            _logger.exception(f"Error downloading statement file {attachment_id}")
+            return error_response(500, f"Internal server error: {str(e)}")
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from odoo import http
+from odoo.addons.thedevkitchen_apigateway.middleware import (
+    require_company,
+    require_session,
+)
+from odoo.http import request
+
+from .utils.auth import require_jwt
+from .utils.commission_filters import (
+    build_commission_filter_domain,
+    commission_scope_user_id,
+)
+from .utils.property_filters import (
+    build_property_filter_domain,
+    build_property_scope_domain,
+    parse_company_ids,
+)
+from .utils.response import attachment_response, error_response, success_response
+from .utils.service_filters import (
+    build_service_access_domain,
+    build_service_filter_domain,
+)
+from ..services.export_job_service import EXPORT_RESOURCES
+from ..services.lead_filter_domain import build_lead_filter_domain, is_pure_agent
+
+_logger = logging.getLogger(__name__)
+
+
+def _query_params(filters):
+    """
+    Flatten a JSON ``filters`` object into query-string style values so the
+    list endpoints' filter builders parse them exactly as they parse GET
+    parameters (booleans as "true"/"false", lists as "1,2,3").
+    """
+    params = {}
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            params[key] = "true" if value else "false"
+        elif isinstance(value, (list, tuple)):
+            params[key] = ",".join(str(item) for item in value)
+        else:
+            params[key] = str(value)
+    return params
+
+
+def _parse_export_body(data):
+    """
+    ``(resource, params, compress)`` of a POST /api/v1/exports body, the
+    ``filters`` flattened by _query_params(). Raises ValueError with the
+    400 message when the body is malformed.
+    """
+    try:
+        body = json.loads(data or "{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        body = None
+    if not isinstance(body, dict):
+        raise ValueError("Invalid JSON in request body")
+
+    resource = body.get("resource")
+    if resource not in EXPORT_RESOURCES:
+        raise ValueError(
+            f"resource must be one of: {', '.join(sorted(EXPORT_RESOURCES))}"
+        )
+    filters = body.get("filters") or {}
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object")
+    return resource, _query_params(filters), bool(body.get("gzip"))
+
+
+def _serialize_job(job):
+    data = {
+        "id": job.id,
+        "resource": job.resource,
+        "state": job.state,
+        "row_count": job.row_count,
+        "error": job.error_message or None,
+        "created_at": job.create_date.isoformat() if job.create_date else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "file": None,
+        "links": [
+            {"rel": "self", "href": f"/api/v1/exports/{job.id}", "method": "GET"},
+        ],
+    }
+    if job.state == "done" and job.attachment_id:
+        attachment = job.attachment_id.sudo()
+        data["file"] = {
+            "filename": attachment.name,
+            "mimetype": attachment.mimetype,
+            "size": attachment.file_size,
+        }
+        data["links"].append(
+            {
+                "rel": "download",
+                "href": f"/api/v1/exports/{job.id}/download",
+                "method": "GET",
+            }
+        )
+    return data
+
+
+class ExportApiController(http.Controller):
+    def _build_export_domain(self, resource, params):
+        """
+        Scoped domain for ``resource`` built with the same helpers as its list
+        endpoint. Returns ``(domain, include_archived, error)`` where
+        ``error`` is ``(status, message)`` or None.
+        """
+        user = request.env.user
+
+        if resource == "leads":
+            domain = build_lead_filter_domain(
+                params,
+                request.company_domain,
+                agent_user_id=user.id if is_pure_agent(user) else None,
+                can_filter_agent=user.has_group(
+                    "quicksol_estate.group_real_estate_manager"
+                ),
+            )
+            return domain, params.get("active") == "all", None
+
+        if resource == "properties":
+            company_ids, company_error = parse_company_ids(
+                params.get("company_ids"), request.user_company_ids
+            )
+            if company_error:
+                return None, False, company_error
+            domain, filter_error = build_property_filter_domain(request.env, params)
+            if filter_error:
+                return None, False, (400, filter_error)
+            domain += build_property_scope_domain(request.env, user, company_ids)
+            # list_properties searches with active_test=False
+            return domain, True, None
+
+        if resource == "services":
+            domain = build_service_filter_domain(params) + build_service_access_domain(
+                request.env, request.user_company_ids
+            )
+            return domain, False, None
+
+        # The worker reads under sudo: every profile below financial only
+        # exports its own commissions
+        domain = build_commission_filter_domain(
+            params,
+            request.company_domain,
+            agent_user_id=commission_scope_user_id(user),
+        )
+        return domain, False, None
+
+    def _get_own_job(self, job_id):
+        job = request.env["real.estate.export.job"].sudo().browse(job_id).exists()
+        if not job:
+            return None
+        user = request.env.user
+        if job.user_id != user and not user.has_group("base.group_system"):
+            return None
+        return job
+
+    @http.route(
+        "/api/v1/exports",
+        type="http",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def create_export(self, **kwargs):
+        """
+        Queue an export of leads, properties, services or commission
+        transactions. ``filters`` takes the query parameters of the matching
+        list endpoint; company/agent isolation is resolved now, with the
+        caller's permissions, and stored on the job.
+        """
+        try:
+            try:
+                resource, params, compress = _parse_export_body(
+                    request.httprequest.data
+                )
+            except ValueError as e:
+                return error_response(400, str(e))
+
+            try:
+                domain, include_archived, error = self._build_export_domain(
+                    resource, params
+                )
+            except ValueError as e:
+                return error_response(400, f"Invalid filter: {str(e)}")
+            if error:
+                return error_response(*error)
+
+            job = (
+                request.env["real.estate.export.job"]
+                .sudo()
+                .create(
+                    {
+                        "name": f"{resource.capitalize()} export",
+                        "user_id": request.env.user.id,
+                        "company_id": request.env.company.id,
+                        "resource": resource,
+                        "domain": json.dumps(domain),
+                        "include_archived": include_archived,
+                        "compress": compress,
+                    }
+                )
+            )
+            job._enqueue()
+
+            return success_response(_serialize_job(job), status_code=202)
+
+        except Exception as e:
+            _logger.exception("Error creating export job")
+            return error_response(500, f"Internal server error: {str(e)}")
+
+    @http.route(
+        "/api/v1/exports/<int:job_id>",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def get_export(self, job_id, **kwargs):
+        """Poll an export job; a ``download`` link appears once it is done."""
+        try:
+            job = self._get_own_job(job_id)
+            if not job:
+                return error_response(404, f"Export job {job_id} not found")
+            return success_response(_serialize_job(job))
+        except Exception as e:
+            _logger.exception(f"Error reading export job {job_id}")
+            return error_response(500, f"Internal server error: {str(e)}")
+
+    @http.route(
+        "/api/v1/exports/<int:job_id>/download",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def download_export(self, job_id, **kwargs):
+        try:
+            job = self._get_own_job(job_id)
+            if not job:
+                return error_response(404, f"Export job {job_id} not found")
+            if job.state != "done" or not job.attachment_id:
+                return error_response(
+                    409, f"Export job {job_id} is {job.state}", "conflict"
+                )
+            return attachment_response(job.attachment_id.sudo())
+        except Exception as e:
+            _logger.exception(f"Error downloading export job {job_id}")
+            return error_response(500, f"Internal server error: {str(e)}")
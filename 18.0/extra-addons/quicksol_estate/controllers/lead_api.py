@@ -3,20 +3,51 @@
 
 import json
 import logging
+import os
+import tempfile
 
-from odoo import http
+from odoo import api, http
 from odoo.addons.thedevkitchen_apigateway.middleware import (
     require_company,
     require_session,
 )
 from odoo.exceptions import AccessError, UserError, ValidationError
 from odoo.http import Response, request
+from odoo.modules.registry import Registry
 
 from .utils.auth import require_jwt
+from .utils.lead_export import (
+    EXPORT_CHUNK_SIZE,
+    LEAD_EXPORT_FIELDS,
+    iter_csv_chunks,
+    write_xlsx,
+)
+from .utils.lead_activities import (
+    RECENT_ACTIVITIES_LIMIT,
+    parse_activity,
+    serialize_recent_activity,
+)
 from .utils.response import error_response, success_response
+from ..services import lead_filter_service, lead_statistics_service
+from ..services.lead_filter_domain import build_lead_filter_domain, is_pure_agent
 
 _logger = logging.getLogger(__name__)
 
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def _iter_file_and_remove(path):
+    """Stream a temporary export file in blocks, deleting it afterwards."""
+    try:
+        with open(path, "rb") as fh:
+            while True:
+                block = fh.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                yield block
+    finally:
+        os.unlink(path)
+
 
 class LeadApiController(http.Controller):
     @http.route(
@@ -30,24 +61,8 @@ class LeadApiController(http.Controller):
         try:
             user = request.env.user
 
-            # Parse query parameters
-            state_filter = kwargs.get("state")
-            agent_filter = kwargs.get("agent_id")
-            search_query = kwargs.get("search", "").strip()
             active_filter = kwargs.get("active", "true")
 
-            # Advanced filters (Phase 6)
-            budget_min_filter = kwargs.get("budget_min")
-            budget_max_filter = kwargs.get("budget_max")
-            bedrooms_filter = kwargs.get("bedrooms")
-            property_type_filter = kwargs.get("property_type_id")
-            location_filter = kwargs.get("location", "").strip()
-            last_activity_before = kwargs.get("last_activity_before", "").strip()
-
-            # Period filters
-            created_from = kwargs.get("created_from", "").strip()
-            created_to = kwargs.get("created_to", "").strip()
-
             # Sorting parameters
             sort_by = kwargs.get("sort_by", "create_date")
             sort_order = kwargs.get("sort_order", "desc").lower()
@@ -63,142 +78,17 @@ class LeadApiController(http.Controller):
             limit = min(int(kwargs.get("limit", 20)), 100)
             offset = int(kwargs.get("offset", 0))
 
-            # Build domain for filtering
-            # FR1.1: company scoping is the base of every subsequent filter,
-            # including the last_activity_before subquery below.
-            domain = list(request.company_domain)
-
-            # FR2.2: pure Agents are additionally restricted to their own leads.
-            if self._is_agent_role(user):
-                domain.append(("agent_id.user_id", "=", user.id))
-
-            # Active filter (ADR-015: soft-delete)
-            if active_filter == "true":
-                domain.append(("active", "=", True))
-            elif active_filter == "false":
-                domain.append(("active", "=", False))
-            # 'all' includes both active and inactive
-
-            # State filter
-            if state_filter:
-                domain.append(("state", "=", state_filter))
-
-            # Agent filter (managers can filter by agent)
-            if agent_filter and user.has_group(
-                "quicksol_estate.group_real_estate_manager"
-            ):
-                domain.append(("agent_id", "=", int(agent_filter)))
-
-            # Free-text search
-            if search_query:
-                domain.append("|")
-                domain.append("|")
-                domain.append(("name", "ilike", search_query))
-                domain.append(("phone", "ilike", search_query))
-                domain.append(("email", "ilike", search_query))
-
-            # Budget filters (FR-039, FR-040)
-            if budget_min_filter:
-                # Find leads with max budget >= specified minimum
-                domain.append(("budget_max", ">=", float(budget_min_filter)))
-
-            if budget_max_filter:
-                # Find leads with min budget <= specified maximum
-                domain.append(("budget_min", "<=", float(budget_max_filter)))
-
-            # Bedrooms filter (FR-041)
-            if bedrooms_filter:
-                domain.append(("bedrooms_needed", "=", int(bedrooms_filter)))
-
-            # Property type filter (FR-042)
-            if property_type_filter:
-                domain.append(
-                    ("property_type_interest", "=", int(property_type_filter))
-                )
-
-            # Location filter (FR-043)
-            if location_filter:
-                domain.append(("location_preference", "ilike", location_filter))
-
-            # Period filter (created_from / created_to)
-            if created_from:
-                try:
-                    from datetime import datetime as dt
-
-                    domain.append(
-                        (
-                            "create_date",
-                            ">=",
-                            dt.strptime(created_from, "%Y-%m-%d").strftime(
-                                "%Y-%m-%d 00:00:00"
-                            ),
-                        )
-                    )
-                except ValueError:
-                    _logger.warning(
-                        f"Invalid date format for created_from: {created_from}"
-                    )
-
-            if created_to:
-                try:
-                    from datetime import datetime as dt
-
-                    domain.append(
-                        (
-                            "create_date",
-                            "<=",
-                            dt.strptime(created_to, "%Y-%m-%d").strftime(
-                                "%Y-%m-%d 23:59:59"
-                            ),
-                        )
-                    )
-                except ValueError:
-                    _logger.warning(f"Invalid date format for created_to: {created_to}")
-
-            # Last activity before filter (FR-047)
-            if last_activity_before:
-                try:
-                    from datetime import datetime as dt
-
-                    activity_date = dt.strptime(last_activity_before, "%Y-%m-%d")
-
-                    # Find leads with no messages after the specified date
-                    # This requires a subquery - we'll get all lead IDs, then filter
-                    Lead = request.env["real.estate.lead"]
-                    all_leads = Lead.sudo().search(domain)
-
-                    inactive_lead_ids = []
-                    for lead in all_leads:
-                        last_message = (
-                            request.env["mail.message"]
-                            .sudo()
-                            .search(
-                                [
-                                    ("model", "=", "real.estate.lead"),
-                                    ("res_id", "=", lead.id),
-                                    ("message_type", "=", "comment"),
-                                ],
-                                order="date desc",
-                                limit=1,
-                            )
-                        )
-
-                        if not last_message or (
-                            last_message.date
-                            and last_message.date.date() < activity_date.date()
-                        ):
-                            inactive_lead_ids.append(lead.id)
-
-                    if inactive_lead_ids:
-                        domain.append(("id", "in", inactive_lead_ids))
-                    else:
-                        # No leads match - return empty result
-                        domain.append(("id", "=", -1))
-
-                except ValueError:
-                    _logger.warning(
-                        f"Invalid date format for last_activity_before: {last_activity_before}"
-                    )
+            # Build domain for filtering (shared with exports)
+            # FR1.1 company scoping + FR2.2 agent scoping are the base of
+            # every filter; managers can filter by agent.
+            domain = build_lead_filter_domain(
+                kwargs,
+                request.company_domain,
+                agent_user_id=user.id if self._is_agent_role(user) else None,
+                can_filter_agent=user.has_group(
+                    "quicksol_estate.group_real_estate_manager"
+                ),
+            )
 
             # Query leads (company/agent domain applied explicitly above,
             # per ADR-008 Sec.1 — .sudo() is retained but no longer relied
@@ -210,9 +100,23 @@ class LeadApiController(http.Controller):
             )
 
             total = lead_ctx.sudo().search_count(domain)
-            leads = lead_ctx.sudo().search(
-                domain, limit=limit, offset=offset, order=order_string
+            search_query = (kwargs.get("search") or "").strip()
+            if search_query and "sort_by" not in kwargs:
+                # Free-text search without explicit sort: best matches first
+                leads = lead_ctx.sudo()._search_ranked(
+                    domain, search_query, limit=limit, offset=offset
+                )
+            else:
+                leads = lead_ctx.sudo().search(
+                    domain, limit=limit, offset=offset, order=order_string
+                )
+
+            # Recent activities of the whole page in one query (FR-035)
+            include_activities = (
+                kwargs.get("include_activities", "false").lower() == "true"
             )
+            if include_activities:
+                activities = leads._get_recent_activities(RECENT_ACTIVITIES_LIMIT)
 
             # Serialize leads
             lead_list = []
@@ -254,6 +158,11 @@ class LeadApiController(http.Controller):
                         else None
                     ),
                 }
+                if include_activities:
+                    lead_data["recent_activities"] = [
+                        serialize_recent_activity(message)
+                        for message in activities[lead.id]
+                    ]
                 lead_list.append(lead_data)
 
             # Build response
@@ -285,158 +194,130 @@ class LeadApiController(http.Controller):
     @require_session
     @require_company
     def export_leads_csv(self, **kwargs):
+        """
+        Export leads with the list_leads filters as a streamed download.
 
-        try:
-            import csv
-            import io
-
-            from werkzeug.wrappers import Response as WerkzeugResponse
+        Leads are read in id-ordered keyset chunks via search_read (only the
+        exported columns; agent and property type names come batched with
+        each chunk), so memory stays flat regardless of the result size.
 
+        - ``gzip=true``: gzip-compressed CSV (leads_export.csv.gz)
+        - ``format=xlsx``: XLSX workbook written in constant-memory mode
+        """
+        try:
             user = request.env.user
-
-            # Parse query parameters (same as list_leads)
-            state_filter = kwargs.get("state")
-            agent_filter = kwargs.get("agent_id")
-            search_query = kwargs.get("search", "").strip()
-            active_filter = kwargs.get("active", "true")
-
-            # Advanced filters
-            budget_min_filter = kwargs.get("budget_min")
-            budget_max_filter = kwargs.get("budget_max")
-            bedrooms_filter = kwargs.get("bedrooms")
-            property_type_filter = kwargs.get("property_type_id")
-            location_filter = kwargs.get("location", "").strip()
-
-            # Build domain (same logic as list_leads, without pagination)
-            # FR1.1: company scoping is the base of every subsequent filter.
-            domain = list(request.company_domain)
-
-            # FR2.2: pure Agents are additionally restricted to their own leads.
-            if self._is_agent_role(user):
-                domain.append(("agent_id.user_id", "=", user.id))
-
-            if active_filter == "true":
-                domain.append(("active", "=", True))
-            elif active_filter == "false":
-                domain.append(("active", "=", False))
-
-            if state_filter:
-                domain.append(("state", "=", state_filter))
-
-            if agent_filter and user.has_group(
-                "quicksol_estate.group_real_estate_manager"
-            ):
-                domain.append(("agent_id", "=", int(agent_filter)))
-
-            if search_query:
-                domain.append("|")
-                domain.append("|")
-                domain.append(("name", "ilike", search_query))
-                domain.append(("phone", "ilike", search_query))
-                domain.append(("email", "ilike", search_query))
-
-            if budget_min_filter:
-                domain.append(("budget_max", ">=", float(budget_min_filter)))
-
-            if budget_max_filter:
-                domain.append(("budget_min", "<=", float(budget_max_filter)))
-
-            if bedrooms_filter:
-                domain.append(("bedrooms_needed", "=", int(bedrooms_filter)))
-
-            if property_type_filter:
-                domain.append(
-                    ("property_type_interest", "=", int(property_type_filter))
+            export_format = (kwargs.get("format") or "csv").lower()
+            if export_format not in ("csv", "xlsx"):
+                return error_response(
+                    400, "format must be 'csv' or 'xlsx'", "VALIDATION_ERROR"
                 )
 
-            if location_filter:
-                domain.append(("location_preference", "ilike", location_filter))
-
-            # Query leads (company/agent domain applied explicitly above,
-            # per ADR-008 Sec.1 — .sudo() is retained but no longer relied
-            # upon alone for isolation; see FR1.3)
-            Lead = request.env["real.estate.lead"]
-            leads = Lead.sudo().search(domain, order="create_date desc")
-
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-
-            # Write header
-            writer.writerow(
-                [
-                    "ID",
-                    "Name",
-                    "State",
-                    "Phone",
-                    "Email",
-                    "Agent",
-                    "Budget Min",
-                    "Budget Max",
-                    "Property Type",
-                    "Location",
-                    "Bedrooms",
-                    "First Contact",
-                    "Expected Closing",
-                    "Days in State",
-                    "Created At",
-                ]
-            )
-
-            # Write data rows
-            for lead in leads:
-                writer.writerow(
-                    [
-                        lead.id,
-                        lead.name,
-                        lead.state,
-                        lead.phone or "",
-                        lead.email or "",
-                        lead.agent_id.name if lead.agent_id else "",
-                        lead.budget_min or "",
-                        lead.budget_max or "",
-                        (
-                            lead.property_type_interest.name
-                            if lead.property_type_interest
-                            else ""
-                        ),
-                        lead.location_preference or "",
-                        lead.bedrooms_needed or "",
-                        (
-                            lead.first_contact_date.strftime("%Y-%m-%d")
-                            if lead.first_contact_date
-                            else ""
-                        ),
-                        (
-                            lead.expected_closing_date.strftime("%Y-%m-%d")
-                            if lead.expected_closing_date
-                            else ""
-                        ),
-                        lead.days_in_state,
-                        (
-                            lead.create_date.strftime("%Y-%m-%d %H:%M:%S")
-                            if lead.create_date
-                            else ""
-                        ),
-                    ]
+            try:
+                # Same domain as list_leads (FR1.1 company + FR2.2 agent scoping)
+                domain = build_lead_filter_domain(
+                    kwargs,
+                    request.company_domain,
+                    agent_user_id=user.id if self._is_agent_role(user) else None,
+                    can_filter_agent=user.has_group(
+                        "quicksol_estate.group_real_estate_manager"
+                    ),
                 )
+            except ValueError as e:
+                return error_response(400, f"Invalid filter: {e}", "VALIDATION_ERROR")
 
-            # Prepare response
-            csv_data = output.getvalue()
-            output.close()
+            context = dict(request.env.context)
+            if kwargs.get("active") == "all":
+                context["active_test"] = False
 
-            # Return CSV file
+            if export_format == "xlsx":
+                return self._export_leads_xlsx(domain, context)
+
+            compress = str(kwargs.get("gzip", "")).lower() in ("1", "true")
+            filename = "leads_export.csv.gz" if compress else "leads_export.csv"
             headers = [
-                ("Content-Type", "text/csv"),
-                ("Content-Disposition", "attachment; filename=leads_export.csv"),
+                (
+                    "Content-Type",
+                    "application/gzip" if compress else "text/csv; charset=utf-8",
+                ),
+                ("Content-Disposition", f"attachment; filename={filename}"),
+                ("Cache-Control", "no-store"),
             ]
-
-            return WerkzeugResponse(csv_data, headers=headers)
+            body = self._stream_leads_csv(
+                request.db, request.env.uid, context, domain, compress
+            )
+            return Response(body, headers=headers, direct_passthrough=True)
 
         except Exception as e:
             _logger.error(f"Error exporting leads to CSV: {str(e)}", exc_info=True)
             return error_response(str(e), 500, "INTERNAL_SERVER_ERROR")
 
+    @staticmethod
+    def _iter_lead_export_chunks(Lead, domain):
+        """Yield search_read chunks ordered by id desc (keyset, no OFFSET)."""
+        last_id = None
+        while True:
+            chunk_domain = domain + [("id", "<", last_id)] if last_id else domain
+            records = Lead.search_read(
+                chunk_domain,
+                LEAD_EXPORT_FIELDS,
+                order="id desc",
+                limit=EXPORT_CHUNK_SIZE,
+            )
+            if not records:
+                return
+            yield records
+            if len(records) < EXPORT_CHUNK_SIZE:
+                return
+            last_id = records[-1]["id"]
+            # Drop the chunk from the ORM cache before reading the next one
+            Lead.env.invalidate_all()
+
+    def _stream_leads_csv(self, dbname, uid, context, domain, compress):
+        """
+        Response body generator. It runs after the request cursor is closed,
+        so it reads through its own cursor (company/agent scoping is already
+        in ``domain``, as for the previous in-memory export).
+        """
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            Lead = env["real.estate.lead"].sudo()
+            try:
+                yield from iter_csv_chunks(
+                    self._iter_lead_export_chunks(Lead, domain), compress=compress
+                )
+            except Exception:
+                # Headers are already sent: the client sees a truncated file
+                _logger.exception("Lead export stream aborted")
+                raise
+
+    def _export_leads_xlsx(self, domain, context):
+        Lead = request.env["real.estate.lead"].with_context(context).sudo()
+        fd, path = tempfile.mkstemp(prefix="leads-export-", suffix=".xlsx")
+        os.close(fd)
+        try:
+            write_xlsx(path, self._iter_lead_export_chunks(Lead, domain))
+        except ImportError:
+            os.unlink(path)
+            return error_response(
+                501, "XLSX export is not available on this server", "NOT_IMPLEMENTED"
+            )
+        except BaseException:
+            os.unlink(path)
+            raise
+
+        headers = [
+            (
+                "Content-Type",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            ),
+            ("Content-Disposition", "attachment; filename=leads_export.xlsx"),
+            ("Content-Length", str(os.path.getsize(path))),
+            ("Cache-Control", "no-store"),
+        ]
+        return Response(
+            _iter_file_and_remove(path), headers=headers, direct_passthrough=True
+        )
+
     @http.route(
         "/api/v1/leads",
         type="http",
@@ -911,44 +792,17 @@ class LeadApiController(http.Controller):
             if agent_filter:
                 domain.append(("agent_id", "=", int(agent_filter)))
 
-            Lead = request.env["real.estate.lead"]
-
-            # Total leads (company/agent domain applied explicitly above)
-            total = Lead.sudo().search_count(domain)
-
-            # Count by status
-            states = ["new", "contacted", "qualified", "won", "lost"]
-            by_status = {}
-            for state in states:
-                state_domain = domain + [("state", "=", state)]
-                by_status[state] = Lead.sudo().search_count(state_domain)
-
-            # Count by agent
-            by_agent = []
-            agent_data = Lead.sudo().read_group(
-                domain, fields=["agent_id"], groupby=["agent_id"]
+            # One GROUPING SETS scan for total/by_status/by_agent, cached per
+            # (companies, agent filter, date range) until a lead changes
+            scope = f"user{user.id}" if self._is_agent_role(user) else "all"
+            if agent_filter:
+                scope += f":agent{int(agent_filter)}"
+            key = lead_statistics_service.cache_key(
+                request.user_company_ids, scope, date_from, date_to
+            )
+            response_data = lead_statistics_service.get_lead_statistics(
+                request.env, domain, key
             )
-
-            for group in agent_data:
-                agent_id = group["agent_id"][0] if group["agent_id"] else None
-                agent_name = group["agent_id"][1] if group["agent_id"] else "Unassigned"
-                count = group["agent_id_count"]
-
-                by_agent.append(
-                    {"agent_id": agent_id, "agent_name": agent_name, "count": count}
-                )
-
-            # Calculate conversion rate
-            won_count = by_status.get("won", 0)
-            conversion_rate = (won_count / total * 100) if total > 0 else 0.0
-
-            # Build response
-            response_data = {
-                "total": total,
-                "by_status": by_status,
-                "by_agent": by_agent,
-                "conversion_rate": round(conversion_rate, 2),
-            }
 
             return success_response(response_data, 200)
 
@@ -958,8 +812,11 @@ class LeadApiController(http.Controller):
 
     # ==================== PRIVATE HELPERS ====================
 
-    def _serialize_lead(self, lead, include_activities=False):
-        """Serialize lead record to JSON (ADR-007: HATEOAS)"""
+    def _serialize_lead(self, lead, include_activities=False, activities=None):
+        """
+        Serialize lead record to JSON (ADR-007: HATEOAS). ``activities`` is a
+        _get_recent_activities() result already loaded for a page of leads.
+        """
         data = {
             "id": lead.id,
             "name": lead.name,
@@ -1024,58 +881,14 @@ class LeadApiController(http.Controller):
 
         # Include recent activities if requested (FR-035)
         if include_activities:
-            messages = (
-                request.env["mail.message"]
-                .sudo()
-                .search(
-                    [
-                        ("model", "=", "real.estate.lead"),
-                        ("res_id", "=", lead.id),
-                        ("message_type", "=", "comment"),
-                    ],
-                    order="date desc",
-                    limit=5,
+            if activities is None:
+                activities = lead.sudo()._get_recent_activities(
+                    RECENT_ACTIVITIES_LIMIT
                 )
-            )
-
-            recent_activities = []
-            for msg in messages:
-                # Extract activity type from body
-                activity_type = "note"
-                body_text = msg.body or ""
-
-                if "📞" in body_text or "CALL" in body_text:
-                    activity_type = "call"
-                elif "📧" in body_text or "EMAIL" in body_text:
-                    activity_type = "email"
-                elif "🤝" in body_text or "MEETING" in body_text:
-                    activity_type = "meeting"
-
-                # Remove HTML and formatting
-                import re
-
-                clean_body = re.sub(r"<[^>]+>", "", body_text)
-                clean_body = re.sub(
-                    r"[📞📧🤝📝]\s*(CALL|EMAIL|MEETING|NOTE)\s*", "", clean_body
-                ).strip()
-
-                recent_activities.append(
-                    {
-                        "id": msg.id,
-                        "activity_type": activity_type,
-                        "body": (
-                            clean_body[:100] + "..."
-                            if len(clean_body) > 100
-                            else clean_body
-                        ),
-                        "author": msg.author_id.name if msg.author_id else "Unknown",
-                        "date": (
-                            msg.date.strftime("%Y-%m-%d %H:%M:%S") if msg.date else None
-                        ),
-                    }
-                )
-
-            data["recent_activities"] = recent_activities
+            data["recent_activities"] = [
+                serialize_recent_activity(message)
+                for message in activities.get(lead.id, [])
+            ]
 
         return data
 
@@ -1087,13 +900,7 @@ class LeadApiController(http.Controller):
         Agent group and none of those broader roles is scoped down to
         their own leads.
         """
-        if user.has_group("base.group_system"):
-            return False
-        if user.has_group("quicksol_estate.group_real_estate_manager"):
-            return False
-        if user.has_group("quicksol_estate.group_real_estate_owner"):
-            return False
-        return user.has_group("quicksol_estate.group_real_estate_agent")
+        return is_pure_agent(user)
 
     def _check_lead_company_access(self, lead, user_company_ids):
         """FR3.2/FR3.4: explicit company check for single-lead activity endpoints.
@@ -1300,24 +1107,8 @@ class LeadApiController(http.Controller):
             # Format activities
             activities = []
             for msg in messages:
-                # Extract activity type from body if it was formatted
-                activity_type = "note"  # default
-                body_text = msg.body or ""
-
-                if "📞" in body_text or "CALL" in body_text:
-                    activity_type = "call"
-                elif "📧" in body_text or "EMAIL" in body_text:
-                    activity_type = "email"
-                elif "🤝" in body_text or "MEETING" in body_text:
-                    activity_type = "meeting"
-
-                # Remove HTML and formatting
-                import re
-
-                clean_body = re.sub(r"<[^>]+>", "", body_text)
-                clean_body = re.sub(
-                    r"[📞📧🤝📝]\s*(CALL|EMAIL|MEETING|NOTE)\s*", "", clean_body
-                ).strip()
+                # Activity type and plain text from the formatted body
+                activity_type, clean_body = parse_activity(msg.body)
 
                 activities.append(
                     {
@@ -1586,10 +1377,12 @@ class LeadApiController(http.Controller):
     )
     @require_jwt
     @require_session
+    @require_company
     def list_filters(self, **kwargs):
 
         try:
             include_shared = kwargs.get("include_shared", "false").lower() == "true"
+            include_counts = kwargs.get("include_counts", "false").lower() == "true"
 
             # Build domain
             domain = [("user_id", "=", request.env.user.id)]
@@ -1606,26 +1399,48 @@ class LeadApiController(http.Controller):
             Filter = request.env["real.estate.lead.filter"]
             filters = Filter.search(domain, order="name")
 
+            # Live counts: every filter in one scan of the caller's leads,
+            # cached per (companies, agent) until a lead changes
+            counts = {}
+            if include_counts:
+                user = request.env.user
+                scope_domain = list(request.company_domain)
+                scope = "all"
+                if is_pure_agent(user):
+                    scope_domain.append(("agent_id.user_id", "=", user.id))
+                    scope = f"user{user.id}"
+                counts = lead_filter_service.get_filter_counts(
+                    request.env,
+                    {
+                        filter_record.domain_hash: filter_record.get_domain()
+                        for filter_record in filters
+                        if filter_record.domain_hash
+                    },
+                    scope_domain,
+                    lead_filter_service.cache_key(request.user_company_ids, scope),
+                )
+
             # Build response
             filter_list = []
             for filter_record in filters:
-                filter_list.append(
-                    {
-                        "id": filter_record.id,
-                        "name": filter_record.name,
-                        "filter_params": json.loads(filter_record.filter_domain),
-                        "is_shared": filter_record.is_shared,
-                        "owner": {
-                            "id": filter_record.user_id.id,
-                            "name": filter_record.user_id.name,
-                        },
-                        "created_at": (
-                            filter_record.create_date.strftime("%Y-%m-%d %H:%M:%S")
-                            if filter_record.create_date
-                            else None
-                        ),
-                    }
-                )
+                filter_data = {
+                    "id": filter_record.id,
+                    "name": filter_record.name,
+                    "filter_params": json.loads(filter_record.filter_domain),
+                    "is_shared": filter_record.is_shared,
+                    "owner": {
+                        "id": filter_record.user_id.id,
+                        "name": filter_record.user_id.name,
+                    },
+                    "created_at": (
+                        filter_record.create_date.strftime("%Y-%m-%d %H:%M:%S")
+                        if filter_record.create_date
+                        else None
+                    ),
+                }
+                if include_counts:
+                    filter_data["count"] = counts.get(filter_record.domain_hash)
+                filter_list.append(filter_data)
 
             response_data = {
                 "success": True,
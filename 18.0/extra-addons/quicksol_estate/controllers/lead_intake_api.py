@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from odoo import http
+from odoo.addons.thedevkitchen_apigateway.middleware import require_jwt
+from odoo.http import request
+
+from .utils.response import error_response, success_response
+from ..services.lead_intake_service import IntakeBatchError, parse_intake_batch
+
+_logger = logging.getLogger(__name__)
+
+
+class LeadIntakeApiController(http.Controller):
+    @http.route(
+        "/api/v1/leads/ingest",
+        type="http",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    def ingest_leads(self, **kwargs):
+        """
+        Portal webhook: accept up to 500 leads and acknowledge once they are
+        queued. Authenticated with the portal's OAuth client token (no user
+        session); the (application, portal) integration decides the company
+        and the receiving agent. Leads are created by the lead_events worker.
+
+        A portal lead ``id`` that was already received, or repeated in the
+        batch, is reported in ``duplicates`` and not queued again, so webhook
+        retries are safe.
+        """
+        try:
+            try:
+                body = json.loads(request.httprequest.data or "{}")
+                portal_code, accepted, repeated, rejected = parse_intake_batch(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return error_response(400, "Invalid JSON in request body")
+            except IntakeBatchError as e:
+                return error_response(400, str(e))
+
+            portal = (
+                request.env["real.estate.lead.portal"]
+                .sudo()
+                .search(
+                    [
+                        ("application_id", "=", request.jwt_application.id),
+                        ("code", "=", portal_code),
+                    ],
+                    limit=1,
+                )
+            )
+            if not portal:
+                return error_response(
+                    403,
+                    f"Portal '{portal_code}' is not enabled for this client",
+                    "forbidden",
+                )
+
+            Intake = request.env["real.estate.lead.intake"].sudo()
+            intakes, duplicates = Intake._append(portal, accepted)
+            intakes._enqueue()
+            duplicates += repeated
+
+            return success_response(
+                {
+                    "portal": portal.code,
+                    "accepted": len(intakes),
+                    "duplicates": duplicates,
+                    "rejected": rejected,
+                },
+                status_code=202,
+            )
+
+        except Exception as e:
+            _logger.exception("Error ingesting portal leads")
+            return error_response(500, f"Internal server error: {str(e)}")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import os
+
+from odoo import http
+from odoo.http import Stream, request
+from odoo.tools import config
+
+from .utils.response import error_response
+from ..services import portal_feed_service
+
+# Crawlers may reuse a feed for a few minutes, then revalidate with If-None-Match
+PORTAL_FEED_MAX_AGE = 300
+
+
+class PortalFeedController(http.Controller):
+    @http.route(
+        "/api/v1/portal-feeds/<string:token>.json",
+        type="http",
+        auth="none",
+        methods=["GET", "HEAD"],
+        csrf=False,
+        cors="*",
+    )
+    def get_portal_feed(self, token, **kwargs):
+        """
+        Public portal feed of a company's published properties.
+
+        The secret token in the URL is the only credential. The file generated
+        by res.company._update_portal_feed() is served straight from disk with
+        an ETag: no ORM access, no session, no JWT.
+        """
+        try:
+            path = portal_feed_service.feed_path(config["data_dir"], request.db, token)
+            stat = os.stat(path)
+        except (ValueError, TypeError, OSError):
+            return error_response(404, "Feed not found", "not_found")
+
+        stream = Stream(
+            type="path",
+            path=path,
+            mimetype="application/json",
+            download_name=f"{token}.json",
+            etag=portal_feed_service.feed_etag(stat),
+            last_modified=stat.st_mtime,
+            size=stat.st_size,
+            conditional=True,
+            public=True,
+            max_age=PORTAL_FEED_MAX_AGE,
+        )
+        return stream.get_response(as_attachment=False)
@@ -6,10 +6,17 @@ from odoo import http
 from odoo.http import request
 from odoo.exceptions import AccessError, UserError, ValidationError
 from .utils.auth import require_jwt
+from .utils.cursor import decode_sequence_cursor, encode_sequence_cursor
+from .utils.property_filters import (
+    build_property_filter_domain,
+    build_property_scope_domain,
+    parse_company_ids,
+)
 from .utils.property_options import get_property_status_values
 from .utils.response import error_response, success_response
 from .utils.serializers import (
     apply_property_mapping_relations,
+    build_property_access_domain,
     build_property_mapping_values,
     serialize_property,
     validate_property_access,
@@ -22,6 +29,31 @@ from ..services.company_validator import CompanyValidator
 
 _logger = logging.getLogger(__name__)
 
+# Fields accepted by PATCH /api/v1/properties/bulk (pricing, status,
+# agent reassignment, publishing flags and archiving)
+BULK_UPDATE_FIELDS = {
+    "price",
+    "rent_price",
+    "property_status",
+    "agent_id",
+    "publish_website",
+    "publish_featured",
+    "publish_super_featured",
+    "active",
+}
+BULK_UPDATE_MAX_RECORDS = 1000
+BULK_WRITE_CHUNK_SIZE = 200
+
+# GET /api/v1/properties/changes
+PROPERTY_CHANGES_DEFAULT_LIMIT = 100
+PROPERTY_CHANGES_MAX_LIMIT = 500
+# Property access-domain fields (build_property_access_domain) mirrored on
+# real.estate.property.change rows
+PROPERTY_CHANGE_ACCESS_FIELDS = {
+    "company_id": "company_id",
+    "agent_id.user_id": "agent_user_id",
+}
+
 
 class PropertyApiController(http.Controller):
     @http.route(
@@ -40,131 +72,26 @@ class PropertyApiController(http.Controller):
             user = request.env.user
 
             # Parse query parameters
-            is_active = kwargs.get("is_active")
-            company_ids_param = kwargs.get("company_ids")
             limit = min(int(kwargs.get("limit", 20)), 100)
             offset = int(kwargs.get("offset", 0))
 
-            # Validate company_ids parameter (REQUIRED)
-            if not company_ids_param:
-                return error_response(400, "company_ids parameter is required")
-
-            # Parse company_ids (can be comma-separated: "1,2,3")
-            try:
-                requested_company_ids = [
-                    int(cid.strip()) for cid in company_ids_param.split(",")
-                ]
-            except ValueError:
-                return error_response(
-                    400,
-                    'Invalid company_ids format. Use comma-separated integers (e.g., "1,2,3")',
-                )
-
-            # Validate user has access to all requested companies (multi-tenancy security)
-            # Admin users (request.user_company_ids is empty for admins) skip this validation
-            if request.user_company_ids:  # Not admin
-                unauthorized_companies = [
-                    cid
-                    for cid in requested_company_ids
-                    if cid not in request.user_company_ids
-                ]
-                if unauthorized_companies:
-                    return error_response(
-                        403,
-                        f"Access denied to company IDs: {unauthorized_companies}. You can only access companies: {request.user_company_ids}",
-                    )
-
-            # Build domain for filtering
-            domain = []
-
-            # Active filter (ADR-015: soft-delete)
-            if is_active is not None:
-                if is_active.lower() == "true":
-                    domain.append(("active", "=", True))
-                elif is_active.lower() == "false":
-                    domain.append(("active", "=", False))
-            # If is_active is None, no filter is applied (returns all)
-
-            # Company filter using validated company_ids
-            if len(requested_company_ids) == 1:
-                domain.append(("company_id", "=", requested_company_ids[0]))
-            else:
-                domain.append(("company_id", "in", requested_company_ids))
-
-            # Optional filters
-            if kwargs.get("property_type_id"):
-                try:
-                    domain.append(
-                        ("property_type_id", "=", int(kwargs["property_type_id"]))
-                    )
-                except ValueError:
-                    return error_response(400, "Invalid property_type_id")
-
-            if kwargs.get("property_status"):
-                status = kwargs["property_status"]
-                valid_statuses = get_property_status_values(request.env)
-                if status not in valid_statuses:
-                    return error_response(
-                        400,
-                        f"Invalid property_status. Must be: {', '.join(valid_statuses)}",
-                    )
-                domain.append(("property_status", "=", status))
-
-            if kwargs.get("agent_id"):
-                try:
-                    domain.append(("agent_id", "=", int(kwargs["agent_id"])))
-                except ValueError:
-                    return error_response(400, "Invalid agent_id")
-
-            if kwargs.get("city"):
-                domain.append(("city", "ilike", kwargs["city"]))
-
-            if kwargs.get("state_id"):
-                try:
-                    domain.append(("state_id", "=", int(kwargs["state_id"])))
-                except ValueError:
-                    return error_response(400, "Invalid state_id")
-
-            if kwargs.get("min_price"):
-                try:
-                    domain.append(("price", ">=", float(kwargs["min_price"])))
-                except ValueError:
-                    return error_response(400, "Invalid min_price")
-
-            if kwargs.get("max_price"):
-                try:
-                    domain.append(("price", "<=", float(kwargs["max_price"])))
-                except ValueError:
-                    return error_response(400, "Invalid max_price")
-
-            if kwargs.get("for_sale") is not None:
-                for_sale = kwargs["for_sale"].lower() == "true"
-                domain.append(("for_sale", "=", for_sale))
-
-            if kwargs.get("for_rent") is not None:
-                for_rent = kwargs["for_rent"].lower() == "true"
-                domain.append(("for_rent", "=", for_rent))
-
-            # RBAC filter
-            is_admin = user.has_group("base.group_system")
-            is_manager = user.has_group("quicksol_estate.group_real_estate_manager")
-            is_owner = user.has_group("quicksol_estate.group_real_estate_owner")
-            is_agent = user.has_group("quicksol_estate.group_real_estate_agent")
+            # Validate company_ids parameter (REQUIRED) against the user's
+            # companies (multi-tenancy security; admins skip the check)
+            requested_company_ids, company_error = parse_company_ids(
+                kwargs.get("company_ids"), request.user_company_ids
+            )
+            if company_error:
+                return error_response(*company_error)
 
-            if not is_admin and not is_manager and not is_owner:
-                if is_agent:
-                    # Agent sees only their assigned properties
-                    agent_record = (
-                        request.env["real.estate.agent"]
-                        .sudo()
-                        .search([("user_id", "=", user.id)], limit=1)
-                    )
+            # Build domain for filtering (shared with bulk updates and exports)
+            domain, filter_error = build_property_filter_domain(request.env, kwargs)
+            if filter_error:
+                return error_response(400, filter_error)
 
-                    if agent_record:
-                        domain.append(("agent_id", "=", agent_record.id))
-                    else:
-                        # Agent without agent record sees nothing
-                        domain.append(("id", "=", False))
+            # Company filter using validated company_ids + RBAC filter
+            domain += build_property_scope_domain(
+                request.env, user, requested_company_ids
+            )
 
             # Query properties
             Property = request.env["real.estate.property"]
@@ -914,6 +841,288 @@ class PropertyApiController(http.Controller):
                 500, f"Internal server error: {str(e)}", "internal_error"
             )
 
+    @http.route(
+        "/api/v1/properties/bulk",
+        type="http",
+        auth="none",
+        methods=["PATCH"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def bulk_update_properties(self, **kwargs):
+        """
+        Apply the same ``values`` to a set of properties selected by ``ids`` or
+        by ``filter`` (same keys as GET /api/v1/properties).
+
+        Access is validated for the whole set with one search; the update is
+        all-or-nothing and written in chunked write() calls.
+        """
+        try:
+            user = request.env.user
+
+            try:
+                data = request.get_json_data()
+            except Exception:
+                data = None
+            if not isinstance(data, dict):
+                return error_response(400, "Invalid JSON in request body")
+
+            values = data.get("values")
+            if not isinstance(values, dict) or not values:
+                return error_response(400, "values must be a non-empty object")
+
+            invalid_fields = sorted(set(values) - BULK_UPDATE_FIELDS)
+            if invalid_fields:
+                return error_response(
+                    400,
+                    f"Fields not allowed in bulk update: {', '.join(invalid_fields)}",
+                    "validation_error",
+                )
+
+            if "property_status" in values:
+                valid_statuses = get_property_status_values(request.env)
+                if values["property_status"] not in valid_statuses:
+                    return error_response(
+                        400,
+                        f"Invalid property_status. Must be: {', '.join(valid_statuses)}",
+                    )
+
+            ids = data.get("ids")
+            property_filter = data.get("filter")
+            if (ids is None) == (property_filter is None):
+                return error_response(400, "Provide either ids or filter")
+
+            if ids is not None:
+                if (
+                    not isinstance(ids, list)
+                    or not ids
+                    or not all(isinstance(pid, int) for pid in ids)
+                ):
+                    return error_response(
+                        400, "ids must be a non-empty list of integers"
+                    )
+                target_domain = [("id", "in", ids)]
+            else:
+                if not isinstance(property_filter, dict):
+                    return error_response(400, "filter must be an object")
+                target_domain, filter_error = build_property_filter_domain(
+                    request.env, property_filter
+                )
+                if filter_error:
+                    return error_response(400, filter_error)
+
+            # Archiving follows the delete permission; everything else is a write
+            operation = "delete" if values.get("active") is False else "write"
+            access_domain, access_error = build_property_access_domain(
+                user, operation=operation
+            )
+            if access_domain is None:
+                return error_response(403, access_error, "access_denied")
+
+            if values.get("agent_id"):
+                agent_count = (
+                    request.env["real.estate.agent"]
+                    .sudo()
+                    .search_count(
+                        [("id", "=", values["agent_id"])] + request.company_domain
+                    )
+                )
+                if not agent_count:
+                    return error_response(
+                        400,
+                        "Agent ID does not exist. Please verify the agent_id.",
+                        "foreign_key_violation",
+                    )
+
+            # One query resolves the target set and authorizes it
+            Property = (
+                request.env["real.estate.property"]
+                .sudo()
+                .with_context(active_test=False)
+            )
+            properties = Property.search(
+                target_domain + request.company_domain + access_domain, order="id"
+            )
+
+            if ids is not None:
+                denied_ids = sorted(set(ids) - set(properties.ids))
+                if denied_ids:
+                    return error_response(
+                        403,
+                        "Some properties were not found or are not accessible",
+                        "access_denied",
+                        details={"ids": denied_ids},
+                    )
+
+            if len(properties) > BULK_UPDATE_MAX_RECORDS:
+                return error_response(
+                    400,
+                    f"Bulk update is limited to {BULK_UPDATE_MAX_RECORDS} properties "
+                    f"per request ({len(properties)} matched)",
+                )
+
+            with request.env.cr.savepoint():
+                for start in range(0, len(properties), BULK_WRITE_CHUNK_SIZE):
+                    properties[start : start + BULK_WRITE_CHUNK_SIZE].write(values)
+
+            return success_response(
+                {
+                    "success": True,
+                    "updated": len(properties),
+                    "ids": properties.ids,
+                    "values": values,
+                }
+            )
+
+        except ValidationError as e:
+            _logger.error(f"Validation error in bulk_update_properties: {e}")
+            return error_response(400, str(e), "validation_error")
+        except AccessError as e:
+            _logger.error(f"Access error in bulk_update_properties: {e}")
+            return error_response(403, "Access denied", "access_denied")
+        except UserError as e:
+            _logger.error(f"User error in bulk_update_properties: {e}")
+            return error_response(400, str(e), "user_error")
+        except ValueError as e:
+            _logger.error(f"Value error in bulk_update_properties: {e}")
+            error_msg = str(e)
+            if "Wrong value for" in error_msg:
+                return error_response(400, error_msg, "invalid_field_value")
+            return error_response(400, error_msg, "value_error")
+        except Exception as e:
+            _logger.error(
+                f"Unexpected error in bulk_update_properties: {e}", exc_info=True
+            )
+            return error_response(
+                500, f"Internal server error: {str(e)}", "internal_error"
+            )
+
+    @http.route(
+        "/api/v1/properties/changes",
+        type="http",
+        auth="none",
+        methods=["GET"],
+        csrf=False,
+        cors="*",
+    )
+    @require_jwt
+    @require_session
+    @require_company
+    def property_changes(self, **kwargs):
+        """
+        Incremental sync feed: properties changed after ``since``, in commit
+        order (see real.estate.property.change). Live properties are
+        returned as ``upsert`` with the full payload; archived ones, deleted
+        ones and ones that left the caller's scope come back as
+        ``archived``/``deleted`` tombstones.
+        Without ``since`` the whole (compacted) log is replayed.
+        """
+        try:
+            user = request.env.user
+            limit = min(
+                int(kwargs.get("limit", PROPERTY_CHANGES_DEFAULT_LIMIT)),
+                PROPERTY_CHANGES_MAX_LIMIT,
+            )
+            if limit < 1:
+                return error_response(400, "limit must be a positive integer")
+
+            access_domain, access_error = build_property_access_domain(user)
+            if access_domain is None:
+                return error_response(403, access_error, "access_denied")
+
+            ChangeLog = request.env["real.estate.property.change"].sudo()
+            log_domain = list(request.company_domain) + [
+                (PROPERTY_CHANGE_ACCESS_FIELDS[field], operator, value)
+                for field, operator, value in access_domain
+            ]
+
+            since = kwargs.get("since")
+            after = None
+            if since:
+                try:
+                    after = decode_sequence_cursor(since)
+                except ValueError:
+                    return error_response(400, "Invalid since cursor")
+                horizon = ChangeLog._get_horizon()
+                if horizon and after < horizon:
+                    return error_response(
+                        410,
+                        "Cursor is older than the change log retention. "
+                        "Resync by calling this endpoint without since.",
+                        "cursor_expired",
+                    )
+
+            rows = ChangeLog._read_changes(log_domain, after=after, limit=limit + 1)
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            # Collapse to the latest row per property, keeping feed order
+            latest = {}
+            for row in rows:
+                latest.pop(row["property_id"], None)
+                latest[row["property_id"]] = row
+
+            # One search resolves current state and visibility of the whole page
+            visible = {
+                prop.id: prop
+                for prop in request.env["real.estate.property"]
+                .sudo()
+                .with_context(active_test=False)
+                .search(
+                    [("id", "in", list(latest))]
+                    + request.company_domain
+                    + access_domain
+                )
+            }
+
+            changes = []
+            for property_id, row in latest.items():
+                prop = visible.get(property_id)
+                entry = {
+                    "property_id": property_id,
+                    "changed_at": row["changed_at"].isoformat(),
+                }
+                if prop and prop.active:
+                    entry["change"] = "upsert"
+                    entry["data"] = serialize_property(prop)
+                else:
+                    entry["change"] = "archived" if prop else "deleted"
+                changes.append(entry)
+
+            next_cursor = (
+                encode_sequence_cursor(rows[-1]["txid"], rows[-1]["id"])
+                if rows
+                else since
+            )
+            self_link = f"/api/v1/properties/changes?limit={limit}"
+            if since:
+                self_link += f"&since={since}"
+            links = {"self": self_link}
+            if next_cursor:
+                links["next"] = (
+                    f"/api/v1/properties/changes?since={next_cursor}&limit={limit}"
+                )
+
+            return success_response(
+                {
+                    "success": True,
+                    "data": changes,
+                    "count": len(changes),
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
+                    "_links": links,
+                }
+            )
+
+        except ValueError as e:
+            return error_response(400, f"Invalid parameter: {str(e)}")
+        except Exception as e:
+            _logger.exception("Error building property change feed")
+            return error_response(500, f"Internal server error: {str(e)}")
+
     @http.route(
         "/api/v1/properties/<int:property_id>",
         type="http",
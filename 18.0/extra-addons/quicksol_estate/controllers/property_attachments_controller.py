@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import base64
 import logging
 
 import magic
@@ -10,12 +9,14 @@ from odoo import http
 from odoo.http import request
 
 from .utils.auth import require_jwt
-from .utils.response import success_response
+from .utils.response import attachment_response, success_response
+from .utils.serializers import group_image_renditions, serialize_image_renditions
 from odoo.addons.thedevkitchen_apigateway.middleware import (
     require_session,
     require_company,
 )
 from odoo.addons.thedevkitchen_observability.services.tracer import trace_http_request
+from ..services.upload_stream import UploadTooLarge, spool_upload
 
 _logger = logging.getLogger(__name__)
 
@@ -28,6 +29,8 @@ CONFIG_PARAM_MAX_DOCUMENTS = "quicksol_estate.max_documents_per_property"
 
 TYPE_IMAGE = "image"
 TYPE_DOCUMENT = "document"
+# Resized WebP/JPEG copies generated in background (models/ir_attachment.py)
+TYPE_RENDITION = "image_rendition"
 
 ALLOWED_IMAGE_MIMETYPES = frozenset(
     {
@@ -114,8 +117,9 @@ def _detect_mime(content):
     return magic.from_buffer(content[:2048], mime=True)
 
 
-def _serialize_attachment(att, property_id, include_self_link=False):
-    download_url = f"/api/v1/properties/{property_id}/attachments/{att.id}/download"
+def _serialize_attachment(att, property_id, include_self_link=False, renditions=None):
+    attachments_url = f"/api/v1/properties/{property_id}/attachments"
+    download_url = f"{attachments_url}/{att.id}/download"
     links = {"download": download_url}
     if include_self_link:
         links["self"] = f"/api/v1/properties/{property_id}/attachments/{att.id}"
@@ -124,7 +128,7 @@ def _serialize_attachment(att, property_id, include_self_link=False):
         att.create_date.strftime("%Y-%m-%dT%H:%M:%SZ") if att.create_date else None
     )
 
-    return {
+    data = {
         "id": att.id,
         "name": att.name,
         "mimetype": att.mimetype,
@@ -133,6 +137,14 @@ def _serialize_attachment(att, property_id, include_self_link=False):
         "uploaded_at": uploaded_at,
         "links": links,
     }
+    if att.description == TYPE_IMAGE:
+        data.update(
+            serialize_image_renditions(
+                renditions or [],
+                lambda rendition: f"{attachments_url}/{rendition.id}/download",
+            )
+        )
+    return data
 
 
 def _fetch_attachment(attachment_id, property_id):
@@ -142,7 +154,7 @@ def _fetch_attachment(attachment_id, property_id):
     # Feature 017 attachments: stored directly on real.estate.property
     # Only expose attachments managed by this API (description in image/document)
     if att.res_model == "real.estate.property" and att.res_id == property_id:
-        if att.description not in (TYPE_IMAGE, TYPE_DOCUMENT):
+        if att.description not in (TYPE_IMAGE, TYPE_DOCUMENT, TYPE_RENDITION):
             return None
         return att
     # Legacy attachments: stored on real.estate.property.photo / real.estate.property.document
@@ -187,6 +199,7 @@ class PropertyAttachmentsController(http.Controller):
     @require_session
     @require_company
     def upload_attachment(self, property_id, **kwargs):
+        spooled = None
         try:
             user = request.env.user
 
@@ -238,19 +251,14 @@ class PropertyAttachmentsController(http.Controller):
                     received=attachment_type,
                 )
 
-            # Read bytes once
-            content = upload.read()
-
-            # Zero-byte validation (FR1.5a) — 400
-            if len(content) == 0:
-                return _att_error(400, "empty_file", "File content cannot be empty.")
-
-            # Size check (FR1.3) — 413
+            # Stream to a temp file while hashing and size-checking (FR1.3) — 413
             max_bytes = _get_max_upload_bytes()
-            if len(content) > max_bytes:
+            try:
+                spooled = spool_upload(upload.stream, max_bytes)
+            except UploadTooLarge as exc:
                 _logger.warning(
                     "upload_attachment: file too large (%d bytes > %d) on property %s (user=%s, company=%s)",
-                    len(content),
+                    exc.size,
                     max_bytes,
                     property_id,
                     request.env.user.id,
@@ -261,9 +269,13 @@ class PropertyAttachmentsController(http.Controller):
                     "file_too_large",
                     "File size exceeds the configured limit.",
                     max_size_bytes=max_bytes,
-                    received_size=len(content),
+                    received_size=exc.size,
                 )
 
+            # Zero-byte validation (FR1.5a) — 400
+            if spooled.size == 0:
+                return _att_error(400, "empty_file", "File content cannot be empty.")
+
             # Quantity limit (FR1.4) — 422
             if attachment_type == TYPE_IMAGE:
                 max_count = _get_max_images_per_property()
@@ -299,7 +311,7 @@ class PropertyAttachmentsController(http.Controller):
                 )
 
             # MIME validation via magic bytes (R002) — 415
-            detected_mime = _detect_mime(content)
+            detected_mime = _detect_mime(spooled.head)
             allowed_for_type = (
                 ALLOWED_IMAGE_MIMETYPES
                 if attachment_type == TYPE_IMAGE
@@ -338,20 +350,20 @@ class PropertyAttachmentsController(http.Controller):
             # Sanitize filename (R007)
             safe_name = secure_filename(upload.filename or "") or "untitled"
 
-            # Persist as ir.attachment (R003)
+            # Persist as ir.attachment (R003), written to the filestore by checksum
             att = (
                 request.env["ir.attachment"]
                 .sudo()
-                .create(
+                ._create_from_spooled(
+                    spooled,
                     {
                         "name": safe_name,
-                        "datas": base64.b64encode(content),
                         "res_model": "real.estate.property",
                         "res_id": property_id,
                         "mimetype": detected_mime,
                         "description": attachment_type,
                         "company_id": request.env.company.id,
-                    }
+                    },
                 )
             )
 
@@ -370,6 +382,9 @@ class PropertyAttachmentsController(http.Controller):
                 "upload_attachment: unexpected error for property %s", property_id
             )
             return _att_error(500, "internal_error", "An unexpected error occurred.")
+        finally:
+            if spooled:
+                spooled.close()
 
     # ------------------------------------------------------------------ #
     # GET /api/v1/properties/<id>/attachments  (US6)                     #
@@ -426,13 +441,21 @@ class PropertyAttachmentsController(http.Controller):
                 domain, order="create_date desc", limit=limit, offset=offset
             )
 
+            renditions = group_image_renditions(
+                Attachment,
+                [a.id for a in items if a.description == TYPE_IMAGE],
+            )
+
             return success_response(
                 {
                     "status": "success",
                     "data": {
                         "items": [
                             _serialize_attachment(
-                                a, property_id, include_self_link=False
+                                a,
+                                property_id,
+                                include_self_link=False,
+                                renditions=renditions.get(a.id),
                             )
                             for a in items
                         ],
@@ -482,8 +505,6 @@ class PropertyAttachmentsController(http.Controller):
                 )
                 return _att_error(404, "not_found", "Attachment not found.")
 
-            content = att.raw  # bytes directly from filestore (FR2.3)
-
             # NEVER redirect to /web/content/ (FR2.4)
             safe_filename = (
                 att.name.replace('"', "")
@@ -491,15 +512,11 @@ class PropertyAttachmentsController(http.Controller):
                 .replace("\n", "")
                 .replace("\r", "")
             )
-            return Response(
-                content,
-                status=200,
-                headers={
-                    "Content-Type": att.mimetype or "application/octet-stream",
-                    "Content-Disposition": f'attachment; filename="{safe_filename}"',
-                    "Content-Security-Policy": "default-src 'none'",
-                    "X-Content-Type-Options": "nosniff",
-                },
+            # Streamed from the filestore (FR2.3): Range, ETag, X-Sendfile
+            return attachment_response(
+                att,
+                download_name=safe_filename,
+                mimetype=att.mimetype or "application/octet-stream",
             )
 
         except Exception:
@@ -10,6 +10,11 @@ from odoo.exceptions import AccessError, UserError, ValidationError
 
 from .utils.auth import require_jwt
 from .utils.response import error_response, success_response
+from .utils.service_filters import (
+    build_service_access_domain,
+    build_service_filter_domain,
+    is_manager_or_owner,
+)
 from odoo.addons.thedevkitchen_apigateway.middleware import (
     require_session,
     require_company,
@@ -37,16 +42,6 @@ ORDERING_MAP = {
 }
 DEFAULT_ORDERING = "recent"
 
-# Valid filter fields that map directly to ORM domain atoms
-_DIRECT_FILTERS = {
-    "stage": ("stage", "="),
-    "operation_type": ("operation_type", "="),
-    "agent_id": ("agent_id", "="),
-    "source_id": ("source_id", "="),
-    "is_pending": ("is_pending", "="),
-    "is_orphan_agent": ("is_orphan_agent", "="),
-}
-
 
 # --------------------------------------------------------------------------- #
 # Helpers                                                                      #
@@ -158,61 +153,6 @@ def _serialize_service(service, include_messages=False):
     return data
 
 
-def _build_domain(params):
-    """Build Odoo domain from query parameters."""
-    domain = []
-
-    for param, (field, operator) in _DIRECT_FILTERS.items():
-        val = params.get(param)
-        if val is not None:
-            if isinstance(val, str) and val.lower() in ("true", "false"):
-                val = val.lower() == "true"
-            elif isinstance(val, str) and val.isdigit():
-                val = int(val)
-            domain.append((field, operator, val))
-
-    # Multi-value filter: tag_ids
-    tag_ids_raw = params.get("tag_ids")
-    if tag_ids_raw:
-        try:
-            tag_ids = [int(t) for t in tag_ids_raw.split(",") if t.strip()]
-            if tag_ids:
-                domain += [("tag_ids", "in", tag_ids)]
-        except (ValueError, AttributeError):
-            pass
-
-    # archived filter
-    archived = params.get("archived")
-    if archived is not None and archived.lower() in ("true", "1"):
-        domain.append(("active", "=", False))
-
-    # Free-text search
-    q = params.get("q", "").strip()
-    if q:
-        domain += [
-            "|",
-            "|",
-            "|",
-            ("client_partner_id.name", "ilike", q),
-            ("client_partner_id.email", "ilike", q),
-            ("client_partner_id.phone_ids.number", "ilike", q),
-            ("property_ids.name", "ilike", q),
-        ]
-
-    return domain
-
-
-_MANAGER_GROUPS = (
-    "quicksol_estate.group_real_estate_owner",
-    "quicksol_estate.group_real_estate_manager",
-)
-
-
-def _is_manager_or_owner(env):
-    user = env.user
-    return any(user.has_group(g) for g in _MANAGER_GROUPS)
-
-
 # --------------------------------------------------------------------------- #
 # Controller                                                                   #
 # --------------------------------------------------------------------------- #
@@ -321,7 +261,7 @@ class ServiceController(http.Controller):
             env = request.env
             sudo_env = env(su=True)
             company_id = env.company.id
-            agent_id = None if _is_manager_or_owner(env) else env.user.id
+            agent_id = None if is_manager_or_owner(env) else env.user.id
             summary = pipeline_svc.compute_summary(
                 sudo_env, company_id=company_id, agent_id=agent_id
             )
@@ -359,7 +299,7 @@ class ServiceController(http.Controller):
         try:
             params = request.httprequest.args
 
-            domain = _build_domain(params)
+            domain = build_service_filter_domain(params)
 
             ordering = ORDERING_MAP.get(
                 params.get("ordering", DEFAULT_ORDERING), ORDERING_MAP[DEFAULT_ORDERING]
@@ -378,9 +318,7 @@ class ServiceController(http.Controller):
 
             # Use sudo + explicit access domain (record rules not reliable in Odoo 18)
             env = request.env
-            access_domain = [("company_id", "in", request.user_company_ids)]
-            if not _is_manager_or_owner(env):
-                access_domain.append(("agent_id", "=", env.user.id))
+            access_domain = build_service_access_domain(env, request.user_company_ids)
             full_domain = domain + access_domain
             Service = env["real.estate.service"].sudo()
             total = Service.search_count(full_domain)
@@ -457,7 +395,7 @@ class ServiceController(http.Controller):
                 or service.company_id.id not in request.user_company_ids
             ):
                 return error_response("NOT_FOUND", "Service not found.", 404)
-            if not _is_manager_or_owner(env) and service.agent_id.id != env.user.id:
+            if not is_manager_or_owner(env) and service.agent_id.id != env.user.id:
                 return error_response("NOT_FOUND", "Service not found.", 404)
             return success_response(_serialize_service(service))
         except AccessError as exc:
@@ -497,7 +435,7 @@ class ServiceController(http.Controller):
                 or service.company_id.id not in request.user_company_ids
             ):
                 return error_response("NOT_FOUND", "Service not found.", 404)
-            if not _is_manager_or_owner(env) and service.agent_id.id != env.user.id:
+            if not is_manager_or_owner(env) and service.agent_id.id != env.user.id:
                 return error_response(
                     "FORBIDDEN", "Agents can only update their own services.", 403
                 )
@@ -542,7 +480,7 @@ class ServiceController(http.Controller):
     @require_company
     def delete_service(self, service_id, **kwargs):
         try:
-            if not _is_manager_or_owner(request.env):
+            if not is_manager_or_owner(request.env):
                 return error_response(
                     "FORBIDDEN", "Only Owner/Manager can delete services.", 403
                 )
@@ -593,7 +531,7 @@ class ServiceController(http.Controller):
                 or service.company_id.id not in request.user_company_ids
             ):
                 return error_response("NOT_FOUND", "Service not found.", 404)
-            if not _is_manager_or_owner(env) and service.agent_id.id != env.user.id:
+            if not is_manager_or_owner(env) and service.agent_id.id != env.user.id:
                 return error_response(
                     "FORBIDDEN",
                     "Agents can only change stage of their own services.",
@@ -641,7 +579,7 @@ class ServiceController(http.Controller):
     @require_company
     def reassign_service(self, service_id, **kwargs):
         try:
-            if not _is_manager_or_owner(request.env):
+            if not is_manager_or_owner(request.env):
                 return error_response(
                     "FORBIDDEN", "Only Owner/Manager can reassign services.", 403
                 )
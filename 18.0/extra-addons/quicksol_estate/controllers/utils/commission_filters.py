@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+PAYMENT_STATUSES = ("pending", "paid", "cancelled")
+
+# Profiles that see every agent's commissions in their company
+COMMISSION_MANAGER_GROUPS = (
+    "base.group_system",
+    "quicksol_estate.group_real_estate_owner",
+    "quicksol_estate.group_real_estate_manager",
+    "quicksol_estate.group_real_estate_financial",
+)
+
+
+def commission_scope_user_id(user):
+    """
+    User whose own transactions ``user`` is restricted to: None for owners,
+    managers, financial users and admins, ``user.id`` for every other
+    profile (an agent sees their commissions, a receptionist none).
+    """
+    if any(user.has_group(group) for group in COMMISSION_MANAGER_GROUPS):
+        return None
+    return user.id
+
+
+def build_commission_filter_domain(params, company_domain, agent_user_id=None):
+    """
+    Translate commission transaction filter parameters into a search domain.
+
+    - ``company_domain``: request.company_domain, base of every filter
+    - ``agent_user_id``: restricts to that user's own transactions, see
+      commission_scope_user_id()
+
+    Filters: ``agent_id``, ``payment_status``, ``transaction_type`` and the
+    ``date_from``/``date_to`` (YYYY-MM-DD) transaction date range.
+    Raises ValueError on invalid values.
+    """
+    domain = list(company_domain)
+
+    if agent_user_id:
+        domain.append(("agent_id.user_id", "=", agent_user_id))
+
+    if params.get("agent_id"):
+        domain.append(("agent_id", "=", int(params["agent_id"])))
+
+    payment_status = params.get("payment_status")
+    if payment_status:
+        if payment_status not in PAYMENT_STATUSES:
+            raise ValueError(
+                f"payment_status must be one of: {', '.join(PAYMENT_STATUSES)}"
+            )
+        domain.append(("payment_status", "=", payment_status))
+
+    if params.get("transaction_type"):
+        domain.append(("transaction_type", "=", params["transaction_type"]))
+
+    for param, operator in (("date_from", ">="), ("date_to", "<=")):
+        value = (params.get(param) or "").strip()
+        if value:
+            try:
+                day = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError(f"{param} must be YYYY-MM-DD")
+            domain.append(("transaction_date", operator, day.isoformat()))
+
+    return domain
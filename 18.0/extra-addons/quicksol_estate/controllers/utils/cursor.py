@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Opaque keyset cursors for ``(timestamp, id)`` and ``(sequence, id)`` ordered
+feeds.
+
+A cursor is the URL-safe base64 of ``"<ISO timestamp>|<id>"`` (or
+``"<sequence>|<id>"``); clients must treat it as opaque and send it back
+unchanged. Dates encode the same way and decode to midnight of that day.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+
+def _encode(key, record_id):
+    raw = f"{key}|{int(record_id)}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(token, parse_key):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        key, record_id = raw.rsplit("|", 1)
+        return parse_key(key), int(record_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_cursor(timestamp, record_id):
+    return _encode(timestamp.isoformat(), record_id)
+
+
+def decode_cursor(token):
+    """Return ``(datetime, id)``; raise ValueError on a malformed cursor."""
+    return _decode(token, datetime.fromisoformat)
+
+
+def encode_sequence_cursor(sequence, record_id):
+    return _encode(int(sequence), record_id)
+
+
+def decode_sequence_cursor(token):
+    """Return ``(sequence, id)``; raise ValueError on a malformed cursor."""
+    return _decode(token, int)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Lead activity (chatter comment) parsing shared by the lead endpoints (FR-035).
+
+Activities are posted by POST /api/v1/leads/<id>/activities as
+``"📞 <strong>CALL</strong><br/>text"``; the type is recovered from the icon
+or keyword and the body is returned without markup. Pure Python — no Odoo
+imports.
+"""
+import re
+
+RECENT_ACTIVITIES_LIMIT = 5
+RECENT_BODY_LENGTH = 100
+
+HTML_TAG = re.compile(r"<[^>]+>")
+ACTIVITY_PREFIX = re.compile(r"[📞📧🤝📝]\s*(CALL|EMAIL|MEETING|NOTE)\s*")
+# One scan of the raw body finds every type marker present
+ACTIVITY_MARKER = re.compile(
+    r"(?P<call>📞|CALL)|(?P<email>📧|EMAIL)|(?P<meeting>🤝|MEETING)"
+)
+# Precedence when a body carries several markers
+ACTIVITY_TYPE_PRIORITY = ("call", "email", "meeting")
+
+
+def activity_type(body):
+    """call, email or meeting from the body markers; note otherwise."""
+    found = {match.lastgroup for match in ACTIVITY_MARKER.finditer(body or "")}
+    for name in ACTIVITY_TYPE_PRIORITY:
+        if name in found:
+            return name
+    return "note"
+
+
+def clean_activity_body(body):
+    """Body text without HTML tags and without the type prefix."""
+    return ACTIVITY_PREFIX.sub("", HTML_TAG.sub("", body or "")).strip()
+
+
+def parse_activity(body):
+    """``(activity_type, clean_body)`` of a chatter message body."""
+    return activity_type(body), clean_activity_body(body)
+
+
+def serialize_recent_activity(message):
+    """
+    Recent-activity entry of a lead payload. ``message`` is a dict with id,
+    body, author_name and date, as returned by
+    real.estate.lead._get_recent_activities().
+    """
+    kind, body = parse_activity(message["body"])
+    if len(body) > RECENT_BODY_LENGTH:
+        body = body[:RECENT_BODY_LENGTH] + "..."
+    date = message["date"]
+    return {
+        "id": message["id"],
+        "activity_type": kind,
+        "body": body,
+        "author": message["author_name"] or "Unknown",
+        "date": date.strftime("%Y-%m-%d %H:%M:%S") if date else None,
+    }
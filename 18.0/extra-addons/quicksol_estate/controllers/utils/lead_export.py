@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming lead export helpers for GET /api/v1/leads/export.
+
+Rows come from ``search_read`` chunks (only the exported columns, many2one
+values as ``(id, name)``) and are turned into CSV text chunks, optionally
+gzip-compressed, or into an XLSX file written in constant-memory mode.
+Pure Python — no Odoo imports.
+"""
+import csv
+import io
+import zlib
+
+EXPORT_CHUNK_SIZE = 1000
+
+# (header, search_read field) in column order
+LEAD_EXPORT_COLUMNS = [
+    ("ID", "id"),
+    ("Name", "name"),
+    ("State", "state"),
+    ("Phone", "phone"),
+    ("Email", "email"),
+    ("Agent", "agent_id"),
+    ("Budget Min", "budget_min"),
+    ("Budget Max", "budget_max"),
+    ("Property Type", "property_type_interest"),
+    ("Location", "location_preference"),
+    ("Bedrooms", "bedrooms_needed"),
+    ("First Contact", "first_contact_date"),
+    ("Expected Closing", "expected_closing_date"),
+    ("Days in State", "days_in_state"),
+    ("Created At", "create_date"),
+]
+LEAD_EXPORT_HEADERS = [header for header, _field in LEAD_EXPORT_COLUMNS]
+LEAD_EXPORT_FIELDS = [field for _header, field in LEAD_EXPORT_COLUMNS]
+
+
+def _m2o_name(value):
+    return value[1] if value else ""
+
+
+def _date(value, fmt="%Y-%m-%d"):
+    return value.strftime(fmt) if value else ""
+
+
+def format_lead_row(values):
+    """One export row from a ``search_read`` dict (same output as the old CSV)."""
+    return [
+        values["id"],
+        values["name"],
+        values["state"],
+        values["phone"] or "",
+        values["email"] or "",
+        _m2o_name(values["agent_id"]),
+        values["budget_min"] or "",
+        values["budget_max"] or "",
+        _m2o_name(values["property_type_interest"]),
+        values["location_preference"] or "",
+        values["bedrooms_needed"] or "",
+        _date(values["first_contact_date"]),
+        _date(values["expected_closing_date"]),
+        values["days_in_state"],
+        _date(values["create_date"], "%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def iter_csv_chunks(record_chunks, compress=False):
+    """
+    Yield encoded CSV bytes: the header, then one block per chunk of
+    ``search_read`` dicts. With ``compress`` the output is a single gzip
+    stream flushed per chunk so clients receive data progressively.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    writer.writerow(LEAD_EXPORT_HEADERS)
+    yield drain()
+    for records in record_chunks:
+        writer.writerows(format_lead_row(values) for values in records)
+        data = drain()
+        if data:
+            yield data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def write_xlsx(fileobj, record_chunks):
+    """
+    Write an XLSX workbook into ``fileobj`` row by row. ``constant_memory``
+    makes xlsxwriter flush each row to its temp file instead of keeping the
+    sheet in memory. Raises ImportError when xlsxwriter is unavailable.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(
+        fileobj, {"constant_memory": True, "in_memory": False}
+    )
+    try:
+        sheet = workbook.add_worksheet("Leads")
+        sheet.write_row(0, 0, LEAD_EXPORT_HEADERS)
+        row_index = 1
+        for records in record_chunks:
+            for values in records:
+                sheet.write_row(row_index, 0, format_lead_row(values))
+                row_index += 1
+    finally:
+        workbook.close()
+    return row_index - 1
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from .property_options import get_property_status_values
+
+
+def _is_true(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() == "true"
+
+
+# (parameter, field, operator, cast) of the plain value filters
+_ID_FILTERS = [
+    ("property_type_id", "property_type_id", "=", int),
+    ("agent_id", "agent_id", "=", int),
+    ("state_id", "state_id", "=", int),
+]
+_PRICE_FILTERS = [
+    ("min_price", "price", ">=", float),
+    ("max_price", "price", "<=", float),
+]
+_FLAG_FILTERS = ["for_sale", "for_rent"]
+
+
+def _cast_filters(params, filters):
+    domain = []
+    for param, field, operator, cast in filters:
+        if not params.get(param):
+            continue
+        try:
+            domain.append((field, operator, cast(params[param])))
+        except (TypeError, ValueError):
+            return None, f"Invalid {param}"
+    return domain, None
+
+
+def _status_filters(env, params):
+    domain = []
+    # Active filter (ADR-015: soft-delete). None means no filter (returns all)
+    is_active = str(params.get("is_active")).lower()
+    if is_active in ("true", "false"):
+        domain.append(("active", "=", is_active == "true"))
+
+    status = params.get("property_status")
+    if status:
+        valid_statuses = get_property_status_values(env)
+        if status not in valid_statuses:
+            return (
+                None,
+                f"Invalid property_status. Must be: {', '.join(valid_statuses)}",
+            )
+        domain.append(("property_status", "=", status))
+    return domain, None
+
+
+def _location_filters(params):
+    if params.get("city"):
+        return [("city", "ilike", params["city"])]
+    return []
+
+
+def _flag_filters(params):
+    return [
+        (flag, "=", _is_true(params[flag]))
+        for flag in _FLAG_FILTERS
+        if params.get(flag) is not None
+    ]
+
+
+def build_property_filter_domain(env, params):
+    """
+    Translate property filter parameters into a search domain.
+
+    Shared by GET /api/v1/properties (query string) and
+    PATCH /api/v1/properties/bulk (JSON ``filter`` object), so values may be
+    strings or native JSON types. Company and RBAC scoping are NOT applied here.
+
+    Returns ``(domain, error_message)``; ``error_message`` is None on success.
+    """
+    status_domain, error = _status_filters(env, params)
+    if error:
+        return None, error
+    id_domain, error = _cast_filters(params, _ID_FILTERS)
+    if error:
+        return None, error
+    price_domain, error = _cast_filters(params, _PRICE_FILTERS)
+    if error:
+        return None, error
+    return (
+        status_domain
+        + id_domain
+        + _location_filters(params)
+        + price_domain
+        + _flag_filters(params)
+    ), None
+
+
+def parse_company_ids(value, allowed_company_ids):
+    """
+    Parse the required ``company_ids`` parameter of the property list
+    ("1,2,3") and check it against the caller's companies (an empty
+    ``allowed_company_ids`` means admin: every company is allowed).
+
+    Returns ``(company_ids, error)``; ``error`` is ``(status, message)`` or None.
+    """
+    if not value:
+        return None, (400, "company_ids parameter is required")
+
+    try:
+        company_ids = [int(cid.strip()) for cid in str(value).split(",")]
+    except ValueError:
+        return None, (
+            400,
+            'Invalid company_ids format. Use comma-separated integers (e.g., "1,2,3")',
+        )
+
+    if allowed_company_ids:
+        unauthorized_companies = [
+            cid for cid in company_ids if cid not in allowed_company_ids
+        ]
+        if unauthorized_companies:
+            return None, (
+                403,
+                f"Access denied to company IDs: {unauthorized_companies}. You can only access companies: {allowed_company_ids}",
+            )
+
+    return company_ids, None
+
+
+def build_property_scope_domain(env, user, company_ids):
+    """
+    Company and RBAC part of the property list domain: the requested
+    companies, and for pure Agents only their assigned properties.
+    """
+    if len(company_ids) == 1:
+        domain = [("company_id", "=", company_ids[0])]
+    else:
+        domain = [("company_id", "in", company_ids)]
+
+    is_admin = user.has_group("base.group_system")
+    is_manager = user.has_group("quicksol_estate.group_real_estate_manager")
+    is_owner = user.has_group("quicksol_estate.group_real_estate_owner")
+    is_agent = user.has_group("quicksol_estate.group_real_estate_agent")
+
+    if not is_admin and not is_manager and not is_owner and is_agent:
+        # Agent sees only their assigned properties
+        agent_record = (
+            env["real.estate.agent"].sudo().search([("user_id", "=", user.id)], limit=1)
+        )
+        if agent_record:
+            domain.append(("agent_id", "=", agent_record.id))
+        else:
+            # Agent without agent record sees nothing
+            domain.append(("id", "=", False))
+
+    return domain
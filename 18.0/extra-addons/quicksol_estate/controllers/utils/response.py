@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo.http import request
+from odoo.http import Stream, request
 
 
 def error_response(arg1, arg2=None, arg3="error", details=None):
@@ -29,3 +29,21 @@ def error_response(arg1, arg2=None, arg3="error", details=None):
 def success_response(data, status_code=200):
 
     return request.make_json_response(data, status=status_code)
+
+
+def attachment_response(attachment, download_name=None, mimetype=None, as_attachment=True):
+    """
+    Send an ir.attachment body after authorization has been checked.
+
+    Built on odoo.http.Stream: filestore files are never loaded into memory —
+    they go out through wsgi.file_wrapper, or are handed to the front proxy
+    (X-Sendfile / X-Accel-Redirect to /web/filestore/) when ``x_sendfile`` is
+    enabled in odoo.conf. Range and conditional requests are honoured, with a
+    strong ETag taken from the attachment checksum.
+    """
+    stream = Stream.from_attachment(attachment)
+    if download_name:
+        stream.download_name = download_name
+    if mimetype:
+        stream.mimetype = mimetype
+    return stream.get_response(as_attachment=as_attachment)
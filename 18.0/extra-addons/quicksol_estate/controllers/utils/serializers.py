@@ -270,17 +270,26 @@ def serialize_property_mapping_fields(property_record):
     )
     doc_att_map = {att.res_id: att.id for att in doc_atts}
 
+    attachments_url = f"/api/v1/properties/{property_record.id}/attachments"
+    photo_renditions = group_image_renditions(Attachment, list(photo_att_map.values()))
+
     result["property_images"] = [
-        _serialize_binary_metadata(
-            photo,
-            photo.name,
-            photo.image,
-            (
-                f"/api/v1/properties/{property_record.id}/attachments/{photo_att_map[photo.id]}/download"
-                if photo.id in photo_att_map
-                else None
+        {
+            **_serialize_binary_metadata(
+                photo,
+                photo.name,
+                photo.image,
+                (
+                    f"{attachments_url}/{photo_att_map[photo.id]}/download"
+                    if photo.id in photo_att_map
+                    else None
+                ),
             ),
-        )
+            **serialize_image_renditions(
+                photo_renditions.get(photo_att_map.get(photo.id), []),
+                lambda rendition: f"{attachments_url}/{rendition.id}/download",
+            ),
+        }
         for photo in property_record.photo_ids
     ]
     result["property_files"] = [
@@ -300,6 +309,37 @@ def serialize_property_mapping_fields(property_record):
     return result
 
 
+def group_image_renditions(Attachment, source_ids):
+    """Fetch the renditions of many images in one search, grouped by source id."""
+    if not source_ids:
+        return {}
+    grouped = {}
+    for rendition in Attachment.search([("rendition_of_id", "in", source_ids)]):
+        grouped.setdefault(rendition.rendition_of_id.id, []).append(rendition)
+    return grouped
+
+
+def serialize_image_renditions(renditions, url_for):
+    """
+    Build ``thumbnail_url`` and per-format ``srcset`` strings for an image.
+
+    ``srcset`` maps ``webp``/``jpeg`` to ``"<url> <width>w, ..."`` so clients can
+    emit ``<picture>`` sources; both are empty until the renditions exist.
+    """
+    thumbnail_url = None
+    srcset = {}
+    for rendition in sorted(renditions, key=lambda r: r.rendition_width or 0):
+        url = url_for(rendition)
+        fmt = "webp" if rendition.mimetype == "image/webp" else "jpeg"
+        srcset.setdefault(fmt, []).append(f"{url} {rendition.rendition_width}w")
+        if rendition.rendition_size == "thumbnail" and fmt == "jpeg":
+            thumbnail_url = url
+    return {
+        "thumbnail_url": thumbnail_url,
+        "srcset": {fmt: ", ".join(entries) for fmt, entries in srcset.items()},
+    }
+
+
 def _serialize_binary_metadata(record, name, binary_value, download_url):
     return {
         "id": record.id,
@@ -658,3 +698,33 @@ def validate_property_access(property_record, user, operation="read"):
 
     # Portal users have no access
     return False, "Insufficient permissions"
+
+
+def build_property_access_domain(user, operation="read"):
+    """
+    Set-based counterpart of validate_property_access().
+
+    Returns ``(domain, error_message)``: a domain restricting properties to the
+    ones ``user`` may access for ``operation``, or ``(None, message)`` when the
+    user has no access at all. Lets bulk endpoints authorize a whole set of
+    records with a single search instead of one check per record.
+    """
+    if user.has_group("base.group_system"):
+        return [], None
+
+    if user.has_group("quicksol_estate.group_real_estate_owner") or user.has_group(
+        "quicksol_estate.group_real_estate_manager"
+    ):
+        return [("company_id", "in", user.company_ids.ids)], None
+
+    if user.has_group("quicksol_estate.group_real_estate_agent"):
+        if operation == "delete":
+            return None, "Agents cannot delete properties"
+        return [("agent_id.user_id", "=", user.id)], None
+
+    if user.has_group("quicksol_estate.group_real_estate_user"):
+        if operation == "delete":
+            return None, "Users cannot delete properties"
+        return [("company_id", "in", user.company_ids.ids)], None
+
+    return None, "Insufficient permissions"
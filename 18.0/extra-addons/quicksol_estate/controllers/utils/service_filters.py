@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Valid filter fields that map directly to ORM domain atoms
+_DIRECT_FILTERS = {
+    "stage": ("stage", "="),
+    "operation_type": ("operation_type", "="),
+    "agent_id": ("agent_id", "="),
+    "source_id": ("source_id", "="),
+    "is_pending": ("is_pending", "="),
+    "is_orphan_agent": ("is_orphan_agent", "="),
+}
+
+_MANAGER_GROUPS = (
+    "quicksol_estate.group_real_estate_owner",
+    "quicksol_estate.group_real_estate_manager",
+)
+
+
+def is_manager_or_owner(env):
+    user = env.user
+    return any(user.has_group(g) for g in _MANAGER_GROUPS)
+
+
+def _direct_filters(params):
+    domain = []
+    for param, (field, operator) in _DIRECT_FILTERS.items():
+        val = params.get(param)
+        if val is None:
+            continue
+        if isinstance(val, str) and val.lower() in ("true", "false"):
+            val = val.lower() == "true"
+        elif isinstance(val, str) and val.isdigit():
+            val = int(val)
+        domain.append((field, operator, val))
+    return domain
+
+
+def _tag_filter(params):
+    # Multi-value filter: tag_ids
+    tag_ids_raw = params.get("tag_ids")
+    if not tag_ids_raw:
+        return []
+    try:
+        tag_ids = [int(t) for t in tag_ids_raw.split(",") if t.strip()]
+    except (ValueError, AttributeError):
+        return []
+    return [("tag_ids", "in", tag_ids)] if tag_ids else []
+
+
+def _archived_filter(params):
+    archived = params.get("archived")
+    if archived is not None and archived.lower() in ("true", "1"):
+        return [("active", "=", False)]
+    return []
+
+
+def _search_filter(params):
+    # Free-text search
+    q = params.get("q", "").strip()
+    if not q:
+        return []
+    return [
+        "|",
+        "|",
+        "|",
+        ("client_partner_id.name", "ilike", q),
+        ("client_partner_id.email", "ilike", q),
+        ("client_partner_id.phone_ids.number", "ilike", q),
+        ("property_ids.name", "ilike", q),
+    ]
+
+
+def build_service_filter_domain(params):
+    """
+    Build Odoo domain from GET /api/v1/services query parameters.
+
+    Shared by list_services and async exports. Company and agent scoping are
+    NOT applied here, see build_service_access_domain().
+    """
+    return (
+        _direct_filters(params)
+        + _tag_filter(params)
+        + _archived_filter(params)
+        + _search_filter(params)
+    )
+
+
+def build_service_access_domain(env, user_company_ids):
+    """
+    Explicit access domain for services read with sudo (record rules are not
+    reliable in Odoo 18): the caller's companies, and only their own services
+    unless they are a manager or owner.
+    """
+    access_domain = [("company_id", "in", user_company_ids)]
+    if not is_manager_or_owner(env):
+        access_domain.append(("agent_id", "=", env.user.id))
+    return access_domain
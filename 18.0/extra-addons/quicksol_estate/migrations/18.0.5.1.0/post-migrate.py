@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Backfill real_estate_lead.last_activity_at from existing comments (FR-047)."""
+    if not version:
+        return
+
+    cr.execute(
+        """
+        UPDATE real_estate_lead lead
+           SET last_activity_at = activity.last_date
+          FROM (
+                SELECT res_id, MAX(date) AS last_date
+                  FROM mail_message
+                 WHERE model = 'real.estate.lead'
+                   AND message_type = 'comment'
+                 GROUP BY res_id
+               ) activity
+         WHERE lead.id = activity.res_id
+        """
+    )
+    _logger.info("Backfilled last_activity_at on %d lead(s)", cr.rowcount)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    Create and fill real_estate_lead.phone_key in SQL before the registry
+    loads, so the new stored compute does not recompute every lead through
+    the ORM. Same normalization as models/lead.py normalize_phone().
+    """
+    if not version:
+        return
+
+    cr.execute(
+        """
+        ALTER TABLE real_estate_lead
+        ADD COLUMN IF NOT EXISTS phone_key varchar
+        """
+    )
+    cr.execute(
+        """
+        UPDATE real_estate_lead
+           SET phone_key = NULLIF(regexp_replace(phone, '[^0-9]', '', 'g'), '')
+         WHERE phone IS NOT NULL
+        """
+    )
+    _logger.info("Backfilled phone_key on %d lead(s)", cr.rowcount)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    Create and fill real_estate_lead.email_key in SQL before the registry
+    loads (same normalization as lead_dedup_service.normalize_email()), and
+    report open leads that would block the new unique (agent_id, key)
+    indexes created by the model's init().
+    """
+    if not version:
+        return
+
+    cr.execute(
+        """
+        ALTER TABLE real_estate_lead
+        ADD COLUMN IF NOT EXISTS email_key varchar
+        """
+    )
+    cr.execute(
+        """
+        UPDATE real_estate_lead
+           SET email_key = NULLIF(lower(trim(email)), '')
+         WHERE email IS NOT NULL
+        """
+    )
+    _logger.info("Backfilled email_key on %d lead(s)", cr.rowcount)
+
+    for column in ("phone_key", "email_key"):
+        cr.execute(
+            f"""
+            SELECT agent_id, {column}, array_agg(id ORDER BY id)
+              FROM real_estate_lead
+             WHERE {column} IS NOT NULL
+               AND active
+               AND state NOT IN ('lost', 'won')
+             GROUP BY agent_id, {column}
+            HAVING count(*) > 1
+            """
+        )
+        for agent_id, key, lead_ids in cr.fetchall():
+            _logger.warning(
+                "Duplicate open leads for agent %s and %s %s: %s",
+                agent_id,
+                column,
+                key,
+                lead_ids,
+            )
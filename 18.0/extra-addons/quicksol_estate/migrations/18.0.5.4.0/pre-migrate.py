@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    Create and fill real_estate_lead.state_changed_at before the registry
+    loads, so existing leads keep their age instead of getting the field
+    default (now). The latest tracked state change is used when there is
+    one, the creation date otherwise.
+    """
+    if not version:
+        return
+
+    cr.execute(
+        """
+        ALTER TABLE real_estate_lead
+        ADD COLUMN IF NOT EXISTS state_changed_at timestamp
+        """
+    )
+    cr.execute(
+        """
+        UPDATE real_estate_lead
+           SET state_changed_at = create_date
+         WHERE state_changed_at IS NULL
+        """
+    )
+    cr.execute(
+        """
+        UPDATE real_estate_lead lead
+           SET state_changed_at = tracked.changed_at
+          FROM (
+                SELECT message.res_id, MAX(message.date) AS changed_at
+                  FROM mail_tracking_value tracking
+                  JOIN mail_message message
+                    ON message.id = tracking.mail_message_id
+                  JOIN ir_model_fields field
+                    ON field.id = tracking.field_id
+                 WHERE message.model = 'real.estate.lead'
+                   AND field.model = 'real.estate.lead'
+                   AND field.name = 'state'
+                 GROUP BY message.res_id
+               ) tracked
+         WHERE lead.id = tracked.res_id
+           AND tracked.changed_at > lead.create_date
+        """
+    )
+    _logger.info(
+        "Backfilled state_changed_at from state tracking on %d lead(s)", cr.rowcount
+    )
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import SUPERUSER_ID, api
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Backfill real_estate_agent_performance_daily from existing commissions."""
+    if not version:
+        return
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    written = env["real.estate.agent.performance.daily"]._rebuild()
+    _logger.info("Backfilled %d agent performance rollup row(s)", written)
@@ -15,6 +15,7 @@ from . import property_owner
 from . import property_building
 from . import property_contact
 from . import property_media
+from . import ir_attachment  # Property photo renditions (WebP/JPEG)
 from . import property_auxiliary
 
 # Import main property model
@@ -22,12 +23,18 @@ from . import property
 
 # Import other models
 from . import agent
+from . import property_change  # Change log for GET /api/v1/properties/changes
 from . import assignment
 from . import commission_rule
 from . import commission_transaction
+from . import agent_performance_daily  # Daily commission rollups per agent
+from . import commission_statement  # Monthly agent commission statements
 from . import lease
 from . import lead  # FR-001: Lead management model
 from . import lead_filter  # FR-048: Saved search filters
+from . import export_job  # Async exports (POST /api/v1/exports)
+from . import lead_intake  # Portal lead webhooks (POST /api/v1/leads/ingest)
+from . import mail_message  # FR-047: lead last_activity_at maintenance
 from . import sale
 from . import lease_renewal_history  # Feature 008: Lease renewal audit trail
 from . import company
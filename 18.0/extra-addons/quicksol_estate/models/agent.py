@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import re
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
 from ..services.creci_validator import CreciValidator
+from ..services import lead_assignment_service
+from ..services import performance_service
 
 
 class RealEstateAgent(models.Model):
@@ -129,6 +133,28 @@ class RealEstateAgent(models.Model):
         help="Reason for deactivation",
     )
 
+    # ==================== LEAD ASSIGNMENT (FR-002b) ====================
+
+    receives_leads = fields.Boolean(
+        "Receives Leads",
+        default=True,
+        help="Agent takes part in the automatic lead assignment of the company",
+    )
+    lead_regions = fields.Char(
+        "Lead Regions",
+        help="Comma-separated neighbourhoods or cities matched against the "
+        "lead location preference (Skill / Region assignment)",
+    )
+    lead_property_type_ids = fields.Many2many(
+        "real.estate.property.type",
+        "real_estate_agent_lead_property_type_rel",
+        "agent_id",
+        "property_type_id",
+        string="Lead Property Types",
+        help="Property types this agent handles (Skill / Region assignment); "
+        "empty means any",
+    )
+
     # ==================== FINANCIAL ====================
 
     bank_name = fields.Char("Bank Name")
@@ -187,20 +213,20 @@ class RealEstateAgent(models.Model):
     # ==================== PERFORMANCE METRICS (US5) ====================
 
     total_sales_count = fields.Integer(
-        compute="_compute_total_sales_count",
+        compute="_compute_commission_statistics",
         string="Total Sales",
         help="Total number of commission transactions (sales)",
     )
 
     total_commissions = fields.Float(
-        compute="_compute_total_commissions",
+        compute="_compute_commission_statistics",
         string="Total Commissions",
         digits="Product Price",
         help="Sum of all commission amounts (in BRL)",
     )
 
     average_commission = fields.Float(
-        compute="_compute_average_commission",
+        compute="_compute_commission_statistics",
         string="Average Commission",
         digits="Product Price",
         help="Average commission amount per transaction (in BRL)",
@@ -466,6 +492,11 @@ class RealEstateAgent(models.Model):
                     vals["company_id"] = user.company_ids[0].id
 
         agent = super().create(vals)
+        agent._reset_lead_assignment()
+        # A new agent enters the company rankings
+        performance_service.schedule_invalidation(
+            self.env, company_ids=agent.company_id.ids
+        )
 
         return agent
 
@@ -477,80 +508,122 @@ class RealEstateAgent(models.Model):
             if user and user.company_ids:
                 vals["company_id"] = user.company_ids[0].id
 
+        if lead_assignment_service.AGENT_FIELDS.intersection(vals):
+            self._reset_lead_assignment(company_ids=[vals.get("company_id")])
+        if performance_service.AGENT_FIELDS.intersection(vals):
+            performance_service.schedule_invalidation(
+                self.env,
+                self.ids,
+                self.company_id.ids + [vals.get("company_id")],
+            )
+        # Commission rules are indexed per company of their agent
+        rule_company_ids = (
+            self.company_id.ids + [vals["company_id"]] if "company_id" in vals else []
+        )
         result = super().write(vals)
+        if rule_company_ids:
+            self.env["real.estate.commission.rule"]._clear_rule_index(
+                rule_company_ids
+            )
 
         return result
 
-    # ==================== PERFORMANCE COMPUTED METHODS (US5) ====================
+    def unlink(self):
+        performance_service.schedule_invalidation(
+            self.env, self.ids, self.company_id.ids
+        )
+        self._reset_lead_assignment()
+        # Their commission rules are deleted by the database (ondelete cascade)
+        rule_company_ids = self.company_id.ids
+        result = super().unlink()
+        self.env["real.estate.commission.rule"]._clear_rule_index(rule_company_ids)
+        return result
 
-    @api.depends(
-        "commission_transaction_ids", "commission_transaction_ids.transaction_type"
-    )
-    def _compute_total_sales_count(self):
-        """
-        Compute total number of commission transactions (sales)
+    def _reset_lead_assignment(self, company_ids=()):
+        """Reload the lead assignment index of the agents' companies on commit."""
+        companies = set(self.company_id.ids)
+        companies.update(cid for cid in company_ids if cid)
+        dbname = self.env.cr.dbname
+        self.env.cr.postcommit.add(
+            lambda: lead_assignment_service.registry.drop(dbname, companies)
+        )
 
-        Business Logic:
-        - Count all commission transactions regardless of payment status
-        - Only count 'sale' type transactions (exclude 'rental')
-        - Multi-tenant isolated (only transactions for this agent's company)
-        """
-        for agent in self:
-            agent.total_sales_count = len(
-                agent.commission_transaction_ids.filtered(
-                    lambda t: t.transaction_type == "sale"
-                )
-            )
+    # ==================== PERFORMANCE CACHE WARM-UP ====================
 
-    @api.depends(
-        "commission_transaction_ids", "commission_transaction_ids.commission_amount"
-    )
-    def _compute_total_commissions(self):
+    def warm_performance_cache(self, company_ids=None):
         """
-        Compute total sum of all commission amounts
-
-        Business Logic:
-        - Sum commission_amount from all transactions
-        - Includes pending, paid, and cancelled transactions
-        - Returns Monetary value in agent's currency (BRL default)
+        Recompute the cached performance of the agents, and the rankings of
+        ``company_ids``, for the standard dashboard periods (this month,
+        last month, year to date). Called over XML-RPC by the
+        performance.warm_cache worker after a change was published. Returns
+        the number of cache entries stored.
         """
-        for agent in self:
-            agent.total_commissions = sum(
-                agent.commission_transaction_ids.mapped("commission_amount")
-            )
+        self.check_access("read")
+        agents = self.sudo().exists().filtered("active")
+        companies = self.env["res.company"].sudo().browse(company_ids or []).exists()
+        service = performance_service.PerformanceService(self.env)
+        return service.warm_cache(
+            agents,
+            companies,
+            performance_service.standard_periods(fields.Date.today()),
+        )
+
+    # ==================== PERFORMANCE COMPUTED METHODS (US5) ====================
 
     @api.depends(
         "commission_transaction_ids",
+        "commission_transaction_ids.transaction_type",
         "commission_transaction_ids.commission_amount",
-        "total_sales_count",
     )
-    def _compute_average_commission(self):
+    def _compute_commission_statistics(self):
         """
-        Compute average commission amount per transaction
+        Compute total_sales_count, total_commissions and average_commission
+        for the whole recordset with one grouped query
 
         Business Logic:
-        - Average = total_commissions / total_sales_count
-        - Returns 0 if no transactions exist
+        - Sales: 'sale' transactions (exclude 'rental'), any payment status
+        - Commissions: sum of every transaction, including pending, paid and
+          cancelled ones (in BRL)
+        - Average = total_commissions / total_sales_count, 0 without sales
+        - Only the transactions the user may read (record rules apply)
         """
+        sales = defaultdict(int)
+        commissions = defaultdict(float)
+        groups = self.env["real.estate.commission.transaction"]._read_group(
+            [("agent_id", "in", self._origin.ids)],
+            ["agent_id", "transaction_type"],
+            ["__count", "commission_amount:sum"],
+        )
+        for agent, transaction_type, count, commission_amount in groups:
+            if transaction_type == "sale":
+                sales[agent.id] += count
+            commissions[agent.id] += commission_amount or 0.0
         for agent in self:
-            if agent.total_sales_count > 0:
-                agent.average_commission = (
-                    agent.total_commissions / agent.total_sales_count
-                )
-            else:
-                agent.average_commission = 0.0
+            agent_id = agent._origin.id
+            agent.total_sales_count = sales[agent_id]
+            agent.total_commissions = commissions[agent_id]
+            agent.average_commission = (
+                commissions[agent_id] / sales[agent_id] if sales[agent_id] else 0.0
+            )
 
     @api.depends("assignment_ids", "assignment_ids.active")
     def _compute_active_properties_count(self):
         """
-        Compute count of currently active property assignments
+        Compute count of currently active property assignments for the whole
+        recordset with one grouped query
 
         Business Logic:
-        - Count assignment_ids where active=True
+        - Count assignments where active=True
         - Only assignments for this agent's company (automatic via record rules)
         """
+        groups = self.env["real.estate.agent.property.assignment"]._read_group(
+            [("agent_id", "in", self._origin.ids), ("active", "=", True)],
+            ["agent_id"],
+            ["__count"],
+        )
+        counts = {agent.id: count for agent, count in groups}
         for agent in self:
-            agent.active_properties_count = len(agent.assignment_ids.filtered("active"))
+            agent.active_properties_count = counts.get(agent._origin.id, 0)
 
     # ==================== SMART BUTTON ACTIONS (Phase 8) ====================
 
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+from ..services import performance_rollup_service
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateAgentPerformanceDaily(models.Model):
+    """
+    Commission transactions of an agent summed per day, transaction type and
+    payment status. Maintained by commission transaction create()/write()
+    through _apply_transaction_deltas(); _rebuild() recomputes it from the
+    transactions (upgrade backfill, ``odoo-bin rebuild_agent_performance``).
+    """
+
+    _name = "real.estate.agent.performance.daily"
+    _description = "Agent Daily Performance Rollup"
+    _order = "day desc, id desc"
+    _log_access = False
+
+    _sql_constraints = [
+        (
+            "unique_agent_day_bucket",
+            "UNIQUE(agent_id, day, transaction_type, payment_status)",
+            "Only one rollup row per agent, day, type and payment status.",
+        ),
+    ]
+
+    agent_id = fields.Many2one(
+        "real.estate.agent",
+        "Agent",
+        required=True,
+        ondelete="cascade",
+        readonly=True,
+    )
+    day = fields.Date("Day", required=True, readonly=True)
+    transaction_type = fields.Selection(
+        [
+            ("sale", "Sale"),
+            ("rental", "Rental"),
+        ],
+        "Transaction Type",
+        required=True,
+        readonly=True,
+    )
+    payment_status = fields.Selection(
+        [
+            ("pending", "Pending Payment"),
+            ("paid", "Paid"),
+            ("cancelled", "Cancelled"),
+        ],
+        "Payment Status",
+        required=True,
+        readonly=True,
+    )
+    transaction_count = fields.Integer("Transactions", readonly=True)
+    transaction_amount = fields.Float(
+        "Transaction Amount", digits=(16, 2), readonly=True
+    )
+    commission_amount = fields.Float(
+        "Commission Amount", digits=(16, 2), readonly=True
+    )
+
+    @api.model
+    def _transaction_deltas(self, transactions, sign=1, payment_status=None):
+        """
+        Signed ``(key, count, transaction_amount, commission_amount)`` deltas
+        of ``transactions``, bucketed by their payment status or by
+        ``payment_status`` when given.
+        """
+        return [
+            (
+                (
+                    transaction.agent_id.id,
+                    transaction.transaction_date,
+                    transaction.transaction_type,
+                    payment_status or transaction.payment_status,
+                ),
+                sign,
+                sign * transaction.transaction_amount,
+                sign * transaction.commission_amount,
+            )
+            for transaction in transactions
+        ]
+
+    @api.model
+    def _apply_transaction_deltas(self, deltas):
+        """
+        Add ``deltas`` (see _transaction_deltas()) to the rollup rows in one
+        upsert; concurrent transactions serialize on the rows they touch.
+        Rows left without transactions are removed.
+        """
+        merged = performance_rollup_service.merge_deltas(deltas)
+        if not merged:
+            return
+        keys = list(merged)
+        rows = self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO real_estate_agent_performance_daily AS daily
+                       (agent_id, day, transaction_type, payment_status,
+                        transaction_count, transaction_amount, commission_amount)
+                SELECT *
+                  FROM unnest(%s::int[], %s::date[], %s::varchar[], %s::varchar[],
+                              %s::int[], %s::numeric[], %s::numeric[])
+                    ON CONFLICT (agent_id, day, transaction_type, payment_status)
+                    DO UPDATE SET
+                       transaction_count =
+                           daily.transaction_count + EXCLUDED.transaction_count,
+                       transaction_amount =
+                           daily.transaction_amount + EXCLUDED.transaction_amount,
+                       commission_amount =
+                           daily.commission_amount + EXCLUDED.commission_amount
+             RETURNING id, transaction_count
+                """,
+                [key[0] for key in keys],
+                [key[1] for key in keys],
+                [key[2] for key in keys],
+                [key[3] for key in keys],
+                [merged[key][0] for key in keys],
+                [merged[key][1] for key in keys],
+                [merged[key][2] for key in keys],
+            )
+        )
+        empty = tuple(id_ for id_, count in rows if count <= 0)
+        if empty:
+            self.env.execute_query(
+                SQL(
+                    "DELETE FROM real_estate_agent_performance_daily"
+                    " WHERE id IN %s AND transaction_count <= 0",
+                    empty,
+                )
+            )
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self, agent_ids=None):
+        """
+        Recompute the rollup rows of ``agent_ids`` (every agent when None)
+        from the commission transactions. The table is locked before reading
+        them: in a fresh transaction, commissions created concurrently are
+        then neither lost nor counted twice. Returns the number of rows
+        written.
+        """
+        self.env["real.estate.commission.transaction"].flush_model()
+        self.env.cr.execute(
+            "LOCK TABLE real_estate_agent_performance_daily"
+            " IN SHARE ROW EXCLUSIVE MODE"
+        )
+        agent_filter = SQL()
+        if agent_ids is not None:
+            agent_filter = SQL("WHERE agent_id IN %s", tuple(agent_ids) or (0,))
+        self.env.execute_query(
+            SQL("DELETE FROM real_estate_agent_performance_daily %s", agent_filter)
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO real_estate_agent_performance_daily
+                       (agent_id, day, transaction_type, payment_status,
+                        transaction_count, transaction_amount, commission_amount)
+                SELECT agent_id, transaction_date, transaction_type,
+                       payment_status, COUNT(*), SUM(transaction_amount),
+                       SUM(commission_amount)
+                  FROM real_estate_commission_transaction
+                  %s
+                 GROUP BY agent_id, transaction_date, transaction_type,
+                          payment_status
+                """,
+                agent_filter,
+            )
+        )
+        written = self.env.cr.rowcount
+        self.invalidate_model()
+        _logger.info("Rebuilt %d agent performance rollup row(s)", written)
+        return written
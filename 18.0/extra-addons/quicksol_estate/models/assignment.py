@@ -3,6 +3,8 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from ..services import performance_service
+
 
 class AgentPropertyAssignment(models.Model):
     _name = "real.estate.agent.property.assignment"
@@ -143,7 +145,9 @@ class AgentPropertyAssignment(models.Model):
             if agent.company_id:
                 vals["company_id"] = agent.company_id.id
 
-        return super().create(vals)
+        assignment = super().create(vals)
+        assignment._schedule_performance_invalidation()
+        return assignment
 
     def write(self, vals):
         """Prevent changing agent or property after creation"""
@@ -155,7 +159,20 @@ class AgentPropertyAssignment(models.Model):
                 )
             )
 
-        return super().write(vals)
+        result = super().write(vals)
+        if "active" in vals or "company_id" in vals:
+            self._schedule_performance_invalidation()
+        return result
+
+    def unlink(self):
+        self._schedule_performance_invalidation()
+        return super().unlink()
+
+    def _schedule_performance_invalidation(self):
+        """Agents' active_properties_count changes: refresh their performance."""
+        performance_service.schedule_invalidation(
+            self.env, self.agent_id.ids, self.company_id.ids
+        )
 
     # ==================== BUSINESS METHODS ====================
 
@@ -1,7 +1,22 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+from ..services import commission_rule_index
+
+RULE_INDEX_KEY = "quicksol_estate.commission_rule_index"
+# Fields of a rule that its index entry depends on
+INDEX_FIELDS = {
+    "agent_id",
+    "transaction_type",
+    "valid_from",
+    "valid_until",
+    "min_value",
+    "max_value",
+    "active",
+}
 
 
 class RealEstateCommissionRule(models.Model):
@@ -267,6 +282,7 @@ class RealEstateCommissionRule(models.Model):
         rule = super().create(vals)
         # Commission rule creation is automatically tracked by mail.thread
         # via tracking=True on relevant fields (agent_id, transaction_type, etc.)
+        rule._clear_rule_index()
 
         return rule
 
@@ -283,8 +299,169 @@ class RealEstateCommissionRule(models.Model):
             )
 
         result = super().write(vals)
+        if INDEX_FIELDS.intersection(vals):
+            self._clear_rule_index()
+        return result
+
+    def unlink(self):
+        company_ids = self.sudo().agent_id.company_id.ids
+        result = super().unlink()
+        self.browse()._clear_rule_index(company_ids)
         return result
 
+    # ==================== RULE INDEX ====================
+
+    def init(self):
+        super().init()
+        # Rule index generation per company, bumped with the rules it covers;
+        # drawn from a sequence so a rolled back value is never reused
+        self._cr.execute(
+            """
+            CREATE SEQUENCE IF NOT EXISTS real_estate_commission_rule_generation_seq
+            """
+        )
+        self._cr.execute(
+            """
+            CREATE TABLE IF NOT EXISTS real_estate_commission_rule_generation (
+                company_id integer PRIMARY KEY,
+                generation bigint NOT NULL
+            )
+            """
+        )
+
+    @api.model
+    @tools.ormcache("company_id", "generation")
+    def _load_rule_index(self, company_id, generation):
+        """
+        RuleIndex of the active rules of the agents of ``company_id``,
+        cached in the registry for the company's rule ``generation``.
+        """
+        rules = (
+            self.sudo()
+            .with_context(active_test=True)
+            .search_read(
+                [("agent_id.company_id", "=", company_id)],
+                [
+                    "agent_id",
+                    "transaction_type",
+                    "valid_from",
+                    "valid_until",
+                    "min_value",
+                    "max_value",
+                ],
+                order="id",
+                load=None,
+            )
+        )
+        return commission_rule_index.RuleIndex(rules)
+
+    @api.model
+    def _rule_index_state(self):
+        """
+        Rule index bookkeeping of this transaction: ``generations`` read by
+        company, ``readable`` rule ids by (company, user, companies) and the
+        companies whose rules it ``changed``. Reset on commit and rollback.
+        """
+        return self.env.cr.postcommit.data.setdefault(
+            RULE_INDEX_KEY, {"generations": {}, "readable": {}, "changed": set()}
+        )
+
+    @api.model
+    def _get_rule_index(self, company_id):
+        """
+        RuleIndex of ``company_id`` for its current rule generation. The
+        generation is read once per transaction, or on every call once the
+        transaction changed the company's rules (savepoints may roll it back).
+        """
+        state = self._rule_index_state()
+        generation = state["generations"].get(company_id)
+        if generation is None:
+            rows = self.env.execute_query(
+                SQL(
+                    """
+                    SELECT generation
+                      FROM real_estate_commission_rule_generation
+                     WHERE company_id = %s
+                    """,
+                    company_id,
+                )
+            )
+            generation = rows[0][0] if rows else 0
+            if company_id not in state["changed"]:
+                state["generations"][company_id] = generation
+        return self._load_rule_index(company_id, generation)
+
+    def _clear_rule_index(self, company_ids=()):
+        """
+        Move the rules' agents' companies (and ``company_ids``) to a new rule
+        index generation. The new generation commits with the change, so
+        other workers load a new index once it is visible, while the rest of
+        the registry cache is kept.
+        """
+        companies = set(self.sudo().agent_id.company_id.ids)
+        companies.update(cid for cid in company_ids if cid)
+        if not companies:
+            return
+        state = self._rule_index_state()
+        state["changed"].update(companies)
+        for company_id in companies:
+            state["generations"].pop(company_id, None)
+        for key in [key for key in state["readable"] if key[0] in companies]:
+            del state["readable"][key]
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO real_estate_commission_rule_generation
+                       (company_id, generation)
+                SELECT company_id, nextval('real_estate_commission_rule_generation_seq')
+                  FROM unnest(%s::int[]) AS company_id
+                ON CONFLICT (company_id)
+                DO UPDATE SET generation = EXCLUDED.generation
+                """,
+                sorted(companies),
+            )
+        )
+
+    @api.model
+    def _readable_rule_ids(self, company_id, index):
+        """
+        Ids of ``index``'s rules the user can read, checked once per
+        transaction and company unless the transaction changed its rules.
+        """
+        if self.env.su:
+            return index.rule_ids
+        state = self._rule_index_state()
+        key = (company_id, self.env.uid, tuple(self.env.companies.ids))
+        readable = state["readable"].get(key)
+        if readable is None:
+            readable = frozenset()
+            if index.rule_ids and self.has_access("read"):
+                readable = frozenset(
+                    self.search([("id", "in", list(index.rule_ids))]).ids
+                )
+            if company_id not in state["changed"]:
+                state["readable"][key] = readable
+        return readable
+
+    @api.model
+    def _resolve_rule(self, agent, transaction_type, on_date, amount=None):
+        """
+        Rule of ``agent`` for a ``transaction_type`` transaction on
+        ``on_date`` (and of ``amount`` when given) from the company's rule
+        index, or an empty recordset; rules the user cannot read are not
+        returned.
+        """
+        company_id = agent.sudo().company_id.id
+        if not company_id:
+            return self.browse()
+        index = self._get_rule_index(company_id)
+        rule_id = index.resolve(
+            agent.id, transaction_type, fields.Date.to_date(on_date), amount
+        )
+        if rule_id not in self._readable_rule_ids(company_id, index):
+            return self.browse()
+        return self.browse(rule_id)
+
     # ==================== HELPER METHODS ====================
 
     def _get_default_company(self):
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+import base64
+import logging
+
+from odoo import fields, models
+from odoo.tools import SQL
+
+from ..services import commission_statement_service
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateCommissionStatementRun(models.Model):
+    """
+    Commission statements of every agent of a company for one month,
+    requested through POST /api/v1/commission-statements and produced by
+    the statement_events worker. See services/commission_statement_service.py.
+    """
+
+    _name = "real.estate.commission.statement.run"
+    _description = "Commission Statement Run"
+    _order = "create_date desc, id desc"
+
+    name = fields.Char(required=True)
+    user_id = fields.Many2one(
+        "res.users",
+        string="Requested By",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    company_id = fields.Many2one(
+        "res.company", string="Company", required=True, index=True
+    )
+    period_start = fields.Date("Period Start", required=True)
+    period_end = fields.Date("Period End", required=True)
+    file_format = fields.Selection(
+        commission_statement_service.FORMATS, default="both", required=True
+    )
+    state = fields.Selection(
+        [
+            ("queued", "Queued"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="queued",
+        required=True,
+        index=True,
+    )
+    statement_ids = fields.One2many(
+        "real.estate.commission.statement", "run_id", string="Statements"
+    )
+    error_message = fields.Text()
+    started_at = fields.Datetime()
+    finished_at = fields.Datetime()
+
+    # ------------------------------------------------------------------ #
+    #  Dispatch                                                           #
+    # ------------------------------------------------------------------ #
+
+    def _enqueue(self):
+        """Dispatch the runs once the creating transaction is committed (ADR-021)."""
+        run_ids = self.ids
+
+        def _dispatch():
+            try:
+                from odoo.addons.quicksol_estate.services.celery_client import (
+                    send_task,
+                )
+
+                for run_id in run_ids:
+                    send_task(
+                        commission_statement_service.STATEMENT_TASK,
+                        kwargs={"run_id": run_id},
+                        queue=commission_statement_service.STATEMENT_QUEUE,
+                    )
+            except Exception:
+                _logger.exception(
+                    "Failed to enqueue commission statement runs %s — they stay "
+                    "queued.",
+                    run_ids,
+                )
+
+        self.env.cr.postcommit.add(_dispatch)
+
+    # ------------------------------------------------------------------ #
+    #  Worker entry points (XML-RPC, statement_events queue)              #
+    # ------------------------------------------------------------------ #
+
+    def prepare_statements(self):
+        """
+        Compute the statements of the run in one aggregated pass and return
+        what the worker renders: ``{"run": {...}, "statements": [...]}``,
+        each statement with its totals and transaction lines. Returns False
+        when the run is already finished. A retry starts over: statements
+        (and files) of a previous attempt are replaced.
+        """
+        self.check_access("write")
+        run = self.sudo()
+        run.ensure_one()
+        if run.state in ("done", "failed"):
+            return False
+
+        run.statement_ids.unlink()
+        run.write({"state": "running", "started_at": fields.Datetime.now()})
+
+        agents = (
+            self.env["real.estate.agent"]
+            .sudo()
+            .with_context(active_test=False)
+            .search([("company_id", "=", run.company_id.id)], order="name, id")
+        )
+        self.env["real.estate.commission.transaction"].flush_model()
+        lines = self.env.execute_query(
+            SQL(
+                """
+                SELECT agent_id, id, transaction_date, transaction_reference,
+                       transaction_type, transaction_amount::float,
+                       commission_amount::float, payment_status
+                  FROM real_estate_commission_transaction
+                 WHERE company_id = %s
+                   AND transaction_date BETWEEN %s AND %s
+                 ORDER BY agent_id, transaction_date, id
+                """,
+                run.company_id.id,
+                run.period_start,
+                run.period_end,
+            )
+        )
+        statements = commission_statement_service.build_statements(
+            [(agent.id, agent.name) for agent in agents], lines
+        )
+        total_fields = list(commission_statement_service.empty_totals())
+        records = self.env["real.estate.commission.statement"].create(
+            [
+                {
+                    "run_id": run.id,
+                    "agent_id": statement["agent_id"],
+                    **{key: statement[key] for key in total_fields},
+                }
+                for statement in statements
+            ]
+        )
+        for statement, record in zip(statements, records):
+            statement["statement_id"] = record.id
+        _logger.info(
+            "Commission statement run %s: %d statement(s) from %d transaction(s)",
+            run.id,
+            len(statements),
+            len(lines),
+        )
+        return {
+            "run": {
+                "id": run.id,
+                "company_name": run.company_id.name,
+                "month": commission_statement_service.month_label(run.period_start),
+                "date_from": run.period_start.isoformat(),
+                "date_to": run.period_end.isoformat(),
+                "formats": commission_statement_service.file_formats(
+                    run.file_format
+                ),
+            },
+            "statements": statements,
+        }
+
+    def store_statement_files(self, files):
+        """
+        Attach rendered files to their statements: ``files`` is a list of
+        ``{"statement_id", "format", "filename", "content"}`` with base64
+        content. Returns the number of attachments created.
+        """
+        self.check_access("write")
+        run = self.sudo()
+        run.ensure_one()
+        statements = run.statement_ids
+        valid_ids = set(statements.ids)
+        stored = [file for file in files if file["statement_id"] in valid_ids]
+        vals_list = []
+        for file in stored:
+            vals_list.append(
+                {
+                    "name": file["filename"],
+                    "raw": base64.b64decode(file["content"]),
+                    "mimetype": commission_statement_service.MIMETYPES[
+                        file["format"]
+                    ],
+                    "res_model": "real.estate.commission.statement",
+                    "res_id": file["statement_id"],
+                    "company_id": run.company_id.id,
+                }
+            )
+        attachments = self.env["ir.attachment"].sudo().create(vals_list)
+        for attachment, file in zip(attachments, stored):
+            statements.browse(file["statement_id"]).write(
+                {f"{file['format']}_attachment_id": attachment.id}
+            )
+        return len(attachments)
+
+    def finish_statements(self):
+        """Called by the worker once every file was stored."""
+        self.check_access("write")
+        self.sudo().filtered(lambda run: run.state == "running").write(
+            {"state": "done", "finished_at": fields.Datetime.now()}
+        )
+        return True
+
+    def mark_statements_failed(self, message):
+        """Called by the worker once its retries are exhausted."""
+        self.check_access("write")
+        self.sudo().filtered(lambda run: run.state != "done").write(
+            {
+                "state": "failed",
+                "error_message": message,
+                "finished_at": fields.Datetime.now(),
+            }
+        )
+        return True
+
+    def unlink(self):
+        # Through unlink() so the statement files go as well
+        self.sudo().statement_ids.unlink()
+        return super().unlink()
+
+
+class RealEstateCommissionStatement(models.Model):
+    """Commission statement of one agent for the month of its run."""
+
+    _name = "real.estate.commission.statement"
+    _description = "Agent Commission Statement"
+    _order = "run_id desc, id"
+    _rec_name = "agent_id"
+
+    run_id = fields.Many2one(
+        "real.estate.commission.statement.run",
+        string="Run",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    agent_id = fields.Many2one(
+        "real.estate.agent", "Agent", required=True, ondelete="cascade"
+    )
+    company_id = fields.Many2one(related="run_id.company_id", store=True)
+    transaction_count = fields.Integer("Transactions")
+    transaction_amount = fields.Float("Transaction Amount", digits=(16, 2))
+    total_commission = fields.Float("Total Commission", digits=(16, 2))
+    pending_commission = fields.Float("Pending Commission", digits=(16, 2))
+    paid_commission = fields.Float("Paid Commission", digits=(16, 2))
+    cancelled_commission = fields.Float("Cancelled Commission", digits=(16, 2))
+    csv_attachment_id = fields.Many2one("ir.attachment", ondelete="set null")
+    pdf_attachment_id = fields.Many2one("ir.attachment", ondelete="set null")
+
+    def unlink(self):
+        attachments = self.sudo().csv_attachment_id | self.sudo().pdf_attachment_id
+        result = super().unlink()
+        attachments.unlink()
+        return result
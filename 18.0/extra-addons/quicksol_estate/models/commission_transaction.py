@@ -5,12 +5,9 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
 import json
 
-_logger = logging.getLogger(__name__)
+from ..services import performance_service
 
-try:
-    from odoo.addons.thedevkitchen_apigateway.services.redis_client import RedisClient
-except ImportError:
-    RedisClient = None
+_logger = logging.getLogger(__name__)
 
 
 class RealEstateCommissionTransaction(models.Model):
@@ -291,41 +288,41 @@ class RealEstateCommissionTransaction(models.Model):
 
     # ==================== CRUD OVERRIDES ====================
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to enforce immutability and create rule snapshot"""
         # If rule_snapshot not provided, create it from rule_id
-        if "rule_id" in vals and "rule_snapshot" not in vals:
-            rule = self.env["real.estate.commission.rule"].browse(vals["rule_id"])
-            if rule:
-                vals["rule_snapshot"] = json.dumps(
-                    {
-                        "percentage": rule.percentage,
-                        "fixed_amount": rule.fixed_amount,
-                        "structure_type": rule.structure_type,
-                        "transaction_type": rule.transaction_type,
-                        "min_value": rule.min_value,
-                        "max_value": rule.max_value,
-                        "valid_from": str(rule.valid_from) if rule.valid_from else None,
-                        "valid_until": (
-                            str(rule.valid_until) if rule.valid_until else None
-                        ),
-                    }
-                )
+        for vals in vals_list:
+            if "rule_id" in vals and "rule_snapshot" not in vals:
+                rule = self.env["real.estate.commission.rule"].browse(vals["rule_id"])
+                if rule:
+                    vals["rule_snapshot"] = json.dumps(
+                        {
+                            "percentage": rule.percentage,
+                            "fixed_amount": rule.fixed_amount,
+                            "structure_type": rule.structure_type,
+                            "transaction_type": rule.transaction_type,
+                            "min_value": rule.min_value,
+                            "max_value": rule.max_value,
+                            "valid_from": (
+                                str(rule.valid_from) if rule.valid_from else None
+                            ),
+                            "valid_until": (
+                                str(rule.valid_until) if rule.valid_until else None
+                            ),
+                        }
+                    )
 
-        transaction = super().create(vals)
+        transactions = super().create(vals_list)
+        Rollup = self.env["real.estate.agent.performance.daily"]
+        Rollup._apply_transaction_deltas(Rollup._transaction_deltas(transactions))
         # Commission transaction creation is automatically tracked by mail.thread
         # via tracking=True on relevant fields (agent_id, commission_amount, etc.)
 
-        # Invalidate performance cache for the agent (T023: US3)
-        if RedisClient and transaction.agent_id:
-            try:
-                deleted = RedisClient.delete_pattern(f'performance:agent:{transaction.agent_id.id}:*')
-                _logger.info('[CACHE] performance invalidated for agent=%d keys_deleted=%s after new commission', transaction.agent_id.id, deleted)
-            except Exception as exc:
-                _logger.warning('[CACHE] performance invalidation failed on commission create: %s', exc)
+        # Invalidate (and warm) the agents' performance cache (T023: US3)
+        transactions._schedule_performance_invalidation()
 
-        return transaction
+        return transactions
 
     def write(self, vals):
         """Override write to prevent modification of critical fields after creation"""
@@ -351,8 +348,23 @@ class RealEstateCommissionTransaction(models.Model):
                     % {"field": field}
                 )
 
+        # Transactions changing payment status move between rollup buckets
+        Rollup = self.env["real.estate.agent.performance.daily"]
+        moved = self.browse()
+        if vals.get("payment_status"):
+            moved = self.filtered(
+                lambda t: t.payment_status != vals["payment_status"]
+            )
+        deltas = Rollup._transaction_deltas(moved, sign=-1)
+
         result = super().write(vals)
 
+        if moved:
+            Rollup._apply_transaction_deltas(
+                deltas + Rollup._transaction_deltas(moved)
+            )
+        self._schedule_performance_invalidation()
+
         # Log payment status changes (skip if tracking is disabled)
         if "payment_status" in vals and not self.env.context.get("tracking_disable"):
             for transaction in self:
@@ -374,6 +386,12 @@ class RealEstateCommissionTransaction(models.Model):
             )
         )
 
+    def _schedule_performance_invalidation(self):
+        """Refresh the cached performance of the agents once committed."""
+        performance_service.schedule_invalidation(
+            self.env, self.agent_id.ids, self.company_id.ids
+        )
+
     # ==================== ACTION METHODS ====================
 
     def action_mark_paid(self):
@@ -1,7 +1,16 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import config
 from ..utils import validators  # Feature 007: Import validators (T005)
+from ..services import lead_assignment_service, portal_feed_service
+import logging
 import re
+import secrets
+
+_logger = logging.getLogger(__name__)
+
+# Change-log rows consumed per query when patching a portal feed
+PORTAL_FEED_BATCH_SIZE = 500
 
 
 class ResCompany(models.Model):
@@ -62,6 +71,28 @@ class ResCompany(models.Model):
         compute="_compute_owner_count",
     )
 
+    # -------------------------------------------------------------------------
+    # Portal listing feed (GET /api/v1/portal-feeds/<token>.json)
+    # -------------------------------------------------------------------------
+    portal_feed_token = fields.Char(
+        string="Portal Feed Token",
+        copy=False,
+        groups="base.group_system",
+        help="Secret part of the public portal feed URL. Generated on first feed build.",
+    )
+
+    # -------------------------------------------------------------------------
+    # Lead assignment (FR-002b)
+    # -------------------------------------------------------------------------
+    lead_assignment_strategy = fields.Selection(
+        lead_assignment_service.STRATEGIES,
+        string="Lead Assignment",
+        default="manual",
+        required=True,
+        help="How leads created without an agent (portal intake, imports) "
+        "are distributed among the agents that receive leads.",
+    )
+
     _sql_constraints = [
         ("cnpj_unique", "UNIQUE(cnpj)", "CNPJ must be unique"),
     ]
@@ -268,3 +299,98 @@ class ResCompany(models.Model):
             "domain": [("company_id", "=", self.id)],
             "context": {"default_company_id": self.id},
         }
+
+    # -------------------------------------------------------------------------
+    # Portal listing feed
+    # -------------------------------------------------------------------------
+
+    def _portal_feed_path(self):
+        self.ensure_one()
+        if not self.sudo().portal_feed_token:
+            self.sudo().portal_feed_token = secrets.token_urlsafe(24)
+        return portal_feed_service.feed_path(
+            config["data_dir"], self.env.cr.dbname, self.sudo().portal_feed_token
+        )
+
+    def _portal_feed_domain(self):
+        self.ensure_one()
+        return [
+            ("company_id", "=", self.id),
+            ("active", "=", True),
+            "|",
+            "|",
+            ("publish_website", "=", True),
+            ("publish_featured", "=", True),
+            ("publish_super_featured", "=", True),
+        ]
+
+    def _update_portal_feed(self):
+        """
+        Bring the company feed file up to date.
+
+        Only properties that appear in the change log after the feed cursor
+        are read and re-serialized; the feed is rebuilt from scratch when it
+        is missing or its cursor predates the change-log horizon.
+        """
+        self.ensure_one()
+        Property = self.env["real.estate.property"].sudo().with_context(
+            active_test=False
+        )
+        ChangeLog = self.env["real.estate.property.change"].sudo()
+        path = self._portal_feed_path()
+        feed = portal_feed_service.load_feed(path)
+
+        cursor = feed and feed.get("cursor")
+        horizon = ChangeLog._get_horizon()
+        if cursor and horizon and tuple(cursor) < horizon:
+            cursor = None
+
+        company_domain = [("company_id", "=", self.id)]
+        if cursor:
+            changed_ids = set()
+            after = tuple(cursor)
+            while True:
+                rows = ChangeLog._read_changes(
+                    company_domain, after=after, limit=PORTAL_FEED_BATCH_SIZE
+                )
+                if not rows:
+                    break
+                changed_ids.update(row["property_id"] for row in rows)
+                after = (rows[-1]["txid"], rows[-1]["id"])
+            cursor = list(after)
+            if not changed_ids:
+                return False
+            published = Property.search(
+                [("id", "in", list(changed_ids))] + self._portal_feed_domain()
+            )
+            feed = portal_feed_service.apply_changes(
+                feed,
+                [portal_feed_service.serialize_listing(prop) for prop in published],
+                changed_ids - set(published.ids),
+                cursor,
+                fields.Datetime.now().isoformat(),
+            )
+        else:
+            cursor = list(ChangeLog._settled_cursor())
+            published = Property.search(self._portal_feed_domain(), order="id")
+            feed = portal_feed_service.build_feed(
+                {"id": self.id, "name": self.name},
+                [portal_feed_service.serialize_listing(prop) for prop in published],
+                cursor,
+                fields.Datetime.now().isoformat(),
+            )
+
+        portal_feed_service.write_feed_atomic(path, feed)
+        return True
+
+    @api.model
+    def _cron_update_portal_feeds(self):
+        companies = self.sudo().search([("is_real_estate", "=", True)])
+        updated = 0
+        for company in companies:
+            try:
+                updated += bool(company._update_portal_feed())
+            except Exception:
+                _logger.exception("Portal feed update failed for company %s", company.id)
+        if updated:
+            _logger.info("Cron: portal feeds updated for %d company(ies)", updated)
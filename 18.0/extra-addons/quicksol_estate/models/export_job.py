@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import config
+
+from ..services import export_job_service
+from ..services.upload_stream import SpooledUpload
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_TASK = "export.run_job"
+EXPORT_QUEUE = "export_events"
+CONFIG_PARAM_RETENTION_DAYS = "quicksol_estate.export_job_retention_days"
+DEFAULT_RETENTION_DAYS = 7
+
+
+class RealEstateExportJob(models.Model):
+    """
+    Asynchronous export requested through POST /api/v1/exports.
+
+    ``domain`` is built at request time with the same filter builders and
+    company/agent scoping as the matching list endpoint, so the worker only
+    replays it. See services/export_job_service.py for the chunk protocol.
+    """
+
+    _name = "real.estate.export.job"
+    _description = "Export Job"
+    _order = "create_date desc, id desc"
+
+    name = fields.Char(required=True)
+    user_id = fields.Many2one(
+        "res.users",
+        string="Requested By",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    company_id = fields.Many2one("res.company", string="Company", index=True)
+    resource = fields.Selection(
+        [
+            ("leads", "Leads"),
+            ("properties", "Properties"),
+            ("services", "Services"),
+            ("commissions", "Commission Transactions"),
+        ],
+        required=True,
+    )
+    domain = fields.Text(required=True, help="JSON-encoded, fully scoped search domain")
+    include_archived = fields.Boolean(help="Search with active_test disabled")
+    compress = fields.Boolean(help="Produce a gzip-compressed CSV")
+    state = fields.Selection(
+        [
+            ("queued", "Queued"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="queued",
+        required=True,
+        index=True,
+    )
+    last_exported_id = fields.Integer(
+        help="Keyset position: highest record id already written"
+    )
+    # Float, not Integer: an int4 column overflows once the file passes 2 GiB
+    committed_size = fields.Float(
+        help="Bytes of the partial file covered by committed chunks"
+    )
+    row_count = fields.Integer(readonly=True)
+    attachment_id = fields.Many2one("ir.attachment", ondelete="set null")
+    error_message = fields.Text()
+    started_at = fields.Datetime()
+    finished_at = fields.Datetime()
+
+    # ------------------------------------------------------------------ #
+    #  Dispatch                                                           #
+    # ------------------------------------------------------------------ #
+
+    def _enqueue(self):
+        """Dispatch the jobs once the creating transaction is committed (ADR-021)."""
+        job_ids = self.ids
+
+        def _dispatch():
+            try:
+                from odoo.addons.quicksol_estate.services.celery_client import (
+                    send_task,
+                )
+
+                for job_id in job_ids:
+                    send_task(EXPORT_TASK, kwargs={"job_id": job_id}, queue=EXPORT_QUEUE)
+            except Exception:
+                _logger.exception(
+                    "Failed to enqueue export jobs %s — they stay queued.", job_ids
+                )
+
+        self.env.cr.postcommit.add(_dispatch)
+
+    # ------------------------------------------------------------------ #
+    #  Worker entry points (XML-RPC, export_events queue)                 #
+    # ------------------------------------------------------------------ #
+
+    def _partial_path(self):
+        self.ensure_one()
+        return export_job_service.partial_path(
+            config["data_dir"], self.env.cr.dbname, self.id
+        )
+
+    def run_export_chunk(self):
+        """
+        Append the next chunk of rows to the job file; return True once the
+        job is finished (done or failed). Each call is its own transaction,
+        so a retried chunk first truncates the file to the committed size.
+        """
+        self.check_access("write")
+        job = self.sudo()
+        job.ensure_one()
+        if job.state in ("done", "failed"):
+            return True
+
+        if job.state == "queued":
+            job.write({"state": "running", "started_at": fields.Datetime.now()})
+
+        path = job._partial_path()
+        if not export_job_service.prepare_partial(path, job.committed_size):
+            _logger.warning("Export job %s lost its partial file; restarting", job.id)
+            job.write({"last_exported_id": 0, "committed_size": 0, "row_count": 0})
+            export_job_service.prepare_partial(path, 0)
+
+        resource = job.resource
+        Model = self.env[export_job_service.EXPORT_RESOURCES[resource]["model"]].sudo()
+        if job.include_archived:
+            Model = Model.with_context(active_test=False)
+        export_fields = export_job_service.export_fields(resource)
+        field_types = {name: Model._fields[name].type for name in export_fields}
+
+        domain = json.loads(job.domain)
+        if job.last_exported_id:
+            domain = domain + [("id", ">", job.last_exported_id)]
+        records = Model.search_read(
+            domain,
+            export_fields,
+            order="id asc",
+            limit=export_job_service.EXPORT_CHUNK_SIZE,
+        )
+
+        data = export_job_service.encode_csv(
+            [
+                export_job_service.format_row(values, export_fields, field_types)
+                for values in records
+            ],
+            header=(
+                export_job_service.export_headers(resource)
+                if not job.committed_size
+                else None
+            ),
+            compress=job.compress,
+        )
+        size = export_job_service.append_chunk(path, data) if data else job.committed_size
+        vals = {"committed_size": size, "row_count": job.row_count + len(records)}
+        if records:
+            vals["last_exported_id"] = records[-1]["id"]
+        job.write(vals)
+
+        if len(records) < export_job_service.EXPORT_CHUNK_SIZE:
+            job._finalize(path)
+            return True
+        return False
+
+    def _finalize(self, path):
+        """Move the finished partial file into the filestore as an attachment."""
+        self.ensure_one()
+        size, checksum, head = export_job_service.file_digest(path)
+        filename = export_job_service.export_filename(
+            self.resource, self.id, self.compress
+        )
+        with SpooledUpload(path, size, checksum, head) as spooled:
+            attachment = self.env["ir.attachment"].sudo()._create_from_spooled(
+                spooled,
+                {
+                    "name": filename,
+                    "mimetype": "application/gzip" if self.compress else "text/csv",
+                    "res_model": self._name,
+                    "res_id": self.id,
+                    "company_id": self.company_id.id,
+                },
+            )
+        self.write(
+            {
+                "state": "done",
+                "attachment_id": attachment.id,
+                "finished_at": fields.Datetime.now(),
+            }
+        )
+
+    def mark_export_failed(self, message):
+        """Called by the worker once its retries are exhausted."""
+        self.check_access("write")
+        for job in self.sudo():
+            if job.state == "done":
+                continue
+            job.write(
+                {
+                    "state": "failed",
+                    "error_message": message,
+                    "finished_at": fields.Datetime.now(),
+                }
+            )
+            path = job._partial_path()
+            if os.path.exists(path):
+                os.unlink(path)
+        return True
+
+    # ------------------------------------------------------------------ #
+    #  Cleanup                                                            #
+    # ------------------------------------------------------------------ #
+
+    def unlink(self):
+        attachments = self.sudo().attachment_id
+        paths = [job._partial_path() for job in self]
+        result = super().unlink()
+        attachments.unlink()
+        for path in paths:
+            if os.path.exists(path):
+                os.unlink(path)
+        return result
+
+    @api.model
+    def _cron_cleanup_export_jobs(self):
+        """Delete jobs (and their files) older than the retention window."""
+        try:
+            days = int(
+                self.env["ir.config_parameter"]
+                .sudo()
+                .get_param(CONFIG_PARAM_RETENTION_DAYS, default=DEFAULT_RETENTION_DAYS)
+            )
+        except (TypeError, ValueError):
+            days = DEFAULT_RETENTION_DAYS
+        cutoff = fields.Datetime.now() - timedelta(days=max(1, days))
+        expired = self.sudo().search([("create_date", "<", cutoff)])
+        count = len(expired)
+        expired.unlink()
+        _logger.info("Cron: %d expired export jobs removed", count)
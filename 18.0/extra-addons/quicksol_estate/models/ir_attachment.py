@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+
+from odoo import api, fields, models
+
+from ..services.image_rendition_service import SOURCE_MIMETYPES, build_renditions
+
+_logger = logging.getLogger(__name__)
+
+RENDITION_DESCRIPTION = "image_rendition"
+RENDITION_TASK = "property.generate_image_renditions"
+RENDITION_QUEUE = "media_events"
+
+
+class IrAttachment(models.Model):
+    """
+    Property photo renditions (thumbnail/medium/large in WebP and JPEG).
+
+    Property images (Feature 017 uploads and legacy real.estate.property.photo
+    binaries) enqueue a job on the ``media_events`` Celery queue after commit;
+    the worker calls generate_property_renditions() which stores each rendition
+    as an ir.attachment linked through ``rendition_of_id``.
+
+    Also hosts the streaming upload write path (_create_from_spooled).
+    """
+
+    _inherit = "ir.attachment"
+
+    rendition_of_id = fields.Many2one(
+        "ir.attachment",
+        string="Rendition Of",
+        ondelete="cascade",
+        index=True,
+        copy=False,
+        help="Original image this attachment is a resized rendition of",
+    )
+    rendition_ids = fields.One2many(
+        "ir.attachment", "rendition_of_id", string="Renditions"
+    )
+    rendition_size = fields.Char(
+        string="Rendition Size", help="thumbnail, medium or large"
+    )
+    rendition_width = fields.Integer(string="Rendition Width (px)")
+
+    def _is_property_image_source(self):
+        self.ensure_one()
+        if self.rendition_of_id or self.mimetype not in SOURCE_MIMETYPES:
+            return False
+        if self.res_model == "real.estate.property":
+            return self.description == "image"
+        return self.res_model == "real.estate.property.photo" and (
+            self.res_field == "image"
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        attachments = super().create(vals_list)
+        attachments._enqueue_property_renditions()
+        return attachments
+
+    def write(self, vals):
+        result = super().write(vals)
+        if "raw" in vals or "datas" in vals:
+            self._enqueue_property_renditions()
+        return result
+
+    def _enqueue_property_renditions(self):
+        """Dispatch rendition jobs once the upload transaction is committed (ADR-021)."""
+        if self.env.context.get("skip_image_renditions"):
+            return
+        sources = self.filtered(lambda att: att._is_property_image_source())
+        if not sources:
+            return
+        attachment_ids = sources.ids
+
+        def _dispatch():
+            try:
+                from odoo.addons.quicksol_estate.services.celery_client import (
+                    send_task,
+                )
+
+                for attachment_id in attachment_ids:
+                    send_task(
+                        RENDITION_TASK,
+                        kwargs={"attachment_id": attachment_id},
+                        queue=RENDITION_QUEUE,
+                    )
+            except Exception:
+                _logger.exception(
+                    "Failed to enqueue image renditions for attachments %s — "
+                    "originals are stored; renditions can be regenerated later.",
+                    attachment_ids,
+                )
+
+        self.env.cr.postcommit.add(_dispatch)
+
+    @api.model
+    def _create_from_spooled(self, spooled, vals):
+        """
+        Create an attachment from a SpooledUpload (services/upload_stream.py)
+        without loading it into memory or base64-encoding it.
+
+        With file storage the spooled file is copied into the filestore under
+        its checksum (same layout and GC marking as _file_write) and the
+        attachment row is pointed at it; database storage falls back to ``raw``.
+        """
+        if self._storage() != "file":
+            with spooled.open() as source:
+                return self.create(dict(vals, raw=source.read()))
+
+        fname = f"{spooled.checksum[:2]}/{spooled.checksum}"
+        full_path = self._full_path(fname)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if not os.path.exists(full_path):
+            spooled.copy_to(full_path)
+            self._mark_for_gc(fname)
+
+        attachment = self.create(vals)
+        self.env.cr.execute(
+            """
+            UPDATE ir_attachment
+               SET store_fname = %s, file_size = %s, checksum = %s, db_datas = NULL
+             WHERE id = %s
+            """,
+            (fname, spooled.size, spooled.checksum, attachment.id),
+        )
+        attachment.invalidate_recordset(["store_fname", "file_size", "checksum", "db_datas"])
+        return attachment
+
+    def generate_property_renditions(self):
+        """
+        Build and store the renditions of property images in self.
+        Called over XML-RPC by the media_events worker; idempotent, existing
+        renditions are replaced.
+        """
+        for source in self.sudo().exists():
+            if not source._is_property_image_source():
+                continue
+            try:
+                renditions = build_renditions(source.raw)
+            except Exception:
+                _logger.exception(
+                    "Could not build renditions for attachment %s", source.id
+                )
+                continue
+
+            source.rendition_ids.unlink()
+            stem = os.path.splitext(source.name or "image")[0]
+            self.sudo().create(
+                [
+                    {
+                        "name": f"{stem}-{rendition['size']}.{rendition['extension']}",
+                        "raw": rendition["content"],
+                        "mimetype": rendition["mimetype"],
+                        "res_model": source.res_model,
+                        "res_id": source.res_id,
+                        "description": RENDITION_DESCRIPTION,
+                        "company_id": source.company_id.id,
+                        "rendition_of_id": source.id,
+                        "rendition_size": rendition["size"],
+                        "rendition_width": rendition["width"],
+                    }
+                    for rendition in renditions
+                ]
+            )
+        return True
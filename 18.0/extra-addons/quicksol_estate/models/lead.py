@@ -1,8 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from psycopg2 import errors
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
+from odoo.osv import expression
+from odoo.tools import SQL
+
+from ..services import (
+    lead_assignment_service,
+    lead_dedup_service,
+    lead_filter_domain,
+    lead_filter_service,
+    lead_statistics_service,
+)
+from ..services.lead_dedup_service import normalize_email, normalize_phone
+
+_logger = logging.getLogger(__name__)
+
+CONFIG_PARAM_ASSIGNMENT_RESYNC = "quicksol_estate.lead_assignment_resync_seconds"
 
 
 class RealEstateLead(models.Model):
@@ -63,6 +83,14 @@ class RealEstateLead(models.Model):
         """
         )
 
+        # Aging queries (stale leads per state, days_in_state filters/sorts)
+        self._cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS real_estate_lead_company_state_changed_idx
+            ON real_estate_lead (company_id, state, state_changed_at)
+        """
+        )
+
         # Index for location searches
         self._cr.execute(
             """
@@ -71,6 +99,67 @@ class RealEstateLead(models.Model):
         """
         )
 
+        # Per-agent duplicate prevention (FR-005a): one open lead per agent and
+        # normalized phone/email, enforced by the database
+        for name, column in lead_dedup_service.UNIQUE_INDEXES.items():
+            self._create_dedup_index(name, column)
+
+        # Trigram indexes for the free-text ``search`` filter: ILIKE '%term%'
+        # cannot use B-tree indexes (FR-045)
+        if self._ensure_trigram_extension():
+            for column in ("name", "phone", "email", "phone_key"):
+                self._cr.execute(
+                    SQL(
+                        "CREATE INDEX IF NOT EXISTS %s ON real_estate_lead "
+                        "USING gin (%s gin_trgm_ops)",
+                        SQL.identifier(f"real_estate_lead_{column}_trgm_idx"),
+                        SQL.identifier(column),
+                    )
+                )
+
+    def _create_dedup_index(self, name, column):
+        """
+        Unique partial index on (agent_id, ``column``) over open leads. Rows
+        that already violate it are reported and the index is skipped until
+        they are cleaned up; the ORM pre-check still applies meanwhile.
+        """
+        try:
+            with self._cr.savepoint():
+                self._cr.execute(
+                    SQL(
+                        "CREATE UNIQUE INDEX IF NOT EXISTS %s ON real_estate_lead "
+                        "(agent_id, %s) WHERE %s IS NOT NULL AND active "
+                        "AND state NOT IN %s",
+                        SQL.identifier(name),
+                        SQL.identifier(column),
+                        SQL.identifier(column),
+                        lead_dedup_service.CLOSED_STATES,
+                    )
+                )
+        except errors.UniqueViolation:
+            _logger.warning(
+                "Index %s not created: open leads share the same agent and %s. "
+                "Merge or close the duplicates and update the module.",
+                name,
+                column,
+            )
+
+    def _ensure_trigram_extension(self):
+        """Create pg_trgm when allowed; False if it is unavailable."""
+        if self.env.registry.has_trigram:
+            return True
+        try:
+            with self._cr.savepoint():
+                self._cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception:
+            _logger.warning(
+                "pg_trgm is not available: lead search runs without trigram "
+                "indexes. Ask a database superuser to CREATE EXTENSION pg_trgm."
+            )
+            return False
+        self.env.registry.has_trigram = True
+        return True
+
     # ==================== CORE IDENTITY ====================
 
     name = fields.Char(
@@ -94,6 +183,7 @@ class RealEstateLead(models.Model):
             ("proposal", "Proposal"),
             ("website", "Website"),
             ("import", "Import"),
+            ("portal", "Portal"),
         ],
         string="Source",
         default="manual",
@@ -136,8 +226,22 @@ class RealEstateLead(models.Model):
 
     phone = fields.Char("Phone", size=20, tracking=True, help="Primary phone number")
 
+    phone_key = fields.Char(
+        "Phone (digits)",
+        compute="_compute_phone_key",
+        store=True,
+        help="Phone number with digits only, used by search and matching",
+    )
+
     email = fields.Char("Email", size=120, tracking=True, help="Email address")
 
+    email_key = fields.Char(
+        "Email (normalized)",
+        compute="_compute_email_key",
+        store=True,
+        help="Lowercased email, used for duplicate detection",
+    )
+
     # ==================== OWNERSHIP & MULTI-TENANCY ====================
 
     agent_id = fields.Many2one(
@@ -233,6 +337,25 @@ class RealEstateLead(models.Model):
         "Lost Reason", tracking=True, help="Reason why lead was lost"
     )
 
+    last_activity_at = fields.Datetime(
+        "Last Activity",
+        readonly=True,
+        copy=False,
+        index=True,
+        help="Date of the latest comment posted on the lead (FR-047). "
+        "Maintained on mail.message creation; empty when never commented.",
+    )
+
+    state_changed_at = fields.Datetime(
+        "State Changed At",
+        readonly=True,
+        copy=False,
+        index=True,
+        default=fields.Datetime.now,
+        help="When the lead entered its current state; days_in_state is "
+        "counted from it, so it can be filtered and sorted in SQL.",
+    )
+
     # ==================== CONVERSION ====================
 
     converted_property_id = fields.Many2one(
@@ -260,6 +383,7 @@ class RealEstateLead(models.Model):
     days_in_state = fields.Integer(
         "Days in Current State",
         compute="_compute_days_in_state",
+        search="_search_days_in_state",
         help="Days since last state change",
     )
 
@@ -289,53 +413,177 @@ class RealEstateLead(models.Model):
             else:
                 record.display_name = record.name
 
-    @api.depends("create_date", "write_date")
+    @api.depends("phone")
+    def _compute_phone_key(self):
+        for record in self:
+            record.phone_key = normalize_phone(record.phone)
+
+    @api.depends("email")
+    def _compute_email_key(self):
+        for record in self:
+            record.email_key = normalize_email(record.email)
+
+    @api.depends("state_changed_at", "create_date")
     def _compute_days_in_state(self):
         """Days in current state (for pipeline metrics)"""
+        now = fields.Datetime.now()
         for record in self:
-            if record.write_date:
-                delta = fields.Datetime.now() - record.write_date
-                record.days_in_state = delta.days
-            else:
-                delta = fields.Datetime.now() - record.create_date
-                record.days_in_state = delta.days
+            changed_at = record.state_changed_at or record.create_date
+            record.days_in_state = (now - changed_at).days if changed_at else 0
+
+    def _search_days_in_state(self, operator, value):
+        """
+        days_in_state as a state_changed_at range, relative to now, so day
+        filters (and saved filters) use the indexed column.
+        """
+        try:
+            if operator in ("in", "not in"):
+                domain = expression.OR(
+                    [self._days_in_state_domain("=", int(day)) for day in value]
+                )
+                return domain if operator == "in" else ["!"] + domain
+            if operator in ("=", "!=", "<", "<=", ">", ">="):
+                return self._days_in_state_domain(operator, int(value))
+        except (TypeError, ValueError):
+            raise UserError(_("Invalid number of days: %s") % (value,)) from None
+        raise UserError(_("Unsupported operator %s for days in state") % operator)
+
+    def _days_in_state_domain(self, operator, days):
+        """state_changed_at domain of ``days_in_state <operator> days``."""
+        now = fields.Datetime.now()
+        if operator == ">":
+            operator, days = ">=", days + 1
+        elif operator == "<":
+            operator, days = "<=", days - 1
+        # days >= N: entered the state at least N days ago
+        older = [("state_changed_at", "<=", now - timedelta(days=days))]
+        # days <= N: entered the state less than N + 1 days ago
+        newer = [("state_changed_at", ">", now - timedelta(days=days + 1))]
+        if operator == ">=":
+            return older
+        if operator == "<=":
+            return newer
+        if operator == "=":
+            return older + newer
+        return ["!", "&"] + older + newer
+
+    def _order_field_to_sql(self, alias, field_name, direction, nulls, query):
+        # days_in_state sorts on state_changed_at, the other way round
+        if field_name == "days_in_state":
+            direction = (
+                SQL("ASC") if direction.code.strip().upper() == "DESC" else SQL("DESC")
+            )
+            return SQL(
+                "%s %s %s",
+                self._field_to_sql(alias, "state_changed_at", query),
+                direction,
+                nulls,
+            )
+        return super()._order_field_to_sql(alias, field_name, direction, nulls, query)
 
     # ==================== VALIDATION CONSTRAINTS ====================
 
-    @api.constrains("agent_id", "phone", "email")
-    def _check_duplicate_per_agent(self):
-        """Per-Agent Duplicate Prevention (FR-005a)"""
-        for record in self:
-            if not record.agent_id:
+    @api.model
+    def _find_duplicate_conflicts(self, candidates, exclude_ids=()):
+        """
+        Per-agent duplicates (FR-005a) of ``candidates`` (built with
+        lead_dedup_service.make_candidate): one lookup on the unique
+        (agent_id, key) indexes for the whole batch, plus duplicates inside
+        the batch itself. Returns lead_dedup_service conflict tuples.
+        """
+        if not candidates:
+            return []
+        conflicts = lead_dedup_service.find_batch_conflicts(candidates)
+
+        self.flush_model(["agent_id", "phone_key", "email_key", "state", "active"])
+        queries = []
+        for key_field, _raw_field in lead_dedup_service.KEY_FIELDS:
+            agent_ids, keys = lead_dedup_service.key_pairs(candidates, key_field)
+            if not keys:
                 continue
+            queries.append(
+                SQL(
+                    "SELECT %s, lead.agent_id, lead.%s FROM real_estate_lead lead"
+                    " JOIN unnest(%s::int[], %s::varchar[]) AS c(agent_id, key)"
+                    " ON lead.agent_id = c.agent_id AND lead.%s = c.key"
+                    " WHERE lead.active AND lead.state NOT IN %s"
+                    " AND lead.id != ALL(%s::int[])",
+                    key_field,
+                    SQL.identifier(key_field),
+                    agent_ids,
+                    keys,
+                    SQL.identifier(key_field),
+                    lead_dedup_service.CLOSED_STATES,
+                    list(exclude_ids),
+                )
+            )
+        existing = self.env.execute_query(SQL(" UNION ALL ").join(queries))
+        return conflicts + lead_dedup_service.find_existing_conflicts(
+            candidates, existing
+        )
 
-            # Check phone duplicate
-            if record.phone:
-                domain = [
-                    ("agent_id", "=", record.agent_id.id),
-                    ("phone", "=ilike", record.phone.strip()),
-                    ("state", "not in", ["lost", "won"]),
-                    ("id", "!=", record.id),
-                ]
-                if self.search_count(domain) > 0:
-                    raise ValidationError(
-                        f"You already have an active lead with phone {record.phone}. "
-                        f"Please edit the existing lead or add a new activity."
-                    )
+    @api.model
+    def _check_duplicate_per_agent(self, candidates, exclude_ids=()):
+        """
+        Per-Agent Duplicate Prevention (FR-005a), batched: a single error
+        lists every conflict so a bulk import can be fixed in one pass.
+        """
+        conflicts = self._find_duplicate_conflicts(candidates, exclude_ids)
+        if conflicts:
+            raise ValidationError(lead_dedup_service.duplicate_message(conflicts))
 
-            # Check email duplicate
-            if record.email:
-                domain = [
-                    ("agent_id", "=", record.agent_id.id),
-                    ("email", "=ilike", record.email.strip().lower()),
-                    ("state", "not in", ["lost", "won"]),
-                    ("id", "!=", record.id),
-                ]
-                if self.search_count(domain) > 0:
-                    raise ValidationError(
-                        f"You already have an active lead with email {record.email}. "
-                        f"Please edit the existing lead or add a new activity."
+    @api.model
+    def _dedup_candidates_from_vals(self, vals_list):
+        """Pre-check candidates for create() values, defaults applied."""
+        candidates = []
+        default_agent_id = None
+        for position, vals in enumerate(vals_list, start=1):
+            if not lead_dedup_service.is_open(
+                vals.get("state", "new"), vals.get("active", True)
+            ):
+                continue
+            agent_id = vals.get("agent_id")
+            if not agent_id:
+                if default_agent_id is None:
+                    default_agent_id = (
+                        self.default_get(["agent_id"]).get("agent_id") or False
                     )
+                agent_id = default_agent_id
+            candidate = lead_dedup_service.make_candidate(
+                f"row {position}", agent_id, vals.get("phone"), vals.get("email")
+            )
+            if candidate:
+                candidates.append(candidate)
+        return candidates
+
+    def _dedup_candidates_for_write(self, vals):
+        """Pre-check candidates for the leads in ``self`` once ``vals`` apply."""
+        candidates = []
+        for record in self:
+            if not lead_dedup_service.is_open(
+                vals.get("state", record.state), vals.get("active", record.active)
+            ):
+                continue
+            candidate = lead_dedup_service.make_candidate(
+                f"lead {record.id}",
+                vals.get("agent_id", record.agent_id.id),
+                vals["phone"] if "phone" in vals else record.phone,
+                vals["email"] if "email" in vals else record.email,
+            )
+            if candidate:
+                candidates.append(candidate)
+        return candidates
+
+    def _raise_duplicate_violation(self, exc):
+        """Report a unique-index race (concurrent intake) as FR-005a."""
+        key_field = lead_dedup_service.index_field(exc.diag.constraint_name)
+        if not key_field:
+            raise exc
+        field = "phone" if key_field == "phone_key" else "email"
+        raise ValidationError(
+            f"You already have an active lead with this {field}. "
+            f"Please edit the existing lead or add a new activity."
+        ) from exc
 
     @api.constrains("budget_min", "budget_max")
     def _check_budget_range(self):
@@ -366,35 +614,409 @@ class RealEstateLead(models.Model):
 
     # ==================== CUSTOM METHODS ====================
 
+    @api.model
+    def _bump_last_activity(self, dates_by_lead):
+        """
+        Move last_activity_at forward for {lead_id: datetime} in one UPDATE.
+        Plain SQL on purpose: a comment must not touch write_date or run the
+        write() side effects (state logging, tracking). Cached saved-filter
+        counts are left alone, so every chatter message does not flush them:
+        ``last_activity_before`` counts catch up within the cache TTL.
+        """
+        if not dates_by_lead:
+            return
+        lead_ids = list(dates_by_lead)
+        self.env.cr.execute(
+            """
+            UPDATE real_estate_lead lead
+               SET last_activity_at = GREATEST(lead.last_activity_at, activity.date)
+              FROM unnest(%s::int[], %s::timestamp[]) AS activity(id, date)
+             WHERE lead.id = activity.id
+            """,
+            (lead_ids, [dates_by_lead[lead_id] for lead_id in lead_ids]),
+        )
+        self.browse(lead_ids).invalidate_recordset(["last_activity_at"])
+
+    @api.model
+    def _search_ranked(self, domain, term, limit=None, offset=0):
+        """
+        Search ``domain`` ordered by trigram similarity of name, email and
+        phone to ``term`` (best first). Without pg_trgm the regular order
+        applies.
+        """
+        if not self.env.registry.has_trigram:
+            return self.search(domain, limit=limit, offset=offset)
+
+        query = self._search(domain, offset=offset, limit=limit)
+        digits = normalize_phone(term) or ""
+        query.order = SQL(
+            "GREATEST(similarity(%s, %s), similarity(%s, %s), similarity(%s, %s)) DESC,"
+            " %s DESC",
+            self._field_to_sql(self._table, "name", query),
+            term,
+            self._field_to_sql(self._table, "email", query),
+            term,
+            self._field_to_sql(self._table, "phone_key", query),
+            digits,
+            SQL.identifier(self._table, "id"),
+        )
+        return self.browse(id_ for id_, in self.env.execute_query(query.select()))
+
+    def _get_recent_activities(self, limit=5):
+        """
+        Latest ``limit`` chatter comments of every lead in ``self`` with one
+        window-function query: ``{lead_id: [{id, body, author_name, date}]}``,
+        newest first. Author names are read in one batch.
+        """
+        if not self:
+            return {}
+        self.env["mail.message"].flush_model(
+            ["model", "res_id", "message_type", "body", "author_id", "date"]
+        )
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT id, res_id, body, author_id, date
+                  FROM (
+                        SELECT id, res_id, body, author_id, date,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY res_id ORDER BY date DESC, id DESC
+                               ) AS position
+                          FROM mail_message
+                         WHERE model = %s
+                           AND res_id = ANY(%s)
+                           AND message_type = 'comment'
+                       ) ranked
+                 WHERE position <= %s
+                 ORDER BY res_id, position
+                """,
+                self._name,
+                self.ids,
+                limit,
+            )
+        )
+        authors = self.env["res.partner"].sudo().browse(
+            list({row[3] for row in rows if row[3]})
+        )
+        author_names = {author.id: author.name for author in authors}
+
+        activities = {lead_id: [] for lead_id in self.ids}
+        for message_id, lead_id, body, author_id, date in rows:
+            activities[lead_id].append(
+                {
+                    "id": message_id,
+                    "body": body or "",
+                    "author_name": author_names.get(author_id),
+                    "date": date,
+                }
+            )
+        return activities
+
+    def _invalidate_on_commit(self, key, invalidate, company_ids=()):
+        """
+        Call ``invalidate(companies)`` with the companies of the leads once
+        the transaction commits (a rollback keeps the cache valid). Companies
+        are collected per transaction and ``key`` so bulk writes invalidate
+        once.
+        """
+        data = self.env.cr.postcommit.data
+        if key not in data:
+            companies = data[key] = set()
+            self.env.cr.postcommit.add(lambda: invalidate(companies))
+        companies = data[key]
+        companies.update(self.sudo().company_id.ids)
+        companies.update(cid for cid in company_ids if cid)
+
+    def _invalidate_lead_statistics(self, company_ids=()):
+        """Drop cached /leads/statistics results of the leads' companies."""
+        self._invalidate_on_commit(
+            "quicksol_estate.lead_statistics_companies",
+            lead_statistics_service.invalidate_companies,
+            company_ids,
+        )
+
+    def _invalidate_lead_filter_counts(self, company_ids=()):
+        """Drop cached saved-filter counts of the leads' companies (FR-048)."""
+        self._invalidate_on_commit(
+            "quicksol_estate.lead_filter_companies",
+            lead_filter_service.invalidate_companies,
+            company_ids,
+        )
+
+    # ==================== AUTOMATIC ASSIGNMENT (FR-002b) ====================
+
+    @api.model
+    def _load_assignment_index(self, company_id):
+        """AgentLoadIndex of a company: its assignable agents and open leads."""
+        agents = (
+            self.env["real.estate.agent"]
+            .sudo()
+            .search([("company_id", "=", company_id), ("receives_leads", "=", True)])
+        )
+        self.flush_model(["agent_id", "company_id", "state", "active"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT agent_id, COUNT(*)
+                  FROM real_estate_lead
+                 WHERE company_id = %s
+                   AND agent_id = ANY(%s)
+                   AND active
+                   AND state NOT IN %s
+                 GROUP BY agent_id
+                """,
+                company_id,
+                agents.ids,
+                lead_assignment_service.CLOSED_STATES,
+            )
+        )
+        loads = dict.fromkeys(agents.ids, 0)
+        loads.update(rows)
+        profiles = {
+            agent.id: lead_assignment_service.AgentProfile(
+                agent.lead_property_type_ids.ids,
+                lead_assignment_service.parse_regions(agent.lead_regions),
+            )
+            for agent in agents
+        }
+        return lead_assignment_service.AgentLoadIndex(loads, profiles)
+
+    @api.model
+    def _assignment_index(self, company_id):
+        ttl = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(
+                CONFIG_PARAM_ASSIGNMENT_RESYNC,
+                lead_assignment_service.DEFAULT_RESYNC_SECONDS,
+            )
+        )
+        return lead_assignment_service.registry.get(
+            (self.env.cr.dbname, company_id),
+            lambda: self._load_assignment_index(company_id),
+            ttl,
+        )
+
+    @api.model
+    def _assign_agents(self, vals_list, reassign_deleted=True):
+        """
+        Set ``agent_id`` in the create values that have none, following the
+        strategy of each lead's company; companies on manual assignment, or
+        without an assignable agent, are left untouched. Values are
+        assigned in order, so a batch spreads over the agents.
+        """
+        todo = [vals for vals in vals_list if not vals.get("agent_id")]
+        if not todo:
+            return
+        default_company_id = None
+        strategies = {}
+        picks = []
+        assigned = []
+        for vals in todo:
+            company_id = vals.get("company_id")
+            if not company_id:
+                if default_company_id is None:
+                    default_company_id = self._default_company_id() or False
+                company_id = default_company_id
+            if company_id not in strategies:
+                strategies[company_id] = (
+                    self.env["res.company"]
+                    .sudo()
+                    .browse(company_id)
+                    .lead_assignment_strategy
+                    if company_id
+                    else False
+                )
+            strategy = strategies[company_id]
+            if strategy not in lead_assignment_service.AUTO_STRATEGIES:
+                continue
+            index = self._assignment_index(company_id)
+            agent_id = index.pick(
+                strategy,
+                vals.get("property_type_interest"),
+                vals.get("location_preference"),
+            )
+            if agent_id:
+                vals["agent_id"] = agent_id
+                picks.append((index, agent_id))
+                assigned.append((vals, company_id))
+        self._hold_assignment_picks(picks)
+        if reassign_deleted:
+            self._reassign_deleted_agents(assigned)
+
+    @api.model
+    def _reassign_deleted_agents(self, assigned):
+        """
+        An agent deleted by another worker stays in this worker's indexes
+        until they resync: leads picked for one are assigned again from
+        reloaded indexes instead of failing on the agent foreign key.
+        ``assigned`` lists the ``(vals, company_id)`` set by _assign_agents.
+        """
+        agent_ids = {vals["agent_id"] for vals, _company_id in assigned}
+        if not agent_ids:
+            return
+        existing = self.env["real.estate.agent"].sudo().browse(agent_ids).exists()
+        stale = [
+            (vals, company_id)
+            for vals, company_id in assigned
+            if vals["agent_id"] not in existing.ids
+        ]
+        if not stale:
+            return
+        lead_assignment_service.registry.drop(
+            self.env.cr.dbname, {company_id for _vals, company_id in stale}
+        )
+        for vals, _company_id in stale:
+            del vals["agent_id"]
+        self._assign_agents([vals for vals, _company_id in stale], False)
+
+    def _hold_assignment_picks(self, picks):
+        """
+        Keep picked agents counted until the transaction ends: the created
+        leads' own deltas replace the provisional counts on commit, and a
+        rollback simply releases them.
+        """
+        if not picks:
+            return
+        data = self.env.cr.postcommit.data
+        key = "quicksol_estate.lead_assignment_picks"
+        if key not in data:
+            held = data[key] = []
+
+            def release():
+                for index, agent_id in held:
+                    index.release(agent_id)
+                held.clear()
+
+            self.env.cr.postcommit.add(release)
+            self.env.cr.postrollback.add(release)
+        data[key].extend(picks)
+
+    def _track_open_lead_load(self, vals=None):
+        """
+        Move the agents' open-lead counters by the leads in ``self`` (created,
+        or about to be written with ``vals``) once the transaction commits.
+        """
+        deltas = Counter()
+        for lead in self:
+            old = lead_assignment_service.open_lead_key(
+                lead.company_id.id, lead.agent_id.id, lead.state, lead.active
+            )
+            if vals is None:
+                new, old = old, None
+            else:
+                new = lead_assignment_service.open_lead_key(
+                    vals.get("company_id", lead.company_id.id),
+                    vals.get("agent_id", lead.agent_id.id),
+                    vals.get("state", lead.state),
+                    vals.get("active", lead.active),
+                )
+            if old == new:
+                continue
+            if old:
+                deltas[old] -= 1
+            if new:
+                deltas[new] += 1
+        if not deltas:
+            return
+        data = self.env.cr.postcommit.data
+        key = "quicksol_estate.lead_assignment_deltas"
+        if key not in data:
+            pending = data[key] = Counter()
+            dbname = self.env.cr.dbname
+            self.env.cr.postcommit.add(
+                lambda: lead_assignment_service.registry.apply_deltas(dbname, pending)
+            )
+        data[key].update(deltas)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Leads without an agent, created by someone who is not one, go
+        # through the company's assignment strategy (FR-002b)
+        if any(not vals.get("agent_id") for vals in vals_list) and not (
+            self._default_agent_id()
+        ):
+            self._assign_agents(vals_list)
+        self._check_duplicate_per_agent(self._dedup_candidates_from_vals(vals_list))
+        try:
+            with self.env.cr.savepoint():
+                # the savepoint flushes on exit, so index violations surface here
+                leads = super().create(vals_list)
+        except errors.UniqueViolation as exc:
+            self._raise_duplicate_violation(exc)
+        leads._invalidate_lead_statistics()
+        leads._invalidate_lead_filter_counts()
+        leads._track_open_lead_load()
+        return leads
+
     def unlink(self):
         """Prevent hard delete - archive instead (FR-018b)"""
         self.write({"active": False})
         return True
 
+    def _write_checked(self, vals):
+        """
+        super().write() of ``self``; like create(), a race past the duplicate
+        pre-check hits the unique indexes and is reported as FR-005a.
+        """
+        if not lead_dedup_service.DEDUP_FIELDS.intersection(vals):
+            return super().write(vals)
+        try:
+            with self.env.cr.savepoint():
+                # the savepoint flushes on exit, so index violations surface here
+                return super().write(vals)
+        except errors.UniqueViolation as exc:
+            self._raise_duplicate_violation(exc)
+
     def write(self, vals):
         """Override write to log state changes (FR-015)"""
+        if lead_dedup_service.DEDUP_FIELDS.intersection(vals):
+            self._check_duplicate_per_agent(
+                self._dedup_candidates_for_write(vals), exclude_ids=self.ids
+            )
+        if lead_statistics_service.STATISTICS_FIELDS.intersection(vals):
+            self._invalidate_lead_statistics(company_ids=[vals.get("company_id")])
+        if lead_filter_domain.FILTER_FIELDS.intersection(vals):
+            self._invalidate_lead_filter_counts(company_ids=[vals.get("company_id")])
+        if lead_assignment_service.LOAD_FIELDS.intersection(vals):
+            self._track_open_lead_load(vals)
         if "state" in vals:
-            for record in self:
-                old_state = record.state
-                new_state = vals["state"]
-
-                # Auto-set lost_date
-                if new_state == "lost" and "lost_date" not in vals:
-                    vals["lost_date"] = fields.Date.today()
-
-                # Log state change in chatter
-                res = super(RealEstateLead, record).write(vals)
-                if old_state != new_state:
-                    try:
-                        record.message_post(
-                            body=f"State changed from {old_state} to {new_state}",
-                            subtype_xmlid="mail.mt_note",
-                        )
-                    except Exception:
-                        pass
-                return res
-
-        return super().write(vals)
+            return self._write_state_change(vals)
+        return self._write_checked(vals)
+
+    def _write_state_change(self, vals):
+        """
+        write() of ``vals`` changing the state: only leads actually changing
+        state restart days_in_state and get the change logged in chatter.
+        """
+        new_state = vals["state"]
+
+        # Auto-set lost_date
+        if new_state == "lost" and "lost_date" not in vals:
+            vals["lost_date"] = fields.Date.today()
+
+        changed = self.filtered(lambda lead: lead.state != new_state)
+        old_states = {record.id: record.state for record in changed}
+        res = True
+        if self - changed:
+            res = (self - changed)._write_checked(vals)
+        if changed:
+            # days_in_state restarts on an actual state change only
+            changed_vals = dict(vals)
+            changed_vals.setdefault("state_changed_at", fields.Datetime.now())
+            res = changed._write_checked(changed_vals)
+
+        # Log state change in chatter
+        for record in changed:
+            old_state = old_states[record.id]
+            try:
+                record.message_post(
+                    body=f"State changed from {old_state} to {new_state}",
+                    subtype_xmlid="mail.mt_note",
+                )
+            except Exception:
+                pass
+        return res
 
     def action_reopen(self):
         """Reopen lost lead (FR-018a)"""
@@ -4,6 +4,8 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 import json
 
+from ..services import lead_filter_service
+
 
 class RealEstateLeadFilter(models.Model):
     _name = "real.estate.lead.filter"
@@ -43,14 +45,44 @@ class RealEstateLeadFilter(models.Model):
         help="Company this filter belongs to",
     )
 
+    compiled_domain = fields.Text(
+        "Compiled Domain",
+        compute="_compute_compiled_domain",
+        store=True,
+        help="JSON search domain built once from the filter criteria",
+    )
+
+    domain_hash = fields.Char(
+        "Domain Hash",
+        compute="_compute_compiled_domain",
+        store=True,
+        index=True,
+        help="SHA-1 of the compiled domain; equal criteria share a hash",
+    )
+
+    @api.depends("filter_domain")
+    def _compute_compiled_domain(self):
+        for record in self:
+            try:
+                params = json.loads(record.filter_domain or "")
+                domain_json, domain_hash = lead_filter_service.compile_filter(params)
+            except (ValueError, TypeError, AttributeError):
+                domain_json = domain_hash = False
+            record.compiled_domain = domain_json
+            record.domain_hash = domain_hash
+
     @api.constrains("filter_domain")
     def _check_filter_domain(self):
         """Validate that filter_domain is valid JSON"""
         for record in self:
             try:
-                json.loads(record.filter_domain)
+                params = json.loads(record.filter_domain)
             except (ValueError, TypeError):
                 raise ValidationError(_("Filter criteria must be valid JSON"))
+            try:
+                lead_filter_service.compile_filter(params)
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValidationError(_("Invalid filter criteria: %s", e))
 
     @api.constrains("name", "user_id")
     def _check_unique_name_per_user(self):
@@ -77,36 +109,16 @@ class RealEstateLeadFilter(models.Model):
         except (ValueError, TypeError):
             return {}
 
+    def get_domain(self):
+        """Compiled lead search domain of this filter (FR-048)"""
+        self.ensure_one()
+        if not self.compiled_domain:
+            return []
+        return lead_filter_service.load_domain(self.compiled_domain)
+
     def apply_filter(self):
         """Apply this filter to lead search"""
         self.ensure_one()
-        params = self.get_filter_params()
-
-        # Build domain from params
-        domain = []
-
-        if params.get("state"):
-            domain.append(("state", "=", params["state"]))
-
-        if params.get("agent_id"):
-            domain.append(("agent_id", "=", int(params["agent_id"])))
-
-        if params.get("budget_min"):
-            domain.append(("budget_max", ">=", float(params["budget_min"])))
-
-        if params.get("budget_max"):
-            domain.append(("budget_min", "<=", float(params["budget_max"])))
-
-        if params.get("bedrooms"):
-            domain.append(("bedrooms_needed", "=", int(params["bedrooms"])))
-
-        if params.get("property_type_id"):
-            domain.append(
-                ("property_type_interest", "=", int(params["property_type_id"]))
-            )
-
-        if params.get("location"):
-            domain.append(("location_preference", "ilike", params["location"]))
 
         # Return action with domain
         return {
@@ -114,6 +126,6 @@ class RealEstateLeadFilter(models.Model):
             "name": self.name,
             "res_model": "real.estate.lead",
             "view_mode": "kanban,list,form",
-            "domain": domain,
+            "domain": self.get_domain(),
             "context": {"search_default_active": 1},
         }
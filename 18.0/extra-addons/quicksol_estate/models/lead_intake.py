@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+from ..services import lead_dedup_service, lead_intake_service
+
+_logger = logging.getLogger(__name__)
+
+INTAKE_TASK = "lead.ingest_batch"
+INTAKE_QUEUE = "lead_events"
+INTAKE_BATCH_SIZE = 200
+# Pending rows older than this were never picked up (broker down): the cron
+# processes them
+STALE_PENDING_MINUTES = 5
+CONFIG_PARAM_RETENTION_DAYS = "quicksol_estate.lead_intake_retention_days"
+DEFAULT_RETENTION_DAYS = 90
+
+
+class RealEstateLeadPortal(models.Model):
+    """
+    A portal integration: which OAuth client may push leads for which
+    company, and the agent that receives them.
+    """
+
+    _name = "real.estate.lead.portal"
+    _description = "Lead Portal Integration"
+    _order = "name"
+
+    _sql_constraints = [
+        (
+            "unique_portal_code_per_application",
+            "UNIQUE(application_id, code)",
+            "Portal code must be unique per OAuth application.",
+        ),
+    ]
+
+    name = fields.Char("Name", size=80, required=True)
+    code = fields.Char(
+        "Code",
+        size=30,
+        required=True,
+        help='Value of "portal" in POST /api/v1/leads/ingest, e.g. "zap", "olx"',
+    )
+    application_id = fields.Many2one(
+        "thedevkitchen.oauth.application",
+        string="OAuth Application",
+        required=True,
+        ondelete="cascade",
+        index=True,
+        help="Client whose access token the portal webhook uses",
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        "Company",
+        required=True,
+        default=lambda self: self.env.company,
+        index=True,
+    )
+    agent_id = fields.Many2one(
+        "real.estate.agent",
+        string="Receiving Agent",
+        ondelete="restrict",
+        help="Agent of the leads received from this portal when the company "
+        "assigns leads manually or has no agent available (FR-002b)",
+    )
+    active = fields.Boolean(default=True)
+
+    @api.constrains("agent_id", "company_id")
+    def _check_agent_company(self):
+        for portal in self:
+            if portal.agent_id and portal.agent_id.company_id != portal.company_id:
+                raise ValidationError(_("Agent must belong to the portal's company."))
+
+
+class RealEstateLeadIntake(models.Model):
+    """
+    Durable queue of portal leads. Rows are appended by the ingest endpoint
+    and turned into real.estate.lead by the lead_events worker; the unique
+    (portal, external id) pair makes webhook redeliveries idempotent.
+    """
+
+    _name = "real.estate.lead.intake"
+    _description = "Portal Lead Intake"
+    _order = "id"
+    _rec_name = "external_id"
+
+    _sql_constraints = [
+        (
+            "unique_external_id_per_portal",
+            "UNIQUE(portal_id, external_id)",
+            "This portal lead was already received.",
+        ),
+    ]
+
+    portal_id = fields.Many2one(
+        "real.estate.lead.portal",
+        string="Portal",
+        required=True,
+        ondelete="cascade",
+    )
+    external_id = fields.Char("Portal Lead ID", required=True)
+    payload = fields.Text(required=True, help="JSON-encoded, validated lead values")
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("rejected", "Rejected"),
+        ],
+        default="pending",
+        required=True,
+    )
+    lead_id = fields.Many2one("real.estate.lead", ondelete="set null")
+    error_message = fields.Text()
+    processed_at = fields.Datetime()
+
+    def init(self):
+        super().init()
+        # The worker and the cron only ever look for pending rows
+        self._cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS real_estate_lead_intake_pending_idx
+            ON real_estate_lead_intake (id) WHERE state = 'pending'
+            """
+        )
+
+    # ------------------------------------------------------------------ #
+    #  Intake (HTTP request)                                              #
+    # ------------------------------------------------------------------ #
+
+    @api.model
+    def _append(self, portal, accepted):
+        """
+        Insert ``accepted`` ``(external_id, values)`` pairs for ``portal`` in
+        one statement. Ids already received are skipped by the unique index,
+        so concurrent redeliveries are safe. Returns ``(intakes, duplicates)``
+        with the external ids that were already queued.
+        """
+        if not accepted:
+            return self.browse(), []
+        rows = self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO real_estate_lead_intake
+                       (portal_id, external_id, payload, state,
+                        create_uid, create_date, write_uid, write_date)
+                SELECT %s, item.external_id, item.payload, 'pending',
+                       %s, now() AT TIME ZONE 'UTC', %s, now() AT TIME ZONE 'UTC'
+                  FROM unnest(%s::varchar[], %s::text[])
+                       WITH ORDINALITY AS item(external_id, payload, position)
+                 ORDER BY item.position
+                    ON CONFLICT (portal_id, external_id) DO NOTHING
+             RETURNING id, external_id
+                """,
+                portal.id,
+                self.env.uid,
+                self.env.uid,
+                [external_id for external_id, _values in accepted],
+                [json.dumps(values) for _external_id, values in accepted],
+            )
+        )
+        inserted = {external_id for _id, external_id in rows}
+        duplicates = [
+            external_id
+            for external_id, _values in accepted
+            if external_id not in inserted
+        ]
+        return self.browse(sorted(id_ for id_, _external_id in rows)), duplicates
+
+    def _enqueue(self):
+        """Dispatch the rows once the request transaction is committed (ADR-021)."""
+        intake_ids = self.ids
+
+        def _dispatch():
+            try:
+                from odoo.addons.quicksol_estate.services.celery_client import (
+                    send_task,
+                )
+
+                for start in range(0, len(intake_ids), INTAKE_BATCH_SIZE):
+                    send_task(
+                        INTAKE_TASK,
+                        kwargs={
+                            "intake_ids": intake_ids[start : start + INTAKE_BATCH_SIZE]
+                        },
+                        queue=INTAKE_QUEUE,
+                    )
+            except Exception:
+                _logger.exception(
+                    "Failed to enqueue %d portal lead(s) — the intake cron "
+                    "will process them.",
+                    len(intake_ids),
+                )
+
+        self.env.cr.postcommit.add(_dispatch)
+
+    # ------------------------------------------------------------------ #
+    #  Processing (XML-RPC, lead_events queue)                            #
+    # ------------------------------------------------------------------ #
+
+    def process_intake(self):
+        """
+        Create the leads of the pending rows in ``self``: one duplicate
+        pre-check and one create() per portal. Rows whose lead cannot be
+        created are rejected with the reason. Safe to retry — rows already
+        processed are skipped. Returns the number of leads created.
+        """
+        self.check_access("write")
+        if not self:
+            return 0
+        # Rows locked by a concurrent run (worker retry, cron) are left to it
+        locked = self.env.execute_query(
+            SQL(
+                "SELECT id FROM real_estate_lead_intake"
+                " WHERE id IN %s AND state = 'pending'"
+                " ORDER BY id FOR UPDATE SKIP LOCKED",
+                tuple(self.ids),
+            )
+        )
+        intakes = self.sudo().browse(id_ for id_, in locked)
+        created = 0
+        for portal in intakes.portal_id:
+            created += intakes.filtered(
+                lambda intake: intake.portal_id == portal
+            )._process_portal_intake(portal)
+        return created
+
+    def _process_portal_intake(self, portal):
+        Lead = (
+            self.env["real.estate.lead"]
+            .sudo()
+            .with_context(mail_create_nolog=True, mail_create_nosubscribe=True)
+        )
+        now = fields.Datetime.now()
+
+        payloads = {intake.id: json.loads(intake.payload) for intake in self}
+        vals_by_intake = {
+            intake_id: lead_intake_service.lead_values(
+                payload, None, portal.company_id.id
+            )
+            for intake_id, payload in payloads.items()
+        }
+        # The company's assignment strategy spreads the batch over its
+        # agents; the portal's agent takes what it leaves unassigned
+        Lead._assign_agents(list(vals_by_intake.values()))
+        candidates = []
+        for intake in self:
+            vals = vals_by_intake[intake.id]
+            vals.setdefault("agent_id", portal.agent_id.id)
+            if not vals["agent_id"]:
+                intake.write(
+                    {
+                        "state": "rejected",
+                        "error_message": "No agent available to receive the lead",
+                        "processed_at": now,
+                    }
+                )
+                continue
+            candidate = lead_dedup_service.make_candidate(
+                intake.id, vals["agent_id"], vals.get("phone"), vals.get("email")
+            )
+            if candidate:
+                candidates.append(candidate)
+
+        conflicts = Lead._find_duplicate_conflicts(candidates)
+        for intake_id, field, value, in_batch in conflicts:
+            agent = self.env["real.estate.agent"].browse(
+                vals_by_intake[intake_id]["agent_id"]
+            )
+            self.browse(intake_id).write(
+                {
+                    "state": "rejected",
+                    "error_message": (
+                        f"Duplicate {field} {value}"
+                        + (" in the same batch" if in_batch else "")
+                        + f" for agent {agent.display_name}"
+                    ),
+                    "processed_at": now,
+                }
+            )
+        todo = self.filtered(lambda intake: intake.state == "pending")
+        if not todo:
+            return 0
+
+        try:
+            with self.env.cr.savepoint():
+                leads = Lead.create([vals_by_intake[intake.id] for intake in todo])
+        except Exception:
+            _logger.info(
+                "Batch create of %d portal lead(s) failed; retrying one by one",
+                len(todo),
+                exc_info=True,
+            )
+            created = todo._process_one_by_one(Lead, vals_by_intake, now)
+        else:
+            for intake, lead in zip(todo, leads):
+                intake.write(
+                    {"state": "done", "lead_id": lead.id, "processed_at": now}
+                )
+            created = len(leads)
+        todo.filtered("lead_id")._post_portal_messages(portal, payloads)
+        return created
+
+    def _post_portal_messages(self, portal, payloads):
+        """Post the portal ``message`` of each intake on its new lead."""
+        for intake in self:
+            message = lead_intake_service.lead_message(payloads[intake.id])
+            if message:
+                intake.lead_id.message_post(
+                    body=_(
+                        "Message from %(portal)s: %(message)s",
+                        portal=portal.name,
+                        message=message,
+                    ),
+                    message_type="comment",
+                    subtype_xmlid="mail.mt_note",
+                )
+
+    def _process_one_by_one(self, Lead, vals_by_intake, now):
+        created = 0
+        for intake in self:
+            try:
+                with self.env.cr.savepoint():
+                    lead = Lead.create(vals_by_intake[intake.id])
+            except Exception as exc:
+                intake.write(
+                    {
+                        "state": "rejected",
+                        "error_message": str(exc),
+                        "processed_at": now,
+                    }
+                )
+                continue
+            intake.write({"state": "done", "lead_id": lead.id, "processed_at": now})
+            created += 1
+        return created
+
+    @api.model
+    def _cron_process_pending_intake(self):
+        """
+        Process rows whose Celery task never ran (broker unavailable at
+        commit time) and drop processed rows past the retention period.
+        """
+        stale = fields.Datetime.now() - timedelta(minutes=STALE_PENDING_MINUTES)
+        pending = self.sudo().search(
+            [("state", "=", "pending"), ("create_date", "<", stale)],
+            limit=INTAKE_BATCH_SIZE * 10,
+        )
+        if pending:
+            _logger.info("Processing %d stale portal lead intake(s)", len(pending))
+            pending.process_intake()
+
+        days = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(CONFIG_PARAM_RETENTION_DAYS, DEFAULT_RETENTION_DAYS)
+        )
+        expired = self.sudo().search(
+            [
+                ("state", "!=", "pending"),
+                ("processed_at", "<", fields.Datetime.now() - timedelta(days=days)),
+            ]
+        )
+        if expired:
+            _logger.info("Removing %d processed portal lead intake(s)", len(expired))
+            expired.unlink()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class MailMessage(models.Model):
+    """Keeps real.estate.lead.last_activity_at in sync with posted comments."""
+
+    _inherit = "mail.message"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        messages = super().create(vals_list)
+        latest_by_lead = {}
+        for message in messages:
+            if (
+                message.model == "real.estate.lead"
+                and message.res_id
+                and message.message_type == "comment"
+                and message.date
+            ):
+                current = latest_by_lead.get(message.res_id)
+                if not current or message.date > current:
+                    latest_by_lead[message.res_id] = message.date
+        if latest_by_lead:
+            self.env["real.estate.lead"]._bump_last_activity(latest_by_lead)
+        return messages
@@ -103,21 +103,9 @@ class CommissionSplitObserver(models.AbstractModel):
             )
             return
 
-        # Find applicable commission rule for agent
-        CommissionRule = env["real.estate.commission.rule"]
-        commission_rule = CommissionRule.search(
-            [
-                ("agent_id", "=", property_obj.agent_id.id),
-                ("transaction_type", "in", ["sale", "both"]),
-                ("valid_from", "<=", sale.sale_date),
-                "|",
-                ("valid_until", "=", False),
-                ("valid_until", ">=", sale.sale_date),
-                ("min_value", "<=", sale.sale_price),
-                ("max_value", ">=", sale.sale_price),
-            ],
-            limit=1,
-            order="valid_from desc",
+        # Find applicable commission rule for agent (in-memory rule index)
+        commission_rule = env["real.estate.commission.rule"]._resolve_rule(
+            property_obj.agent_id, "sale", sale.sale_date, sale.sale_price
         )
 
         if not commission_rule:
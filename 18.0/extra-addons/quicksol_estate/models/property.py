@@ -474,20 +474,46 @@ class Property(models.Model):
             prop.active_proposal_id = first_active_by_property.get(prop.id, False)
 
     def write(self, vals):
-        """When a property is archived, cancel all non-terminal proposals (FR-047)."""
+        """When properties are archived, cancel all non-terminal proposals (FR-047).
+
+        Proposals of the whole recordset are fetched with one search and
+        cancelled with one batched write, so bulk archiving stays O(1) in queries.
+        Every write is also recorded in the property change log.
+        """
+        previous_scopes = (
+            {prop: (prop.company_id.id, prop.agent_id.user_id.id) for prop in self}
+            if "agent_id" in vals or "company_id" in vals
+            else {}
+        )
         result = super().write(vals)
-        if vals.get("active") is False:
+
+        # Change feed (GET /api/v1/properties/changes)
+        ChangeLog = self.env["real.estate.property.change"]
+        ChangeLog._log_properties(
+            self, "archived" if vals.get("active") is False else "updated"
+        )
+        if previous_scopes:
+            ChangeLog._log_scope_exits(previous_scopes)
+
+        if vals.get("active") is False and self.ids:
             TERMINAL = ("accepted", "rejected", "expired", "cancelled")
-            for prop in self:
-                live_proposals = prop.proposal_ids.filtered(
-                    lambda p: p.state not in TERMINAL
+            live_proposals = self.env["real.estate.proposal"].search(
+                [
+                    ("property_id", "in", self.ids),
+                    ("state", "not in", TERMINAL),
+                ]
+            )
+            if live_proposals:
+                live_proposals.action_cancel_batch(
+                    "Proposta cancelada automaticamente: imóvel arquivado."
                 )
-                if live_proposals:
-                    live_proposals.action_cancel(
-                        "Proposta cancelada automaticamente: imóvel arquivado."
-                    )
         return result
 
+    def unlink(self):
+        # Tombstones for the change feed must be logged while company/agent are readable
+        self.env["real.estate.property.change"]._log_properties(self, "deleted")
+        return super().unlink()
+
     # ========== COMPUTED FIELDS ==========
     @api.depends(
         "street",
@@ -724,6 +750,7 @@ class Property(models.Model):
                         vals["agent_id"] = current_agent.id
 
         properties = super().create(vals_list)
+        self.env["real.estate.property.change"]._log_properties(properties, "created")
 
         # Emit property.created event for each created property (async notifications)
         for prop in properties:
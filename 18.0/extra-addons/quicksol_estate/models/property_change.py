@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+CONFIG_PARAM_TOMBSTONE_DAYS = "quicksol_estate.property_change_tombstone_days"
+CONFIG_PARAM_HORIZON = "quicksol_estate.property_change_horizon_cursor"
+DEFAULT_TOMBSTONE_DAYS = 30
+
+
+class RealEstatePropertyChange(models.Model):
+    """
+    Append-only change log backing GET /api/v1/properties/changes.
+
+    One row is written per property on create/write/unlink (see
+    real.estate.property). The feed only uses rows to know *which* properties
+    changed after a cursor; payloads come from the current property state.
+    The log is compacted daily: superseded rows are dropped (only the latest
+    row per property is kept) and tombstones expire after a retention window.
+    """
+
+    _name = "real.estate.property.change"
+    _description = "Property Change Log"
+    _order = "changed_at, id"
+    _log_access = False
+
+    # Plain integers: rows must outlive the deleted property and its agent
+    property_id = fields.Integer(string="Property ID", required=True, index=True)
+    company_id = fields.Many2one(
+        "res.company", string="Company", ondelete="cascade", index=True
+    )
+    agent_user_id = fields.Integer(
+        string="Agent User ID", help="Snapshot of property.agent_id.user_id"
+    )
+    change_type = fields.Selection(
+        [
+            ("created", "Created"),
+            ("updated", "Updated"),
+            ("archived", "Archived"),
+            ("deleted", "Deleted"),
+        ],
+        required=True,
+    )
+    changed_at = fields.Datetime(required=True, default=fields.Datetime.now)
+
+    def init(self):
+        # Commit-ordered feed key (no bigint ORM field type)
+        self._cr.execute(
+            """
+            ALTER TABLE real_estate_property_change
+              ADD COLUMN IF NOT EXISTS txid bigint NOT NULL
+              DEFAULT pg_current_xact_id()::text::bigint
+            """
+        )
+        # Keyset scans of the feed: WHERE (txid, id) > (%s, %s)
+        self._cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS real_estate_property_change_txid_idx
+            ON real_estate_property_change (txid, id)
+            """
+        )
+        # Seed the log once so a sync without cursor returns the full inventory
+        self._cr.execute(
+            """
+            INSERT INTO real_estate_property_change
+                (property_id, company_id, agent_user_id, change_type, changed_at)
+            SELECT p.id, p.company_id, a.user_id,
+                   CASE WHEN p.active THEN 'created' ELSE 'archived' END,
+                   COALESCE(p.write_date, p.create_date, now() at time zone 'UTC')
+              FROM real_estate_property p
+              LEFT JOIN real_estate_agent a ON a.id = p.agent_id
+             WHERE NOT EXISTS (SELECT 1 FROM real_estate_property_change)
+            """
+        )
+
+    @api.model
+    def _log_properties(self, properties, change_type):
+        """Record one change row per property (single batched INSERT)."""
+        if not properties:
+            return
+        now = fields.Datetime.now()
+        self.sudo().create(
+            [
+                {
+                    "property_id": prop.id,
+                    "company_id": prop.company_id.id,
+                    "agent_user_id": prop.agent_id.user_id.id,
+                    "change_type": change_type,
+                    "changed_at": now,
+                }
+                for prop in properties
+            ]
+        )
+
+    @api.model
+    def _log_scope_exits(self, previous_scopes):
+        """
+        Record rows for the scopes properties left on write so those feeds
+        emit a tombstone. ``previous_scopes`` maps property -> (company id,
+        agent user id) before the write: a company move logs a deletion under
+        the previous company, an agent reassignment a row for the previous
+        agent.
+        """
+        now = fields.Datetime.now()
+        rows = []
+        for prop, (company_id, user_id) in previous_scopes.items():
+            if company_id != prop.company_id.id:
+                change_type = "deleted"
+            elif user_id and user_id != prop.agent_id.user_id.id:
+                company_id, change_type = prop.company_id.id, "updated"
+            else:
+                continue
+            rows.append(
+                {
+                    "property_id": prop.id,
+                    "company_id": company_id,
+                    "agent_user_id": user_id,
+                    "change_type": change_type,
+                    "changed_at": now,
+                }
+            )
+        if rows:
+            self.sudo().create(rows)
+
+    @api.model
+    def _read_changes(self, domain, after=None, limit=None):
+        """
+        Rows of ``domain`` after the ``(txid, id)`` cursor ``after``, in
+        commit order, as dicts with ``id``, ``txid``, ``property_id`` and
+        ``changed_at``. Rows of transactions that may still be running (not
+        older than the snapshot xmin) are held back until they are settled.
+        """
+        self.flush_model()
+        txid = SQL.identifier(self._table, "txid")
+        row_id = SQL.identifier(self._table, "id")
+        query = self._search(domain)
+        query.add_where(
+            SQL("%s < pg_snapshot_xmin(pg_current_snapshot())::text::bigint", txid)
+        )
+        if after:
+            query.add_where(SQL("(%s, %s) > (%s, %s)", txid, row_id, *after))
+        query.order = SQL("%s, %s", txid, row_id)
+        query.limit = limit
+        return self.env.execute_query_dict(
+            query.select(
+                row_id,
+                txid,
+                SQL.identifier(self._table, "property_id"),
+                SQL.identifier(self._table, "changed_at"),
+            )
+        )
+
+    @api.model
+    def _settled_cursor(self):
+        """
+        Cursor covering every change the current snapshot already reflects:
+        changes of transactions still running sort after it.
+        """
+        self._cr.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return self._cr.fetchone()[0], 0
+
+    @api.model
+    def _get_horizon(self):
+        """
+        Oldest ``(txid, id)`` cursor still served: tombstones before it have
+        been purged.
+        """
+        value = (
+            self.env["ir.config_parameter"].sudo().get_param(CONFIG_PARAM_HORIZON)
+        )
+        if not value:
+            return None
+        txid, row_id = value.split(",")
+        return int(txid), int(row_id)
+
+    @api.model
+    def _cron_compact_change_log(self):
+        """Drop superseded rows and tombstones past the retention window."""
+        IrConfig = self.env["ir.config_parameter"].sudo()
+        try:
+            days = int(
+                IrConfig.get_param(
+                    CONFIG_PARAM_TOMBSTONE_DAYS, default=DEFAULT_TOMBSTONE_DAYS
+                )
+            )
+        except (TypeError, ValueError):
+            days = DEFAULT_TOMBSTONE_DAYS
+        cutoff = fields.Datetime.now() - timedelta(days=max(1, days))
+
+        self._cr.execute(
+            """
+            DELETE FROM real_estate_property_change c
+             USING real_estate_property_change newer
+             WHERE newer.property_id = c.property_id
+               AND COALESCE(newer.company_id, 0) = COALESCE(c.company_id, 0)
+               AND COALESCE(newer.agent_user_id, 0) = COALESCE(c.agent_user_id, 0)
+               AND (newer.txid, newer.id) > (c.txid, c.id)
+            """
+        )
+        superseded = self._cr.rowcount
+        self._cr.execute(
+            """
+            DELETE FROM real_estate_property_change
+             WHERE change_type = 'deleted' AND changed_at < %s
+         RETURNING txid, id
+            """,
+            (cutoff,),
+        )
+        expired = self._cr.fetchall()
+        if expired:
+            horizon = max(expired)
+            previous = self._get_horizon()
+            if previous:
+                horizon = max(horizon, previous)
+            IrConfig.set_param(CONFIG_PARAM_HORIZON, "%d,%d" % horizon)
+        _logger.info(
+            "Cron: property change log compacted (%d superseded, %d expired tombstones)",
+            superseded,
+            len(expired),
+        )
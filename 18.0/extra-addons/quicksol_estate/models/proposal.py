@@ -728,6 +728,57 @@ class RealEstateProposal(models.Model):
         self._promote_next_queued()
         return True
 
+    def action_cancel_batch(self, cancellation_reason):
+        """
+        Batch counterpart of action_cancel (FR-021/FR-047): cancels every
+        non-terminal proposal in self with a single write, then promotes the
+        next queued proposal once per property whose active slot was released.
+        """
+        if not (cancellation_reason or "").strip():
+            raise ValidationError(_("A cancellation reason is required."))
+        live = self.filtered(lambda p: p.state not in TERMINAL_STATES)
+        if not live:
+            return True
+        released_property_ids = live.filtered(
+            lambda p: p.state != "queued"
+        ).property_id.ids
+        live.write(
+            {
+                "state": "cancelled",
+                "cancellation_reason": cancellation_reason,
+                "active": False,
+            }
+        )
+        if released_property_ids:
+            queued = self.search(
+                [
+                    ("property_id", "in", released_property_ids),
+                    ("state", "=", "queued"),
+                    ("active", "=", True),
+                    ("parent_proposal_id", "=", False),
+                ],
+                order="property_id asc, create_date asc, id asc",
+            )
+            promoted = self.browse()
+            seen_property_ids = set()
+            for proposal in queued:
+                if proposal.property_id.id not in seen_property_ids:
+                    seen_property_ids.add(proposal.property_id.id)
+                    promoted |= proposal
+            if promoted:
+                promoted.write({"state": "draft"})
+                for proposal in promoted:
+                    proposal._emit_event(
+                        "proposal.promoted",
+                        {
+                            "template": "email_template_proposal_promoted",
+                            "recipient_partner_ids": [
+                                proposal.agent_id.user_id.partner_id.id
+                            ],
+                        },
+                    )
+        return True
+
     def action_counter(self, vals):
         """
         Sent/Negotiation → Negotiation (parent); new child Draft takes active slot.
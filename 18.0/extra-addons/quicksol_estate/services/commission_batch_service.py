@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Batch commission calculation.
+
+CommissionService.calculate_batch() resolves the rule of every input
+transaction, groups the transactions by rule and hands each group to
+calculate_group(): the rate of the rule is converted once and applied to
+the whole group in Decimal, every commission rounded half-up to cents.
+split_commission() divides a commission between prospector and agent so
+the two shares always add up to the commission. Amounts come in as floats
+(ORM values, JSON) and are converted through their decimal representation,
+never their binary one. Pure Python — no Odoo imports.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+CENT = Decimal("0.01")
+HUNDRED = Decimal(100)
+
+BATCH_MAX_ITEMS = 5000
+
+
+def to_decimal(value):
+    """Decimal of a float/int/str amount (``0.1`` -> ``Decimal("0.1")``)."""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value or 0))
+
+
+def to_cents(value):
+    """``value`` rounded half-up to cents."""
+    return to_decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def calculate_group(rule, amounts):
+    """
+    Commissions of ``amounts`` (in order) under ``rule``, a dict with
+    ``structure_type``, ``percentage`` and ``fixed_amount``; Decimals
+    rounded to cents.
+    """
+    if rule["structure_type"] == "percentage":
+        rate = to_decimal(rule["percentage"]) / HUNDRED
+        return [
+            (to_decimal(amount) * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+            for amount in amounts
+        ]
+    if rule["structure_type"] == "fixed":
+        return [to_cents(rule["fixed_amount"])] * len(amounts)
+    raise ValueError("Invalid commission structure type: %s" % rule["structure_type"])
+
+
+def split_commission(commission, split_percentage):
+    """
+    ``(prospector_share, agent_share)`` of ``commission`` for a prospector
+    ``split_percentage`` (0.0-1.0). The prospector share is rounded, the
+    agent gets the remainder, so no cent is lost or created.
+    """
+    prospector = (to_decimal(commission) * to_decimal(split_percentage)).quantize(
+        CENT, rounding=ROUND_HALF_UP
+    )
+    return prospector, to_decimal(commission) - prospector
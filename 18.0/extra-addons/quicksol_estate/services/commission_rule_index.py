@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory commission rule resolution.
+
+A RuleIndex holds the active commission rules of one company, grouped by
+(agent, transaction type) — a ``both`` rule is listed under ``sale`` and
+``rental`` — and sorted by validity start. Resolving the rule of a
+transaction is a binary search to the newest rule already started on its
+date, then a walk back past the rules that had expired or whose value range
+excludes the amount; no query. Resolution follows the ORM search it
+replaces: newest ``valid_from`` first, highest id on ties.
+
+The commission rule model caches one index per company in the registry
+(ormcache), keyed by a per-company generation that is bumped when rules,
+or agents' companies, change. Pure Python — no Odoo imports.
+"""
+from bisect import bisect_right
+
+TRANSACTION_TYPES = ("sale", "rental")
+
+
+class RuleEntry:
+    """Validity interval and value range of a commission rule."""
+
+    __slots__ = (
+        "rule_id",
+        "valid_from",
+        "valid_until",
+        "min_value",
+        "max_value",
+    )
+
+    def __init__(self, rule_id, valid_from, valid_until, min_value, max_value):
+        self.rule_id = rule_id
+        self.valid_from = valid_from
+        self.valid_until = valid_until or None
+        self.min_value = min_value or 0.0
+        self.max_value = max_value
+
+    def applies(self, on_date, amount=None):
+        """Whether the rule is valid on ``on_date`` and covers ``amount``."""
+        if self.valid_from > on_date:
+            return False
+        if self.valid_until is not None and self.valid_until < on_date:
+            return False
+        if amount is None:
+            return True
+        if amount < self.min_value:
+            return False
+        return self.max_value is None or amount <= self.max_value
+
+
+class RuleIndex:
+    """Commission rules of one company, searchable by agent, type and date."""
+
+    def __init__(self, rules):
+        """
+        ``rules``: iterable of dicts with the ``id``, ``agent_id``,
+        ``transaction_type``, ``valid_from``, ``valid_until``, ``min_value``
+        and ``max_value`` of active rules (``agent_id`` as an int).
+        """
+        by_key = {}
+        rule_ids = set()
+        for rule in rules:
+            rule_ids.add(rule["id"])
+            entry = RuleEntry(
+                rule["id"],
+                rule["valid_from"],
+                rule["valid_until"],
+                rule["min_value"],
+                rule["max_value"],
+            )
+            types = (
+                TRANSACTION_TYPES
+                if rule["transaction_type"] == "both"
+                else (rule["transaction_type"],)
+            )
+            for transaction_type in types:
+                by_key.setdefault((rule["agent_id"], transaction_type), []).append(
+                    entry
+                )
+        self.rule_ids = frozenset(rule_ids)
+        self._entries = {}
+        self._starts = {}
+        for key, entries in by_key.items():
+            entries.sort(key=lambda entry: (entry.valid_from, entry.rule_id))
+            self._entries[key] = entries
+            self._starts[key] = [entry.valid_from for entry in entries]
+
+    def __len__(self):
+        return len(self.rule_ids)
+
+    def resolve(self, agent_id, transaction_type, on_date, amount=None):
+        """
+        Id of the rule of ``agent_id`` for a ``transaction_type``
+        transaction on ``on_date`` (and of ``amount`` when given), or None.
+        """
+        key = (agent_id, transaction_type)
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        # Rules [0, position) started on or before on_date, newest last
+        position = bisect_right(self._starts[key], on_date)
+        for index in range(position - 1, -1, -1):
+            if entries[index].applies(on_date, amount):
+                return entries[index].rule_id
+        return None
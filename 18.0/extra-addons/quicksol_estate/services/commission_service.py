@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from odoo import _
+from odoo import _, fields
 from odoo.exceptions import ValidationError, UserError, AccessError
+from collections import defaultdict
 from datetime import datetime, date
 import logging
 import json
 
+from . import commission_batch_service
+
 _logger = logging.getLogger(__name__)
 
 
@@ -64,7 +67,7 @@ class CommissionService:
         return commission
 
     def get_active_rule_for_agent(
-        self, agent_id, transaction_type, transaction_date=None
+        self, agent_id, transaction_type, transaction_date=None, amount=None
     ):
         if transaction_date is None:
             transaction_date = date.today()
@@ -72,41 +75,23 @@ class CommissionService:
         if isinstance(transaction_date, datetime):
             transaction_date = transaction_date.date()
 
-        # Build domain for active rules
-        domain = [
-            ("agent_id", "=", agent_id),
-            ("active", "=", True),
-            "|",
-            ("transaction_type", "=", transaction_type),
-            ("transaction_type", "=", "both"),
-            (
-                "valid_from",
-                "<=",
-                transaction_date,
-            ),  # Non-retroactive: must be valid from this date
-        ]
-
-        # Add valid_until check (if set, must not be expired)
-        domain.append(
-            "|",
-        )
-        domain.append(("valid_until", "=", False))  # No expiration
-        domain.append(("valid_until", ">=", transaction_date))  # Or not yet expired
-
-        # Search for matching rules, order by most recent first
-        rules = self.env["real.estate.commission.rule"].search(
-            domain, order="valid_from desc, id desc", limit=1
+        # Most recent active rule of the type (or "both") started by the
+        # date (non-retroactive) and not yet expired, covering the amount
+        # when given — resolved from the company's in-memory rule index
+        agent = self.env["real.estate.agent"].browse(agent_id)
+        rule = self.env["real.estate.commission.rule"]._resolve_rule(
+            agent, transaction_type, transaction_date, amount
         )
 
-        if rules:
+        if rule:
             _logger.info(
                 "Found active commission rule (ID: %s) for agent %s, type %s, date %s",
-                rules.id,
+                rule.id,
                 agent_id,
                 transaction_type,
                 transaction_date,
             )
-            return rules[0]
+            return rule
         else:
             _logger.warning(
                 "No active commission rule found for agent %s, type %s, date %s",
@@ -154,20 +139,7 @@ class CommissionService:
         commission_amount = self.calculate_commission(rule, transaction_amount)
 
         # Create rule snapshot (immutable)
-        rule_snapshot = json.dumps(
-            {
-                "percentage": rule.percentage,
-                "fixed_amount": rule.fixed_amount,
-                "structure_type": rule.structure_type,
-                "transaction_type": rule.transaction_type,
-                "min_value": rule.min_value,
-                "max_value": rule.max_value,
-                "valid_from": str(rule.valid_from) if rule.valid_from else None,
-                "valid_until": str(rule.valid_until) if rule.valid_until else None,
-                "rule_id": rule.id,
-                "rule_name": rule.name_get()[0][1] if rule.name_get() else "",
-            }
-        )
+        rule_snapshot = json.dumps(self._rule_snapshot(rule))
 
         # Create transaction record
         transaction = self.env["real.estate.commission.transaction"].create(
@@ -199,52 +171,322 @@ class CommissionService:
 
         return transaction
 
+    def _rule_snapshot(self, rule):
+        return {
+            "percentage": rule.percentage,
+            "fixed_amount": rule.fixed_amount,
+            "structure_type": rule.structure_type,
+            "transaction_type": rule.transaction_type,
+            "min_value": rule.min_value,
+            "max_value": rule.max_value,
+            "valid_from": str(rule.valid_from) if rule.valid_from else None,
+            "valid_until": str(rule.valid_until) if rule.valid_until else None,
+            "rule_id": rule.id,
+            "rule_name": rule.name_get()[0][1] if rule.name_get() else "",
+        }
+
     def bulk_create_transactions(self, transactions_data):
-        created_transactions = []
-        errors = []
+        """Create the commission transactions of ``transactions_data``."""
+        return list(self.calculate_batch(transactions_data)["transactions"])
+
+    def calculate_batch(self, transactions_data, dry_run=False):
+        """
+        Calculate the commissions of ``transactions_data`` — dicts with
+        ``agent_id``, ``transaction_type``, ``transaction_amount`` and
+        optionally ``transaction_date``, ``transaction_reference`` and
+        ``prospector_id`` — and, unless ``dry_run``, create their commission
+        transactions in one create(). Rules are resolved from the rule index
+        and each rule computes the commissions of all its transactions at
+        once (commission_batch_service). A prospector other than the agent
+        gets the configured share of the commission in a transaction of its
+        own.
+
+        All or nothing: any invalid transaction raises a UserError listing
+        every error. Returns ``{"results": [...], "transactions": records}``,
+        one result per input transaction in input order.
+        """
+        items = list(transactions_data)
+        if len(items) > commission_batch_service.BATCH_MAX_ITEMS:
+            raise UserError(
+                _("At most %(max)s transactions can be calculated at once.")
+                % {"max": commission_batch_service.BATCH_MAX_ITEMS}
+            )
+        rows, errors = self._batch_rows(items)
+        rules = self.env["real.estate.commission.rule"].browse(
+            sorted({row["rule_id"] for row in rows})
+        )
+        # One read of every rule involved, then one calculation per rule
+        rule_values = {
+            values["id"]: values
+            for values in rules.read(
+                [
+                    "structure_type",
+                    "percentage",
+                    "fixed_amount",
+                    "min_value",
+                    "max_value",
+                ]
+            )
+        }
+        by_rule = self._group_by_rule(rows, rule_values, errors)
+        if errors:
+            _logger.error(
+                "Batch commission calculation failed: %d error(s)", len(errors)
+            )
+            raise UserError(
+                _("Failed to create %(count)s transaction(s):\n%(errors)s")
+                % {"count": len(errors), "errors": "\n".join(errors)}
+            )
 
-        # Use savepoint for transactional integrity - all or nothing
-        savepoint = self.env.cr.savepoint()
-        try:
-            for i, data in enumerate(transactions_data):
-                try:
-                    transaction = self.create_commission_transaction(
-                        agent_id=data["agent_id"],
-                        transaction_type=data["transaction_type"],
-                        transaction_amount=data["transaction_amount"],
-                        transaction_date=data.get("transaction_date"),
-                        transaction_reference=data.get("transaction_reference"),
-                    )
-                    created_transactions.append(transaction)
-                except (ValidationError, UserError) as e:
-                    error_msg = f"Transaction {i+1}: {str(e)}"
-                    errors.append(error_msg)
-                    _logger.error("Bulk transaction creation failed: %s", error_msg)
-
-            if errors:
-                # Rollback all changes if any error occurred
-                savepoint.__exit__(True, None, None)
-                raise UserError(
-                    _("Failed to create %(count)s transaction(s):\n%(errors)s")
-                    % {"count": len(errors), "errors": "\n".join(errors)}
-                )
+        split_percentage = None
+        if any(row["prospector"] for row in rows):
+            split_percentage = self._prospector_split_percentage()
+        self._calculate_groups(by_rule, rule_values, split_percentage)
 
-            # Commit the savepoint if all transactions succeeded
-            savepoint.__exit__(False, None, None)
-        except Exception:
-            # Ensure savepoint is cleaned up on unexpected errors
-            try:
-                savepoint.__exit__(True, None, None)
-            except Exception:
-                pass
-            raise
+        results = [
+            {
+                "agent_id": row["agent"].id,
+                "prospector_id": row["prospector"].id or None,
+                "rule_id": row["rule_id"],
+                "transaction_type": row["transaction_type"],
+                "transaction_date": str(row["transaction_date"]),
+                "transaction_reference": row["transaction_reference"],
+                "transaction_amount": row["transaction_amount"],
+                "commission_amount": float(row["commission_amount"]),
+                "prospector_commission": float(row["prospector_commission"]),
+                "agent_commission": float(row["agent_commission"]),
+            }
+            for row in rows
+        ]
+        Transaction = self.env["real.estate.commission.transaction"]
+        if dry_run:
+            return {"results": results, "transactions": Transaction}
+
+        vals_list, owners = self._batch_vals_list(
+            results, rows, rules, split_percentage
+        )
+        transactions = Transaction.with_context(
+            mail_create_nolog=True, mail_create_nosubscribe=True
+        ).create(vals_list)
+        for result, transaction in zip(owners, transactions):
+            result["transaction_ids"].append(transaction.id)
 
         _logger.info(
-            "Bulk created %s commission transactions successfully",
-            len(created_transactions),
+            "Batch created %s commission transactions for %s input transaction(s)",
+            len(transactions),
+            len(results),
         )
+        return {"results": results, "transactions": transactions.with_env(self.env)}
+
+    def _batch_rows(self, items):
+        """
+        Validate the ``items`` of a batch and resolve their rules from the
+        rule index, leaving out rules the user cannot read. Returns
+        ``(rows, errors)``: one row per valid item and one message per
+        invalid one.
+        """
+        Agent = self.env["real.estate.agent"]
+        Rule = self.env["real.estate.commission.rule"]
+        agent_ids = {data.get("agent_id") for data in items}
+        agent_ids.update(data.get("prospector_id") for data in items)
+        agents = {
+            agent.id: agent
+            for agent in Agent.browse(
+                [id_ for id_ in agent_ids if isinstance(id_, int)]
+            ).exists()
+        }
+        today = date.today()
+        rows = []
+        errors = []
+        for position, data in enumerate(items, 1):
+            try:
+                row = self._batch_row(data, agents, today)
+            except (ValidationError, ValueError, TypeError) as e:
+                errors.append(f"Transaction {position}: {str(e)}")
+                continue
+            agent = row["agent"]
+            # Same resolution, access rules included, as a single transaction
+            rule = Rule._resolve_rule(
+                agent, row["transaction_type"], row["transaction_date"]
+            )
+            if not rule:
+                errors.append(
+                    _(
+                        "Transaction %(position)s: No active commission rule found "
+                        "for agent %(agent)s and transaction type %(type)s on date "
+                        "%(date)s."
+                    )
+                    % {
+                        "position": position,
+                        "agent": agent.name,
+                        "type": row["transaction_type"],
+                        "date": row["transaction_date"],
+                    }
+                )
+                continue
+            row.update(position=position, rule_id=rule.id)
+            rows.append(row)
+        return rows, errors
+
+    def _batch_row(self, data, agents, today):
+        """
+        Row of the batch item ``data``, with its ``agents`` looked up;
+        raises a ValidationError when the item is invalid.
+        """
+        Agent = self.env["real.estate.agent"]
+        agent = agents.get(data.get("agent_id"))
+        prospector = agents.get(data.get("prospector_id")) or Agent
+        transaction_type = data.get("transaction_type")
+        if not agent:
+            raise ValidationError(
+                _("Agent with ID %s does not exist") % data.get("agent_id")
+            )
+        if data.get("prospector_id") and not prospector:
+            raise ValidationError(
+                _("Prospector with ID %s does not exist") % data.get("prospector_id")
+            )
+        if prospector and prospector.company_id != agent.company_id:
+            raise ValidationError(_("Prospector must belong to the agent's company"))
+        if transaction_type not in ("sale", "rental"):
+            raise ValidationError(_("Invalid transaction type: %s") % transaction_type)
+        amount = float(data.get("transaction_amount") or 0.0)
+        if amount <= 0:
+            raise ValidationError(
+                _("Transaction amount must be positive. Got: %.2f") % amount
+            )
+        transaction_date = fields.Date.to_date(data.get("transaction_date")) or today
+        if prospector == agent:
+            prospector = Agent
+        return {
+            "agent": agent,
+            "prospector": prospector,
+            "transaction_type": transaction_type,
+            "transaction_amount": amount,
+            "transaction_date": transaction_date,
+            "transaction_reference": data.get("transaction_reference"),
+        }
 
-        return created_transactions
+    def _group_by_rule(self, rows, rule_values, errors):
+        """
+        Rows grouped by rule id; rows whose amount is outside their rule's
+        value range are left out and reported in ``errors``.
+        """
+        by_rule = defaultdict(list)
+        for row in rows:
+            values = rule_values[row["rule_id"]]
+            amount = row["transaction_amount"]
+            if amount < values["min_value"]:
+                errors.append(
+                    _(
+                        "Transaction %(position)s: Transaction amount (%(amount).2f) "
+                        "is below minimum value (%(limit).2f) for this rule"
+                    )
+                    % {
+                        "position": row["position"],
+                        "amount": amount,
+                        "limit": values["min_value"],
+                    }
+                )
+            elif amount > values["max_value"]:
+                errors.append(
+                    _(
+                        "Transaction %(position)s: Transaction amount (%(amount).2f) "
+                        "exceeds maximum value (%(limit).2f) for this rule"
+                    )
+                    % {
+                        "position": row["position"],
+                        "amount": amount,
+                        "limit": values["max_value"],
+                    }
+                )
+            else:
+                by_rule[row["rule_id"]].append(row)
+        return by_rule
+
+    def _calculate_groups(self, by_rule, rule_values, split_percentage):
+        """Set the commission and its split on the rows of each rule group."""
+        for rule_id, group in by_rule.items():
+            commissions = commission_batch_service.calculate_group(
+                rule_values[rule_id], [row["transaction_amount"] for row in group]
+            )
+            for row, commission in zip(group, commissions):
+                row["commission_amount"] = commission
+                row["prospector_commission"] = commission_batch_service.to_cents(0)
+                row["agent_commission"] = commission
+                if row["prospector"]:
+                    (
+                        row["prospector_commission"],
+                        row["agent_commission"],
+                    ) = commission_batch_service.split_commission(
+                        commission, split_percentage
+                    )
+
+    def _batch_vals_list(self, results, rows, rules, split_percentage):
+        """
+        Commission transaction values of the calculated ``rows``, and the
+        result each of them belongs to.
+        """
+        snapshots = {rule.id: self._rule_snapshot(rule) for rule in rules}
+        calculated_at = fields.Datetime.now()
+        vals_list = []
+        owners = []
+        for result, row in zip(results, rows):
+            shares = [(row["agent"], row["agent_commission"], None)]
+            if row["prospector"]:
+                shares = [
+                    (row["prospector"], row["prospector_commission"], "prospector"),
+                    (row["agent"], row["agent_commission"], "agent"),
+                ]
+            result["transaction_ids"] = []
+            for agent, commission, role in shares:
+                # A split share of zero (0% or 100% split) is not recorded
+                if role and not commission:
+                    continue
+                snapshot = snapshots[row["rule_id"]]
+                if role:
+                    snapshot = dict(
+                        snapshot,
+                        commission_split={
+                            "role": role,
+                            "prospector_percentage": split_percentage,
+                        },
+                    )
+                vals_list.append(
+                    {
+                        "agent_id": agent.id,
+                        "rule_id": row["rule_id"],
+                        "transaction_type": row["transaction_type"],
+                        "transaction_amount": row["transaction_amount"],
+                        "commission_amount": float(commission),
+                        "transaction_date": row["transaction_date"],
+                        "transaction_reference": row["transaction_reference"],
+                        "rule_snapshot": json.dumps(snapshot),
+                        "payment_status": "pending",
+                        "calculated_at": calculated_at,
+                        "calculated_by": self.env.user.id,
+                    }
+                )
+                owners.append(result)
+        return vals_list, owners
+
+    def _prospector_split_percentage(self):
+        """Prospector share of a split commission (0.0-1.0)."""
+        split_percentage = float(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(
+                "quicksol_estate.prospector_commission_percentage", default="0.30"
+            )
+        )
+        if not 0.0 <= split_percentage <= 1.0:
+            raise ValidationError(
+                _(
+                    "Invalid prospector commission split percentage: "
+                    "%(percentage).2f%%. Must be between 0.0 and 1.0."
+                )
+                % {"percentage": split_percentage}
+            )
+        return split_percentage
 
     def get_agent_commission_summary(self, agent_id, date_from=None, date_to=None):
 
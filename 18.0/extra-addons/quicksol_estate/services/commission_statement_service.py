@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Monthly commission statements (POST /api/v1/commission-statements).
+
+A real.estate.commission.statement.run covers one company and one month.
+The statement_events Celery worker calls prepare_statements(), which reads
+the commission transactions of the month with a single query ordered by
+agent and folds them here, in one pass, into one statement per agent of the
+company (agents without commissions get an empty statement). The worker
+renders the CSV/PDF files in a process pool and sends them back as
+attachments of the statements; the run's manifest lists them.
+
+Pure Python — no Odoo imports.
+"""
+import calendar
+import re
+from datetime import date
+
+STATEMENT_TASK = "commission.generate_statements"
+STATEMENT_QUEUE = "statement_events"
+FORMATS = [
+    ("csv", "CSV"),
+    ("pdf", "PDF"),
+    ("both", "CSV and PDF"),
+]
+MIMETYPES = {"csv": "text/csv", "pdf": "application/pdf"}
+
+_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+def parse_month(value):
+    """First and last day of a ``YYYY-MM`` month; ValueError otherwise."""
+    match = _MONTH_RE.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid month: {value}. Use YYYY-MM")
+    year, month = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {value}. Use YYYY-MM")
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def month_label(period_start):
+    return period_start.strftime("%Y-%m")
+
+
+def file_formats(file_format):
+    """Extensions rendered for a run format (``both`` -> csv and pdf)."""
+    return ["csv", "pdf"] if file_format == "both" else [file_format]
+
+
+def empty_totals():
+    return {
+        "transaction_count": 0,
+        "transaction_amount": 0.0,
+        "total_commission": 0.0,
+        "pending_commission": 0.0,
+        "paid_commission": 0.0,
+        "cancelled_commission": 0.0,
+    }
+
+
+def build_statements(agents, lines):
+    """
+    Statements of ``agents`` (``(agent_id, name)`` pairs, in output order)
+    from ``lines``: ``(agent_id, transaction_id, date, reference, type,
+    transaction_amount, commission_amount, payment_status)`` tuples sorted
+    by agent. One pass over the lines; lines of agents outside ``agents``
+    are ignored.
+    """
+    statements = {
+        agent_id: {"agent_id": agent_id, "agent_name": name, "lines": []}
+        for agent_id, name in agents
+    }
+    for statement in statements.values():
+        statement.update(empty_totals())
+    for (
+        agent_id,
+        transaction_id,
+        transaction_date,
+        reference,
+        transaction_type,
+        transaction_amount,
+        commission_amount,
+        payment_status,
+    ) in lines:
+        statement = statements.get(agent_id)
+        if statement is None:
+            continue
+        statement["transaction_count"] += 1
+        statement["transaction_amount"] += transaction_amount
+        statement["total_commission"] += commission_amount
+        statement[f"{payment_status}_commission"] += commission_amount
+        statement["lines"].append(
+            {
+                "id": transaction_id,
+                "date": transaction_date.isoformat(),
+                "reference": reference or "",
+                "type": transaction_type,
+                "transaction_amount": transaction_amount,
+                "commission_amount": commission_amount,
+                "payment_status": payment_status,
+            }
+        )
+    for statement in statements.values():
+        for key in statement:
+            if key.endswith(("_amount", "_commission")):
+                statement[key] = round(statement[key], 2)
+    return list(statements.values())
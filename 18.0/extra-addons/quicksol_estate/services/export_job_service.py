@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous export jobs (POST /api/v1/exports).
+
+The request stores the fully scoped search domain on a
+real.estate.export.job; the export_events Celery worker then calls
+run_export_chunk() repeatedly. Each call appends one chunk of CSV rows to a
+partial file under ``<data_dir>/exports/<db>/`` and commits its progress, so
+no Odoo worker is held for the whole export. The finished file is moved
+into the filestore as an attachment of the job.
+
+This module holds the resource definitions and the file handling.
+Pure Python — no Odoo imports.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import os
+
+EXPORT_DIRNAME = "exports"
+EXPORT_CHUNK_SIZE = 2000
+HASH_BLOCK_SIZE = 64 * 1024
+SNIFF_BYTES = 2048
+
+# resource -> model and (header, field) columns read with search_read
+EXPORT_RESOURCES = {
+    "leads": {
+        "model": "real.estate.lead",
+        "columns": [
+            ("ID", "id"),
+            ("Name", "name"),
+            ("State", "state"),
+            ("Phone", "phone"),
+            ("Email", "email"),
+            ("Agent", "agent_id"),
+            ("Budget Min", "budget_min"),
+            ("Budget Max", "budget_max"),
+            ("Property Type", "property_type_interest"),
+            ("Location", "location_preference"),
+            ("Bedrooms", "bedrooms_needed"),
+            ("First Contact", "first_contact_date"),
+            ("Expected Closing", "expected_closing_date"),
+            ("Last Activity", "last_activity_at"),
+            ("Created At", "create_date"),
+        ],
+    },
+    "properties": {
+        "model": "real.estate.property",
+        "columns": [
+            ("ID", "id"),
+            ("Reference", "reference_code"),
+            ("Name", "name"),
+            ("Property Type", "property_type_id"),
+            ("Status", "property_status"),
+            ("For Sale", "for_sale"),
+            ("For Rent", "for_rent"),
+            ("Price", "price"),
+            ("Rent Price", "rent_price"),
+            ("Condominium Fee", "condominium_fee"),
+            ("Street", "street"),
+            ("Neighborhood", "neighborhood"),
+            ("City", "city"),
+            ("State", "state_id"),
+            ("Bedrooms", "num_rooms"),
+            ("Area", "area"),
+            ("Agent", "agent_id"),
+            ("Company", "company_id"),
+            ("Active", "active"),
+            ("Created At", "create_date"),
+        ],
+    },
+    "services": {
+        "model": "real.estate.service",
+        "columns": [
+            ("ID", "id"),
+            ("Name", "name"),
+            ("Stage", "stage"),
+            ("Operation Type", "operation_type"),
+            ("Client", "client_partner_id"),
+            ("Agent", "agent_id"),
+            ("Source", "source_id"),
+            ("Pending", "is_pending"),
+            ("Lost Reason", "lost_reason"),
+            ("Won Date", "won_date"),
+            ("Last Activity", "last_activity_date"),
+            ("Active", "active"),
+            ("Created At", "create_date"),
+        ],
+    },
+    "commissions": {
+        "model": "real.estate.commission.transaction",
+        "columns": [
+            ("ID", "id"),
+            ("Reference", "transaction_reference"),
+            ("Date", "transaction_date"),
+            ("Type", "transaction_type"),
+            ("Agent", "agent_id"),
+            ("Company", "company_id"),
+            ("Transaction Amount", "transaction_amount"),
+            ("Commission Amount", "commission_amount"),
+            ("Currency", "currency_id"),
+            ("Payment Status", "payment_status"),
+            ("Payment Date", "payment_date"),
+        ],
+    },
+}
+
+
+def export_fields(resource):
+    return [field for _header, field in EXPORT_RESOURCES[resource]["columns"]]
+
+
+def export_headers(resource):
+    return [header for header, _field in EXPORT_RESOURCES[resource]["columns"]]
+
+
+def export_filename(resource, job_id, compress=False):
+    return f"{resource}_export_{job_id}.csv" + (".gz" if compress else "")
+
+
+def format_value(value, field_type):
+    """CSV cell for a search_read value; ``field_type`` is the ORM field type."""
+    if field_type == "boolean":
+        return "true" if value else "false"
+    if value is False or value is None:
+        return ""
+    if field_type == "many2one":
+        return value[1]
+    if field_type == "date":
+        return value.strftime("%Y-%m-%d")
+    if field_type == "datetime":
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def format_row(values, fields, field_types):
+    return [format_value(values[field], field_types.get(field)) for field in fields]
+
+
+def encode_csv(rows, header=None, compress=False):
+    """
+    Encode rows (and an optional header) as UTF-8 CSV bytes. With
+    ``compress`` each chunk becomes its own gzip member: concatenated members
+    form a valid gzip file, so chunks can be appended independently.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    data = buffer.getvalue().encode("utf-8")
+    return gzip.compress(data) if compress and data else data
+
+
+def partial_path(data_dir, dbname, job_id):
+    return os.path.join(data_dir, EXPORT_DIRNAME, dbname, f"job-{int(job_id)}.partial")
+
+
+def prepare_partial(path, committed_size):
+    """
+    Cut the partial file back to ``committed_size`` bytes, dropping rows a
+    failed (rolled back) chunk may have appended. Returns False when the file
+    is missing although data was committed: the export must restart.
+    """
+    if not os.path.exists(path):
+        if committed_size:
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+        return True
+    with open(path, "r+b") as fh:
+        fh.truncate(int(committed_size))
+    return True
+
+
+def append_chunk(path, data):
+    """Append ``data`` durably; returns the new file size."""
+    with open(path, "ab") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+        return fh.tell()
+
+
+def file_digest(path):
+    """Return ``(size, sha1 hexdigest, first bytes)`` reading in blocks."""
+    sha = hashlib.sha1()
+    size = 0
+    head = b""
+    with open(path, "rb") as fh:
+        while True:
+            block = fh.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            if len(head) < SNIFF_BYTES:
+                head += block[: SNIFF_BYTES - len(head)]
+            sha.update(block)
+            size += len(block)
+    return size, sha.hexdigest(), head
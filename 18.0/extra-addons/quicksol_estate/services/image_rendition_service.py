@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Image rendition pipeline for property photos.
+
+Builds resized WebP/JPEG renditions (thumbnail, medium, large) of an uploaded
+image with Pillow. Pure functions: persistence and queueing live in
+models/ir_attachment.py so this module can be unit-tested without Odoo.
+"""
+import io
+import logging
+
+from PIL import Image, ImageOps
+
+_logger = logging.getLogger(__name__)
+
+# (size name, target width in px) — heights follow the original aspect ratio
+RENDITION_SIZES = (
+    ("thumbnail", 320),
+    ("medium", 800),
+    ("large", 1600),
+)
+
+# (format key, Pillow format, mimetype, file extension, save options)
+RENDITION_FORMATS = (
+    ("webp", "WEBP", "image/webp", "webp", {"quality": 80, "method": 4}),
+    (
+        "jpeg",
+        "JPEG",
+        "image/jpeg",
+        "jpg",
+        {"quality": 82, "optimize": True, "progressive": True},
+    ),
+)
+
+SOURCE_MIMETYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+
+# Decompression-bomb guard: refuse sources above ~50 megapixels
+MAX_SOURCE_PIXELS = 50_000_000
+
+
+def _open_source(content):
+    image = Image.open(io.BytesIO(content))
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        raise ValueError(
+            f"Image too large for renditions ({image.width}x{image.height})"
+        )
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        # JPEG has no alpha channel: flatten on white
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    return image.convert("RGB")
+
+
+def build_renditions(content):
+    """
+    Return a list of rendition dicts for the given image bytes:
+    ``{size, width, height, format, mimetype, extension, content}``.
+
+    Sizes wider than the source are skipped (no upscaling); the thumbnail is
+    always produced so every image has at least one rendition.
+    """
+    source = _open_source(content)
+    renditions = []
+
+    for size_name, target_width in RENDITION_SIZES:
+        if source.width <= target_width and size_name != "thumbnail":
+            continue
+        resized = source.copy()
+        resized.thumbnail((target_width, target_width * 4), Image.LANCZOS)
+
+        for fmt_key, pil_format, mimetype, extension, options in RENDITION_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=pil_format, **options)
+            renditions.append(
+                {
+                    "size": size_name,
+                    "width": resized.width,
+                    "height": resized.height,
+                    "format": fmt_key,
+                    "mimetype": mimetype,
+                    "extension": extension,
+                    "content": buffer.getvalue(),
+                }
+            )
+
+    return renditions
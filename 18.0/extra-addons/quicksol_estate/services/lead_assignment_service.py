@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Automatic lead assignment (FR-002b).
+
+Each company picks a strategy for leads created without an agent (portal
+intake, back office, imports):
+
+- ``round_robin``: the agent who received a lead longest ago
+- ``least_open``: the agent with the fewest open leads (ties rotate)
+- ``skill_region``: least_open among the specialists whose property types
+  and regions match the lead, then among the matching generalists, then
+  among every agent
+
+Open-lead counts live in an in-process AgentLoadIndex per (database,
+company): seeded with one grouped query, then moved by the lead create()
+and write() deltas once their transaction commits, so a round_robin or
+least_open decision is a heap pop instead of a count query per agent
+(skill_region scans the counters of the matching agents only). Other
+server processes only see those deltas at their next reseed; the counts
+steer the balance and never decide correctness. Pure Python — no Odoo
+imports.
+"""
+import heapq
+import itertools
+import threading
+import time
+import unicodedata
+
+STRATEGIES = [
+    ("manual", "Manual"),
+    ("round_robin", "Round Robin"),
+    ("least_open", "Least Open Leads"),
+    ("skill_region", "Skill / Region"),
+]
+AUTO_STRATEGIES = {"round_robin", "least_open", "skill_region"}
+
+CLOSED_STATES = ("lost", "won")
+# Lead fields whose change moves a lead between agents' open counts
+LOAD_FIELDS = {"agent_id", "company_id", "state", "active"}
+# Agent fields that change who is assignable, or how, in a company
+AGENT_FIELDS = {
+    "active",
+    "company_id",
+    "receives_leads",
+    "lead_regions",
+    "lead_property_type_ids",
+}
+
+DEFAULT_RESYNC_SECONDS = 300
+
+
+def normalize_text(value):
+    """Lowercase, accent-free text for region matching ("São" == "sao")."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def parse_regions(value):
+    """Region keywords of an agent: comma-separated, normalized, no blanks."""
+    parts = (normalize_text(part).strip() for part in (value or "").split(","))
+    return frozenset(part for part in parts if part)
+
+
+class AgentProfile:
+    """Property types and regions an agent covers; empty means any."""
+
+    __slots__ = ("property_type_ids", "regions")
+
+    def __init__(self, property_type_ids=(), regions=()):
+        self.property_type_ids = frozenset(property_type_ids)
+        self.regions = frozenset(regions)
+
+    def matches(self, property_type_id, location):
+        """Whether the agent covers a lead of this type and location."""
+        if self.property_type_ids and property_type_id not in self.property_type_ids:
+            return False
+        if self.regions:
+            location = normalize_text(location)
+            return any(region in location for region in self.regions)
+        return True
+
+    @property
+    def is_specialist(self):
+        return bool(self.property_type_ids or self.regions)
+
+
+class AgentLoadIndex:
+    """
+    Open-lead count and last assignment of the agents of one company, with
+    heaps keyed by load and by recency so picks are O(log n). Stale heap
+    entries are dropped when popped (lazy deletion) and the heaps are rebuilt
+    when they grow past twice the live entries.
+    """
+
+    def __init__(self, loads, profiles=None):
+        """
+        ``loads``: {agent_id: open_count} of the assignable agents;
+        ``profiles``: {agent_id: AgentProfile} for skill_region.
+        """
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.profiles = dict(profiles or {})
+        # agent_id -> [open_count, last_assignment_sequence]
+        self._state = {agent_id: [count, 0] for agent_id, count in loads.items()}
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._state)
+
+    def __contains__(self, agent_id):
+        return agent_id in self._state
+
+    def count(self, agent_id):
+        return self._state[agent_id][0]
+
+    def _rebuild(self):
+        self._by_load = [
+            (count, last, agent_id) for agent_id, (count, last) in self._state.items()
+        ]
+        self._by_recency = [
+            (last, agent_id) for agent_id, (_count, last) in self._state.items()
+        ]
+        heapq.heapify(self._by_load)
+        heapq.heapify(self._by_recency)
+
+    def _push(self, agent_id):
+        count, last = self._state[agent_id]
+        heapq.heappush(self._by_load, (count, last, agent_id))
+        heapq.heappush(self._by_recency, (last, agent_id))
+        if len(self._by_load) > 2 * len(self._state) + 32:
+            self._rebuild()
+
+    def _top(self, heap, entry_of):
+        """Smallest live entry of ``heap``, popping the stale ones."""
+        while heap:
+            entry = heap[0]
+            agent_id = entry[-1]
+            if agent_id in self._state and entry == entry_of(agent_id):
+                return agent_id
+            heapq.heappop(heap)
+        return None
+
+    def adjust(self, agent_id, delta):
+        """Move an agent's open count; agents outside the index are ignored."""
+        with self._lock:
+            if agent_id in self._state and delta:
+                state = self._state[agent_id]
+                state[0] = max(state[0] + delta, 0)
+                self._push(agent_id)
+
+    def pick(self, strategy, property_type_id=None, location=None):
+        """
+        Choose an agent for a new lead and count the lead as open for that
+        agent until release() (its create delta takes over at commit).
+        Returns None when the company has no assignable agent.
+        """
+        with self._lock:
+            if strategy == "round_robin":
+                agent_id = self._top(
+                    self._by_recency, lambda a: (self._state[a][1], a)
+                )
+            elif strategy == "skill_region":
+                agent_id = self._pick_matching(property_type_id, location)
+            else:
+                agent_id = self._top(
+                    self._by_load, lambda a: (*self._state[a], a)
+                )
+            if agent_id is not None:
+                state = self._state[agent_id]
+                state[0] += 1
+                state[1] = next(self._sequence)
+                self._push(agent_id)
+            return agent_id
+
+    def _pick_matching(self, property_type_id, location):
+        matching = [
+            agent_id
+            for agent_id in self._state
+            if self.profiles.get(agent_id, AgentProfile()).matches(
+                property_type_id, location
+            )
+        ]
+        # Specialists first: a generalist only gets the lead when no
+        # specialist covers it
+        specialists = [
+            agent_id
+            for agent_id in matching
+            if self.profiles.get(agent_id, AgentProfile()).is_specialist
+        ]
+        candidates = specialists or matching
+        if not candidates:
+            return self._top(self._by_load, lambda a: (*self._state[a], a))
+        return min(candidates, key=lambda a: (*self._state[a], a))
+
+    def release(self, agent_id):
+        """Undo the provisional count of a pick()."""
+        self.adjust(agent_id, -1)
+
+
+class LoadIndexRegistry:
+    """AgentLoadIndex per key, reseeded by ``loader`` after ``ttl`` seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def get(self, key, loader, ttl=DEFAULT_RESYNC_SECONDS):
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached and time.monotonic() - cached[1] < ttl:
+                return cached[0]
+        index = loader()
+        with self._lock:
+            self._indexes[key] = (index, time.monotonic())
+        return index
+
+    def peek(self, key):
+        """The loaded index of ``key``, or None (never loads)."""
+        with self._lock:
+            cached = self._indexes.get(key)
+        return cached[0] if cached else None
+
+    def apply_deltas(self, dbname, deltas):
+        """Apply ``{(company_id, agent_id): delta}`` to the loaded indexes."""
+        for (company_id, agent_id), delta in deltas.items():
+            index = self.peek((dbname, company_id))
+            if index is not None:
+                index.adjust(agent_id, delta)
+
+    def drop(self, dbname, company_ids):
+        """Forget the indexes of ``company_ids``; they reseed on next use."""
+        with self._lock:
+            for company_id in company_ids:
+                self._indexes.pop((dbname, company_id), None)
+
+
+registry = LoadIndexRegistry()
+
+
+def open_lead_key(company_id, agent_id, state, active):
+    """``(company_id, agent_id)`` a lead counts for, or None if not open."""
+    if not active or state in CLOSED_STATES or not agent_id or not company_id:
+        return None
+    return company_id, agent_id
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Per-agent lead deduplication (FR-005a).
+
+An agent may hold only one open lead per client phone or email. Matching uses
+normalized keys: digits-only phone and lowercased email. The database
+enforces the rule with unique partial indexes on (agent_id, phone_key) and
+(agent_id, email_key); this module holds the pure part of the batched
+pre-check that turns conflicts into one readable error before any INSERT.
+"""
+import re
+
+NON_DIGITS = re.compile(r"[^0-9]")
+
+# Leads in these states (or archived) no longer block a new lead
+CLOSED_STATES = ("lost", "won")
+
+# Fields whose changes can create a duplicate
+DEDUP_FIELDS = {"agent_id", "phone", "email", "state", "active"}
+
+# (key field, raw field) pairs checked for every lead
+KEY_FIELDS = (("phone_key", "phone"), ("email_key", "email"))
+
+# Unique partial indexes created by real.estate.lead init()
+UNIQUE_INDEXES = {
+    "real_estate_lead_agent_phone_key_uniq": "phone_key",
+    "real_estate_lead_agent_email_key_uniq": "email_key",
+}
+
+
+def normalize_phone(phone):
+    """Digits-only phone used for search and matching ("(11) 9..." -> "119...")."""
+    return NON_DIGITS.sub("", phone or "") or False
+
+
+def normalize_email(email):
+    """Lowercased, stripped email used for matching."""
+    return (email or "").strip().lower() or False
+
+
+def is_open(state, active=True):
+    return bool(active) and state not in CLOSED_STATES
+
+
+def make_candidate(ref, agent_id, phone, email):
+    """
+    ``ref`` labels the lead in error messages ("row 3" in a bulk create,
+    "lead 42" on write). Returns None when there is nothing to match.
+    """
+    candidate = {
+        "ref": ref,
+        "agent_id": agent_id,
+        "phone": phone,
+        "email": email,
+        "phone_key": normalize_phone(phone),
+        "email_key": normalize_email(email),
+    }
+    if not agent_id or not (candidate["phone_key"] or candidate["email_key"]):
+        return None
+    return candidate
+
+
+def key_pairs(candidates, key_field):
+    """(agent_ids, keys) arrays for an unnest() lookup of ``key_field``."""
+    pairs = {(c["agent_id"], c[key_field]) for c in candidates if c[key_field]}
+    return [agent_id for agent_id, _key in pairs], [key for _agent, key in pairs]
+
+
+def find_batch_conflicts(candidates):
+    """Candidates of the same batch that share an agent and a key."""
+    conflicts = []
+    for key_field, raw_field in KEY_FIELDS:
+        seen = set()
+        for candidate in candidates:
+            key = candidate[key_field]
+            if not key:
+                continue
+            if (candidate["agent_id"], key) in seen:
+                conflicts.append(
+                    (candidate["ref"], raw_field, candidate[raw_field], True)
+                )
+            seen.add((candidate["agent_id"], key))
+    return conflicts
+
+
+def find_existing_conflicts(candidates, existing):
+    """
+    ``existing`` holds ``(key_field, agent_id, key)`` rows of open leads
+    already stored; every candidate matching one of them is a conflict.
+    """
+    taken = set(existing)
+    conflicts = []
+    for key_field, raw_field in KEY_FIELDS:
+        for candidate in candidates:
+            key = candidate[key_field]
+            if key and (key_field, candidate["agent_id"], key) in taken:
+                conflicts.append(
+                    (candidate["ref"], raw_field, candidate[raw_field], False)
+                )
+    return conflicts
+
+
+def duplicate_message(conflicts):
+    """
+    One conflict keeps the historical FR-005a message; several are listed
+    together so a bulk import can be fixed in one pass.
+    """
+    if len(conflicts) == 1:
+        _ref, field, value, _in_batch = conflicts[0]
+        return (
+            f"You already have an active lead with {field} {value}. "
+            f"Please edit the existing lead or add a new activity."
+        )
+    lines = [
+        f"Found {len(conflicts)} duplicate leads for the same agent. "
+        f"Please edit the existing leads or add new activities."
+    ]
+    for ref, field, value, in_batch in conflicts:
+        source = "repeated in this batch" if in_batch else "already exists"
+        lines.append(f"- {ref}: {field} {value} {source}")
+    return "\n".join(lines)
+
+
+def index_field(constraint_name):
+    """Key field guarded by a unique index name, or None."""
+    return UNIQUE_INDEXES.get(constraint_name)
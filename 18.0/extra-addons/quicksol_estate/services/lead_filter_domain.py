@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Lead filter parameters (GET /api/v1/leads query string) to search domain.
+
+Shared by the lead list and CSV export, async exports and saved filters
+(lead_filter_service), so the same parameters select the same leads
+everywhere. Pure Python — no Odoo imports.
+"""
+import logging
+import re
+from datetime import datetime
+
+_logger = logging.getLogger(__name__)
+
+# Lead fields the domains built here can match (besides the immutable
+# create_date): only writes to these change saved filter counts
+FILTER_FIELDS = frozenset(
+    {
+        "company_id",
+        "agent_id",
+        "active",
+        "state",
+        "state_changed_at",
+        "name",
+        "phone",
+        "email",
+        "budget_min",
+        "budget_max",
+        "bedrooms_needed",
+        "property_type_interest",
+        "location_preference",
+        "last_activity_at",
+    }
+)
+
+NON_DIGITS = re.compile(r"[^0-9]")
+# Shorter digit runs cannot use the trigram index and match almost every phone
+MIN_PHONE_SEARCH_DIGITS = 3
+
+
+def _parse_day(value, param_name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        _logger.warning(f"Invalid date format for {param_name}: {value}")
+        return None
+
+
+def is_pure_agent(user):
+    """FR2.1: True only for a pure Agent (no Manager/Owner/Admin override)."""
+    if user.has_group("base.group_system"):
+        return False
+    if user.has_group("quicksol_estate.group_real_estate_manager"):
+        return False
+    if user.has_group("quicksol_estate.group_real_estate_owner"):
+        return False
+    return user.has_group("quicksol_estate.group_real_estate_agent")
+
+
+def _scope_filters(params, agent_user_id, can_filter_agent):
+    domain = []
+    if agent_user_id:
+        domain.append(("agent_id.user_id", "=", agent_user_id))
+
+    # Active filter (ADR-015: soft-delete); 'all' includes both
+    active_filter = params.get("active", "true")
+    if active_filter in ("true", "false"):
+        domain.append(("active", "=", active_filter == "true"))
+
+    if params.get("state"):
+        domain.append(("state", "=", params["state"]))
+
+    if params.get("agent_id") and can_filter_agent:
+        domain.append(("agent_id", "=", int(params["agent_id"])))
+    return domain
+
+
+def _search_filter(params):
+    # Free-text search, served by the trigram indexes of real.estate.lead;
+    # digits also match the normalized phone ("(11) 9..." finds "119...")
+    search_query = (params.get("search") or "").strip()
+    if not search_query:
+        return []
+    search_domain = [
+        ("name", "ilike", search_query),
+        ("phone", "ilike", search_query),
+        ("email", "ilike", search_query),
+    ]
+    digits = NON_DIGITS.sub("", search_query)
+    if len(digits) >= MIN_PHONE_SEARCH_DIGITS:
+        search_domain.append(("phone_key", "ilike", digits))
+    return ["|"] * (len(search_domain) - 1) + search_domain
+
+
+# (parameter, field, operator, cast) of the plain value filters
+_VALUE_FILTERS = [
+    # Budget filters (FR-039, FR-040): overlap of the requested range
+    ("budget_min", "budget_max", ">=", float),
+    ("budget_max", "budget_min", "<=", float),
+    # Bedrooms filter (FR-041)
+    ("bedrooms", "bedrooms_needed", "=", int),
+    # Property type filter (FR-042)
+    ("property_type_id", "property_type_interest", "=", int),
+    # Aging filters: days in the current state, resolved against the indexed
+    # state_changed_at when the search runs (saved filters stay relative)
+    ("min_days_in_state", "days_in_state", ">=", int),
+    ("max_days_in_state", "days_in_state", "<=", int),
+]
+
+
+def _value_filters(params):
+    domain = [
+        (field, operator, cast(params[param]))
+        for param, field, operator, cast in _VALUE_FILTERS
+        if params.get(param)
+    ]
+    # Location filter (FR-043)
+    location = (params.get("location") or "").strip()
+    if location:
+        domain.append(("location_preference", "ilike", location))
+    return domain
+
+
+def _day_param(params, param_name):
+    value = (params.get(param_name) or "").strip()
+    return _parse_day(value, param_name) if value else None
+
+
+def _date_filters(params):
+    domain = []
+    # Period filter (created_from / created_to)
+    created_from = _day_param(params, "created_from")
+    if created_from:
+        domain.append(
+            ("create_date", ">=", created_from.strftime("%Y-%m-%d 00:00:00"))
+        )
+    created_to = _day_param(params, "created_to")
+    if created_to:
+        domain.append(("create_date", "<=", created_to.strftime("%Y-%m-%d 23:59:59")))
+
+    # Last activity before filter (FR-047): leads never commented or whose
+    # latest comment predates the given day (indexed column)
+    last_activity_before = _day_param(params, "last_activity_before")
+    if last_activity_before:
+        domain += [
+            "|",
+            ("last_activity_at", "=", False),
+            (
+                "last_activity_at",
+                "<",
+                last_activity_before.strftime("%Y-%m-%d 00:00:00"),
+            ),
+        ]
+    return domain
+
+
+def build_lead_filter_domain(
+    params, company_domain, agent_user_id=None, can_filter_agent=False
+):
+    """
+    Translate GET /api/v1/leads filter parameters into a search domain.
+
+    Shared by list_leads, export_leads_csv and async exports so the same
+    query string selects the same leads everywhere.
+
+    - ``company_domain``: request.company_domain (FR1.1), base of every filter
+    - ``agent_user_id``: set for pure Agents, restricting to their leads (FR2.2)
+    - ``can_filter_agent``: whether the ``agent_id`` parameter is honoured
+
+    Invalid numbers raise ValueError; invalid dates are logged and ignored.
+    """
+    return (
+        list(company_domain)
+        + _scope_filters(params, agent_user_id, can_filter_agent)
+        + _search_filter(params)
+        + _value_filters(params)
+        + _date_filters(params)
+    )
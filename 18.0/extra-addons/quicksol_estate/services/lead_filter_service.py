@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Saved lead filters (FR-048): compilation and live counts.
+
+A saved filter stores GET /api/v1/leads query parameters. They are compiled
+once, when the filter is saved, into the canonical domain list_leads would
+build for them, and hashed; filters with the same criteria share a hash.
+GET /api/v1/leads/filters?include_counts=true then counts every filter of
+the sidebar in a single scan of real_estate_lead, one
+``COUNT(*) FILTER (WHERE ...)`` per distinct hash, within the caller's
+company/agent scope. Counts are cached in Redis per scope and dropped after
+commit whenever a lead of one of the scope's companies changes.
+"""
+import hashlib
+import json
+import logging
+
+from odoo.tools import SQL
+
+from . import lead_statistics_service
+from .lead_filter_domain import build_lead_filter_domain
+
+_logger = logging.getLogger(__name__)
+
+try:
+    from odoo.addons.thedevkitchen_apigateway.services.redis_client import RedisClient
+except ImportError:
+    RedisClient = None
+
+CACHE_PREFIX = "lead_filter_counts"
+
+
+def canonical_params(params):
+    """
+    Filter parameters as list_leads receives them: string values, surrounding
+    blanks and empty values dropped, so 300000 and "300000" compile alike.
+    """
+    canonical = {}
+    for key in sorted(params):
+        value = params[key]
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        value = str(value).strip()
+        if value:
+            canonical[key] = value
+    return canonical
+
+
+def compile_filter(params):
+    """
+    ``(domain_json, domain_hash)`` of saved filter parameters; the domain is
+    the one list_leads builds, without the per-request company/agent scope.
+    Raises ValueError for invalid numbers.
+    """
+    domain = build_lead_filter_domain(
+        canonical_params(params), [], can_filter_agent=True
+    )
+    domain_json = json.dumps(domain, separators=(",", ":"), ensure_ascii=False)
+    return domain_json, hashlib.sha1(domain_json.encode("utf-8")).hexdigest()
+
+
+def load_domain(domain_json):
+    """Domain list (leaves as tuples) of a stored compiled domain."""
+    return [
+        tuple(leaf) if isinstance(leaf, list) else leaf
+        for leaf in json.loads(domain_json)
+    ]
+
+
+def cache_key(company_ids, scope):
+    """Same company encoding as lead_statistics_service.cache_key()."""
+    if company_ids:
+        companies = "," + ",".join(str(cid) for cid in sorted(company_ids)) + ","
+    else:
+        companies = "all"
+    return f"{CACHE_PREFIX}:{companies}:{scope}"
+
+
+def invalidate_companies(company_ids):
+    """Drop cached filter counts covering any of ``company_ids``."""
+    if not RedisClient:
+        return
+    try:
+        deleted = RedisClient.delete_pattern(f"{CACHE_PREFIX}:all:*")
+        for company_id in company_ids:
+            deleted += RedisClient.delete_pattern(f"{CACHE_PREFIX}:*,{company_id},*")
+        _logger.debug(
+            "[CACHE] lead filter counts invalidated companies=%s keys_deleted=%s",
+            sorted(company_ids),
+            deleted,
+        )
+    except Exception as exc:
+        _logger.warning("[CACHE] lead filter counts invalidation error: %s", exc)
+
+
+def count_filters(env, domains_by_hash, scope_domain):
+    """
+    ``{hash: count}`` for ``{hash: domain}`` in one query over the leads of
+    ``scope_domain``. A domain needing joins is counted through a sub-select
+    of the same statement, so it stays one round trip.
+    """
+    if not domains_by_hash:
+        return {}
+    # Saved domains carry their own active criterion
+    Lead = env["real.estate.lead"].sudo().with_context(active_test=False)
+    query = Lead._search(scope_domain)
+    query.order = None
+
+    hashes = sorted(domains_by_hash)
+    counts_sql = []
+    for domain_hash in hashes:
+        filter_query = Lead._search(domains_by_hash[domain_hash])
+        if filter_query._joins:
+            condition = SQL(
+                "%s IN (%s)",
+                SQL.identifier(Lead._table, "id"),
+                filter_query.subselect(),
+            )
+        else:
+            condition = filter_query.where_clause
+        if condition:
+            counts_sql.append(SQL("COUNT(*) FILTER (WHERE %s)", condition))
+        else:
+            counts_sql.append(SQL("COUNT(*)"))
+
+    [row] = env.execute_query(query.select(*counts_sql))
+    return dict(zip(hashes, row))
+
+
+def get_filter_counts(env, domains_by_hash, scope_domain, key):
+    """
+    Cached count_filters(); ``key`` comes from cache_key(). Only the hashes
+    missing from the cached map are counted, then the map is stored back.
+    """
+    counts = {}
+    if RedisClient:
+        counts = RedisClient.get_json(key) or {}
+    missing = {
+        domain_hash: domain
+        for domain_hash, domain in domains_by_hash.items()
+        if domain_hash not in counts
+    }
+    if missing:
+        counts.update(count_filters(env, missing, scope_domain))
+        if RedisClient:
+            RedisClient.set_json(key, counts, lead_statistics_service.cache_ttl(env))
+    else:
+        _logger.debug("[CACHE] lead filter counts HIT key=%s", key)
+    return {domain_hash: counts[domain_hash] for domain_hash in domains_by_hash}
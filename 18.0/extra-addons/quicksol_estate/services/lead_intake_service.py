@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Batch lead intake from real-estate portals (POST /api/v1/leads/ingest).
+
+Portals (ZAP, VivaReal, OLX...) push leads in bursts. The endpoint only
+validates the batch and appends it to real.estate.lead.intake, keyed by
+(portal, portal lead id) so a redelivered webhook is acknowledged without
+queueing the lead twice; the lead_events Celery worker then creates the
+leads in batches. This module holds the request parsing. Pure Python — no
+Odoo imports.
+"""
+
+MAX_BATCH_SIZE = 500
+MAX_EXTERNAL_ID_LENGTH = 64
+
+# Payload key -> (lead field, type)
+LEAD_FIELDS = {
+    "name": ("name", str),
+    "phone": ("phone", str),
+    "email": ("email", str),
+    "budget_min": ("budget_min", float),
+    "budget_max": ("budget_max", float),
+    "location_preference": ("location_preference", str),
+    "bedrooms_needed": ("bedrooms_needed", int),
+    "min_area": ("min_area", float),
+    "max_area": ("max_area", float),
+}
+
+# Lead Char field sizes; longer portal values are cut instead of rejected
+FIELD_SIZES = {"name": 100, "phone": 20, "email": 120}
+
+
+class IntakeBatchError(ValueError):
+    """The batch as a whole is unusable (HTTP 400)."""
+
+
+def _parse_external_id(item):
+    external_id = item.get("id")
+    if isinstance(external_id, bool) or not isinstance(external_id, (str, int)):
+        raise ValueError('"id" (portal lead id) is required')
+    external_id = str(external_id).strip()
+    if not external_id or len(external_id) > MAX_EXTERNAL_ID_LENGTH:
+        raise ValueError(
+            f'"id" must have 1 to {MAX_EXTERNAL_ID_LENGTH} characters'
+        )
+    return external_id
+
+
+def _cast_value(key, field, cast, value):
+    try:
+        if cast is str:
+            return str(value).strip()[: FIELD_SIZES.get(field)]
+        if isinstance(value, bool):
+            raise TypeError
+        return cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'"{key}" must be a {cast.__name__}') from None
+
+
+def _parse_values(item):
+    values = {}
+    for key, (field, cast) in LEAD_FIELDS.items():
+        value = item.get(key)
+        if value is None or value == "":
+            continue
+        value = _cast_value(key, field, cast, value)
+        if value != "":
+            values[field] = value
+
+    if not values.get("name"):
+        raise ValueError('"name" is required')
+    if not values.get("phone") and not values.get("email"):
+        raise ValueError('"phone" or "email" is required')
+    if "message" in item and item["message"] is not None:
+        values["message"] = str(item["message"])
+    return values
+
+
+def _parse_item(item):
+    """Return ``(external_id, values)``; ValueError describes a bad item."""
+    if not isinstance(item, dict):
+        raise ValueError("lead must be an object")
+    return _parse_external_id(item), _parse_values(item)
+
+
+def parse_intake_batch(body):
+    """
+    Validate a decoded request body ``{"portal": code, "leads": [...]}``.
+
+    Returns ``(portal_code, accepted, repeated, rejected)``: ``accepted`` is
+    a list of ``(external_id, values)`` in request order, first occurrence
+    of each id only; ``repeated`` lists the ids of the later occurrences,
+    skipped; ``rejected`` lists ``{"index", "id", "error"}`` for invalid
+    items. Raises IntakeBatchError when the batch itself is invalid.
+    """
+    if not isinstance(body, dict):
+        raise IntakeBatchError("Request body must be a JSON object")
+    portal_code = body.get("portal")
+    if not isinstance(portal_code, str) or not portal_code.strip():
+        raise IntakeBatchError('"portal" is required')
+    leads = body.get("leads")
+    if not isinstance(leads, list) or not leads:
+        raise IntakeBatchError('"leads" must be a non-empty array')
+    if len(leads) > MAX_BATCH_SIZE:
+        raise IntakeBatchError(
+            f"A batch accepts at most {MAX_BATCH_SIZE} leads, got {len(leads)}"
+        )
+
+    accepted = []
+    repeated = []
+    rejected = []
+    seen = set()
+    for index, item in enumerate(leads):
+        try:
+            external_id, values = _parse_item(item)
+        except ValueError as exc:
+            raw_id = item.get("id") if isinstance(item, dict) else None
+            rejected.append({"index": index, "id": raw_id, "error": str(exc)})
+            continue
+        if external_id in seen:
+            repeated.append(external_id)
+            continue
+        seen.add(external_id)
+        accepted.append((external_id, values))
+    return portal_code.strip(), accepted, repeated, rejected
+
+
+def lead_values(values, agent_id, company_id):
+    """
+    real.estate.lead create() values for a stored intake payload; without
+    ``agent_id`` the lead is left to the company's assignment strategy. The
+    portal ``message`` is not a lead field, see lead_message().
+    """
+    lead_vals = {
+        field: values[field]
+        for field, _cast in LEAD_FIELDS.values()
+        if field in values
+    }
+    lead_vals.update({"company_id": company_id, "source": "portal"})
+    if agent_id:
+        lead_vals["agent_id"] = agent_id
+    return lead_vals
+
+
+def lead_message(values):
+    """Portal ``message`` of a stored intake payload, posted on the lead."""
+    return (values.get("message") or "").strip() or None
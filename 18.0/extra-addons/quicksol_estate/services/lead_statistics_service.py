@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Lead statistics for GET /api/v1/leads/statistics.
+
+The totals, the per-state counts, the per-agent counts and the aging
+buckets of the open leads come from a single GROUPING SETS query over the
+endpoint's domain instead of one scan per figure. Results are cached in
+Redis per (companies, agent filter, date range) and dropped after commit
+whenever a lead of one of those companies is created or changes state,
+agent, company or active flag.
+"""
+import logging
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+try:
+    from odoo.addons.thedevkitchen_apigateway.services.redis_client import RedisClient
+except ImportError:
+    RedisClient = None
+
+LEAD_STATES = ["new", "contacted", "qualified", "won", "lost"]
+CACHE_PREFIX = "lead_stats"
+DEFAULT_CACHE_TTL = 300
+# Lead fields whose changes alter the statistics
+STATISTICS_FIELDS = {"state", "agent_id", "active", "company_id"}
+OPEN_STATES = ["new", "contacted", "qualified"]
+# (label, first day, last day) of days_in_state for open leads
+AGING_BUCKETS = [("0-7", 0, 7), ("8-30", 8, 30), ("31+", 31, None)]
+
+
+def cache_key(company_ids, scope, date_from, date_to):
+    """
+    ``company_ids`` empty means all companies (admins). Company ids are
+    wrapped in commas so invalidation can match one id with a glob.
+    """
+    if company_ids:
+        companies = "," + ",".join(str(cid) for cid in sorted(company_ids)) + ","
+    else:
+        companies = "all"
+    return f"{CACHE_PREFIX}:{companies}:{scope}:{date_from or ''}:{date_to or ''}"
+
+
+def invalidate_companies(company_ids):
+    """Drop cached statistics covering any of ``company_ids``."""
+    if not RedisClient:
+        return
+    try:
+        deleted = RedisClient.delete_pattern(f"{CACHE_PREFIX}:all:*")
+        for company_id in company_ids:
+            deleted += RedisClient.delete_pattern(f"{CACHE_PREFIX}:*,{company_id},*")
+        _logger.debug(
+            "[CACHE] lead statistics invalidated companies=%s keys_deleted=%s",
+            sorted(company_ids),
+            deleted,
+        )
+    except Exception as exc:
+        _logger.warning("[CACHE] lead statistics invalidation error: %s", exc)
+
+
+def cache_ttl(env):
+    # Same TTL setting as the agent performance metrics
+    try:
+        settings = env["thedevkitchen.security.settings"].sudo().get_settings()
+        if not settings:
+            return DEFAULT_CACHE_TTL
+        return settings.performance_cache_ttl_seconds
+    except Exception:
+        return DEFAULT_CACHE_TTL
+
+
+def compute_lead_statistics(env, domain):
+    """
+    One grouped scan of real_estate_lead: the () set gives the total and the
+    aging buckets, (state) the per-state counts and (agent_id) the per-agent
+    counts.
+    """
+    Lead = env["real.estate.lead"].sudo()
+    query = Lead._search(domain)
+    state_sql = Lead._field_to_sql(Lead._table, "state", query)
+    agent_sql = Lead._field_to_sql(Lead._table, "agent_id", query)
+    changed_sql = Lead._field_to_sql(Lead._table, "state_changed_at", query)
+    query.order = None
+    query.groupby = SQL("GROUPING SETS ((), (%s), (%s))", state_sql, agent_sql)
+    now = fields.Datetime.now()
+    aging_sql = []
+    for _label, first_day, last_day in AGING_BUCKETS:
+        # days_in_state between first_day and last_day, on the indexed column
+        condition = SQL(
+            "%s IN %s AND %s <= %s",
+            state_sql,
+            tuple(OPEN_STATES),
+            changed_sql,
+            now - timedelta(days=first_day),
+        )
+        if last_day is not None:
+            condition = SQL(
+                "%s AND %s > %s",
+                condition,
+                changed_sql,
+                now - timedelta(days=last_day + 1),
+            )
+        aging_sql.append(SQL("COUNT(*) FILTER (WHERE %s)", condition))
+    rows = env.execute_query(
+        query.select(
+            state_sql,
+            agent_sql,
+            SQL("GROUPING(%s, %s)", state_sql, agent_sql),
+            SQL("COUNT(*)"),
+            *aging_sql,
+        )
+    )
+
+    total = 0
+    by_status = dict.fromkeys(LEAD_STATES, 0)
+    agent_counts = {}
+    aging = {label: 0 for label, _first, _last in AGING_BUCKETS}
+    for state, agent_id, grouping, count, *bucket_counts in rows:
+        if grouping == 3:  # () — both columns aggregated
+            total = count
+            aging = {
+                label: bucket_count
+                for (label, _first, _last), bucket_count in zip(
+                    AGING_BUCKETS, bucket_counts
+                )
+            }
+        elif grouping == 1:  # (state)
+            if state in by_status:
+                by_status[state] = count
+        else:  # (agent_id)
+            agent_counts[agent_id] = count
+
+    # Same order as read_group: the agent model order, unassigned last
+    agents = (
+        env["real.estate.agent"]
+        .sudo()
+        .with_context(active_test=False)
+        .search([("id", "in", [aid for aid in agent_counts if aid])])
+    )
+    by_agent = [
+        {
+            "agent_id": agent.id,
+            "agent_name": agent.display_name,
+            "count": agent_counts[agent.id],
+        }
+        for agent in agents
+    ]
+    if None in agent_counts:
+        by_agent.append(
+            {"agent_id": None, "agent_name": "Unassigned", "count": agent_counts[None]}
+        )
+
+    won_count = by_status.get("won", 0)
+    conversion_rate = (won_count / total * 100) if total > 0 else 0.0
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_agent": by_agent,
+        "aging": aging,
+        "conversion_rate": round(conversion_rate, 2),
+    }
+
+
+def get_lead_statistics(env, domain, key):
+    """Cached compute_lead_statistics(); ``key`` comes from cache_key()."""
+    if RedisClient:
+        cached = RedisClient.get_json(key)
+        if cached is not None:
+            _logger.debug("[CACHE] lead statistics HIT key=%s", key)
+            return cached
+
+    stats = compute_lead_statistics(env, domain)
+
+    if RedisClient:
+        RedisClient.set_json(key, stats, cache_ttl(env))
+    return stats
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Daily agent performance rollups.
+
+real_estate_agent_performance_daily holds, per (agent, day, transaction
+type, payment status), the number of commission transactions and the sum of
+their transaction and commission amounts. Commission transaction create()
+and write() turn their changes into signed deltas that are merged here and
+upserted in one statement, so agent performance and ranking queries sum
+pre-aggregated rows (one per active day) instead of scanning transactions.
+Pure Python — no Odoo imports.
+"""
+
+
+def merge_deltas(deltas):
+    """
+    Sum ``(key, count, transaction_amount, commission_amount)`` deltas per
+    key; keys whose deltas cancel out are dropped. A single upsert cannot
+    touch the same row twice, hence one entry per key.
+    """
+    merged = {}
+    for key, count, transaction_amount, commission_amount in deltas:
+        totals = merged.setdefault(key, [0, 0.0, 0.0])
+        totals[0] += count
+        totals[1] += transaction_amount
+        totals[2] += commission_amount
+    return {
+        key: tuple(totals)
+        for key, totals in merged.items()
+        if totals[0] or totals[1] or totals[2]
+    }
+
+
+def summarize(groups):
+    """
+    Aggregated performance metrics of rollup groups
+    ``(transaction_type, payment_status, count, commission_amount)``, with
+    the definitions of GET /api/v1/agents/<id>/performance: sales are
+    counted whatever their status, commissions summed over every
+    transaction, the average is commissions per sale. ``transaction_count``
+    (every type and status) sizes the paginated transactions listing.
+    """
+    sales_count = 0
+    transaction_count = 0
+    by_status = {"pending": 0.0, "paid": 0.0, "cancelled": 0.0}
+    for transaction_type, payment_status, count, commission_amount in groups:
+        transaction_count += count
+        if transaction_type == "sale":
+            sales_count += count
+        by_status[payment_status] = by_status.get(payment_status, 0.0) + (
+            commission_amount or 0.0
+        )
+    total_commissions = sum(by_status.values())
+    return {
+        "total_sales_count": sales_count,
+        "total_commissions": total_commissions,
+        "average_commission": (
+            total_commissions / sales_count if sales_count > 0 else 0.0
+        ),
+        "pending_commissions": by_status["pending"],
+        "paid_commissions": by_status["paid"],
+        "cancelled_commissions": by_status["cancelled"],
+        "transaction_count": transaction_count,
+    }
@@ -1,16 +1,107 @@
 # -*- coding: utf-8 -*-
 
 import logging
+from datetime import timedelta
+
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+
+from . import performance_rollup_service
 
 _logger = logging.getLogger(__name__)
 
+RANKING_CACHE_KEY = (
+    "performance:ranking:{company_id}:{metric}:{limit}:{date_from}:{date_to}"
+)
+# Ranking metric -> sort column of _query_top_agents()
+RANKING_ORDER = {
+    "total_commissions": "commissions",
+    "total_sales": "sales_count",
+    "average_commission": "average",
+}
+
+# Agent fields shown in performance payloads and rankings
+AGENT_FIELDS = {"name", "company_id", "active"}
+
+# Changes of a transaction are published once it commits (schedule_invalidation)
+CHANGES_KEY = "quicksol_estate.performance_changes"
+WARM_TASK = "performance.warm_cache"
+WARM_QUEUE = "commission_events"
+# Ranking size warmed for every metric (the endpoint's default limit)
+WARM_RANKING_LIMIT = 10
+
+TRANSACTIONS_DEFAULT_LIMIT = 50
+TRANSACTIONS_MAX_LIMIT = 200
+
 try:
     from odoo.addons.thedevkitchen_apigateway.services.redis_client import RedisClient
 except ImportError:
     RedisClient = None
 
 
+def standard_periods(today):
+    """
+    ``(date_from, date_to)`` of the dashboard periods kept warm: this month
+    and last month (whole months) and the year to date.
+    """
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    last_month_end = month_start - timedelta(days=1)
+    return [
+        (month_start, month_end),
+        (last_month_end.replace(day=1), last_month_end),
+        (today.replace(month=1, day=1), today),
+    ]
+
+
+def schedule_invalidation(env, agent_ids=(), company_ids=()):
+    """
+    Publish a performance change of ``agent_ids`` and ``company_ids`` when
+    the transaction commits (a rollback keeps the cache valid). Changes are
+    collected per transaction, so bulk writes publish once.
+    """
+    data = env.cr.postcommit.data
+    if CHANGES_KEY not in data:
+        changes = data[CHANGES_KEY] = {"agents": set(), "companies": set()}
+        env.cr.postcommit.add(lambda: publish_changes(changes))
+    changes = data[CHANGES_KEY]
+    changes["agents"].update(agent_id for agent_id in agent_ids if agent_id)
+    changes["companies"].update(cid for cid in company_ids if cid)
+
+
+def publish_changes(changes):
+    """
+    Drop the cached performance of the changed agents and the rankings of
+    the changed companies, then ask the commission worker to recompute the
+    standard periods (real.estate.agent.warm_performance_cache). Without a
+    broker the entries are simply recomputed on their next read.
+    """
+    agent_ids = sorted(changes["agents"])
+    company_ids = sorted(changes["companies"])
+    for agent_id in agent_ids:
+        PerformanceService.invalidate_cache(agent_id)
+    for company_id in company_ids:
+        PerformanceService.invalidate_ranking_cache(company_id)
+    if not RedisClient or not (agent_ids or company_ids):
+        return
+    try:
+        from odoo.addons.quicksol_estate.services.celery_client import send_task
+
+        send_task(
+            WARM_TASK,
+            kwargs={"agent_ids": agent_ids, "company_ids": company_ids},
+            queue=WARM_QUEUE,
+        )
+    except Exception:
+        _logger.warning(
+            "Failed to enqueue the performance cache warm-up of agents=%s "
+            "companies=%s",
+            agent_ids,
+            company_ids,
+            exc_info=True,
+        )
+
+
 class PerformanceService:
 
     def __init__(self, env):
@@ -24,6 +115,79 @@ class PerformanceService:
             self.cache_ttl = 300
 
     def get_agent_performance(self, agent_id, date_from=None, date_to=None):
+        agent = self._get_visible_agent(agent_id)
+
+        # Check cache first
+        cache_key = self._agent_cache_key(agent_id, date_from, date_to)
+        cached_data = self._get_cached_performance(cache_key)
+        if cached_data:
+            _logger.info(f"Performance cache HIT for agent {agent_id}")
+            return cached_data
+
+        performance_data = self._build_agent_performance(agent, date_from, date_to)
+
+        # Cache the result
+        self._cache_performance(cache_key, performance_data)
+        return performance_data
+
+    def list_agent_transactions(
+        self, agent_id, date_from=None, date_to=None, limit=None, after=None
+    ):
+        """
+        One page of the agent's commission transactions of the period, newest
+        first, keyset-paginated on (transaction_date, id): ``after`` is the
+        ``(transaction_date, id)`` of the last row of the previous page.
+        Never cached. Returns ``(transactions, has_more)``.
+        """
+        agent = self._get_visible_agent(agent_id)
+        limit = min(limit or TRANSACTIONS_DEFAULT_LIMIT, TRANSACTIONS_MAX_LIMIT)
+
+        domain = [("agent_id", "=", agent.id)]
+        if date_from:
+            domain.append(("transaction_date", ">=", date_from))
+        if date_to:
+            domain.append(("transaction_date", "<=", date_to))
+        if after:
+            after_date, after_id = after
+            domain += [
+                "|",
+                ("transaction_date", "<", after_date),
+                "&",
+                ("transaction_date", "=", after_date),
+                ("id", "<", after_id),
+            ]
+        rows = (
+            self.env["real.estate.commission.transaction"]
+            .sudo()
+            .search_read(
+                domain,
+                [
+                    "transaction_date",
+                    "transaction_amount",
+                    "commission_amount",
+                    "payment_status",
+                    "transaction_reference",
+                    "transaction_type",
+                ],
+                order="transaction_date desc, id desc",
+                limit=limit + 1,
+            )
+        )
+        transactions = [
+            {
+                "id": row["id"],
+                "date": str(row["transaction_date"]),
+                "amount": row["transaction_amount"],
+                "commission": row["commission_amount"],
+                "status": row["payment_status"],
+                "reference": row["transaction_reference"] or "",
+                "type": row["transaction_type"],
+            }
+            for row in rows[:limit]
+        ]
+        return transactions, len(rows) > limit
+
+    def _get_visible_agent(self, agent_id):
         # Validate agent exists
         agent = self.env["real.estate.agent"].sudo().browse(agent_id)
         if not agent.exists():
@@ -34,17 +198,15 @@ class PerformanceService:
         if hasattr(user, "company_ids"):
             if agent.company_id.id not in user.company_ids.ids:
                 raise UserError("Access denied: Agent belongs to a different company")
+        return agent
 
-        # Check cache first
+    @staticmethod
+    def _agent_cache_key(agent_id, date_from, date_to):
         if RedisClient:
-            cache_key = RedisClient.performance_key(agent_id, str(date_from), str(date_to))
-        else:
-            cache_key = f"performance:agent:{agent_id}:{date_from}:{date_to}"
-        cached_data = self._get_cached_performance(cache_key)
-        if cached_data:
-            _logger.info(f"Performance cache HIT for agent {agent_id}")
-            return cached_data
+            return RedisClient.performance_key(agent_id, str(date_from), str(date_to))
+        return f"performance:agent:{agent_id}:{date_from}:{date_to}"
 
+    def _build_agent_performance(self, agent, date_from, date_to):
         # Calculate performance metrics
         metrics = self._calculate_performance_metrics(agent, date_from, date_to)
 
@@ -59,12 +221,8 @@ class PerformanceService:
                 "date_to": str(date_to) if date_to else None,
             },
             "metrics": metrics["aggregated"],
-            "transactions": metrics["transactions"],
         }
 
-        # Cache the result
-        self._cache_performance(cache_key, performance_data)
-
         _logger.info(
             f'Calculated performance for agent {agent.name}: {metrics["aggregated"]["total_sales_count"]} sales, R$ {metrics["aggregated"]["total_commissions"]:,.2f} total'
         )
@@ -81,7 +239,7 @@ class PerformanceService:
     ):
 
         # Validate metric
-        valid_metrics = ["total_commissions", "total_sales", "average_commission"]
+        valid_metrics = list(RANKING_ORDER)
         if metric not in valid_metrics:
             raise ValidationError(
                 f'Invalid metric: {metric}. Must be one of: {", ".join(valid_metrics)}'
@@ -100,46 +258,25 @@ class PerformanceService:
                     "Access denied: Cannot view rankings for different company"
                 )
 
-        # Get all active agents for this company
-        agents = (
-            self.env["real.estate.agent"]
-            .sudo()
-            .search(
-                [
-                    ("company_id", "=", company_id),
-                    ("active", "=", True),
-                ]
-            )
+        cache_key = RANKING_CACHE_KEY.format(
+            company_id=company_id,
+            metric=metric,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
         )
+        cached_data = self._get_cached_performance(cache_key)
+        if cached_data:
+            return cached_data
 
-        # Calculate performance for each agent
-        agent_performances = []
-        for agent in agents:
-            metrics = self._calculate_performance_metrics(agent, date_from, date_to)
-
-            agent_performances.append(
-                {
-                    "agent_id": agent.id,
-                    "agent_name": agent.name,
-                    "total_sales_count": metrics["aggregated"]["total_sales_count"],
-                    "total_commissions": metrics["aggregated"]["total_commissions"],
-                    "average_commission": metrics["aggregated"]["average_commission"],
-                    "active_properties_count": metrics["aggregated"][
-                        "active_properties_count"
-                    ],
-                }
-            )
-
-        # Sort by selected metric (descending)
-        if metric == "total_commissions":
-            agent_performances.sort(key=lambda x: x["total_commissions"], reverse=True)
-        elif metric == "total_sales":
-            agent_performances.sort(key=lambda x: x["total_sales_count"], reverse=True)
-        elif metric == "average_commission":
-            agent_performances.sort(key=lambda x: x["average_commission"], reverse=True)
+        ranking_data = self._build_ranking(company, metric, limit, date_from, date_to)
+        self._cache_performance(cache_key, ranking_data)
+        return ranking_data
 
-        # Apply limit and add ranking
-        top_agents = agent_performances[:limit]
+    def _build_ranking(self, company, metric, limit, date_from, date_to):
+        top_agents = self._query_top_agents(
+            company.id, metric, limit, date_from, date_to
+        )
         for idx, agent_data in enumerate(top_agents, start=1):
             agent_data["rank"] = idx
 
@@ -147,7 +284,7 @@ class PerformanceService:
             f"Generated ranking for company {company.name}: top {len(top_agents)} agents by {metric}"
         )
 
-        return {
+        ranking_data = {
             "company_id": company.id,
             "company_name": company.name,
             "metric": metric,
@@ -157,81 +294,137 @@ class PerformanceService:
             },
             "ranking": top_agents,
         }
+        return ranking_data
+
+    def warm_cache(self, agents, companies, periods):
+        """
+        Recompute and store the performance of ``agents`` and the rankings
+        of ``companies`` (every metric, default limit) for ``periods``,
+        whatever is cached. Access checks are the caller's. Returns the
+        number of entries stored.
+        """
+        if not RedisClient:
+            return 0
+        stored = 0
+        for agent in agents:
+            for date_from, date_to in periods:
+                self._cache_performance(
+                    self._agent_cache_key(agent.id, date_from, date_to),
+                    self._build_agent_performance(agent, date_from, date_to),
+                )
+                stored += 1
+        for company in companies:
+            for metric in RANKING_ORDER:
+                for date_from, date_to in periods:
+                    self._cache_performance(
+                        RANKING_CACHE_KEY.format(
+                            company_id=company.id,
+                            metric=metric,
+                            limit=WARM_RANKING_LIMIT,
+                            date_from=date_from,
+                            date_to=date_to,
+                        ),
+                        self._build_ranking(
+                            company, metric, WARM_RANKING_LIMIT, date_from, date_to
+                        ),
+                    )
+                    stored += 1
+        return stored
+
+    def _query_top_agents(self, company_id, metric, limit, date_from, date_to):
+        """
+        Ranking rows of the company's active agents from one grouped query
+        over the daily performance rollups, sorted and limited in SQL (ties
+        keep the agent order: name). Agents without transactions rank with
+        zeros, as before.
+        """
+        self.env["real.estate.agent"].flush_model(["company_id", "active", "name"])
+        date_filter = SQL()
+        if date_from:
+            date_filter = SQL("%s AND daily.day >= %s", date_filter, date_from)
+        if date_to:
+            date_filter = SQL("%s AND daily.day <= %s", date_filter, date_to)
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT id, name, sales_count, commissions,
+                       CASE WHEN sales_count > 0
+                            THEN commissions / sales_count ELSE 0 END AS average
+                  FROM (
+                        SELECT agent.id, agent.name,
+                               COALESCE(SUM(daily.transaction_count) FILTER (
+                                   WHERE daily.transaction_type = 'sale'
+                               ), 0) AS sales_count,
+                               COALESCE(SUM(daily.commission_amount), 0)
+                                   AS commissions
+                          FROM real_estate_agent agent
+                     LEFT JOIN real_estate_agent_performance_daily daily
+                            ON daily.agent_id = agent.id %s
+                         WHERE agent.company_id = %s
+                           AND agent.active
+                         GROUP BY agent.id
+                       ) totals
+                 ORDER BY %s DESC, name, id
+                 LIMIT %s
+                """,
+                date_filter,
+                company_id,
+                SQL.identifier(RANKING_ORDER[metric]),
+                limit,
+            )
+        )
+
+        # Active assignments of the listed agents only (not date filtered)
+        groups = (
+            self.env["real.estate.agent.property.assignment"]
+            .sudo()
+            ._read_group(
+                [("agent_id", "in", [row[0] for row in rows]), ("active", "=", True)],
+                ["agent_id"],
+                ["__count"],
+            )
+        )
+        counts_by_agent = {agent.id: count for agent, count in groups}
+        return [
+            {
+                "agent_id": agent_id,
+                "agent_name": name,
+                "total_sales_count": sales_count,
+                "total_commissions": float(commissions),
+                "average_commission": float(average),
+                "active_properties_count": counts_by_agent.get(agent_id, 0),
+            }
+            for agent_id, name, sales_count, commissions, average in rows
+        ]
 
     def _calculate_performance_metrics(self, agent, date_from=None, date_to=None):
 
-        # Build search domain for transactions
-        domain = [("agent_id", "=", agent.id)]
+        # Build search domain for the period
+        rollup_domain = [("agent_id", "=", agent.id)]
 
         # Apply date filtering
         if date_from:
-            domain.append(("transaction_date", ">=", date_from))
+            rollup_domain.append(("day", ">=", date_from))
         if date_to:
-            domain.append(("transaction_date", "<=", date_to))
+            rollup_domain.append(("day", "<=", date_to))
 
-        # Search transactions
-        transactions = (
-            self.env["real.estate.commission.transaction"]
+        # Aggregated metrics from the daily rollups: one row per active day
+        groups = (
+            self.env["real.estate.agent.performance.daily"]
             .sudo()
-            .search(domain, order="transaction_date desc")
-        )
-
-        # Calculate aggregated metrics
-        total_sales_count = len(
-            transactions.filtered(lambda t: t.transaction_type == "sale")
-        )
-        total_commissions = sum(transactions.mapped("commission_amount"))
-        average_commission = (
-            total_commissions / total_sales_count if total_sales_count > 0 else 0.0
-        )
-
-        # Calculate by payment status
-        pending_commissions = sum(
-            transactions.filtered(lambda t: t.payment_status == "pending").mapped(
-                "commission_amount"
-            )
-        )
-        paid_commissions = sum(
-            transactions.filtered(lambda t: t.payment_status == "paid").mapped(
-                "commission_amount"
-            )
-        )
-        cancelled_commissions = sum(
-            transactions.filtered(lambda t: t.payment_status == "cancelled").mapped(
-                "commission_amount"
+            ._read_group(
+                rollup_domain,
+                ["transaction_type", "payment_status"],
+                ["transaction_count:sum", "commission_amount:sum"],
             )
         )
+        aggregated = performance_rollup_service.summarize(groups)
 
         # Active properties count (not filtered by date)
-        active_properties_count = len(agent.assignment_ids.filtered("active"))
-
-        # Serialize transactions for response
-        transactions_data = []
-        for transaction in transactions:
-            transactions_data.append(
-                {
-                    "id": transaction.id,
-                    "date": str(transaction.transaction_date),
-                    "amount": transaction.transaction_amount,
-                    "commission": transaction.commission_amount,
-                    "status": transaction.payment_status,
-                    "reference": transaction.transaction_reference or "",
-                    "type": transaction.transaction_type,
-                }
-            )
+        aggregated["active_properties_count"] = agent.active_properties_count
 
-        return {
-            "aggregated": {
-                "total_sales_count": total_sales_count,
-                "total_commissions": total_commissions,
-                "average_commission": average_commission,
-                "active_properties_count": active_properties_count,
-                "pending_commissions": pending_commissions,
-                "paid_commissions": paid_commissions,
-                "cancelled_commissions": cancelled_commissions,
-            },
-            "transactions": transactions_data,
-        }
+        # Transactions themselves are paged by list_agent_transactions()
+        return {"aggregated": aggregated}
 
     def _get_cached_performance(self, cache_key):
         if not RedisClient:
@@ -256,7 +449,18 @@ class PerformanceService:
         except Exception as exc:
             _logger.warning('[CACHE] performance write error key=%s: %s', cache_key, exc)
 
-    def invalidate_cache(self, agent_id):
+    @staticmethod
+    def invalidate_ranking_cache(company_id):
+        if not RedisClient:
+            return
+        try:
+            deleted = RedisClient.delete_pattern(f'performance:ranking:{company_id}:*')
+            _logger.info('[CACHE] ranking invalidated company=%s keys_deleted=%s', company_id, deleted)
+        except Exception as exc:
+            _logger.warning('[CACHE] ranking invalidation error company=%s: %s', company_id, exc)
+
+    @staticmethod
+    def invalidate_cache(agent_id):
         if not RedisClient:
             return
         try:
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Per-company listing feeds for real-estate portals.
+
+Each real-estate company has one JSON feed file under
+``<data_dir>/portal_feeds/<db>/<token>.json`` holding its published
+properties. res.company._update_portal_feed() patches it incrementally from
+the property change log and this module writes it atomically, so crawlers
+are served a static file (GET /api/v1/portal-feeds/<token>.json) and never
+reach the ORM. Pure Python — no Odoo imports.
+"""
+import json
+import os
+import re
+import tempfile
+
+FEED_DIRNAME = "portal_feeds"
+FEED_VERSION = 1
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+def feed_dir(data_dir, dbname):
+    return os.path.join(data_dir, FEED_DIRNAME, dbname)
+
+
+def feed_path(data_dir, dbname, token):
+    """Path of a company feed; ValueError for tokens that could escape the dir."""
+    if not token or not TOKEN_PATTERN.match(token):
+        raise ValueError("Invalid feed token")
+    return os.path.join(feed_dir(data_dir, dbname), f"{token}.json")
+
+
+def load_feed(path):
+    """Return the stored feed dict, or None when missing or unreadable."""
+    try:
+        with open(path, "rb") as fh:
+            feed = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(feed, dict) or feed.get("version") != FEED_VERSION:
+        return None
+    return feed
+
+
+def serialize_listing(prop):
+    """Public listing entry: no owner, commission or internal data."""
+    return {
+        "id": prop.id,
+        "reference": prop.reference_code or "",
+        "title": prop.name or "",
+        "description": prop.description or "",
+        "property_type": prop.property_type_id.name or None,
+        "for_sale": bool(prop.for_sale),
+        "for_rent": bool(prop.for_rent),
+        "price": float(prop.price or 0.0),
+        "rent_price": float(prop.rent_price or 0.0),
+        "condominium_fee": float(prop.condominium_fee or 0.0),
+        "currency": prop.currency_id.name or None,
+        "featured": bool(prop.publish_featured),
+        "super_featured": bool(prop.publish_super_featured),
+        "address": {
+            "street": prop.street or "",
+            "neighborhood": prop.neighborhood or "",
+            "city": prop.city or "",
+            "state": prop.state_id.code or None,
+            "zip_code": prop.zip_code or "",
+        },
+        "features": {
+            "bedrooms": prop.num_rooms or 0,
+            "suites": prop.num_suites or 0,
+            "bathrooms": prop.num_bathrooms or 0,
+            "parking_spaces": prop.num_parking or 0,
+            "area": float(prop.area or 0.0),
+            "total_area": float(prop.total_area or 0.0),
+        },
+        "agent": (
+            {
+                "name": prop.agent_id.name or "",
+                "email": prop.agent_id.email or "",
+                "phone": prop.agent_id.mobile or prop.agent_id.phone or "",
+            }
+            if prop.agent_id
+            else None
+        ),
+        "updated_at": prop.write_date.isoformat() if prop.write_date else None,
+    }
+
+
+def build_feed(company, listings, cursor, generated_at):
+    """Assemble a feed; listings are sorted by id for stable diffs."""
+    ordered = sorted(listings, key=lambda listing: listing["id"])
+    return {
+        "version": FEED_VERSION,
+        "company": company,
+        "generated_at": generated_at,
+        "cursor": cursor,
+        "count": len(ordered),
+        "listings": ordered,
+    }
+
+
+def apply_changes(feed, upserts, removed_ids, cursor, generated_at):
+    """
+    Return a new feed with ``upserts`` (listing dicts) replacing or adding
+    entries and ``removed_ids`` dropped. Untouched listings are kept as-is.
+    """
+    listings = {listing["id"]: listing for listing in feed.get("listings", [])}
+    for property_id in removed_ids:
+        listings.pop(property_id, None)
+    for listing in upserts:
+        listings[listing["id"]] = listing
+    return build_feed(feed.get("company"), listings.values(), cursor, generated_at)
+
+
+def write_feed_atomic(path, feed):
+    """Write ``feed`` via a temp file + rename so readers never see partial JSON."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=directory, prefix=".feed-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(feed, fh, ensure_ascii=False, separators=(",", ":"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(partial, 0o644)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+
+
+def feed_etag(stat_result):
+    """Strong validator from mtime and size; every atomic rewrite changes mtime."""
+    return f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming upload spooling.
+
+Copies an uploaded file stream to a temporary file in fixed-size chunks while
+computing its SHA-1 (the filestore key used by ir.attachment) and enforcing the
+size limit, so the request never holds the whole file in memory. The first
+bytes are kept aside for magic-bytes MIME detection.
+
+Shared by the property attachments API and CmsMediaService.upload; the
+filestore write itself lives in ir.attachment._create_from_spooled().
+Pure Python — no Odoo imports.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+MIME_SNIFF_BYTES = 2048
+
+
+class UploadTooLarge(ValueError):
+    """Raised when the stream exceeds ``limit``; ``size`` is the full stream size."""
+
+    def __init__(self, limit, size):
+        super().__init__(f"Upload of {size} bytes exceeds the {limit} bytes limit")
+        self.limit = limit
+        self.size = size
+
+
+class SpooledUpload:
+    """Temporary copy of an upload; use as a context manager to remove it."""
+
+    def __init__(self, path, size, checksum, head):
+        self.path = path
+        self.size = size
+        self.checksum = checksum
+        self.head = head
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def copy_to(self, destination):
+        """Copy the spooled content to ``destination`` atomically."""
+        directory = os.path.dirname(destination)
+        fd, partial = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as target, self.open() as source:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+            os.replace(partial, destination)
+        except BaseException:
+            if os.path.exists(partial):
+                os.unlink(partial)
+            raise
+
+    def close(self):
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def spool_upload(stream, max_bytes, chunk_size=CHUNK_SIZE):
+    """
+    Spool ``stream`` to a temporary file and return a SpooledUpload.
+
+    Raises UploadTooLarge once more than ``max_bytes`` have been read; the
+    remainder of the stream is only counted (not stored) so the error can
+    report the real size.
+    """
+    sha = hashlib.sha1()
+    head = b""
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    continue
+                if len(head) < MIME_SNIFF_BYTES:
+                    head += chunk[: MIME_SNIFF_BYTES - len(head)]
+                sha.update(chunk)
+                spool.write(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes, size)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledUpload(path, size, sha.hexdigest(), head)
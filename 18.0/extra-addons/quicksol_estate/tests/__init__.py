@@ -20,6 +20,24 @@ from .integration import test_proposal_list
 from .integration import test_proposal_attachments
 from .integration import test_proposal_expiration
 from .integration import test_validation_gaps
+from .integration import test_property_changes
+from .integration import test_lead_last_activity
+from .integration import test_lead_statistics
+from .integration import test_lead_search
+from .integration import test_lead_dedup
+from .integration import test_lead_intake
+from .integration import test_lead_recent_activities
+from .integration import test_lead_filter_counts
+from .integration import test_lead_assignment
+from .integration import test_lead_aging
+from .integration import test_performance_ranking
+from .integration import test_agent_performance_rollup
+from .integration import test_performance_cache_events
+from .integration import test_performance_transactions
+from .integration import test_agent_statistics
+from .integration import test_commission_rule_index
+from .integration import test_commission_batch
+from .integration import test_commission_statements
 
 # Observer pattern tests
 from . import observers
@@ -32,3 +32,57 @@ from . import test_proposal_expiration
 
 # 2026-07 ADR-003 validation-coverage audit gap fixes
 from . import test_validation_gaps
+
+# Commit-ordered property change feed and company-move tombstones
+from . import test_property_changes
+
+# FR-047: stored lead activity timestamp
+from . import test_lead_last_activity
+
+# Single-query lead statistics (GROUPING SETS) + benchmark
+from . import test_lead_statistics
+
+# FR-045: trigram lead search + normalized phone
+from . import test_lead_search
+
+# FR-005a: unique per-agent lead phone/email keys + batched pre-check
+from . import test_lead_dedup
+
+# Portal lead webhooks: idempotent intake + batched lead creation
+from . import test_lead_intake
+
+# FR-035: recent activities of a lead page in one window-function query
+from . import test_lead_recent_activities
+
+# FR-048: saved lead filter counts in one query
+from . import test_lead_filter_counts
+
+# FR-002b: automatic lead assignment by company strategy
+from . import test_lead_assignment
+
+# Lead aging: stored state_changed_at behind days_in_state
+from . import test_lead_aging
+
+# Agent ranking from one grouped commission query
+from . import test_performance_ranking
+
+# Daily agent performance rollups behind performance and ranking reads
+from . import test_agent_performance_rollup
+
+# Performance cache invalidation events and warm-up
+from . import test_performance_cache_events
+
+# Keyset-paginated transactions of agent performance
+from . import test_performance_transactions
+
+# Agent statistic fields computed per recordset with grouped queries
+from . import test_agent_statistics
+
+# Commission rules resolved from the in-memory per-company rule index
+from . import test_commission_rule_index
+
+# Batch commission calculation with a single insert and dry-run mode
+from . import test_commission_batch
+
+# Monthly commission statement runs (one aggregated pass, files as attachments)
+from . import test_commission_statements
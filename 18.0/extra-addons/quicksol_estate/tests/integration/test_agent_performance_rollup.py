@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for real.estate.agent.performance.daily.
+
+The rollups must always equal the commission transactions summed per
+(agent, day, type, payment status): after create(), after payment status
+changes and after a rebuild from scratch.
+"""
+from datetime import date, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from ...services.performance_service import PerformanceService
+
+
+@tagged("post_install", "-at_install")
+class TestAgentPerformanceRollup(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Rollup Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        cls.agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Rollup Agent",
+                "cpf": "390.533.447-05",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.today = date.today()
+        cls.rule = cls.env["real.estate.commission.rule"].create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "sale",
+                "structure_type": "percentage",
+                "percentage": 3.0,
+                "valid_from": cls.today - timedelta(days=90),
+                "valid_until": cls.today + timedelta(days=365),
+            }
+        )
+        cls.Rollup = cls.env["real.estate.agent.performance.daily"]
+        cls.transactions = cls.env["real.estate.commission.transaction"]
+        for position, (kind, commission, days_ago) in enumerate(
+            [
+                ("sale", 3000.0, 1),
+                ("sale", 1500.0, 1),
+                ("rental", 800.0, 1),
+                ("sale", 6000.0, 20),
+            ]
+        ):
+            cls.transactions |= cls._create_transaction(
+                kind, commission, days_ago, f"ROLLUP-{position}"
+            )
+
+    @classmethod
+    def _create_transaction(cls, kind, commission, days_ago, reference):
+        return cls.env["real.estate.commission.transaction"].create(
+            {
+                "agent_id": cls.agent.id,
+                "rule_id": cls.rule.id,
+                "transaction_type": kind,
+                "transaction_amount": commission / 0.03,
+                "commission_amount": commission,
+                "rule_snapshot": '{"percentage": 3.0}',
+                "transaction_date": cls.today - timedelta(days=days_ago),
+                "transaction_reference": reference,
+            }
+        )
+
+    def _rollup_rows(self):
+        rows = self.Rollup.search([("agent_id", "=", self.agent.id)])
+        return {
+            (row.day, row.transaction_type, row.payment_status): (
+                row.transaction_count,
+                row.transaction_amount,
+                row.commission_amount,
+            )
+            for row in rows
+        }
+
+    def _expected_rows(self):
+        expected = {}
+        for transaction in self.transactions:
+            key = (
+                transaction.transaction_date,
+                transaction.transaction_type,
+                transaction.payment_status,
+            )
+            count, amount, commission = expected.get(key, (0, 0.0, 0.0))
+            expected[key] = (
+                count + 1,
+                amount + transaction.transaction_amount,
+                commission + transaction.commission_amount,
+            )
+        return expected
+
+    def test_create_adds_to_the_day_bucket(self):
+        self.assertEqual(self._rollup_rows(), self._expected_rows())
+        yesterday = self.today - timedelta(days=1)
+        self.assertEqual(
+            self._rollup_rows()[(yesterday, "sale", "pending")],
+            (2, 150000.0, 4500.0),
+        )
+
+    def test_payment_status_moves_between_buckets(self):
+        self.transactions[0].action_mark_paid()
+        self.transactions[2].action_cancel()
+        # No change: already cancelled transactions stay where they are
+        self.transactions[2].write({"payment_status": "cancelled"})
+        self.assertEqual(self._rollup_rows(), self._expected_rows())
+
+        self.transactions[1].action_mark_paid()
+        yesterday = self.today - timedelta(days=1)
+        rows = self._rollup_rows()
+        self.assertNotIn((yesterday, "sale", "pending"), rows)
+        self.assertEqual(rows[(yesterday, "sale", "paid")], (2, 150000.0, 4500.0))
+
+    def test_rebuild_matches_incremental_rows(self):
+        self.transactions[3].action_mark_paid()
+        incremental = self._rollup_rows()
+        self.env.cr.execute("DELETE FROM real_estate_agent_performance_daily")
+        self.Rollup.invalidate_model()
+
+        self.assertTrue(self.Rollup._rebuild(self.agent.ids))
+        self.assertEqual(self._rollup_rows(), incremental)
+        self.assertEqual(self._rollup_rows(), self._expected_rows())
+
+    def test_performance_metrics_from_rollups(self):
+        self.transactions[0].action_mark_paid()
+        service = PerformanceService(self.env)
+        metrics = service._calculate_performance_metrics(self.agent)["aggregated"]
+        self.assertEqual(metrics["total_sales_count"], 3)
+        self.assertEqual(metrics["total_commissions"], 11300.0)
+        self.assertEqual(metrics["average_commission"], 11300.0 / 3)
+        self.assertEqual(metrics["paid_commissions"], 3000.0)
+        self.assertEqual(metrics["pending_commissions"], 8300.0)
+
+        recent = service._calculate_performance_metrics(
+            self.agent, self.today - timedelta(days=7)
+        )
+        self.assertEqual(recent["aggregated"]["total_sales_count"], 2)
+        self.assertEqual(recent["aggregated"]["total_commissions"], 5300.0)
+        self.assertEqual(recent["aggregated"]["transaction_count"], 3)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the batched agent statistic fields.
+
+total_sales_count, total_commissions, average_commission and
+active_properties_count are computed for a whole recordset with grouped
+queries; the values must match the per-agent definitions and follow new
+transactions.
+"""
+from datetime import date, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+# agent index -> [(type, commission)]
+TRANSACTIONS = {
+    0: [("sale", 3000.0), ("sale", 1000.0), ("rental", 500.0)],
+    1: [("rental", 800.0)],
+    2: [],
+}
+
+
+@tagged("post_install", "-at_install")
+class TestAgentStatistics(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Stats Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        Agent = cls.env["real.estate.agent"]
+        cls.agents = Agent.browse()
+        for index, cpf in enumerate(
+            ["529.982.247-25", "390.533.447-05", "246.813.579-28"]
+        ):
+            cls.agents |= Agent.create(
+                {
+                    "name": f"Stats Agent {index}",
+                    "cpf": cpf,
+                    "company_id": cls.company.id,
+                }
+            )
+        today = date.today()
+        cls.rules = {}
+        for index, transactions in TRANSACTIONS.items():
+            agent = cls.agents[index]
+            cls.rules[index] = cls.env["real.estate.commission.rule"].create(
+                {
+                    "agent_id": agent.id,
+                    "company_id": cls.company.id,
+                    "transaction_type": "sale",
+                    "structure_type": "percentage",
+                    "percentage": 3.0,
+                    "valid_from": today - timedelta(days=90),
+                    "valid_until": today + timedelta(days=365),
+                }
+            )
+            for kind, commission in transactions:
+                cls._create_transaction(index, kind, commission)
+
+    @classmethod
+    def _create_transaction(cls, index, kind, commission):
+        return cls.env["real.estate.commission.transaction"].create(
+            {
+                "agent_id": cls.agents[index].id,
+                "rule_id": cls.rules[index].id,
+                "transaction_type": kind,
+                "transaction_amount": commission / 0.03,
+                "commission_amount": commission,
+                "rule_snapshot": '{"percentage": 3.0}',
+            }
+        )
+
+    def _statistics(self):
+        self.agents.invalidate_recordset(
+            ["total_sales_count", "total_commissions", "average_commission"]
+        )
+        return [
+            (agent.total_sales_count, agent.total_commissions, agent.average_commission)
+            for agent in self.agents
+        ]
+
+    def test_recordset_statistics(self):
+        self.assertEqual(
+            self._statistics(),
+            [(2, 4500.0, 2250.0), (0, 800.0, 0.0), (0, 0.0, 0.0)],
+        )
+
+    def test_statistics_follow_new_transactions(self):
+        self._create_transaction(1, "sale", 1200.0)
+        self.assertEqual(self._statistics()[1], (1, 2000.0, 2000.0))
+
+    def test_new_record_has_empty_statistics(self):
+        agent = self.env["real.estate.agent"].new({"name": "Draft Agent"})
+        self.assertEqual(agent.total_sales_count, 0)
+        self.assertEqual(agent.total_commissions, 0.0)
+        self.assertEqual(agent.active_properties_count, 0)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the batch commission calculation.
+
+CommissionService.calculate_batch() groups transactions by rule, computes
+their commissions in Decimal and records them in one create(): results
+must match the per-transaction calculation, a dry run must not write, the
+prospector split must add up and one invalid transaction rejects the batch.
+"""
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.quicksol_estate.services.commission_service import (
+    CommissionService,
+)
+
+SPLIT_PARAM = "quicksol_estate.prospector_commission_percentage"
+
+
+@tagged("post_install", "-at_install")
+class TestCommissionBatch(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Batch Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        Agent = cls.env["real.estate.agent"]
+        cls.agent, cls.other_agent, cls.prospector = [
+            Agent.create(
+                {
+                    "name": f"Batch Agent {index}",
+                    "cpf": cpf,
+                    "company_id": cls.company.id,
+                }
+            )
+            for index, cpf in enumerate(
+                ["529.982.247-25", "390.533.447-05", "246.813.579-28"]
+            )
+        ]
+        today = date.today()
+        Rule = cls.env["real.estate.commission.rule"]
+        cls.percentage_rule = Rule.create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "both",
+                "structure_type": "percentage",
+                "percentage": 6.0,
+                "valid_from": today - timedelta(days=60),
+                "max_value": 2000000.0,
+            }
+        )
+        cls.fixed_rule = Rule.create(
+            {
+                "agent_id": cls.other_agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "rental",
+                "structure_type": "fixed",
+                "fixed_amount": 800.0,
+                "valid_from": today - timedelta(days=60),
+            }
+        )
+        cls.env["ir.config_parameter"].sudo().set_param(SPLIT_PARAM, "0.30")
+        cls.service = CommissionService(cls.env)
+        cls.Transaction = cls.env["real.estate.commission.transaction"]
+
+    def _items(self):
+        return [
+            {
+                "agent_id": self.agent.id,
+                "transaction_type": "sale",
+                "transaction_amount": 850000.0,
+                "transaction_reference": "BATCH-1",
+            },
+            {
+                "agent_id": self.other_agent.id,
+                "transaction_type": "rental",
+                "transaction_amount": 3500.0,
+            },
+            {
+                "agent_id": self.agent.id,
+                "transaction_type": "rental",
+                "transaction_amount": 4200.25,
+            },
+        ]
+
+    def test_dry_run_matches_single_calculation(self):
+        count = self.Transaction.search_count([])
+        batch = self.service.calculate_batch(self._items(), dry_run=True)
+        self.assertEqual(self.Transaction.search_count([]), count)
+        self.assertFalse(batch["transactions"])
+        self.assertEqual(
+            [result["commission_amount"] for result in batch["results"]],
+            [51000.0, 800.0, 252.02],
+        )
+        self.assertEqual(
+            [result["rule_id"] for result in batch["results"]],
+            [self.percentage_rule.id, self.fixed_rule.id, self.percentage_rule.id],
+        )
+        for item, result in zip(self._items(), batch["results"]):
+            rule = self.service.get_active_rule_for_agent(
+                item["agent_id"], item["transaction_type"]
+            )
+            self.assertAlmostEqual(
+                self.service.calculate_commission(rule, item["transaction_amount"]),
+                result["commission_amount"],
+                delta=0.01,
+            )
+
+    def test_creates_all_transactions(self):
+        batch = self.service.calculate_batch(self._items())
+        transactions = batch["transactions"]
+        self.assertEqual(len(transactions), 3)
+        self.assertEqual(
+            transactions.mapped("commission_amount"), [51000.0, 800.0, 252.02]
+        )
+        self.assertEqual(transactions[0].transaction_reference, "BATCH-1")
+        self.assertEqual(transactions[0].rule_percentage, 6.0)
+        self.assertEqual(set(transactions.mapped("payment_status")), {"pending"})
+        self.assertEqual(
+            [result["transaction_ids"] for result in batch["results"]],
+            [[transaction.id] for transaction in transactions],
+        )
+        # Rollups follow the single insert
+        self.assertAlmostEqual(self.agent.total_commissions, 51252.02, places=2)
+
+    def test_prospector_split(self):
+        item = dict(self._items()[0], prospector_id=self.prospector.id)
+        batch = self.service.calculate_batch([item])
+        result = batch["results"][0]
+        self.assertEqual(result["prospector_commission"], 15300.0)
+        self.assertEqual(result["agent_commission"], 35700.0)
+        prospector_share, agent_share = batch["transactions"]
+        self.assertEqual(prospector_share.agent_id, self.prospector)
+        self.assertEqual(prospector_share.commission_amount, 15300.0)
+        self.assertEqual(agent_share.agent_id, self.agent)
+        self.assertEqual(agent_share.commission_amount, 35700.0)
+        self.assertEqual(prospector_share.rule_id, self.percentage_rule)
+
+    def test_prospector_same_as_agent_does_not_split(self):
+        item = dict(self._items()[0], prospector_id=self.agent.id)
+        batch = self.service.calculate_batch([item], dry_run=True)
+        self.assertIsNone(batch["results"][0]["prospector_id"])
+        self.assertEqual(batch["results"][0]["agent_commission"], 51000.0)
+
+    def test_one_invalid_transaction_rejects_the_batch(self):
+        count = self.Transaction.search_count([])
+        items = self._items() + [
+            {
+                "agent_id": self.other_agent.id,
+                "transaction_type": "sale",
+                "transaction_amount": 100.0,
+            },
+            {
+                "agent_id": self.agent.id,
+                "transaction_type": "sale",
+                "transaction_amount": 5000000.0,
+            },
+        ]
+        with self.assertRaises(UserError) as caught:
+            self.service.calculate_batch(items)
+        message = str(caught.exception)
+        self.assertIn("Transaction 4:", message)
+        self.assertIn("Transaction 5:", message)
+        self.assertEqual(self.Transaction.search_count([]), count)
+
+    def test_unreadable_rule_is_not_resolved(self):
+        # Like a single resolution, rules the user cannot read are left out
+        Rule = self.env["real.estate.commission.rule"]
+        with patch.object(
+            type(Rule), "_readable_rule_ids", lambda *args, **kw: frozenset()
+        ), self.assertRaisesRegex(UserError, "No active commission rule"):
+            self.service.calculate_batch(self._items(), dry_run=True)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the in-memory commission rule index.
+
+get_active_rule_for_agent() and the commission split observer resolve
+rules from a per-company index cached in the registry by rule generation;
+it must agree with the ORM search it replaced, follow rule
+create/write/unlink and keep the indexes of other companies.
+"""
+from datetime import date, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.quicksol_estate.models.commission_rule import RULE_INDEX_KEY
+from odoo.addons.quicksol_estate.services.commission_service import (
+    CommissionService,
+)
+
+
+@tagged("post_install", "-at_install")
+class TestCommissionRuleIndex(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Index Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        cls.agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Index Agent",
+                "cpf": "529.982.247-25",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.today = date.today()
+        cls.Rule = cls.env["real.estate.commission.rule"]
+        cls.old_rule = cls._create_rule(days_ago=200, transaction_type="both")
+        cls.sale_rule = cls._create_rule(days_ago=100, max_value=500000.0)
+        cls.rental_rule = cls._create_rule(days_ago=50, transaction_type="rental")
+
+    @classmethod
+    def _create_rule(cls, days_ago, transaction_type="sale", **vals):
+        return cls.Rule.create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": transaction_type,
+                "structure_type": "percentage",
+                "percentage": 5.0,
+                "valid_from": cls.today - timedelta(days=days_ago),
+                **vals,
+            }
+        )
+
+    def _search(self, transaction_type, on_date, amount=None):
+        domain = [
+            ("agent_id", "=", self.agent.id),
+            ("transaction_type", "in", [transaction_type, "both"]),
+            ("valid_from", "<=", on_date),
+            "|",
+            ("valid_until", "=", False),
+            ("valid_until", ">=", on_date),
+        ]
+        if amount is not None:
+            domain += [("min_value", "<=", amount), ("max_value", ">=", amount)]
+        return self.Rule.search(domain, order="valid_from desc, id desc", limit=1)
+
+    def test_matches_orm_search(self):
+        for days_ago in (300, 150, 75, 10, 0):
+            on_date = self.today - timedelta(days=days_ago)
+            for transaction_type in ("sale", "rental"):
+                for amount in (None, 100000.0, 800000.0):
+                    self.assertEqual(
+                        self.Rule._resolve_rule(
+                            self.agent, transaction_type, on_date, amount
+                        ),
+                        self._search(transaction_type, on_date, amount),
+                        (on_date, transaction_type, amount),
+                    )
+
+    def _new_transaction(self):
+        # As in a transaction that did not create the rules of setUpClass
+        self.env.cr.postcommit.data.pop(RULE_INDEX_KEY, None)
+
+    def test_service_uses_index(self):
+        self._new_transaction()
+        service = CommissionService(self.env)
+        # Once loaded, resolution runs no query
+        self.assertEqual(
+            service.get_active_rule_for_agent(self.agent.id, "sale"), self.sale_rule
+        )
+        with self.assertQueryCount(0):
+            rule = service.get_active_rule_for_agent(self.agent.id, "sale")
+        self.assertEqual(rule, self.sale_rule)
+        self.assertEqual(
+            service.get_active_rule_for_agent(self.agent.id, "sale", amount=800000.0),
+            self.old_rule,
+        )
+
+    def test_follows_rule_changes(self):
+        service = CommissionService(self.env)
+        newer = self._create_rule(days_ago=5)
+        self.assertEqual(
+            service.get_active_rule_for_agent(self.agent.id, "sale"), newer
+        )
+        newer.valid_until = self.today - timedelta(days=1)
+        self.assertEqual(
+            service.get_active_rule_for_agent(self.agent.id, "sale"), self.sale_rule
+        )
+        self.sale_rule.active = False
+        self.assertEqual(
+            service.get_active_rule_for_agent(self.agent.id, "sale"), self.old_rule
+        )
+        self.old_rule.unlink()
+        self.assertFalse(service.get_active_rule_for_agent(self.agent.id, "sale"))
+
+    def test_access_checked_once_per_company(self):
+        user = self.env["res.users"].create(
+            {
+                "name": "Index Other Agent",
+                "login": "index_other_agent@test.local",
+                "groups_id": [
+                    (6, 0, [self.env.ref("quicksol_estate.group_real_estate_agent").id])
+                ],
+                "company_ids": [(4, self.company.id)],
+                "company_id": self.company.id,
+            }
+        )
+        self._new_transaction()
+        Rule = self.Rule.with_user(user)
+        # Another agent's rules are not readable
+        self.assertFalse(Rule._resolve_rule(self.agent, "sale", self.today))
+        with self.assertQueryCount(0):
+            self.assertFalse(Rule._resolve_rule(self.agent, "rental", self.today))
+
+    def test_rule_change_keeps_other_company_index(self):
+        other_company = self.env["res.company"].create({"name": "Other Imobiliária"})
+        other_agent = self.env["real.estate.agent"].create(
+            {
+                "name": "Other Agent",
+                "cpf": "390.533.447-05",
+                "company_id": other_company.id,
+            }
+        )
+        index = self.Rule._get_rule_index(self.company.id)
+        other_rule = self.Rule.create(
+            {
+                "agent_id": other_agent.id,
+                "transaction_type": "sale",
+                "structure_type": "percentage",
+                "percentage": 3.0,
+                "valid_from": self.today,
+            }
+        )
+        self.assertIs(self.Rule._get_rule_index(self.company.id), index)
+        self.assertEqual(
+            self.Rule._resolve_rule(other_agent, "sale", self.today), other_rule
+        )
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the monthly commission statement runs.
+
+prepare_statements() builds one statement per agent of the company from
+the month's commission transactions in one pass; the worker's files come
+back through store_statement_files() as attachments of the statements.
+"""
+import base64
+from datetime import date
+
+from odoo.tests import TransactionCase, tagged
+
+MONTH_START = date(2026, 9, 1)
+MONTH_END = date(2026, 9, 30)
+
+
+@tagged("post_install", "-at_install")
+class TestCommissionStatements(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Extrato Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        Agent = cls.env["real.estate.agent"]
+        cls.agent, cls.idle_agent = [
+            Agent.create(
+                {"name": name, "cpf": cpf, "company_id": cls.company.id}
+            )
+            for name, cpf in [
+                ("Ana Extrato", "529.982.247-25"),
+                ("Bruno Extrato", "390.533.447-05"),
+            ]
+        ]
+        rule = cls.env["real.estate.commission.rule"].create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "both",
+                "structure_type": "percentage",
+                "percentage": 5.0,
+                "valid_from": date(2026, 1, 1),
+            }
+        )
+        Transaction = cls.env["real.estate.commission.transaction"]
+        for transaction_date, amount in [
+            (date(2026, 9, 2), 400000.0),
+            (date(2026, 9, 30), 200000.0),
+            (date(2026, 10, 1), 900000.0),  # next month
+        ]:
+            Transaction.create(
+                {
+                    "agent_id": cls.agent.id,
+                    "rule_id": rule.id,
+                    "transaction_type": "sale",
+                    "transaction_date": transaction_date,
+                    "transaction_amount": amount,
+                    "commission_amount": amount * 0.05,
+                    "rule_snapshot": '{"percentage": 5.0}',
+                }
+            )
+        cls.run = cls.env["real.estate.commission.statement.run"].create(
+            {
+                "name": "September statements",
+                "user_id": cls.env.user.id,
+                "company_id": cls.company.id,
+                "period_start": MONTH_START,
+                "period_end": MONTH_END,
+                "file_format": "both",
+            }
+        )
+
+    def _files(self, data):
+        return [
+            {
+                "statement_id": statement["statement_id"],
+                "format": extension,
+                "filename": f"statement_{statement['agent_id']}.{extension}",
+                "content": base64.b64encode(b"rendered").decode("ascii"),
+            }
+            for statement in data["statements"]
+            for extension in data["run"]["formats"]
+        ]
+
+    def test_prepare_statements(self):
+        data = self.run.prepare_statements()
+        self.assertEqual(self.run.state, "running")
+        self.assertEqual(data["run"]["month"], "2026-09")
+        self.assertEqual(data["run"]["formats"], ["csv", "pdf"])
+        by_agent = {s["agent_id"]: s for s in data["statements"]}
+        self.assertEqual(set(by_agent), {self.agent.id, self.idle_agent.id})
+        statement = by_agent[self.agent.id]
+        self.assertEqual(statement["transaction_count"], 2)
+        self.assertEqual(statement["total_commission"], 30000.0)
+        self.assertEqual(statement["pending_commission"], 30000.0)
+        self.assertEqual(
+            [line["date"] for line in statement["lines"]],
+            ["2026-09-02", "2026-09-30"],
+        )
+        self.assertEqual(by_agent[self.idle_agent.id]["transaction_count"], 0)
+        record = self.run.statement_ids.filtered(
+            lambda s: s.agent_id == self.agent
+        )
+        self.assertEqual(record.total_commission, 30000.0)
+        self.assertEqual(record.transaction_amount, 600000.0)
+
+    def test_store_files_and_finish(self):
+        data = self.run.prepare_statements()
+        self.assertEqual(self.run.store_statement_files(self._files(data)), 4)
+        self.run.finish_statements()
+        self.assertEqual(self.run.state, "done")
+        for statement in self.run.statement_ids:
+            self.assertEqual(statement.csv_attachment_id.mimetype, "text/csv")
+            self.assertEqual(statement.pdf_attachment_id.mimetype, "application/pdf")
+            self.assertEqual(statement.csv_attachment_id.raw, b"rendered")
+        # A finished run is not recomputed
+        self.assertFalse(self.run.prepare_statements())
+
+    def test_retry_replaces_previous_attempt(self):
+        data = self.run.prepare_statements()
+        self.run.store_statement_files(self._files(data))
+        attachments = self.run.statement_ids.csv_attachment_id
+        self.run.prepare_statements()
+        self.assertEqual(len(self.run.statement_ids), 2)
+        self.assertFalse(self.run.statement_ids.csv_attachment_id)
+        self.assertFalse(attachments.exists())
+
+    def test_failed_run(self):
+        self.run.mark_statements_failed("render error")
+        self.assertEqual(self.run.state, "failed")
+        self.assertEqual(self.run.error_message, "render error")
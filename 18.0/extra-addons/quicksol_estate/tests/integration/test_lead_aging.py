@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for lead aging (days_in_state): state_changed_at is only
+reset by an actual state change, and days_in_state filters, sorts and
+statistics buckets all run on the stored timestamp.
+"""
+from datetime import timedelta
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from ...services import lead_statistics_service
+from .base_proposal_test import BaseProposalTest
+
+
+@tagged("post_install", "-at_install")
+class TestLeadAging(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Lead = cls.env["real.estate.lead"]
+        cls.leads = Lead.create(
+            [
+                {
+                    "name": f"Aging Lead {days}",
+                    "company_id": cls.company.id,
+                    "agent_id": cls.agent.id,
+                    "state": "contacted",
+                }
+                for days in (0, 3, 10, 45)
+            ]
+        )
+        now = fields.Datetime.now()
+        for lead, days in zip(cls.leads, (0, 3, 10, 45)):
+            cls.env.cr.execute(
+                "UPDATE real_estate_lead SET state_changed_at = %s WHERE id = %s",
+                (now - timedelta(days=days, hours=1), lead.id),
+            )
+        cls.leads.invalidate_recordset(["state_changed_at"])
+        cls.domain = [("id", "in", cls.leads.ids)]
+
+    def test_days_in_state(self):
+        self.assertEqual(self.leads.mapped("days_in_state"), [0, 3, 10, 45])
+
+    def test_search_days_in_state(self):
+        Lead = self.env["real.estate.lead"]
+        cases = [
+            (">=", 10, [10, 45]),
+            (">", 10, [45]),
+            ("<=", 3, [0, 3]),
+            ("<", 3, [0]),
+            ("=", 10, [10]),
+            ("!=", 10, [0, 3, 45]),
+            ("<=", 3.0, [0, 3]),
+            ("in", [0, 45], [0, 45]),
+            ("not in", [0, 45], [3, 10]),
+            ("in", [], []),
+        ]
+        for operator, value, expected in cases:
+            leads = Lead.search(self.domain + [("days_in_state", operator, value)])
+            self.assertEqual(
+                sorted(leads.mapped("days_in_state")),
+                expected,
+                f"days_in_state {operator} {value}",
+            )
+
+    def test_search_days_in_state_rejects_unsupported_operator(self):
+        Lead = self.env["real.estate.lead"]
+        with self.assertRaises(UserError):
+            Lead.search(self.domain + [("days_in_state", "like", 10)])
+        with self.assertRaises(UserError):
+            Lead.search(self.domain + [("days_in_state", ">=", "ten")])
+
+    def test_sort_by_days_in_state(self):
+        Lead = self.env["real.estate.lead"]
+        self.assertEqual(
+            Lead.search(self.domain, order="days_in_state desc").mapped(
+                "days_in_state"
+            ),
+            [45, 10, 3, 0],
+        )
+        self.assertEqual(
+            Lead.search(self.domain, order="days_in_state asc").mapped(
+                "days_in_state"
+            ),
+            [0, 3, 10, 45],
+        )
+
+    def test_only_real_state_change_resets(self):
+        stale = self.leads[-1]
+        stale.write({"state": "contacted", "budget_max": 1000.0})
+        self.assertEqual(stale.days_in_state, 45)
+
+        stale.write({"state": "qualified"})
+        self.assertEqual(stale.days_in_state, 0)
+
+    def test_multi_record_state_write(self):
+        self.leads.write({"state": "qualified"})
+        self.assertEqual(set(self.leads.mapped("state")), {"qualified"})
+        self.assertEqual(set(self.leads.mapped("days_in_state")), {0})
+
+    def test_statistics_aging_buckets(self):
+        stats = lead_statistics_service.compute_lead_statistics(self.env, self.domain)
+        self.assertEqual(stats["aging"], {"0-7": 2, "8-30": 1, "31+": 1})
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for automatic lead assignment (FR-002b): leads created
+without an agent follow the company strategy, and portal intake batches are
+spread over the agents.
+"""
+from ...services import lead_assignment_service
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadAssignment(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Second Assignment Agent",
+                "cpf": "529.982.247-25",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.agents = cls.agent | cls.other_agent
+        cls.Lead = cls.env["real.estate.lead"].sudo()
+
+    def setUp(self):
+        super().setUp()
+        # The index is per process: start every test from the database
+        lead_assignment_service.registry.drop(self.env.cr.dbname, [self.company.id])
+        self.addCleanup(
+            lead_assignment_service.registry.drop,
+            self.env.cr.dbname,
+            [self.company.id],
+        )
+
+    def _create(self, count, start=0, **extra):
+        return self.Lead.create(
+            [
+                dict(
+                    {
+                        "name": f"Assigned Lead {index}",
+                        "company_id": self.company.id,
+                        "phone": f"1193333{index:04d}",
+                    },
+                    **extra,
+                )
+                for index in range(start, start + count)
+            ]
+        )
+
+    def test_manual_strategy_keeps_default(self):
+        self.company.lead_assignment_strategy = "manual"
+        vals = [{"name": "Manual Lead", "company_id": self.company.id}]
+        self.Lead._assign_agents(vals)
+        self.assertNotIn("agent_id", vals[0])
+
+    def test_least_open_balances_agents(self):
+        self.company.lead_assignment_strategy = "least_open"
+        self._create(3).write({"agent_id": self.agent.id})
+        lead_assignment_service.registry.drop(self.env.cr.dbname, [self.company.id])
+
+        leads = self._create(5, start=10)
+        # agent already had 3 open leads: 4 of the 5 go to the other one
+        self.assertEqual(
+            len(leads.filtered(lambda lead: lead.agent_id == self.agent)), 1
+        )
+        self.assertEqual(
+            len(leads.filtered(lambda lead: lead.agent_id == self.other_agent)), 4
+        )
+
+    def test_round_robin_alternates(self):
+        self.company.lead_assignment_strategy = "round_robin"
+        leads = self._create(4)
+        self.assertEqual(len(leads.agent_id), 2)
+        self.assertNotEqual(leads[0].agent_id, leads[1].agent_id)
+        self.assertEqual(leads[0].agent_id, leads[2].agent_id)
+
+    def test_skill_region_prefers_region_specialist(self):
+        self.company.lead_assignment_strategy = "skill_region"
+        self.other_agent.lead_regions = "Moema"
+        leads = self._create(3, location_preference="Apartamento em Moema")
+        self.assertEqual(leads.agent_id, self.other_agent)
+
+    def test_agents_not_receiving_leads_are_skipped(self):
+        self.company.lead_assignment_strategy = "least_open"
+        self.agent.receives_leads = False
+        lead_assignment_service.registry.drop(self.env.cr.dbname, [self.company.id])
+        self.assertEqual(self._create(3).agent_id, self.other_agent)
+
+    def test_agent_deleted_by_another_worker_is_not_picked(self):
+        self.company.lead_assignment_strategy = "least_open"
+        idle_agent = self.env["real.estate.agent"].create(
+            {
+                "name": "Deleted Assignment Agent",
+                "cpf": "246.813.579-28",
+                "company_id": self.company.id,
+            }
+        )
+        self._create(2, agent_id=self.agent.id)
+        self.Lead._assignment_index(self.company.id)
+        # unlink() resets the index on commit; another worker keeps it
+        idle_agent.unlink()
+        leads = self._create(2, start=20)
+        self.assertEqual(leads.agent_id, self.other_agent)
+
+    def test_portal_intake_is_spread(self):
+        self.company.lead_assignment_strategy = "round_robin"
+        application = self.env["thedevkitchen.oauth.application"].create(
+            {"name": "OLX Webhook"}
+        )
+        portal = self.env["real.estate.lead.portal"].create(
+            {
+                "name": "OLX",
+                "code": "olx",
+                "application_id": application.id,
+                "company_id": self.company.id,
+            }
+        )
+        intakes, _duplicates = self.env["real.estate.lead.intake"]._append(
+            portal,
+            [
+                (f"r-{index}", {"name": f"Lead {index}", "phone": f"11944{index:06d}"})
+                for index in range(4)
+            ],
+        )
+        self.assertEqual(intakes.process_intake(), 4)
+        self.assertEqual(intakes.lead_id.agent_id, self.agents)
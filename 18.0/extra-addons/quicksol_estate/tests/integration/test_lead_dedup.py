@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for per-agent lead deduplication (FR-005a): normalized
+phone/email keys, the unique partial indexes and the batched pre-check.
+"""
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadDedup(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Second Dedup Agent",
+                "cpf": "529.982.247-25",
+                "company_id": cls.company.id,
+            }
+        )
+
+    def _lead_vals(self, name, **values):
+        vals = {
+            "name": name,
+            "agent_id": self.agent.id,
+            "company_id": self.company.id,
+        }
+        vals.update(values)
+        return vals
+
+    def setUp(self):
+        super().setUp()
+        self.Lead = self.env["real.estate.lead"]
+        self.existing = self.Lead.create(
+            self._lead_vals(
+                "Existing Lead", phone="(11) 98765-4321", email="Cliente@Example.com"
+            )
+        )
+
+    def test_keys_are_normalized(self):
+        self.assertEqual(self.existing.phone_key, "11987654321")
+        self.assertEqual(self.existing.email_key, "cliente@example.com")
+
+    def test_unique_indexes_exist(self):
+        self.env.cr.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'real_estate_lead'"
+        )
+        names = {name for name, in self.env.cr.fetchall()}
+        self.assertIn("real_estate_lead_agent_phone_key_uniq", names)
+        self.assertIn("real_estate_lead_agent_email_key_uniq", names)
+
+    def test_formatted_phone_is_a_duplicate(self):
+        with self.assertRaisesRegex(ValidationError, "already have an active lead"):
+            self.Lead.create(self._lead_vals("Same Phone", phone="11987654321"))
+
+    def test_email_case_is_ignored(self):
+        with self.assertRaisesRegex(ValidationError, "email CLIENTE@example.com"):
+            self.Lead.create(self._lead_vals("Same Email", email="CLIENTE@example.com"))
+
+    def test_other_agent_lost_and_archived_leads_do_not_block(self):
+        self.Lead.create(
+            self._lead_vals(
+                "Other Agent", agent_id=self.other_agent.id, phone="11987654321"
+            )
+        )
+        self.existing.write({"state": "lost", "lost_reason": "No budget"})
+        again = self.Lead.create(self._lead_vals("Again", phone="11987654321"))
+        again.write({"active": False})
+        self.Lead.create(self._lead_vals("Third", phone="11987654321"))
+
+    def test_bulk_create_reports_all_conflicts(self):
+        with self.assertRaises(ValidationError) as context:
+            self.Lead.create(
+                [
+                    self._lead_vals("Fresh", phone="11900000001"),
+                    self._lead_vals("Dup Existing", email="cliente@example.com"),
+                    self._lead_vals("Fresh Again", phone="(11) 90000-0001"),
+                ]
+            )
+        message = str(context.exception)
+        self.assertIn("Found 2 duplicate leads", message)
+        self.assertIn("row 2: email cliente@example.com already exists", message)
+        self.assertIn("row 3: phone (11) 90000-0001 repeated in this batch", message)
+        self.assertFalse(self.Lead.search([("name", "=", "Fresh")]))
+
+    def test_write_checks_duplicates(self):
+        other = self.Lead.create(self._lead_vals("Other", phone="11911112222"))
+        with self.assertRaises(ValidationError):
+            other.write({"phone": "11 98765-4321"})
+
+    def test_write_race_past_pre_check_is_reported(self):
+        # A concurrent write that passed the pre-check hits the unique index
+        other = self.Lead.create(self._lead_vals("Racing", phone="11911113333"))
+        with patch.object(
+            type(self.Lead), "_check_duplicate_per_agent", lambda *args, **kw: None
+        ), self.assertRaisesRegex(ValidationError, "already have an active lead"):
+            other.write({"phone": "11 98765-4321"})
+        other.invalidate_recordset()
+        self.assertEqual(other.phone, "11911113333")
+
+    def test_reopening_checks_duplicates(self):
+        self.existing.write({"state": "lost", "lost_reason": "No budget"})
+        self.Lead.create(self._lead_vals("Replacement", phone="11987654321"))
+        with self.assertRaises(ValidationError):
+            self.existing.action_reopen()
+
+    def test_pre_check_is_one_query(self):
+        vals_list = [
+            self._lead_vals(f"Bulk {index}", phone=f"1190000{index:04d}")
+            for index in range(50)
+        ]
+        self.env.flush_all()
+        with self.assertQueryCount(1):
+            self.Lead._check_duplicate_per_agent(
+                self.Lead._dedup_candidates_from_vals(vals_list)
+            )
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the saved lead filter counts (FR-048).
+
+count_filters() must return, in one query, what search_count() returns for
+each compiled filter domain within the caller's scope.
+"""
+import json
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from ...services import lead_filter_service
+from .base_proposal_test import BaseProposalTest
+
+FILTER_PARAMS = [
+    {},
+    {"state": "new"},
+    {"state": "qualified", "budget_min": 300000},
+    {"active": "all"},
+    {"active": "false"},
+    {"search": "Filter Lead 1"},
+    {"last_activity_before": "2000-01-01"},
+]
+
+
+@tagged("post_install", "-at_install")
+class TestLeadFilterCounts(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Second Filter Agent",
+                "cpf": "390.533.447-05",
+                "company_id": cls.company.id,
+            }
+        )
+        Lead = cls.env["real.estate.lead"]
+        states = ["new", "contacted", "qualified"]
+        leads = Lead.create(
+            [
+                {
+                    "name": f"Filter Lead {index}",
+                    "company_id": cls.company.id,
+                    "agent_id": (cls.agent if index % 2 else cls.other_agent).id,
+                    "state": states[index % len(states)],
+                    "budget_max": 100000 * index,
+                }
+                for index in range(30)
+            ]
+        )
+        leads[:5].write({"active": False})
+
+        Filter = cls.env["real.estate.lead.filter"]
+        cls.filters = Filter.create(
+            [
+                {
+                    "name": f"Filter {index}",
+                    "user_id": cls.env.uid,
+                    "filter_domain": json.dumps(params),
+                }
+                for index, params in enumerate(FILTER_PARAMS)
+            ]
+        )
+        cls.scope_domain = [("company_id", "in", [cls.company.id])]
+
+    def _expected_counts(self, scope_domain):
+        Lead = self.env["real.estate.lead"].sudo().with_context(active_test=False)
+        return {
+            saved_filter.domain_hash: Lead.search_count(
+                scope_domain + saved_filter.get_domain()
+            )
+            for saved_filter in self.filters
+        }
+
+    def _domains(self):
+        return {
+            saved_filter.domain_hash: saved_filter.get_domain()
+            for saved_filter in self.filters
+        }
+
+    def test_counts_match_search_count(self):
+        self.assertEqual(
+            lead_filter_service.count_filters(
+                self.env, self._domains(), self.scope_domain
+            ),
+            self._expected_counts(self.scope_domain),
+        )
+
+    def test_agent_scope(self):
+        scope_domain = self.scope_domain + [("agent_id", "=", self.agent.id)]
+        self.assertEqual(
+            lead_filter_service.count_filters(self.env, self._domains(), scope_domain),
+            self._expected_counts(scope_domain),
+        )
+
+    def test_single_query(self):
+        domains = self._domains()
+        self.env["real.estate.lead"].flush_model()
+        with self.assertQueryCount(1):
+            lead_filter_service.count_filters(self.env, domains, self.scope_domain)
+
+    def test_only_filter_fields_invalidate_counts(self):
+        lead = self.env["real.estate.lead"].search(
+            [("name", "=", "Filter Lead 1")], limit=1
+        )
+        with patch.object(
+            type(lead), "_invalidate_lead_filter_counts", autospec=True
+        ) as invalidate:
+            lead.write({"min_area": 80.0})
+            lead.message_post(body="Called the client")
+            invalidate.assert_not_called()
+            lead.write({"budget_max": 450000})
+            invalidate.assert_called_once()
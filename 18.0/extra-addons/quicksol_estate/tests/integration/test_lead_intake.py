@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for portal lead intake (POST /api/v1/leads/ingest):
+idempotent appends to real.estate.lead.intake and batched lead creation by
+process_intake().
+"""
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadIntake(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.application = cls.env["thedevkitchen.oauth.application"].create(
+            {"name": "ZAP Webhook"}
+        )
+        cls.portal = cls.env["real.estate.lead.portal"].create(
+            {
+                "name": "ZAP Imóveis",
+                "code": "zap",
+                "application_id": cls.application.id,
+                "company_id": cls.company.id,
+                "agent_id": cls.agent.id,
+            }
+        )
+        cls.Intake = cls.env["real.estate.lead.intake"]
+
+    def _append(self, *items):
+        return self.Intake._append(self.portal, list(items))
+
+    def test_redelivery_is_not_queued_twice(self):
+        intakes, duplicates = self._append(
+            ("a-1", {"name": "Ana", "phone": "11911110001"}),
+            ("a-2", {"name": "Bia", "email": "bia@example.com"}),
+        )
+        self.assertEqual(len(intakes), 2)
+        self.assertEqual(duplicates, [])
+
+        intakes, duplicates = self._append(
+            ("a-2", {"name": "Bia", "email": "bia@example.com"}),
+            ("a-3", {"name": "Caio", "phone": "11911110003"}),
+        )
+        self.assertEqual(intakes.mapped("external_id"), ["a-3"])
+        self.assertEqual(duplicates, ["a-2"])
+
+    def test_process_creates_leads_in_batch(self):
+        intakes, _duplicates = self._append(
+            ("b-1", {"name": "Ana", "phone": "11922220001", "budget_max": 500000.0}),
+            ("b-2", {"name": "Bia", "email": "bia.b@example.com"}),
+        )
+        self.assertEqual(intakes.process_intake(), 2)
+        self.assertEqual(set(intakes.mapped("state")), {"done"})
+        leads = intakes.lead_id
+        self.assertEqual(leads.agent_id, self.agent)
+        self.assertEqual(leads.company_id, self.company)
+        self.assertEqual(set(leads.mapped("source")), {"portal"})
+        self.assertEqual(intakes[0].lead_id.budget_max, 500000.0)
+
+        # Retried task: nothing left to do
+        self.assertEqual(intakes.process_intake(), 0)
+
+    def test_duplicates_are_rejected_without_blocking_the_batch(self):
+        self.env["real.estate.lead"].create(
+            {
+                "name": "Existing",
+                "phone": "(11) 93333-0001",
+                "agent_id": self.agent.id,
+                "company_id": self.company.id,
+            }
+        )
+        intakes, _duplicates = self._append(
+            ("c-1", {"name": "Same phone", "phone": "11933330001"}),
+            ("c-2", {"name": "Fresh", "phone": "11933330002"}),
+            ("c-3", {"name": "Fresh again", "phone": "11 93333 0002"}),
+        )
+        self.assertEqual(intakes.process_intake(), 1)
+        self.assertEqual(intakes.mapped("state"), ["rejected", "done", "rejected"])
+        self.assertIn("Duplicate phone", intakes[0].error_message)
+        self.assertIn("same batch", intakes[2].error_message)
+
+    def test_invalid_lead_is_rejected_alone(self):
+        intakes, _duplicates = self._append(
+            (
+                "d-1",
+                {
+                    "name": "Bad budget",
+                    "phone": "11944440001",
+                    "budget_min": 900.0,
+                    "budget_max": 100.0,
+                },
+            ),
+            ("d-2", {"name": "Good", "phone": "11944440002"}),
+        )
+        self.assertEqual(intakes.process_intake(), 1)
+        self.assertEqual(intakes.mapped("state"), ["rejected", "done"])
+        self.assertIn("budget", intakes[0].error_message)
+
+    def test_portal_message_is_posted_on_the_lead(self):
+        intakes, _duplicates = self._append(
+            (
+                "e-1",
+                {
+                    "name": "Ana",
+                    "phone": "11955550001",
+                    "message": "Is it still available?",
+                },
+            ),
+            ("e-2", {"name": "Bia", "phone": "11955550002"}),
+        )
+        self.assertEqual(intakes.process_intake(), 2)
+        with_message, without_message = (
+            [str(body) for body in intake.lead_id.message_ids.mapped("body")]
+            for intake in intakes
+        )
+        self.assertTrue(
+            any("Is it still available?" in body for body in with_message),
+            with_message,
+        )
+        self.assertFalse(any("Message from" in body for body in without_message))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for real.estate.lead.last_activity_at (FR-047).
+
+The column backs the list_leads ``last_activity_before`` filter and is moved
+forward whenever a comment is posted on the lead.
+"""
+from datetime import datetime
+
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadLastActivity(BaseProposalTest):
+    def setUp(self):
+        super().setUp()
+        self.lead = self.env["real.estate.lead"].create(
+            {
+                "name": "Lead FR-047",
+                "agent_id": self.agent.id,
+                "company_id": self.company.id,
+            }
+        )
+
+    def _before(self, day):
+        return self.env["real.estate.lead"].search(
+            [
+                ("id", "=", self.lead.id),
+                "|",
+                ("last_activity_at", "=", False),
+                ("last_activity_at", "<", day),
+            ]
+        )
+
+    def test_new_lead_has_no_activity(self):
+        self.assertFalse(self.lead.last_activity_at)
+        self.assertEqual(self._before("2000-01-01 00:00:00"), self.lead)
+
+    def test_comment_sets_last_activity(self):
+        message = self.lead.message_post(
+            body="Called the client", message_type="comment"
+        )
+        self.assertEqual(self.lead.last_activity_at, message.date)
+        self.assertFalse(self._before("2000-01-01 00:00:00"))
+
+    def test_notification_does_not_count_as_activity(self):
+        self.lead.message_post(body="State changed", message_type="notification")
+        self.assertFalse(self.lead.last_activity_at)
+
+    def test_older_comment_does_not_move_activity_back(self):
+        self.lead.message_post(body="Latest", message_type="comment")
+        latest = self.lead.last_activity_at
+        self.env["mail.message"].create(
+            {
+                "model": "real.estate.lead",
+                "res_id": self.lead.id,
+                "message_type": "comment",
+                "body": "Imported history",
+                "date": datetime(2020, 1, 1),
+            }
+        )
+        self.assertEqual(self.lead.last_activity_at, latest)
+
+    def test_comment_does_not_touch_write_date(self):
+        write_date = self.lead.write_date
+        self.lead.message_post(body="Follow-up", message_type="comment")
+        self.assertEqual(self.lead.write_date, write_date)
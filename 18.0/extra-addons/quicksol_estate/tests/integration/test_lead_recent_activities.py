@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the batched recent activities of a lead page (FR-035):
+_get_recent_activities() must return what the former per-lead mail.message
+search returned, with one query for the whole page.
+"""
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadRecentActivities(BaseProposalTest):
+    def setUp(self):
+        super().setUp()
+        Lead = self.env["real.estate.lead"]
+        self.leads = Lead.create(
+            [
+                {
+                    "name": f"Activity Lead {index}",
+                    "agent_id": self.agent.id,
+                    "company_id": self.company.id,
+                }
+                for index in range(3)
+            ]
+        )
+        for index in range(7):
+            self.leads[0].message_post(
+                body=f"📞 <strong>CALL</strong><br/>Call {index}",
+                message_type="comment",
+                subtype_xmlid="mail.mt_note",
+            )
+        self.leads[1].message_post(
+            body="📧 <strong>EMAIL</strong><br/>Sent brochure",
+            message_type="comment",
+            subtype_xmlid="mail.mt_note",
+        )
+
+    def _legacy_recent(self, lead):
+        return (
+            self.env["mail.message"]
+            .sudo()
+            .search(
+                [
+                    ("model", "=", "real.estate.lead"),
+                    ("res_id", "=", lead.id),
+                    ("message_type", "=", "comment"),
+                ],
+                # id breaks ties between messages posted in the same second
+                order="date desc, id desc",
+                limit=5,
+            )
+        )
+
+    def test_matches_per_lead_search(self):
+        activities = self.leads._get_recent_activities(5)
+        self.assertEqual(set(activities), set(self.leads.ids))
+        for lead in self.leads:
+            legacy = self._legacy_recent(lead)
+            self.assertEqual(
+                [message["id"] for message in activities[lead.id]], legacy.ids
+            )
+        self.assertEqual(len(activities[self.leads[0].id]), 5)
+        self.assertEqual(activities[self.leads[2].id], [])
+
+        latest = activities[self.leads[0].id][0]
+        self.assertIn("Call 6", latest["body"])
+        self.assertEqual(latest["author_name"], self.env.user.partner_id.name)
+
+    def test_single_query_for_the_page(self):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        # the window-function query + one read of the author names
+        with self.assertQueryCount(2):
+            self.leads._get_recent_activities(5)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the lead free-text search (FR-045): normalized
+phone_key and trigram-ranked results.
+"""
+from .base_proposal_test import BaseProposalTest
+
+
+class TestLeadSearch(BaseProposalTest):
+    def setUp(self):
+        super().setUp()
+        Lead = self.env["real.estate.lead"]
+        self.exact = Lead.create(
+            {
+                "name": "Mariana Souza",
+                "phone": "(11) 98765-4321",
+                "agent_id": self.agent.id,
+                "company_id": self.company.id,
+            }
+        )
+        self.partial = Lead.create(
+            {
+                "name": "Mariana Souza Lima Pereira",
+                "agent_id": self.agent.id,
+                "company_id": self.company.id,
+            }
+        )
+
+    def test_phone_key_is_digits_only(self):
+        self.assertEqual(self.exact.phone_key, "11987654321")
+        self.assertFalse(self.partial.phone_key)
+        self.exact.phone = "+55 11 3333-0000"
+        self.assertEqual(self.exact.phone_key, "551133330000")
+
+    def test_formatted_phone_finds_lead(self):
+        leads = self.env["real.estate.lead"].search(
+            [("phone_key", "ilike", "119876543")]
+        )
+        self.assertEqual(leads, self.exact)
+
+    def test_ranked_search_puts_best_match_first(self):
+        domain = [("id", "in", (self.exact | self.partial).ids)]
+        leads = self.env["real.estate.lead"]._search_ranked(domain, "Mariana Souza")
+        self.assertEqual(set(leads.ids), {self.exact.id, self.partial.id})
+        if self.env.registry.has_trigram:
+            self.assertEqual(leads[0], self.exact)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests + benchmark for the single-query lead statistics.
+
+compute_lead_statistics() must return exactly what the former
+search_count-per-state + read_group implementation returned, with one scan
+of real_estate_lead instead of seven.
+"""
+import logging
+import time
+
+from odoo.tests import tagged
+
+from ...services import lead_statistics_service
+from .base_proposal_test import BaseProposalTest
+
+_logger = logging.getLogger(__name__)
+
+BENCHMARK_ROUNDS = 20
+
+
+@tagged("post_install", "-at_install", "performance")
+class TestLeadStatistics(BaseProposalTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Second Statistics Agent",
+                "cpf": "529.982.247-25",
+                "company_id": cls.company.id,
+            }
+        )
+        Lead = cls.env["real.estate.lead"]
+        vals_list = []
+        states = lead_statistics_service.LEAD_STATES
+        for index in range(300):
+            state = states[index % len(states)]
+            vals = {
+                "name": f"Statistics Lead {index}",
+                "company_id": cls.company.id,
+                "agent_id": (cls.agent if index % 3 else cls.other_agent).id,
+                "state": state,
+            }
+            if state == "lost":
+                vals["lost_reason"] = "Budget"
+            vals_list.append(vals)
+        Lead.create(vals_list)
+        cls.domain = [("active", "=", True), ("company_id", "in", [cls.company.id])]
+
+    def _legacy_statistics(self, domain):
+        """
+        The former implementation (1 + 5 search_count + read_group), plus
+        one search_count per aging bucket.
+        """
+        Lead = self.env["real.estate.lead"].sudo()
+        total = Lead.search_count(domain)
+        by_status = {
+            state: Lead.search_count(domain + [("state", "=", state)])
+            for state in lead_statistics_service.LEAD_STATES
+        }
+        groups = Lead.read_group(domain, fields=["agent_id"], groupby=["agent_id"])
+        by_agent = [
+            {
+                "agent_id": group["agent_id"][0] if group["agent_id"] else None,
+                "agent_name": (
+                    group["agent_id"][1] if group["agent_id"] else "Unassigned"
+                ),
+                "count": group["agent_id_count"],
+            }
+            for group in groups
+        ]
+        open_domain = domain + [
+            ("state", "in", lead_statistics_service.OPEN_STATES)
+        ]
+        aging = {
+            "0-7": Lead.search_count(open_domain + [("days_in_state", "<=", 7)]),
+            "8-30": Lead.search_count(
+                open_domain
+                + [("days_in_state", ">=", 8), ("days_in_state", "<=", 30)]
+            ),
+            "31+": Lead.search_count(open_domain + [("days_in_state", ">=", 31)]),
+        }
+        won_count = by_status.get("won", 0)
+        return {
+            "total": total,
+            "by_status": by_status,
+            "by_agent": by_agent,
+            "aging": aging,
+            "conversion_rate": round((won_count / total * 100) if total else 0.0, 2),
+        }
+
+    def test_matches_legacy_statistics(self):
+        self.assertEqual(
+            lead_statistics_service.compute_lead_statistics(self.env, self.domain),
+            self._legacy_statistics(self.domain),
+        )
+
+    def test_matches_legacy_with_date_and_agent_filter(self):
+        domain = self.domain + [
+            ("create_date", ">=", "2000-01-01 00:00:00"),
+            ("agent_id", "=", self.agent.id),
+        ]
+        self.assertEqual(
+            lead_statistics_service.compute_lead_statistics(self.env, domain),
+            self._legacy_statistics(domain),
+        )
+
+    def test_empty_domain_result(self):
+        stats = lead_statistics_service.compute_lead_statistics(
+            self.env, self.domain + [("id", "=", 0)]
+        )
+        self.assertEqual(stats["total"], 0)
+        self.assertEqual(stats["by_agent"], [])
+        self.assertEqual(set(stats["by_status"].values()), {0})
+
+    def test_cache_key_matches_company_glob(self):
+        key = lead_statistics_service.cache_key([12, 3], "all", "2026-01-01", None)
+        self.assertEqual(key, "lead_stats:,3,12,:all:2026-01-01:")
+        self.assertIn(",3,", key)
+        self.assertEqual(
+            lead_statistics_service.cache_key([], "all", None, None),
+            "lead_stats:all:all::",
+        )
+
+    def test_write_collects_company_for_invalidation(self):
+        leads = self.env["real.estate.lead"].search(self.domain, limit=5)
+        leads.write({"agent_id": self.other_agent.id})
+        leads.write({"agent_id": self.agent.id})
+        companies = self.env.cr.postcommit.data[
+            "quicksol_estate.lead_statistics_companies"
+        ]
+        self.assertIn(self.company.id, companies)
+
+    def test_benchmark_single_query(self):
+        """Log DB time and query count of both implementations."""
+        cr = self.env.cr
+        self.env.flush_all()
+
+        def measure(compute):
+            queries = cr.sql_log_count
+            start = time.perf_counter()
+            for _round in range(BENCHMARK_ROUNDS):
+                compute()
+                self.env.invalidate_all()
+            elapsed = (time.perf_counter() - start) / BENCHMARK_ROUNDS
+            return elapsed, (cr.sql_log_count - queries) / BENCHMARK_ROUNDS
+
+        legacy_time, legacy_queries = measure(
+            lambda: self._legacy_statistics(self.domain)
+        )
+        grouped_time, grouped_queries = measure(
+            lambda: lead_statistics_service.compute_lead_statistics(
+                self.env, self.domain
+            )
+        )
+        _logger.info(
+            "Lead statistics benchmark: legacy %.2f ms / %.1f queries, "
+            "grouped %.2f ms / %.1f queries",
+            legacy_time * 1000,
+            legacy_queries,
+            grouped_time * 1000,
+            grouped_queries,
+        )
+        self.assertLess(grouped_queries, legacy_queries)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the performance cache change events.
+
+Commission transaction and agent changes must publish the affected agents
+and companies once the transaction commits, and warm_performance_cache()
+must refill the standard periods of the agents and company rankings.
+"""
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+from odoo.tests import TransactionCase, tagged
+
+from ...services import performance_service
+
+
+@tagged("post_install", "-at_install")
+class TestPerformanceCacheEvents(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Cache Imobiliária"})
+        cls.other_company = cls.env["res.company"].create(
+            {"name": "Cache Imobiliária 2"}
+        )
+        cls.env.user.company_ids = [(4, cls.company.id), (4, cls.other_company.id)]
+        cls.agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Cache Agent",
+                "cpf": "529.982.247-25",
+                "company_id": cls.company.id,
+            }
+        )
+        today = date.today()
+        cls.rule = cls.env["real.estate.commission.rule"].create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "sale",
+                "structure_type": "percentage",
+                "percentage": 3.0,
+                "valid_from": today - timedelta(days=90),
+                "valid_until": today + timedelta(days=365),
+            }
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.env.cr.postcommit.data.pop(performance_service.CHANGES_KEY, None)
+
+    def _changes(self):
+        return self.env.cr.postcommit.data.get(
+            performance_service.CHANGES_KEY, {"agents": set(), "companies": set()}
+        )
+
+    def _create_transaction(self):
+        return self.env["real.estate.commission.transaction"].create(
+            {
+                "agent_id": self.agent.id,
+                "rule_id": self.rule.id,
+                "transaction_type": "sale",
+                "transaction_amount": 100000.0,
+                "commission_amount": 3000.0,
+                "rule_snapshot": '{"percentage": 3.0}',
+                "transaction_date": date.today(),
+            }
+        )
+
+    def test_commission_changes_publish_agent_and_company(self):
+        transaction = self._create_transaction()
+        self.assertEqual(
+            self._changes(), {"agents": {self.agent.id}, "companies": {self.company.id}}
+        )
+
+        self.env.cr.postcommit.data.pop(performance_service.CHANGES_KEY)
+        transaction.action_mark_paid()
+        self.assertEqual(self._changes()["agents"], {self.agent.id})
+
+    def test_agent_move_publishes_both_companies(self):
+        self.agent.write({"agency_name": "Centro"})
+        self.assertFalse(self._changes()["agents"])
+
+        self.agent.write({"company_id": self.other_company.id})
+        self.assertEqual(
+            self._changes(),
+            {
+                "agents": {self.agent.id},
+                "companies": {self.company.id, self.other_company.id},
+            },
+        )
+
+    def test_warm_up_stores_standard_periods(self):
+        self._create_transaction()
+        redis = MagicMock()
+        redis.performance_key.side_effect = (
+            lambda agent_id, date_from, date_to: f"performance:agent:{agent_id}:"
+            f"{date_from}:{date_to}"
+        )
+        with patch.object(performance_service, "RedisClient", redis):
+            stored = self.agent.warm_performance_cache(company_ids=self.company.ids)
+
+        # 3 periods for the agent, 3 periods x 3 metrics for the ranking
+        self.assertEqual(stored, 12)
+        keys = [args[0] for args, _kwargs in redis.set_json.call_args_list]
+        this_month = performance_service.standard_periods(date.today())[0]
+        self.assertIn(
+            f"performance:agent:{self.agent.id}:{this_month[0]}:{this_month[1]}", keys
+        )
+        self.assertIn(
+            f"performance:ranking:{self.company.id}:total_commissions:10:"
+            f"{this_month[0]}:{this_month[1]}",
+            keys,
+        )
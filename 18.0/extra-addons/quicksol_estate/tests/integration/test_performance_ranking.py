@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the SQL agent ranking of PerformanceService.
+
+get_top_agents_ranking() must rank exactly like the former implementation,
+which ran _calculate_performance_metrics() for every active agent and
+sorted in Python, with one grouped query instead.
+"""
+from datetime import date, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from ...services.performance_service import PerformanceService
+
+# agent index -> [(type, commission, days ago)]
+TRANSACTIONS = {
+    0: [("sale", 10000.0, 1), ("sale", 5000.0, 40), ("rental", 800.0, 2)],
+    1: [("sale", 30000.0, 3)],
+    2: [("rental", 1200.0, 5), ("rental", 1200.0, 35)],
+    3: [],
+}
+
+
+@tagged("post_install", "-at_install")
+class TestPerformanceRanking(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Ranking Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        Agent = cls.env["real.estate.agent"]
+        cls.agents = Agent.browse()
+        for index, cpf in enumerate(
+            ["123.456.789-09", "987.654.321-00", "246.813.579-28", "529.982.247-25"]
+        ):
+            cls.agents |= Agent.create(
+                {
+                    "name": f"Ranking Agent {index}",
+                    "cpf": cpf,
+                    "company_id": cls.company.id,
+                }
+            )
+
+        today = date.today()
+        Transaction = cls.env["real.estate.commission.transaction"]
+        for index, transactions in TRANSACTIONS.items():
+            agent = cls.agents[index]
+            rule = cls.env["real.estate.commission.rule"].create(
+                {
+                    "agent_id": agent.id,
+                    "company_id": cls.company.id,
+                    "transaction_type": "sale",
+                    "structure_type": "percentage",
+                    "percentage": 3.0,
+                    "valid_from": today - timedelta(days=90),
+                    "valid_until": today + timedelta(days=365),
+                }
+            )
+            for position, (kind, commission, days_ago) in enumerate(transactions):
+                Transaction.create(
+                    {
+                        "agent_id": agent.id,
+                        "rule_id": rule.id,
+                        "transaction_type": kind,
+                        "transaction_amount": commission / 0.03,
+                        "commission_amount": commission,
+                        "rule_snapshot": '{"percentage": 3.0}',
+                        "transaction_date": today - timedelta(days=days_ago),
+                        "transaction_reference": f"RANK-{index}-{position}",
+                    }
+                )
+        cls.service = PerformanceService(cls.env)
+
+    def _legacy_ranking(self, metric, limit, date_from=None, date_to=None):
+        """The former implementation: full metrics per agent, sorted in Python."""
+        sort_key = {
+            "total_commissions": "total_commissions",
+            "total_sales": "total_sales_count",
+            "average_commission": "average_commission",
+        }[metric]
+        rows = []
+        for agent in self.agents.sorted("name"):
+            aggregated = self.service._calculate_performance_metrics(
+                agent, date_from, date_to
+            )["aggregated"]
+            rows.append(
+                {
+                    "agent_id": agent.id,
+                    "agent_name": agent.name,
+                    "total_sales_count": aggregated["total_sales_count"],
+                    "total_commissions": aggregated["total_commissions"],
+                    "average_commission": aggregated["average_commission"],
+                    "active_properties_count": aggregated["active_properties_count"],
+                }
+            )
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def test_matches_legacy_ranking(self):
+        date_from = date.today() - timedelta(days=30)
+        for metric in ("total_commissions", "total_sales", "average_commission"):
+            for period in ((None, None), (date_from, None), (None, date_from)):
+                with self.subTest(metric=metric, period=period):
+                    self.assertEqual(
+                        self.service._query_top_agents(
+                            self.company.id, metric, 3, *period
+                        ),
+                        self._legacy_ranking(metric, 3, *period),
+                    )
+
+    def test_ranking_payload(self):
+        ranking = self.service.get_top_agents_ranking(
+            self.company.id, metric="total_sales", limit=2
+        )
+        self.assertEqual(
+            [row["agent_id"] for row in ranking["ranking"]],
+            [self.agents[0].id, self.agents[1].id],
+        )
+        self.assertEqual([row["rank"] for row in ranking["ranking"]], [1, 2])
+
+    def test_archived_agents_are_not_ranked(self):
+        self.agents[1].active = False
+        ranking = self.service._query_top_agents(
+            self.company.id, "total_commissions", 10, None, None
+        )
+        self.assertNotIn(self.agents[1].id, [row["agent_id"] for row in ranking])
+        self.assertEqual(len(ranking), 3)
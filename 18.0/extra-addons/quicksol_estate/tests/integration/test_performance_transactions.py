@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the paginated transactions of agent performance.
+
+The performance payload (and its cache entry) carries aggregates only;
+list_agent_transactions() pages through the period's transactions newest
+first with a (transaction_date, id) keyset.
+"""
+from datetime import date, timedelta
+
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+from ...services.performance_service import PerformanceService
+
+
+@tagged("post_install", "-at_install")
+class TestPerformanceTransactions(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Paging Imobiliária"})
+        cls.env.user.company_ids = [(4, cls.company.id)]
+        cls.agent = cls.env["real.estate.agent"].create(
+            {
+                "name": "Paging Agent",
+                "cpf": "123.456.789-09",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.today = date.today()
+        rule = cls.env["real.estate.commission.rule"].create(
+            {
+                "agent_id": cls.agent.id,
+                "company_id": cls.company.id,
+                "transaction_type": "sale",
+                "structure_type": "percentage",
+                "percentage": 3.0,
+                "valid_from": cls.today - timedelta(days=90),
+                "valid_until": cls.today + timedelta(days=365),
+            }
+        )
+        # Two transactions share each day, so pages split inside a day
+        cls.transactions = cls.env["real.estate.commission.transaction"]
+        for position, days_ago in enumerate([1, 1, 2, 2, 40]):
+            cls.transactions |= cls.transactions.create(
+                {
+                    "agent_id": cls.agent.id,
+                    "rule_id": rule.id,
+                    "transaction_type": "sale",
+                    "transaction_amount": 100000.0,
+                    "commission_amount": 3000.0,
+                    "rule_snapshot": '{"percentage": 3.0}',
+                    "transaction_date": cls.today - timedelta(days=days_ago),
+                    "transaction_reference": f"PAGE-{position}",
+                }
+            )
+        cls.service = PerformanceService(cls.env)
+
+    def _all_pages(self, limit, date_from=None):
+        ids, after = [], None
+        while True:
+            page, has_more = self.service.list_agent_transactions(
+                self.agent.id, date_from, limit=limit, after=after
+            )
+            self.assertLessEqual(len(page), limit)
+            ids += [row["id"] for row in page]
+            if not has_more:
+                return ids
+            after = (date.fromisoformat(page[-1]["date"]), page[-1]["id"])
+
+    def test_pages_cover_the_period_newest_first(self):
+        expected = self.transactions.sorted(
+            lambda t: (t.transaction_date, t.id), reverse=True
+        ).ids
+        self.assertEqual(self._all_pages(2), expected)
+        self.assertEqual(self._all_pages(10), expected)
+
+        recent = self._all_pages(2, date_from=self.today - timedelta(days=7))
+        self.assertEqual(recent, expected[:4])
+
+    def test_payload_holds_aggregates_only(self):
+        payload = self.service.get_agent_performance(self.agent.id)
+        self.assertNotIn("transactions", payload)
+        self.assertEqual(payload["metrics"]["transaction_count"], 5)
+
+    def test_other_company_agent_is_refused(self):
+        other = self.env["res.company"].create({"name": "Paging Outra"})
+        outsider = self.env["real.estate.agent"].create(
+            {
+                "name": "Paging Outsider",
+                "cpf": "987.654.321-00",
+                "company_id": other.id,
+            }
+        )
+        with self.assertRaises(UserError):
+            self.service.list_agent_transactions(outsider.id)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for the property change log behind
+GET /api/v1/properties/changes.
+
+The feed is keyed on the writing transaction (``txid``) and only serves
+rows of transactions older than every transaction still running, so a
+change that commits late cannot land behind a cursor already handed out.
+A property moved to another company leaves a tombstone in the feed of the
+company it left.
+"""
+from datetime import datetime
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestPropertyChanges(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Feed Imobiliária"})
+        cls.other_company = cls.env["res.company"].create({"name": "Feed Destino"})
+        cls.env.user.company_ids = [(4, cls.company.id), (4, cls.other_company.id)]
+        cls.ChangeLog = cls.env["real.estate.property.change"]
+        country = cls.env.ref("base.br")
+        cls.property = cls.env["real.estate.property"].create(
+            {
+                "name": "Feed Property",
+                "property_purpose": "residential",
+                "property_type_id": cls.env["real.estate.property.type"]
+                .create({"name": "Feed Type"})
+                .id,
+                "company_id": cls.company.id,
+                "origin_media": "website",
+                "country_id": country.id,
+                "state_id": cls.env["res.country.state"]
+                .search([("country_id", "=", country.id)], limit=1)
+                .id,
+                "city": "São Paulo",
+                "zip_code": "01310-100",
+                "street": "Av. Paulista",
+                "street_number": "1000",
+                "location_type_id": cls.env["real.estate.location.type"]
+                .create({"name": "Feed Location"})
+                .id,
+                "area": 80.0,
+            }
+        )
+
+    def _xmin(self):
+        self.env.cr.execute(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+        )
+        return self.env.cr.fetchone()[0]
+
+    def _set_txid(self, rows, txid):
+        self.ChangeLog.flush_model()
+        self.env.cr.execute(
+            "UPDATE real_estate_property_change SET txid = %s WHERE id IN %s",
+            (txid, tuple(rows.ids)),
+        )
+
+    def _log(self, property_id, changed_at):
+        return self.ChangeLog.create(
+            {
+                "property_id": property_id,
+                "company_id": self.other_company.id,
+                "change_type": "updated",
+                "changed_at": changed_at,
+            }
+        )
+
+    def test_late_commit_is_served_after_the_cursor(self):
+        domain = [("company_id", "=", self.other_company.id)]
+        xmin = self._xmin()
+        # Started first (older changed_at) but still running at the first read
+        early = self._log(1001, datetime(2026, 5, 6, 10, 0, 0))
+        late = self._log(1002, datetime(2026, 5, 6, 10, 5, 0))
+        self._set_txid(late, xmin - 2)
+        self._set_txid(early, xmin + 10)
+
+        rows = self.ChangeLog._read_changes(domain, limit=10)
+        self.assertEqual([row["id"] for row in rows], [late.id])
+        cursor = (rows[-1]["txid"], rows[-1]["id"])
+
+        # Its transaction commits: it sorts after the cursor, not before it
+        self._set_txid(early, xmin - 1)
+        rows = self.ChangeLog._read_changes(domain, after=cursor, limit=10)
+        self.assertEqual([row["property_id"] for row in rows], [1001])
+
+    def test_company_move_leaves_tombstone_in_previous_company(self):
+        self.property.write({"company_id": self.other_company.id})
+        tombstone = self.ChangeLog.search(
+            [
+                ("property_id", "=", self.property.id),
+                ("company_id", "=", self.company.id),
+                ("change_type", "=", "deleted"),
+            ]
+        )
+        self.assertEqual(len(tombstone), 1)
+        self.assertTrue(
+            self.ChangeLog.search_count(
+                [
+                    ("property_id", "=", self.property.id),
+                    ("company_id", "=", self.other_company.id),
+                    ("change_type", "=", "updated"),
+                ]
+            )
+        )
+
+        # The row under the new company does not supersede the tombstone
+        self._set_txid(
+            self.ChangeLog.search([("property_id", "=", self.property.id)]),
+            self._xmin() - 1,
+        )
+        self.ChangeLog._cron_compact_change_log()
+        self.assertTrue(tombstone.exists())
+        rows = self.ChangeLog._read_changes(
+            [("company_id", "=", self.company.id)], limit=10
+        )
+        self.assertEqual(rows[-1]["property_id"], self.property.id)
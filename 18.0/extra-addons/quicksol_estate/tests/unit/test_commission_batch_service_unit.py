@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/commission_batch_service.py
+
+Batch commission arithmetic: Decimal conversion of float amounts, half-up
+rounding to cents per transaction and the prospector/agent split that
+never loses a cent. No Odoo required.
+"""
+import importlib.util
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "commission_batch_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location(
+        "commission_batch_service", SERVICE_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+commission_batch_service = _load_service()
+
+PERCENTAGE = {"structure_type": "percentage", "percentage": 6.0, "fixed_amount": 0}
+FIXED = {"structure_type": "fixed", "percentage": 0, "fixed_amount": 1500.555}
+
+
+class TestConversion(unittest.TestCase):
+    def test_floats_use_their_decimal_representation(self):
+        self.assertEqual(commission_batch_service.to_decimal(0.1), Decimal("0.1"))
+        self.assertEqual(commission_batch_service.to_decimal(None), Decimal("0"))
+
+    def test_to_cents_rounds_half_up(self):
+        self.assertEqual(commission_batch_service.to_cents(2.675), Decimal("2.68"))
+        self.assertEqual(commission_batch_service.to_cents(-0.005), Decimal("-0.01"))
+
+
+class TestCalculateGroup(unittest.TestCase):
+    def test_percentage_per_amount(self):
+        self.assertEqual(
+            commission_batch_service.calculate_group(
+                PERCENTAGE, [850000.0, 100.25, 0.01]
+            ),
+            [Decimal("51000.00"), Decimal("6.02"), Decimal("0.00")],
+        )
+
+    def test_half_cents_round_up(self):
+        # 3% of 0.50 is 0.015: float arithmetic gives 0.01
+        rule = dict(PERCENTAGE, percentage=3.0)
+        self.assertEqual(
+            commission_batch_service.calculate_group(rule, [0.5]), [Decimal("0.02")]
+        )
+
+    def test_fixed_ignores_amounts(self):
+        self.assertEqual(
+            commission_batch_service.calculate_group(FIXED, [10.0, 99999.0]),
+            [Decimal("1500.56"), Decimal("1500.56")],
+        )
+
+    def test_unknown_structure(self):
+        with self.assertRaises(ValueError):
+            commission_batch_service.calculate_group(
+                dict(PERCENTAGE, structure_type="tiered"), [1.0]
+            )
+
+
+class TestSplit(unittest.TestCase):
+    def test_shares_add_up_to_the_commission(self):
+        for commission in ("51000.00", "0.03", "1000.01", "33.33"):
+            prospector, agent = commission_batch_service.split_commission(
+                Decimal(commission), 0.3
+            )
+            self.assertEqual(prospector + agent, Decimal(commission))
+
+    def test_prospector_share_is_rounded(self):
+        self.assertEqual(
+            commission_batch_service.split_commission(Decimal("0.05"), 0.3),
+            (Decimal("0.02"), Decimal("0.03")),
+        )
+
+    def test_bounds(self):
+        self.assertEqual(
+            commission_batch_service.split_commission(Decimal("10.00"), 0.0),
+            (Decimal("0.00"), Decimal("10.00")),
+        )
+        self.assertEqual(
+            commission_batch_service.split_commission(Decimal("10.00"), 1.0),
+            (Decimal("10.00"), Decimal("0.00")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — controllers/utils/commission_filters.py
+
+Commission exports are read under sudo, so every profile below financial
+is restricted to its own transactions. No Odoo required.
+"""
+import importlib.util
+import unittest
+from pathlib import Path
+
+FILTERS_PATH = (
+    Path(__file__).parent.parent.parent
+    / "controllers"
+    / "utils"
+    / "commission_filters.py"
+)
+
+_spec = importlib.util.spec_from_file_location("qe_commission_filters", FILTERS_PATH)
+commission_filters = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(commission_filters)
+
+COMPANY_DOMAIN = [("company_id", "in", [1])]
+
+
+class FakeUser:
+    def __init__(self, user_id, *groups):
+        self.id = user_id
+        self.groups = set(groups)
+
+    def has_group(self, group):
+        return group in self.groups
+
+
+class TestCommissionScope(unittest.TestCase):
+    def test_receptionist_only_sees_own_transactions(self):
+        receptionist = FakeUser(
+            11,
+            "quicksol_estate.group_real_estate_receptionist",
+            "quicksol_estate.group_real_estate_user",
+        )
+        domain = commission_filters.build_commission_filter_domain(
+            {},
+            COMPANY_DOMAIN,
+            agent_user_id=commission_filters.commission_scope_user_id(receptionist),
+        )
+        self.assertIn(("agent_id.user_id", "=", 11), domain)
+
+    def test_agent_and_prospector_are_scoped(self):
+        for group in (
+            "quicksol_estate.group_real_estate_agent",
+            "quicksol_estate.group_real_estate_prospector",
+        ):
+            with self.subTest(group=group):
+                user = FakeUser(12, group)
+                self.assertEqual(commission_filters.commission_scope_user_id(user), 12)
+
+    def test_managing_profiles_see_the_company(self):
+        for group in commission_filters.COMMISSION_MANAGER_GROUPS:
+            with self.subTest(group=group):
+                user = FakeUser(13, group, "quicksol_estate.group_real_estate_agent")
+                self.assertIsNone(commission_filters.commission_scope_user_id(user))
+                domain = commission_filters.build_commission_filter_domain(
+                    {}, COMPANY_DOMAIN, agent_user_id=None
+                )
+                self.assertEqual(domain, COMPANY_DOMAIN)
+
+    def test_invalid_payment_status(self):
+        with self.assertRaises(ValueError):
+            commission_filters.build_commission_filter_domain(
+                {"payment_status": "unknown"}, COMPANY_DOMAIN
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
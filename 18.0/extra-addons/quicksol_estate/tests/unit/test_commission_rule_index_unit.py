@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/commission_rule_index.py
+
+In-memory commission rule resolution: validity intervals, "both" rules,
+value ranges and the newest-first tie order of the ORM search it replaces.
+No Odoo required.
+"""
+import importlib.util
+import unittest
+from datetime import date
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "commission_rule_index.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("commission_rule_index", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+commission_rule_index = _load_service()
+RuleIndex = commission_rule_index.RuleIndex
+
+
+def _rule(
+    rule_id,
+    valid_from,
+    valid_until=False,
+    transaction_type="sale",
+    agent_id=7,
+    min_value=0.0,
+    max_value=999999999.99,
+):
+    return {
+        "id": rule_id,
+        "agent_id": agent_id,
+        "transaction_type": transaction_type,
+        "valid_from": valid_from,
+        "valid_until": valid_until,
+        "min_value": min_value,
+        "max_value": max_value,
+    }
+
+
+class TestResolve(unittest.TestCase):
+    def test_newest_started_rule_wins(self):
+        index = RuleIndex([_rule(1, date(2026, 1, 1)), _rule(2, date(2026, 3, 1))])
+        self.assertEqual(index.resolve(7, "sale", date(2026, 2, 15)), 1)
+        self.assertEqual(index.resolve(7, "sale", date(2026, 3, 1)), 2)
+        self.assertIsNone(index.resolve(7, "sale", date(2025, 12, 31)))
+
+    def test_expired_rules_are_skipped(self):
+        index = RuleIndex(
+            [
+                _rule(1, date(2026, 1, 1)),
+                _rule(2, date(2026, 3, 1), valid_until=date(2026, 3, 31)),
+            ]
+        )
+        self.assertEqual(index.resolve(7, "sale", date(2026, 3, 31)), 2)
+        self.assertEqual(index.resolve(7, "sale", date(2026, 4, 1)), 1)
+
+    def test_same_start_prefers_highest_id(self):
+        index = RuleIndex([_rule(5, date(2026, 1, 1)), _rule(3, date(2026, 1, 1))])
+        self.assertEqual(index.resolve(7, "sale", date(2026, 6, 1)), 5)
+
+    def test_both_rules_cover_sales_and_rentals(self):
+        index = RuleIndex(
+            [
+                _rule(1, date(2026, 1, 1), transaction_type="both"),
+                _rule(2, date(2026, 2, 1), transaction_type="rental"),
+            ]
+        )
+        self.assertEqual(index.resolve(7, "sale", date(2026, 3, 1)), 1)
+        self.assertEqual(index.resolve(7, "rental", date(2026, 3, 1)), 2)
+        self.assertEqual(index.resolve(7, "rental", date(2026, 1, 15)), 1)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.rule_ids, {1, 2})
+
+    def test_value_range_when_amount_given(self):
+        index = RuleIndex(
+            [
+                _rule(1, date(2026, 1, 1)),
+                _rule(2, date(2026, 2, 1), min_value=500000.0),
+                _rule(3, date(2026, 3, 1), max_value=100000.0),
+            ]
+        )
+        on = date(2026, 4, 1)
+        self.assertEqual(index.resolve(7, "sale", on), 3)
+        self.assertEqual(index.resolve(7, "sale", on, 100000.0), 3)
+        self.assertEqual(index.resolve(7, "sale", on, 600000.0), 2)
+        self.assertEqual(index.resolve(7, "sale", on, 300000.0), 1)
+
+    def test_unknown_agent_or_type(self):
+        index = RuleIndex([_rule(1, date(2026, 1, 1))])
+        self.assertIsNone(index.resolve(8, "sale", date(2026, 2, 1)))
+        self.assertIsNone(index.resolve(7, "rental", date(2026, 2, 1)))
+        self.assertEqual(len(RuleIndex([])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/commission_statement_service.py
+
+Monthly commission statements: month parsing and the single pass that
+folds a company's transaction lines into one statement per agent. No Odoo
+required.
+"""
+import importlib.util
+import unittest
+from datetime import date
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent
+    / "services"
+    / "commission_statement_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location(
+        "commission_statement_service", SERVICE_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+commission_statement_service = _load_service()
+
+
+class TestParseMonth(unittest.TestCase):
+    def test_bounds(self):
+        self.assertEqual(
+            commission_statement_service.parse_month("2028-02"),
+            (date(2028, 2, 1), date(2028, 2, 29)),
+        )
+        self.assertEqual(
+            commission_statement_service.parse_month("2026-12"),
+            (date(2026, 12, 1), date(2026, 12, 31)),
+        )
+
+    def test_invalid(self):
+        for value in (None, "", "2026-13", "2026-00", "2026-9", "09/2026"):
+            with self.assertRaises(ValueError):
+                commission_statement_service.parse_month(value)
+
+    def test_file_formats(self):
+        self.assertEqual(
+            commission_statement_service.file_formats("both"), ["csv", "pdf"]
+        )
+        self.assertEqual(commission_statement_service.file_formats("pdf"), ["pdf"])
+
+
+class TestBuildStatements(unittest.TestCase):
+    def test_one_statement_per_agent(self):
+        day = date(2026, 9, 3)
+        lines = [
+            (1, 10, day, "S-1", "sale", 500000.0, 15000.0, "paid"),
+            (1, 11, day, None, "rental", 3000.0, 300.0, "pending"),
+            (2, 12, day, "S-2", "sale", 100000.0, 3000.0, "cancelled"),
+            (9, 13, day, "S-9", "sale", 1.0, 0.1, "paid"),
+        ]
+        statements = commission_statement_service.build_statements(
+            [(1, "Ana"), (2, "Bruno"), (3, "Carla")], lines
+        )
+        self.assertEqual(
+            [statement["agent_name"] for statement in statements],
+            ["Ana", "Bruno", "Carla"],
+        )
+        ana, bruno, carla = statements
+        self.assertEqual(ana["transaction_count"], 2)
+        self.assertEqual(ana["transaction_amount"], 503000.0)
+        self.assertEqual(ana["total_commission"], 15300.0)
+        self.assertEqual(ana["paid_commission"], 15000.0)
+        self.assertEqual(ana["pending_commission"], 300.0)
+        self.assertEqual(
+            ana["lines"][1],
+            {
+                "id": 11,
+                "date": "2026-09-03",
+                "reference": "",
+                "type": "rental",
+                "transaction_amount": 3000.0,
+                "commission_amount": 300.0,
+                "payment_status": "pending",
+            },
+        )
+        self.assertEqual(bruno["cancelled_commission"], 3000.0)
+        self.assertEqual(bruno["total_commission"], 3000.0)
+        self.assertEqual(carla["transaction_count"], 0)
+        self.assertEqual(carla["lines"], [])
+        self.assertEqual(carla["total_commission"], 0.0)
+
+    def test_totals_rounded_to_cents(self):
+        day = date(2026, 9, 3)
+        lines = [(1, id_, day, "", "sale", 0.1, 0.1, "paid") for id_ in range(3)]
+        (statement,) = commission_statement_service.build_statements(
+            [(1, "Ana")], lines
+        )
+        self.assertEqual(statement["total_commission"], 0.3)
+        self.assertEqual(statement["transaction_amount"], 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/export_job_service.py
+
+Async export jobs: CSV cell formatting, gzip members appended chunk by chunk
+and the partial-file protocol that makes retried chunks idempotent.
+No Odoo required.
+"""
+import csv
+import gzip
+import hashlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "export_job_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("export_job_service", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+export_job_service = _load_service()
+
+
+class TestFormatting(unittest.TestCase):
+    def test_format_value_by_field_type(self):
+        fmt = export_job_service.format_value
+        self.assertEqual(fmt((3, "Agent Smith"), "many2one"), "Agent Smith")
+        self.assertEqual(fmt(False, "many2one"), "")
+        self.assertEqual(fmt(False, "boolean"), "false")
+        self.assertEqual(fmt(True, "boolean"), "true")
+        self.assertEqual(fmt(False, "char"), "")
+        self.assertEqual(fmt(0.0, "float"), 0.0)
+        self.assertEqual(fmt(date(2026, 3, 1), "date"), "2026-03-01")
+        self.assertEqual(
+            fmt(datetime(2026, 3, 1, 8, 5, 0), "datetime"), "2026-03-01 08:05:00"
+        )
+
+    def test_every_resource_has_id_first(self):
+        for resource in export_job_service.EXPORT_RESOURCES:
+            self.assertEqual(export_job_service.export_fields(resource)[0], "id")
+            self.assertEqual(
+                len(export_job_service.export_fields(resource)),
+                len(export_job_service.export_headers(resource)),
+            )
+
+    def test_filename(self):
+        self.assertEqual(
+            export_job_service.export_filename("leads", 7), "leads_export_7.csv"
+        )
+        self.assertEqual(
+            export_job_service.export_filename("leads", 7, compress=True),
+            "leads_export_7.csv.gz",
+        )
+
+
+class TestPartialFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = export_job_service.partial_path(self.tmp.name, "db", 5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_new_partial_is_created(self):
+        self.assertTrue(export_job_service.prepare_partial(self.path, 0))
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_missing_partial_with_committed_data_requires_restart(self):
+        self.assertFalse(export_job_service.prepare_partial(self.path, 10))
+
+    def test_rolled_back_chunk_is_truncated(self):
+        export_job_service.prepare_partial(self.path, 0)
+        committed = export_job_service.append_chunk(
+            self.path, export_job_service.encode_csv([[1]], header=["ID"])
+        )
+        export_job_service.append_chunk(self.path, b"2\r\n")  # never committed
+        self.assertTrue(export_job_service.prepare_partial(self.path, committed))
+        with open(self.path, "rb") as fh:
+            rows = list(csv.reader(io.StringIO(fh.read().decode())))
+        self.assertEqual(rows, [["ID"], ["1"]])
+
+    def test_committed_size_past_2gib(self):
+        # The job stores the offset as a float (int4 overflows at 2 GiB)
+        committed = 2**31 + 5
+        export_job_service.prepare_partial(self.path, 0)
+        with open(self.path, "r+b") as fh:
+            fh.truncate(committed + 100)  # sparse: no 2 GiB actually written
+        self.assertTrue(
+            export_job_service.prepare_partial(self.path, float(committed))
+        )
+        self.assertEqual(os.path.getsize(self.path), committed)
+        self.assertEqual(export_job_service.append_chunk(self.path, b"x"), committed + 1)
+
+    def test_gzip_members_form_one_file(self):
+        export_job_service.prepare_partial(self.path, 0)
+        export_job_service.append_chunk(
+            self.path,
+            export_job_service.encode_csv([[1]], header=["ID"], compress=True),
+        )
+        export_job_service.append_chunk(
+            self.path, export_job_service.encode_csv([[2]], compress=True)
+        )
+        with gzip.open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), b"ID\r\n1\r\n2\r\n")
+
+    def test_file_digest(self):
+        content = os.urandom(200_000)
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as fh:
+            fh.write(content)
+        size, checksum, head = export_job_service.file_digest(self.path)
+        self.assertEqual(size, len(content))
+        self.assertEqual(checksum, hashlib.sha1(content).hexdigest())
+        self.assertEqual(head, content[: export_job_service.SNIFF_BYTES])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/image_rendition_service.py
+
+Renditions are built with Pillow only; no Odoo or database required.
+"""
+import importlib.util
+import io
+import unittest
+from pathlib import Path
+
+try:
+    from PIL import Image
+
+    _pil_available = True
+except ImportError:
+    _pil_available = False
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "image_rendition_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("image_rendition_service", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _image_bytes(width, height, mode="RGB", fmt="JPEG"):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 100, 50, 128)[: len(mode)]).save(
+        buffer, format=fmt
+    )
+    return buffer.getvalue()
+
+
+@unittest.skipUnless(_pil_available, "Pillow not installed")
+class TestBuildRenditions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = _load_service()
+
+    def test_large_source_produces_all_sizes_in_both_formats(self):
+        renditions = self.service.build_renditions(_image_bytes(2400, 1600))
+
+        produced = {(r["size"], r["format"]) for r in renditions}
+        self.assertEqual(
+            produced,
+            {
+                (size, fmt)
+                for size in ("thumbnail", "medium", "large")
+                for fmt in ("webp", "jpeg")
+            },
+        )
+        widths = {r["size"]: r["width"] for r in renditions}
+        self.assertEqual(widths, {"thumbnail": 320, "medium": 800, "large": 1600})
+
+    def test_aspect_ratio_is_preserved(self):
+        renditions = self.service.build_renditions(_image_bytes(2400, 1600))
+        thumbnail = next(r for r in renditions if r["size"] == "thumbnail")
+        self.assertEqual((thumbnail["width"], thumbnail["height"]), (320, 213))
+
+    def test_small_source_is_not_upscaled(self):
+        renditions = self.service.build_renditions(_image_bytes(640, 480))
+        self.assertEqual({r["size"] for r in renditions}, {"thumbnail"})
+
+    def test_renditions_are_smaller_than_source(self):
+        source = _image_bytes(2400, 1600)
+        renditions = self.service.build_renditions(source)
+        thumbnail = next(
+            r for r in renditions if r["size"] == "thumbnail" and r["format"] == "jpeg"
+        )
+        self.assertLess(len(thumbnail["content"]), len(source))
+        self.assertEqual(Image.open(io.BytesIO(thumbnail["content"])).format, "JPEG")
+
+    def test_transparent_png_is_flattened_for_jpeg(self):
+        renditions = self.service.build_renditions(
+            _image_bytes(400, 400, mode="RGBA", fmt="PNG")
+        )
+        jpeg = next(r for r in renditions if r["format"] == "jpeg")
+        self.assertEqual(Image.open(io.BytesIO(jpeg["content"])).mode, "RGB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — controllers/utils/lead_activities.py
+
+Activity type detection and body cleanup for lead activities (FR-035), as
+posted by POST /api/v1/leads/<id>/activities. No Odoo required.
+"""
+import importlib.util
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+UTILS_PATH = (
+    Path(__file__).parent.parent.parent / "controllers" / "utils" / "lead_activities.py"
+)
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("lead_activities", UTILS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lead_activities = _load()
+
+
+class TestParseActivity(unittest.TestCase):
+    def test_posted_activity_formats(self):
+        for kind, icon in (
+            ("call", "📞"),
+            ("email", "📧"),
+            ("meeting", "🤝"),
+            ("note", "📝"),
+        ):
+            body = f"<p>{icon} <strong>{kind.upper()}</strong><br/>Talked to client</p>"
+            self.assertEqual(
+                lead_activities.parse_activity(body), (kind, "Talked to client")
+            )
+
+    def test_call_wins_over_other_markers(self):
+        self.assertEqual(
+            lead_activities.activity_type("Sent EMAIL after the CALL"), "call"
+        )
+        self.assertEqual(lead_activities.activity_type("MEETING then EMAIL"), "email")
+
+    def test_plain_and_empty_bodies(self):
+        self.assertEqual(
+            lead_activities.parse_activity("<p>Just a comment</p>"),
+            ("note", "Just a comment"),
+        )
+        self.assertEqual(lead_activities.parse_activity(None), ("note", ""))
+
+
+class TestSerializeRecentActivity(unittest.TestCase):
+    def test_long_body_is_truncated(self):
+        data = lead_activities.serialize_recent_activity(
+            {
+                "id": 9,
+                "body": "📝 <strong>NOTE</strong><br/>" + "x" * 150,
+                "author_name": None,
+                "date": datetime(2026, 3, 1, 9, 30, 0),
+            }
+        )
+        self.assertEqual(data["body"], "x" * 100 + "...")
+        self.assertEqual(data["author"], "Unknown")
+        self.assertEqual(data["date"], "2026-03-01 09:30:00")
+        self.assertEqual(data["activity_type"], "note")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/lead_assignment_service.py
+
+Automatic lead assignment (FR-002b): round-robin, least-open and
+skill/region picks over the in-memory open-lead counters, counter deltas
+and the per-company index registry. No Odoo required.
+"""
+import importlib.util
+import unittest
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "lead_assignment_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location(
+        "lead_assignment_service", SERVICE_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lead_assignment_service = _load_service()
+AgentLoadIndex = lead_assignment_service.AgentLoadIndex
+AgentProfile = lead_assignment_service.AgentProfile
+
+
+class TestRegions(unittest.TestCase):
+    def test_parse_regions(self):
+        self.assertEqual(
+            lead_assignment_service.parse_regions(" Moema, São Paulo ,, "),
+            frozenset({"moema", "sao paulo"}),
+        )
+        self.assertEqual(lead_assignment_service.parse_regions(None), frozenset())
+
+    def test_profile_matches(self):
+        profile = AgentProfile([3], {"moema"})
+        self.assertTrue(profile.matches(3, "Apartamento em MOEMA"))
+        self.assertFalse(profile.matches(4, "Moema"))
+        self.assertFalse(profile.matches(3, "Santos"))
+        self.assertTrue(AgentProfile().matches(None, None))
+        self.assertFalse(AgentProfile().is_specialist)
+
+
+class TestLeastOpen(unittest.TestCase):
+    def test_picks_fewest_open_leads(self):
+        index = AgentLoadIndex({1: 5, 2: 1, 3: 3})
+        self.assertEqual(index.pick("least_open"), 2)
+        self.assertEqual(index.count(2), 2)
+
+    def test_balances_a_batch(self):
+        index = AgentLoadIndex({1: 0, 2: 0, 3: 2})
+        picks = [index.pick("least_open") for _ in range(7)]
+        self.assertEqual(picks.count(1), 3)
+        self.assertEqual(picks.count(2), 3)
+        self.assertEqual(picks.count(3), 1)
+        self.assertEqual({index.count(a) for a in (1, 2, 3)}, {3})
+
+    def test_ties_rotate(self):
+        index = AgentLoadIndex({1: 0, 2: 0})
+        first = index.pick("least_open")
+        index.release(first)
+        self.assertNotEqual(index.pick("least_open"), first)
+
+    def test_adjust_and_release(self):
+        index = AgentLoadIndex({1: 1, 2: 2})
+        index.adjust(1, 5)
+        self.assertEqual(index.pick("least_open"), 2)
+        index.release(2)
+        self.assertEqual(index.count(2), 2)
+        index.adjust(1, -10)
+        self.assertEqual(index.count(1), 0)
+        index.adjust(99, 1)
+        self.assertNotIn(99, index)
+
+    def test_heaps_stay_bounded(self):
+        index = AgentLoadIndex({1: 0, 2: 0})
+        for _ in range(1000):
+            index.adjust(1, 1)
+            index.adjust(1, -1)
+        self.assertLess(len(index._by_load), 2 * len(index) + 34)
+
+    def test_empty_index(self):
+        index = AgentLoadIndex({})
+        self.assertIsNone(index.pick("least_open"))
+        self.assertIsNone(index.pick("round_robin"))
+        self.assertIsNone(index.pick("skill_region"))
+
+
+class TestRoundRobin(unittest.TestCase):
+    def test_cycles_through_agents_whatever_the_load(self):
+        index = AgentLoadIndex({1: 10, 2: 0, 3: 4})
+        picks = [index.pick("round_robin") for _ in range(6)]
+        self.assertEqual(picks[:3], picks[3:])
+        self.assertEqual(sorted(picks[:3]), [1, 2, 3])
+
+
+class TestSkillRegion(unittest.TestCase):
+    def setUp(self):
+        self.index = AgentLoadIndex(
+            {1: 0, 2: 5, 3: 8, 4: 1},
+            {
+                2: AgentProfile([], {"moema"}),
+                3: AgentProfile([], {"moema", "santos"}),
+                4: AgentProfile([7], set()),
+            },
+        )
+
+    def test_least_loaded_matching_specialist(self):
+        self.assertEqual(self.index.pick("skill_region", None, "Moema"), 2)
+
+    def test_property_type_specialist(self):
+        self.assertEqual(self.index.pick("skill_region", 7, "Centro"), 4)
+
+    def test_generalist_when_no_specialist_matches(self):
+        self.assertEqual(self.index.pick("skill_region", None, "Centro"), 1)
+
+
+class TestRegistry(unittest.TestCase):
+    def test_loads_once_then_applies_deltas(self):
+        registry = lead_assignment_service.LoadIndexRegistry()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return AgentLoadIndex({1: 0})
+
+        index = registry.get(("db", 1), loader)
+        self.assertIs(registry.get(("db", 1), loader), index)
+        self.assertEqual(len(loads), 1)
+
+        registry.apply_deltas("db", {(1, 1): 2, (2, 5): 1})
+        self.assertEqual(index.count(1), 2)
+
+        registry.drop("db", [1])
+        self.assertIsNone(registry.peek(("db", 1)))
+        registry.get(("db", 1), loader, ttl=0)
+        self.assertEqual(len(loads), 2)
+
+    def test_open_lead_key(self):
+        key = lead_assignment_service.open_lead_key
+        self.assertEqual(key(1, 2, "new", True), (1, 2))
+        self.assertIsNone(key(1, 2, "won", True))
+        self.assertIsNone(key(1, 2, "new", False))
+        self.assertIsNone(key(1, False, "new", True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/lead_dedup_service.py
+
+Per-agent duplicate prevention (FR-005a): key normalization, conflicts
+inside a bulk batch and against stored leads, and the error message.
+No Odoo required.
+"""
+import importlib.util
+import unittest
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "lead_dedup_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("lead_dedup_service", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lead_dedup_service = _load_service()
+
+
+class TestNormalization(unittest.TestCase):
+    def test_keys(self):
+        self.assertEqual(
+            lead_dedup_service.normalize_phone("+55 (11) 98765-4321"), "5511987654321"
+        )
+        self.assertFalse(lead_dedup_service.normalize_phone("n/a"))
+        self.assertEqual(
+            lead_dedup_service.normalize_email("  Cliente@Example.COM "),
+            "cliente@example.com",
+        )
+        self.assertFalse(lead_dedup_service.normalize_email("   "))
+
+    def test_closed_or_archived_leads_do_not_count(self):
+        self.assertTrue(lead_dedup_service.is_open("new"))
+        self.assertFalse(lead_dedup_service.is_open("lost"))
+        self.assertFalse(lead_dedup_service.is_open("won"))
+        self.assertFalse(lead_dedup_service.is_open("contacted", active=False))
+
+    def test_candidate_needs_agent_and_contact(self):
+        self.assertIsNone(lead_dedup_service.make_candidate("row 1", 7, None, None))
+        self.assertIsNone(
+            lead_dedup_service.make_candidate("row 1", False, "11999", None)
+        )
+        candidate = lead_dedup_service.make_candidate("row 1", 7, "(11) 999", None)
+        self.assertEqual(candidate["phone_key"], "11999")
+        self.assertFalse(candidate["email_key"])
+
+
+class TestConflicts(unittest.TestCase):
+    def setUp(self):
+        make = lead_dedup_service.make_candidate
+        self.candidates = [
+            make("row 1", 7, "(11) 99988-7766", "a@example.com"),
+            make("row 2", 7, "11999887766", "b@example.com"),
+            make("row 3", 8, "11999887766", "A@example.com"),
+            make("row 4", 7, None, "A@Example.com"),
+        ]
+
+    def test_batch_conflicts_are_per_agent(self):
+        conflicts = lead_dedup_service.find_batch_conflicts(self.candidates)
+        self.assertEqual(
+            [(ref, field) for ref, field, _value, _in_batch in conflicts],
+            [("row 2", "phone"), ("row 4", "email")],
+        )
+        self.assertTrue(all(in_batch for *_rest, in_batch in conflicts))
+
+    def test_existing_conflicts(self):
+        existing = [("phone_key", 8, "11999887766"), ("email_key", 9, "b@example.com")]
+        conflicts = lead_dedup_service.find_existing_conflicts(
+            self.candidates, existing
+        )
+        self.assertEqual(conflicts, [("row 3", "phone", "11999887766", False)])
+
+    def test_key_pairs_are_deduplicated(self):
+        agent_ids, keys = lead_dedup_service.key_pairs(self.candidates, "phone_key")
+        self.assertEqual(
+            sorted(zip(agent_ids, keys)), [(7, "11999887766"), (8, "11999887766")]
+        )
+
+
+class TestDuplicateMessage(unittest.TestCase):
+    def test_single_conflict_keeps_historical_message(self):
+        message = lead_dedup_service.duplicate_message(
+            [("row 1", "phone", "+5511999887766", False)]
+        )
+        self.assertEqual(
+            message,
+            "You already have an active lead with phone +5511999887766. "
+            "Please edit the existing lead or add a new activity.",
+        )
+
+    def test_all_conflicts_are_listed(self):
+        message = lead_dedup_service.duplicate_message(
+            [
+                ("row 2", "phone", "11999887766", True),
+                ("row 5", "email", "a@example.com", False),
+            ]
+        )
+        self.assertIn("Found 2 duplicate leads", message)
+        self.assertIn("- row 2: phone 11999887766 repeated in this batch", message)
+        self.assertIn("- row 5: email a@example.com already exists", message)
+
+    def test_index_field(self):
+        self.assertEqual(
+            lead_dedup_service.index_field("real_estate_lead_agent_email_key_uniq"),
+            "email_key",
+        )
+        self.assertIsNone(lead_dedup_service.index_field("other_constraint"))
+
+
+if __name__ == "__main__":
+    unittest.main()
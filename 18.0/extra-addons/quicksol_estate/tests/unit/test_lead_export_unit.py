@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — controllers/utils/lead_export.py and
+services/lead_filter_domain.py
+
+Streaming lead export: row formatting from search_read dicts, chunked CSV
+output (plain and gzip) and the shared list/export filter domain.
+No Odoo required.
+"""
+import csv
+import gzip
+import importlib.util
+import io
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).parent.parent.parent
+
+
+def _load(name, directory):
+    spec = importlib.util.spec_from_file_location(
+        name, MODULE_PATH / directory / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lead_export = _load("lead_export", "controllers/utils")
+lead_filters = _load("lead_filter_domain", "services")
+
+
+def _record(lead_id, **overrides):
+    values = {
+        "id": lead_id,
+        "name": f"Lead {lead_id}",
+        "state": "new",
+        "phone": False,
+        "email": "lead@example.com",
+        "agent_id": (7, "Agent Smith"),
+        "budget_min": 100000.0,
+        "budget_max": 0.0,
+        "property_type_interest": False,
+        "location_preference": "Centro",
+        "bedrooms_needed": 3,
+        "first_contact_date": date(2026, 1, 2),
+        "expected_closing_date": False,
+        "days_in_state": 4,
+        "create_date": datetime(2026, 1, 2, 10, 30, 0),
+    }
+    values.update(overrides)
+    return values
+
+
+class TestFormatLeadRow(unittest.TestCase):
+    def test_columns_match_headers(self):
+        row = lead_export.format_lead_row(_record(1))
+        self.assertEqual(len(row), len(lead_export.LEAD_EXPORT_HEADERS))
+        self.assertEqual(lead_export.LEAD_EXPORT_FIELDS[0], "id")
+
+    def test_values_are_formatted(self):
+        row = lead_export.format_lead_row(_record(1))
+        self.assertEqual(row[5], "Agent Smith")
+        self.assertEqual(row[3], "")
+        self.assertEqual(row[7], "")
+        self.assertEqual(row[8], "")
+        self.assertEqual(row[11], "2026-01-02")
+        self.assertEqual(row[12], "")
+        self.assertEqual(row[14], "2026-01-02 10:30:00")
+
+
+class TestIterCsvChunks(unittest.TestCase):
+    def setUp(self):
+        self.chunks = [[_record(3), _record(2)], [_record(1)]]
+
+    def _rows(self, data):
+        return list(csv.reader(io.StringIO(data.decode("utf-8"))))
+
+    def test_header_then_one_block_per_chunk(self):
+        blocks = list(lead_export.iter_csv_chunks(iter(self.chunks)))
+        self.assertEqual(len(blocks), 3)
+        rows = self._rows(b"".join(blocks))
+        self.assertEqual(rows[0], lead_export.LEAD_EXPORT_HEADERS)
+        self.assertEqual([row[0] for row in rows[1:]], ["3", "2", "1"])
+
+    def test_gzip_round_trip(self):
+        plain = b"".join(lead_export.iter_csv_chunks(iter(self.chunks)))
+        compressed = b"".join(
+            lead_export.iter_csv_chunks(iter(self.chunks), compress=True)
+        )
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_empty_export_has_header_only(self):
+        rows = self._rows(b"".join(lead_export.iter_csv_chunks(iter([]))))
+        self.assertEqual(rows, [lead_export.LEAD_EXPORT_HEADERS])
+
+
+class TestBuildLeadFilterDomain(unittest.TestCase):
+    company_domain = [("company_id", "in", [1])]
+
+    def test_defaults_to_active_company_leads(self):
+        domain = lead_filters.build_lead_filter_domain({}, self.company_domain)
+        self.assertEqual(domain, [("company_id", "in", [1]), ("active", "=", True)])
+
+    def test_agent_scoping_and_agent_filter_permission(self):
+        domain = lead_filters.build_lead_filter_domain(
+            {"agent_id": "9", "active": "all"}, self.company_domain, agent_user_id=5
+        )
+        self.assertIn(("agent_id.user_id", "=", 5), domain)
+        self.assertNotIn(("agent_id", "=", 9), domain)
+
+        domain = lead_filters.build_lead_filter_domain(
+            {"agent_id": "9"}, self.company_domain, can_filter_agent=True
+        )
+        self.assertIn(("agent_id", "=", 9), domain)
+
+    def test_does_not_mutate_company_domain(self):
+        lead_filters.build_lead_filter_domain({"state": "won"}, self.company_domain)
+        self.assertEqual(self.company_domain, [("company_id", "in", [1])])
+
+    def test_invalid_number_raises_and_invalid_date_is_ignored(self):
+        with self.assertRaises(ValueError):
+            lead_filters.build_lead_filter_domain(
+                {"budget_min": "abc"}, self.company_domain
+            )
+        domain = lead_filters.build_lead_filter_domain(
+            {"created_from": "02/01/2026"}, self.company_domain
+        )
+        self.assertFalse([leaf for leaf in domain if leaf[0] == "create_date"])
+
+    def test_search_and_last_activity(self):
+        domain = lead_filters.build_lead_filter_domain(
+            {"search": " ana ", "last_activity_before": "2026-03-01"},
+            self.company_domain,
+        )
+        self.assertIn(("name", "ilike", "ana"), domain)
+        self.assertIn(("last_activity_at", "<", "2026-03-01 00:00:00"), domain)
+
+    def test_search_digits_match_normalized_phone(self):
+        domain = lead_filters.build_lead_filter_domain(
+            {"search": "(11) 98765"}, self.company_domain
+        )
+        self.assertIn(("phone_key", "ilike", "1198765"), domain)
+        self.assertEqual(domain.count("|"), 3)
+
+        domain = lead_filters.build_lead_filter_domain(
+            {"search": "ana 12"}, self.company_domain
+        )
+        self.assertNotIn("phone_key", [leaf[0] for leaf in domain if leaf != "|"])
+
+    def test_days_in_state_range(self):
+        domain = lead_filters.build_lead_filter_domain(
+            {"min_days_in_state": "8", "max_days_in_state": "30"},
+            self.company_domain,
+        )
+        self.assertIn(("days_in_state", ">=", 8), domain)
+        self.assertIn(("days_in_state", "<=", 30), domain)
+        with self.assertRaises(ValueError):
+            lead_filters.build_lead_filter_domain(
+                {"min_days_in_state": "week"}, self.company_domain
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
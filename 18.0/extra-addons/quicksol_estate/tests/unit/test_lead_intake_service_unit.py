@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/lead_intake_service.py
+
+Portal webhook batches (POST /api/v1/leads/ingest): batch validation,
+per-item rejection, idempotency key handling and lead values.
+No Odoo required.
+"""
+import importlib.util
+import unittest
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "lead_intake_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("lead_intake_service", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lead_intake_service = _load_service()
+
+
+class TestParseIntakeBatch(unittest.TestCase):
+    def test_invalid_batches(self):
+        parse = lead_intake_service.parse_intake_batch
+        error = lead_intake_service.IntakeBatchError
+        for body in (
+            [],
+            {"leads": [{"id": 1}]},
+            {"portal": "zap", "leads": []},
+            {"portal": "zap", "leads": {"id": 1}},
+            {
+                "portal": "zap",
+                "leads": [{}] * (lead_intake_service.MAX_BATCH_SIZE + 1),
+            },
+        ):
+            with self.assertRaises(error):
+                parse(body)
+
+    def test_items_are_validated_one_by_one(self):
+        portal, accepted, repeated, rejected = lead_intake_service.parse_intake_batch(
+            {
+                "portal": " zap ",
+                "leads": [
+                    {"id": 10, "name": "Ana", "phone": "(11) 98765-4321"},
+                    {"id": "11", "name": "No contact"},
+                    {"name": "No id", "email": "x@example.com"},
+                    {
+                        "id": "12",
+                        "name": "Bad budget",
+                        "email": "b@x.com",
+                        "budget_max": "a lot",
+                    },
+                    "not an object",
+                    {
+                        "id": "13",
+                        "name": "Bruno",
+                        "email": "bruno@example.com",
+                        "budget_max": "450000",
+                        "bedrooms_needed": 3,
+                        "message": "Is it still available?",
+                    },
+                ],
+            }
+        )
+        self.assertEqual(portal, "zap")
+        self.assertEqual([external_id for external_id, _ in accepted], ["10", "13"])
+        self.assertEqual(
+            accepted[1][1],
+            {
+                "name": "Bruno",
+                "email": "bruno@example.com",
+                "budget_max": 450000.0,
+                "bedrooms_needed": 3,
+                "message": "Is it still available?",
+            },
+        )
+        self.assertEqual(repeated, [])
+        self.assertEqual([item["index"] for item in rejected], [1, 2, 3, 4])
+        self.assertIn("budget_max", rejected[2]["error"])
+
+    def test_repeated_id_in_batch_is_queued_once(self):
+        _portal, accepted, repeated, rejected = lead_intake_service.parse_intake_batch(
+            {
+                "portal": "olx",
+                "leads": [
+                    {"id": "7", "name": "First", "phone": "11911112222"},
+                    {"id": "7", "name": "Redelivered", "phone": "11911112222"},
+                ],
+            }
+        )
+        self.assertEqual(len(accepted), 1)
+        self.assertEqual(accepted[0][1]["name"], "First")
+        self.assertEqual(repeated, ["7"])
+        self.assertEqual(rejected, [])
+
+    def test_long_values_are_cut_to_field_size(self):
+        _portal, accepted, _repeated, _rejected = (
+            lead_intake_service.parse_intake_batch(
+                {
+                    "portal": "zap",
+                    "leads": [{"id": "1", "name": "N" * 300, "phone": "1"}],
+                }
+            )
+        )
+        self.assertEqual(len(accepted[0][1]["name"]), 100)
+
+
+class TestLeadValues(unittest.TestCase):
+    def test_message_is_kept_apart_from_lead_fields(self):
+        payload = {"name": "Ana", "phone": "11999", "message": " Hi "}
+        self.assertEqual(lead_intake_service.lead_message(payload), "Hi")
+        vals = lead_intake_service.lead_values(payload, 5, 2)
+        self.assertEqual(
+            vals,
+            {
+                "name": "Ana",
+                "phone": "11999",
+                "agent_id": 5,
+                "company_id": 2,
+                "source": "portal",
+            },
+        )
+
+    def test_blank_message_is_not_posted(self):
+        for message in (None, "", "   "):
+            with self.subTest(message=message):
+                self.assertIsNone(
+                    lead_intake_service.lead_message({"message": message})
+                )
+
+    def test_without_agent_leaves_assignment_to_company(self):
+        vals = lead_intake_service.lead_values({"name": "Ana", "phone": "1"}, None, 2)
+        self.assertNotIn("agent_id", vals)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -178,5 +178,87 @@ class TestPerformanceServiceRedisDown(unittest.TestCase):
         self.assertFalse(raised)
 
 
+class TestPerformanceStandardPeriods(unittest.TestCase):
+    """Warm-up periods: this month, last month, year to date"""
+
+    def test_periods(self):
+        from datetime import date
+        from odoo.addons.quicksol_estate.services.performance_service import standard_periods
+
+        self.assertEqual(
+            standard_periods(date(2026, 3, 15)),
+            [
+                (date(2026, 3, 1), date(2026, 3, 31)),
+                (date(2026, 2, 1), date(2026, 2, 28)),
+                (date(2026, 1, 1), date(2026, 3, 15)),
+            ],
+        )
+
+    def test_january_reaches_back_to_december(self):
+        from datetime import date
+        from odoo.addons.quicksol_estate.services.performance_service import standard_periods
+
+        this_month, last_month, ytd = standard_periods(date(2026, 1, 31))
+        self.assertEqual(this_month, (date(2026, 1, 1), date(2026, 1, 31)))
+        self.assertEqual(last_month, (date(2025, 12, 1), date(2025, 12, 31)))
+        self.assertEqual(ytd, (date(2026, 1, 1), date(2026, 1, 31)))
+
+
+class TestPerformanceChangeEvents(unittest.TestCase):
+    """Changes are published once per transaction, after commit"""
+
+    def _env(self):
+        mock_env = MagicMock()
+        mock_env.cr.postcommit.data = {}
+        return mock_env
+
+    def test_changes_collected_until_commit(self):
+        from odoo.addons.quicksol_estate.services import performance_service
+
+        mock_env = self._env()
+        performance_service.schedule_invalidation(mock_env, [1, 2], [7])
+        performance_service.schedule_invalidation(mock_env, [2, 3, False], [7, None])
+
+        mock_env.cr.postcommit.add.assert_called_once()
+        self.assertEqual(
+            mock_env.cr.postcommit.data[performance_service.CHANGES_KEY],
+            {"agents": {1, 2, 3}, "companies": {7}},
+        )
+
+    @patch('odoo.addons.quicksol_estate.services.performance_service.RedisClient')
+    def test_publish_invalidates_then_enqueues_warm_up(self, mock_redis_cls):
+        from odoo.addons.quicksol_estate.services import performance_service
+
+        with patch(
+            'odoo.addons.quicksol_estate.services.celery_client.send_task'
+        ) as mock_send:
+            performance_service.publish_changes({"agents": {5, 4}, "companies": {9}})
+
+        mock_redis_cls.delete_pattern.assert_has_calls(
+            [
+                call('performance:agent:4:*'),
+                call('performance:agent:5:*'),
+                call('performance:ranking:9:*'),
+            ]
+        )
+        mock_send.assert_called_once_with(
+            performance_service.WARM_TASK,
+            kwargs={"agent_ids": [4, 5], "company_ids": [9]},
+            queue=performance_service.WARM_QUEUE,
+        )
+
+    @patch('odoo.addons.quicksol_estate.services.performance_service.RedisClient')
+    def test_broker_down_no_exception(self, mock_redis_cls):
+        from odoo.addons.quicksol_estate.services import performance_service
+
+        with patch(
+            'odoo.addons.quicksol_estate.services.celery_client.send_task',
+            side_effect=Exception('Broker down'),
+        ):
+            performance_service.publish_changes({"agents": {4}, "companies": set()})
+
+        mock_redis_cls.delete_pattern.assert_called_once_with('performance:agent:4:*')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/performance_rollup_service.py
+
+Daily agent performance rollups: delta merging before the upsert and the
+performance metrics computed from rollup groups. No Odoo required.
+"""
+import importlib.util
+import unittest
+from datetime import date
+from pathlib import Path
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "performance_rollup_service.py"
+)
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location(
+        "performance_rollup_service", SERVICE_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+performance_rollup_service = _load_service()
+
+DAY = date(2026, 3, 2)
+PENDING = (7, DAY, "sale", "pending")
+PAID = (7, DAY, "sale", "paid")
+
+
+class TestMergeDeltas(unittest.TestCase):
+    def test_sums_per_key(self):
+        merged = performance_rollup_service.merge_deltas(
+            [
+                (PENDING, 1, 100000.0, 3000.0),
+                (PENDING, 1, 50000.0, 1500.0),
+                (PAID, 1, 20000.0, 600.0),
+            ]
+        )
+        self.assertEqual(
+            merged,
+            {PENDING: (2, 150000.0, 4500.0), PAID: (1, 20000.0, 600.0)},
+        )
+
+    def test_cancelling_deltas_are_dropped(self):
+        # A transaction created and paid in the same batch leaves pending as is
+        merged = performance_rollup_service.merge_deltas(
+            [
+                (PENDING, 1, 100000.0, 3000.0),
+                (PENDING, -1, -100000.0, -3000.0),
+                (PAID, 1, 100000.0, 3000.0),
+            ]
+        )
+        self.assertEqual(merged, {PAID: (1, 100000.0, 3000.0)})
+
+    def test_empty(self):
+        self.assertEqual(performance_rollup_service.merge_deltas([]), {})
+
+
+class TestSummarize(unittest.TestCase):
+    def test_metrics(self):
+        metrics = performance_rollup_service.summarize(
+            [
+                ("sale", "pending", 2, 4500.0),
+                ("sale", "paid", 1, 600.0),
+                ("sale", "cancelled", 1, 900.0),
+                ("rental", "paid", 3, 2400.0),
+            ]
+        )
+        self.assertEqual(
+            metrics,
+            {
+                "total_sales_count": 4,
+                "total_commissions": 8400.0,
+                "average_commission": 2100.0,
+                "pending_commissions": 4500.0,
+                "paid_commissions": 3000.0,
+                "cancelled_commissions": 900.0,
+                "transaction_count": 7,
+            },
+        )
+
+    def test_no_sales(self):
+        metrics = performance_rollup_service.summarize(
+            [("rental", "pending", 2, 1600.0)]
+        )
+        self.assertEqual(metrics["total_sales_count"], 0)
+        self.assertEqual(metrics["average_commission"], 0.0)
+        self.assertEqual(metrics["total_commissions"], 1600.0)
+
+    def test_empty_period(self):
+        metrics = performance_rollup_service.summarize([])
+        self.assertEqual(metrics["total_commissions"], 0.0)
+        self.assertEqual(metrics["paid_commissions"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
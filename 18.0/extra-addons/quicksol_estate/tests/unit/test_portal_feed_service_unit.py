@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/portal_feed_service.py
+
+Per-company portal feed files: incremental patching, atomic writes and
+path/token hardening. No Odoo required.
+"""
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+SERVICE_PATH = (
+    Path(__file__).parent.parent.parent / "services" / "portal_feed_service.py"
+)
+
+_spec = importlib.util.spec_from_file_location("portal_feed_service", SERVICE_PATH)
+feeds = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(feeds)
+
+TOKEN = "AbCdEfGhIjKlMnOpQrStUvWx"
+
+
+def _listing(property_id, title="Casa"):
+    return {"id": property_id, "title": title}
+
+
+def _property(**overrides):
+    values = dict(
+        id=16,
+        reference_code="PROP-0016",
+        name="Apartamento Centro",
+        description=False,
+        property_type_id=SimpleNamespace(name="Apartment"),
+        for_sale=True,
+        for_rent=False,
+        price=450000.0,
+        rent_price=0.0,
+        condominium_fee=800.0,
+        currency_id=SimpleNamespace(name="BRL"),
+        publish_featured=True,
+        publish_super_featured=False,
+        street="Rua A",
+        neighborhood="Centro",
+        city="Santos",
+        state_id=SimpleNamespace(code="SP"),
+        zip_code="11010-000",
+        num_rooms=2,
+        num_suites=1,
+        num_bathrooms=2,
+        num_parking=1,
+        area=70.0,
+        total_area=0.0,
+        agent_id=False,
+        owner_id=SimpleNamespace(name="Private Owner"),
+        write_date=datetime(2026, 5, 6, 14, 0, 0),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestFeedPath(unittest.TestCase):
+    def test_path_is_scoped_to_database_dir(self):
+        path = feeds.feed_path("/var/lib/odoo", "realestate", TOKEN)
+        self.assertEqual(
+            path, f"/var/lib/odoo/portal_feeds/realestate/{TOKEN}.json"
+        )
+
+    def test_rejects_traversal_and_short_tokens(self):
+        for token in ("../../etc/passwd", "short", "", None, "a/b" * 10):
+            with self.subTest(token=token), self.assertRaises(ValueError):
+                feeds.feed_path("/var/lib/odoo", "realestate", token)
+
+
+class TestApplyChanges(unittest.TestCase):
+    def test_upserts_replace_and_removals_drop(self):
+        feed = feeds.build_feed(
+            {"id": 1},
+            [_listing(3), _listing(1), _listing(2)],
+            ["2026-01-01 00:00:00", 5],
+            "t0",
+        )
+        patched = feeds.apply_changes(
+            feed,
+            [_listing(2, "Updated"), _listing(4)],
+            {1, 99},
+            ["2026-01-02 00:00:00", 9],
+            "t1",
+        )
+        self.assertEqual([item["id"] for item in patched["listings"]], [2, 3, 4])
+        self.assertEqual(patched["listings"][0]["title"], "Updated")
+        self.assertEqual(patched["count"], 3)
+        self.assertEqual(patched["cursor"], ["2026-01-02 00:00:00", 9])
+        self.assertEqual(patched["company"], {"id": 1})
+        # The original feed is left untouched
+        self.assertEqual(feed["count"], 3)
+
+
+class TestFeedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = feeds.feed_path(self.tmp.name, "db", TOKEN)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_then_load_round_trip(self):
+        feed = feeds.build_feed({"id": 1}, [_listing(1)], None, "t0")
+        feeds.write_feed_atomic(self.path, feed)
+        self.assertEqual(feeds.load_feed(self.path), feed)
+        # No temp files left next to the feed
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [f"{TOKEN}.json"])
+
+    def test_missing_or_foreign_file_loads_as_none(self):
+        self.assertIsNone(feeds.load_feed(self.path))
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as fh:
+            json.dump({"version": 0}, fh)
+        self.assertIsNone(feeds.load_feed(self.path))
+
+    def test_etag_changes_on_rewrite(self):
+        feeds.write_feed_atomic(self.path, feeds.build_feed({}, [], None, "t0"))
+        first = feeds.feed_etag(os.stat(self.path))
+        feeds.write_feed_atomic(
+            self.path, feeds.build_feed({}, [_listing(1)], None, "t1")
+        )
+        self.assertNotEqual(first, feeds.feed_etag(os.stat(self.path)))
+
+
+class TestSerializeListing(unittest.TestCase):
+    def test_public_fields_only(self):
+        listing = feeds.serialize_listing(_property())
+        self.assertEqual(listing["reference"], "PROP-0016")
+        self.assertTrue(listing["featured"])
+        self.assertEqual(listing["address"]["state"], "SP")
+        self.assertIsNone(listing["agent"])
+        self.assertNotIn("owner", listing)
+        self.assertEqual(listing["updated_at"], "2026-05-06T14:00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
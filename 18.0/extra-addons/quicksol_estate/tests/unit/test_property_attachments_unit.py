@@ -86,16 +86,23 @@ _ctrl_pkg = _make_module("quicksol_estate.controllers")
 _ctrl_pkg.__path__ = [str(CONTROLLER_PATH.parent)]
 _ctrl_pkg.__package__ = "quicksol_estate.controllers"
 _utils_pkg = _make_module("quicksol_estate.controllers.utils")
+# utils.serializers is pure Python: resolve it from the real utils directory
+_utils_pkg.__path__ = [str(CONTROLLER_PATH.parent / "utils")]
+# services.upload_stream is pure Python: resolve it from the real services directory
+_services_pkg = _make_module("quicksol_estate.services")
+_services_pkg.__path__ = [str(CONTROLLER_PATH.parent.parent / "services")]
 _auth_mod = _make_module("quicksol_estate.controllers.utils.auth")
 _auth_mod.require_jwt = _identity
 _response_mod = _make_module("quicksol_estate.controllers.utils.response")
 _response_mod.error_response = MagicMock()
 _response_mod.success_response = MagicMock()
+_response_mod.attachment_response = MagicMock()
 
 for _name, _obj in [
     ("quicksol_estate", _make_module("quicksol_estate")),
     ("quicksol_estate.controllers", _ctrl_pkg),
     ("quicksol_estate.controllers.utils", _utils_pkg),
+    ("quicksol_estate.services", _services_pkg),
     ("quicksol_estate.controllers.utils.auth", _auth_mod),
     ("quicksol_estate.controllers.utils.response", _response_mod),
 ]:
@@ -551,6 +558,44 @@ class TestNoRedirectToWebContent(unittest.TestCase):
                 self.fail(f"Found /web/content/ in non-comment line: {stripped!r}")
 
 
+# ---------------------------------------------------------------------------
+# Download streams from the filestore (no att.raw in worker memory)
+# ---------------------------------------------------------------------------
+
+
+class _NoRawAttachment(SimpleNamespace):
+    @property
+    def raw(self):
+        raise AssertionError("download must not load att.raw into memory")
+
+
+class TestDownloadStreamsAttachment(unittest.TestCase):
+    def _download(self, att):
+        controller = ctrl.PropertyAttachmentsController()
+        with patch.object(
+            ctrl, "_fetch_property_for_company", return_value=object()
+        ), patch.object(ctrl, "_fetch_attachment", return_value=att), patch.object(
+            ctrl, "attachment_response", return_value="streamed"
+        ) as mock_stream:
+            result = controller.download_attachment(7, 42)
+        return result, mock_stream
+
+    def test_download_delegates_to_attachment_response(self):
+        att = _NoRawAttachment(id=42, name="planta.pdf", mimetype="application/pdf")
+        result, mock_stream = self._download(att)
+        self.assertEqual(result, "streamed")
+        mock_stream.assert_called_once_with(
+            att, download_name="planta.pdf", mimetype="application/pdf"
+        )
+
+    def test_download_name_is_sanitized(self):
+        att = _NoRawAttachment(id=42, name='a"b\r\nc.pdf', mimetype=None)
+        _, mock_stream = self._download(att)
+        kwargs = mock_stream.call_args.kwargs
+        self.assertEqual(kwargs["download_name"], "abc.pdf")
+        self.assertEqual(kwargs["mimetype"], "application/octet-stream")
+
+
 # ---------------------------------------------------------------------------
 # Serializer field completeness
 # ---------------------------------------------------------------------------
@@ -603,6 +648,62 @@ class TestSerializerFields(unittest.TestCase):
         self.assertEqual(result["size"], 204800)
 
 
+# ---------------------------------------------------------------------------
+# Image renditions — thumbnail_url / srcset
+# ---------------------------------------------------------------------------
+
+
+class TestSerializerRenditions(unittest.TestCase):
+    """Image attachments expose their WebP/JPEG renditions as thumbnail_url/srcset."""
+
+    def _make_att(self, description="image"):
+        return SimpleNamespace(
+            id=10,
+            name="fachada.jpg",
+            mimetype="image/jpeg",
+            file_size=2048,
+            description=description,
+            create_date=None,
+        )
+
+    def _rendition(self, att_id, size, width, mimetype):
+        return SimpleNamespace(
+            id=att_id,
+            rendition_size=size,
+            rendition_width=width,
+            mimetype=mimetype,
+        )
+
+    def test_image_without_renditions_has_empty_srcset(self):
+        result = ctrl._serialize_attachment(self._make_att(), property_id=7)
+        self.assertIsNone(result["thumbnail_url"])
+        self.assertEqual(result["srcset"], {})
+
+    def test_image_renditions_build_srcset_per_format(self):
+        renditions = [
+            self._rendition(21, "medium", 800, "image/webp"),
+            self._rendition(20, "thumbnail", 320, "image/webp"),
+            self._rendition(22, "thumbnail", 320, "image/jpeg"),
+        ]
+        result = ctrl._serialize_attachment(
+            self._make_att(), property_id=7, renditions=renditions
+        )
+        base = "/api/v1/properties/7/attachments"
+        self.assertEqual(result["thumbnail_url"], f"{base}/22/download")
+        self.assertEqual(
+            result["srcset"]["webp"],
+            f"{base}/20/download 320w, {base}/21/download 800w",
+        )
+        self.assertEqual(result["srcset"]["jpeg"], f"{base}/22/download 320w")
+
+    def test_documents_have_no_rendition_fields(self):
+        result = ctrl._serialize_attachment(
+            self._make_att(description="document"), property_id=7
+        )
+        self.assertNotIn("srcset", result)
+        self.assertNotIn("thumbnail_url", result)
+
+
 # ---------------------------------------------------------------------------
 # T002 — Quantity limits are read from ir.config_parameter (seeded in system_parameters.xml)
 # ---------------------------------------------------------------------------
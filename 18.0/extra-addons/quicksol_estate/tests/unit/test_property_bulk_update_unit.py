@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — PATCH /api/v1/properties/bulk helpers
+
+Covers the shared filter-domain builder and the set-based access domain used
+to authorize a whole bulk update with a single search. No Odoo required.
+"""
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+UTILS_DIR = Path(__file__).parent.parent.parent / "controllers" / "utils"
+
+# Load controllers/utils modules as a synthetic package so relative imports
+# resolve without executing utils/__init__.py (which needs odoo.http).
+_pkg = types.ModuleType("qe_bulk_utils")
+_pkg.__path__ = [str(UTILS_DIR)]
+sys.modules.setdefault("qe_bulk_utils", _pkg)
+
+property_filters = importlib.import_module("qe_bulk_utils.property_filters")
+serializers = importlib.import_module("qe_bulk_utils.serializers")
+
+build_property_filter_domain = property_filters.build_property_filter_domain
+build_property_access_domain = serializers.build_property_access_domain
+
+
+class _FakeSelectionEnv(dict):
+    def __init__(self):
+        model = MagicMock()
+        model._fields = {
+            "property_status": MagicMock(
+                selection=[("available", "Available"), ("sold", "Sold")]
+            )
+        }
+        super().__init__({"real.estate.property": model})
+
+
+def _user(*groups, company_ids=(1, 2), uid=7):
+    user = MagicMock()
+    user.id = uid
+    user.company_ids.ids = list(company_ids)
+    user.has_group.side_effect = lambda xmlid: xmlid in groups
+    return user
+
+
+class TestBuildPropertyFilterDomain(unittest.TestCase):
+    def test_query_string_values(self):
+        domain, error = build_property_filter_domain(
+            _FakeSelectionEnv(),
+            {
+                "is_active": "true",
+                "property_status": "available",
+                "agent_id": "5",
+                "min_price": "100000",
+                "for_rent": "false",
+            },
+        )
+        self.assertIsNone(error)
+        self.assertEqual(
+            domain,
+            [
+                ("active", "=", True),
+                ("property_status", "=", "available"),
+                ("agent_id", "=", 5),
+                ("price", ">=", 100000.0),
+                ("for_rent", "=", False),
+            ],
+        )
+
+    def test_json_values(self):
+        domain, error = build_property_filter_domain(
+            _FakeSelectionEnv(), {"agent_id": 3, "for_sale": True, "city": "Santos"}
+        )
+        self.assertIsNone(error)
+        self.assertIn(("agent_id", "=", 3), domain)
+        self.assertIn(("for_sale", "=", True), domain)
+        self.assertIn(("city", "ilike", "Santos"), domain)
+
+    def test_invalid_status_returns_error(self):
+        domain, error = build_property_filter_domain(
+            _FakeSelectionEnv(), {"property_status": "bogus"}
+        )
+        self.assertIsNone(domain)
+        self.assertIn("Invalid property_status", error)
+
+    def test_invalid_integer_returns_error(self):
+        domain, error = build_property_filter_domain(
+            _FakeSelectionEnv(), {"state_id": "abc"}
+        )
+        self.assertIsNone(domain)
+        self.assertEqual(error, "Invalid state_id")
+
+
+class TestBuildPropertyAccessDomain(unittest.TestCase):
+    def test_admin_has_no_restriction(self):
+        domain, error = build_property_access_domain(_user("base.group_system"))
+        self.assertEqual(domain, [])
+        self.assertIsNone(error)
+
+    def test_manager_scoped_to_companies(self):
+        domain, _ = build_property_access_domain(
+            _user("quicksol_estate.group_real_estate_manager"), operation="delete"
+        )
+        self.assertEqual(domain, [("company_id", "in", [1, 2])])
+
+    def test_agent_scoped_to_own_properties(self):
+        domain, _ = build_property_access_domain(
+            _user("quicksol_estate.group_real_estate_agent", uid=42),
+            operation="write",
+        )
+        self.assertEqual(domain, [("agent_id.user_id", "=", 42)])
+
+    def test_agent_cannot_archive(self):
+        domain, error = build_property_access_domain(
+            _user("quicksol_estate.group_real_estate_agent"), operation="delete"
+        )
+        self.assertIsNone(domain)
+        self.assertEqual(error, "Agents cannot delete properties")
+
+    def test_portal_user_denied(self):
+        domain, error = build_property_access_domain(_user())
+        self.assertIsNone(domain)
+        self.assertEqual(error, "Insufficient permissions")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — GET /api/v1/properties/changes cursor helpers
+
+Keyset cursors encode ``(txid, id)`` (and, for date feeds, ``(date, id)``)
+opaquely. No Odoo required.
+"""
+import importlib.util
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+CURSOR_PATH = (
+    Path(__file__).parent.parent.parent / "controllers" / "utils" / "cursor.py"
+)
+
+_spec = importlib.util.spec_from_file_location("qe_cursor", CURSOR_PATH)
+cursor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cursor)
+
+
+class TestChangeCursor(unittest.TestCase):
+    def test_round_trip(self):
+        changed_at = datetime(2026, 5, 6, 14, 0, 0, 123456)
+        token = cursor.encode_cursor(changed_at, 42)
+        self.assertEqual(cursor.decode_cursor(token), (changed_at, 42))
+
+    def test_token_is_url_safe(self):
+        token = cursor.encode_cursor(datetime(2026, 1, 1), 999999)
+        self.assertNotIn("=", token)
+        self.assertNotIn("/", token)
+        self.assertNotIn("+", token)
+
+    def test_ordering_ties_are_distinct(self):
+        changed_at = datetime(2026, 5, 6, 14, 0, 0)
+        self.assertNotEqual(
+            cursor.encode_cursor(changed_at, 1), cursor.encode_cursor(changed_at, 2)
+        )
+
+    def test_invalid_cursor_raises_value_error(self):
+        truncated = cursor.encode_cursor(datetime(2026, 1, 1), 1)[:-3]
+        for token in ("", "not-a-cursor", "!!!", truncated):
+            with self.subTest(token=token), self.assertRaises(ValueError):
+                cursor.decode_cursor(token)
+
+
+class TestSequenceCursor(unittest.TestCase):
+    def test_round_trip(self):
+        token = cursor.encode_sequence_cursor(9876543210, 42)
+        self.assertEqual(cursor.decode_sequence_cursor(token), (9876543210, 42))
+
+    def test_orders_as_tuples(self):
+        tokens = [
+            cursor.encode_sequence_cursor(txid, row_id)
+            for txid, row_id in [(7, 3), (7, 5), (8, 1)]
+        ]
+        decoded = [cursor.decode_sequence_cursor(token) for token in tokens]
+        self.assertEqual(decoded, sorted(decoded))
+
+    def test_timestamp_cursor_is_not_a_sequence_cursor(self):
+        token = cursor.encode_cursor(datetime(2026, 5, 6, 14, 0, 0), 42)
+        with self.assertRaises(ValueError):
+            cursor.decode_sequence_cursor(token)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -237,6 +237,41 @@ class TestSavedFilters(common.TransactionCase):
         self.assertIn(("state", "=", "qualified"), action["domain"])
         self.assertIn(("budget_max", ">=", 300000), action["domain"])
 
+    def test_compiled_domain_shared_by_equal_criteria(self):
+        """Equal criteria compile to one domain hash whatever the value types"""
+        numeric = self.Filter.create(
+            {
+                "name": "Numeric Budget",
+                "user_id": self.user1.id,
+                "filter_domain": json.dumps({"budget_min": 300000, "state": "new"}),
+            }
+        )
+        textual = self.Filter.create(
+            {
+                "name": "Textual Budget",
+                "user_id": self.user2.id,
+                "filter_domain": json.dumps({"state": "new", "budget_min": "300000"}),
+            }
+        )
+
+        self.assertTrue(numeric.domain_hash)
+        self.assertEqual(numeric.domain_hash, textual.domain_hash)
+        self.assertEqual(numeric.get_domain(), textual.get_domain())
+
+        numeric.filter_domain = json.dumps({"state": "won"})
+        self.assertNotEqual(numeric.domain_hash, textual.domain_hash)
+
+    def test_invalid_filter_criteria(self):
+        """Criteria list_leads would reject cannot be saved"""
+        with self.assertRaises(ValidationError):
+            self.Filter.create(
+                {
+                    "name": "Bad Budget",
+                    "user_id": self.user1.id,
+                    "filter_domain": json.dumps({"budget_min": "a lot"}),
+                }
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
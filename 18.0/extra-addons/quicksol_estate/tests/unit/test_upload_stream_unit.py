@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests — services/upload_stream.py
+
+Streaming upload spooling: checksum, size limit and MIME sniff head are
+computed chunk by chunk. No Odoo required.
+"""
+import hashlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+SERVICE_PATH = Path(__file__).parent.parent.parent / "services" / "upload_stream.py"
+
+
+def _load_service():
+    spec = importlib.util.spec_from_file_location("upload_stream", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+upload_stream = _load_service()
+
+
+class TestSpoolUpload(unittest.TestCase):
+    def setUp(self):
+        self.content = os.urandom(300_000)
+
+    def test_checksum_size_and_head(self):
+        with upload_stream.spool_upload(
+            io.BytesIO(self.content), max_bytes=1_000_000, chunk_size=1000
+        ) as spooled:
+            self.assertEqual(spooled.size, len(self.content))
+            self.assertEqual(spooled.checksum, hashlib.sha1(self.content).hexdigest())
+            self.assertEqual(spooled.head, self.content[: upload_stream.MIME_SNIFF_BYTES])
+            with spooled.open() as fh:
+                self.assertEqual(fh.read(), self.content)
+
+    def test_close_removes_temp_file(self):
+        spooled = upload_stream.spool_upload(io.BytesIO(b"abc"), max_bytes=10)
+        path = spooled.path
+        self.assertTrue(os.path.exists(path))
+        spooled.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_too_large_reports_full_size(self):
+        with self.assertRaises(upload_stream.UploadTooLarge) as ctx:
+            upload_stream.spool_upload(io.BytesIO(self.content), max_bytes=1000)
+        self.assertEqual(ctx.exception.limit, 1000)
+        self.assertEqual(ctx.exception.size, len(self.content))
+        self.assertIsInstance(ctx.exception, ValueError)
+
+    def test_empty_stream(self):
+        with upload_stream.spool_upload(io.BytesIO(b""), max_bytes=10) as spooled:
+            self.assertEqual(spooled.size, 0)
+            self.assertEqual(spooled.head, b"")
+
+    def test_copy_to_writes_destination(self):
+        with tempfile.TemporaryDirectory() as directory:
+            destination = os.path.join(directory, "ab", "abcdef")
+            os.makedirs(os.path.dirname(destination))
+            with upload_stream.spool_upload(
+                io.BytesIO(self.content), max_bytes=1_000_000
+            ) as spooled:
+                spooled.copy_to(destination)
+            with open(destination, "rb") as fh:
+                self.assertEqual(fh.read(), self.content)
+            self.assertEqual(os.listdir(os.path.dirname(destination)), ["abcdef"])
+
+
+if __name__ == "__main__":
+    unittest.main()
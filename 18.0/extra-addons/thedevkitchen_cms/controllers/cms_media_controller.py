@@ -2,6 +2,7 @@
 import logging
 from odoo import http
 from odoo.http import request, Response
+from odoo.addons.quicksol_estate.controllers.utils.response import attachment_response
 from odoo.addons.quicksol_estate.services.role_resolver import resolve_role
 from odoo.addons.thedevkitchen_apigateway.middleware import (
     require_jwt,
@@ -45,11 +46,10 @@ class CmsMediaController(http.Controller):
 
         filename = file_obj.filename or "upload"
         claimed_mime = file_obj.content_type or None
-        file_bytes = file_obj.read()
 
         try:
             media = CmsMediaService.upload(
-                request.env, file_bytes, filename, claimed_mime, company_id
+                request.env, file_obj.stream, filename, claimed_mime, company_id
             )
         except ValueError as exc:
             err_str = str(exc)
@@ -180,20 +180,16 @@ class CmsMediaController(http.Controller):
         if not media:
             return _cms_error(404, "not_found", f"Media {media_id} not found")
 
-        attachment = media.attachment_id
-        if not attachment or not attachment.datas:
+        attachment = media.attachment_id.sudo()
+        if not attachment or not (attachment.store_fname or attachment.db_datas):
             return _cms_error(404, "not_found", "File binary not found")
 
-        import base64
-        file_bytes = base64.b64decode(attachment.datas)
-        return Response(
-            file_bytes,
-            status=200,
-            content_type=media.mime_type,
-            headers=[
-                ("Content-Disposition", f'inline; filename="{media.name}"'),
-                ("Content-Length", str(len(file_bytes))),
-            ],
+        # Streamed from the filestore (Range, checksum ETag, X-Sendfile when enabled)
+        return attachment_response(
+            attachment,
+            download_name=media.name,
+            mimetype=media.mime_type,
+            as_attachment=False,
         )
 
     # ==================== DELETE (hard) ====================
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
-import base64
+import io
 import logging
 import os
 import re
 
+from odoo.addons.quicksol_estate.services.upload_stream import (
+    UploadTooLarge,
+    spool_upload,
+)
+
 _logger = logging.getLogger(__name__)
 
 
@@ -36,6 +41,9 @@ SIZE_LIMITS = {
     "document": 20 * 1024 * 1024,  # 20 MB
 }
 
+# Spooling stops storing bytes past the largest per-type limit
+MAX_UPLOAD_BYTES = max(SIZE_LIMITS.values())
+
 
 class CmsMediaService:
     """Business logic for media upload, validation, and storage."""
@@ -43,7 +51,11 @@ class CmsMediaService:
     # ==================== VALIDATE ====================
 
     @staticmethod
-    def validate_upload(file_bytes, filename, claimed_mime=None):
+    def validate_upload(file_bytes, filename, claimed_mime=None, size=None):
+        """
+        Validate an upload from its leading bytes. ``size`` is the full file
+        size when ``file_bytes`` only holds the head of a spooled upload.
+        """
         try:
             import magic
             detected_mime = magic.from_buffer(file_bytes[:2048], mime=True)
@@ -63,7 +75,8 @@ class CmsMediaService:
             raise ValueError(f"mime_mismatch|{claimed_mime}|{detected_mime}")
 
         # 3. Size limit
-        size = len(file_bytes)
+        if size is None:
+            size = len(file_bytes)
         limit = SIZE_LIMITS[media_type]
         if size > limit:
             raise ValueError(f"file_too_large|{limit}|{size}")
@@ -84,17 +97,34 @@ class CmsMediaService:
     # ==================== UPLOAD ====================
 
     @staticmethod
-    def upload(env, file_bytes, filename, claimed_mime, company_id):
-        info = CmsMediaService.validate_upload(file_bytes, filename, claimed_mime)
-
-        # Store binary in ir.attachment (private by default — served via CMS API)
-        attachment = env["ir.attachment"].sudo().create({
-            "name": info["filename"],
-            "datas": base64.b64encode(file_bytes).decode("utf-8"),
-            "mimetype": info["detected_mime"],
-            "res_model": "thedevkitchen.cms.media",
-            "company_id": company_id,
-        })
+    def upload(env, file_data, filename, claimed_mime, company_id):
+        """``file_data`` is a readable stream (request upload) or bytes."""
+        stream = (
+            io.BytesIO(file_data)
+            if isinstance(file_data, (bytes, bytearray))
+            else file_data
+        )
+        try:
+            spooled = spool_upload(stream, MAX_UPLOAD_BYTES)
+        except UploadTooLarge as exc:
+            raise ValueError(f"file_too_large|{exc.limit}|{exc.size}") from exc
+
+        with spooled:
+            info = CmsMediaService.validate_upload(
+                spooled.head, filename, claimed_mime, size=spooled.size
+            )
+
+            # Store binary in ir.attachment (private by default — served via CMS API),
+            # streamed to the filestore by checksum
+            attachment = env["ir.attachment"].sudo()._create_from_spooled(
+                spooled,
+                {
+                    "name": info["filename"],
+                    "mimetype": info["detected_mime"],
+                    "res_model": "thedevkitchen.cms.media",
+                    "company_id": company_id,
+                },
+            )
 
         media = env["thedevkitchen.cms.media"].sudo().create({
             "name": info["filename"],
@@ -43,6 +43,23 @@ def _stub_odoo():
     sys.modules.setdefault(
         "odoo.addons.thedevkitchen_observability.services.tracer", obs_tracer
     )
+
+    # cms_media_service spools uploads with quicksol_estate's pure-Python helper
+    import importlib.util
+    import pathlib
+
+    upload_stream_path = (
+        pathlib.Path(__file__).parents[3]
+        / "quicksol_estate" / "services" / "upload_stream.py"
+    )
+    spec = importlib.util.spec_from_file_location(
+        "odoo.addons.quicksol_estate.services.upload_stream", upload_stream_path
+    )
+    upload_stream = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(upload_stream)
+    sys.modules.setdefault(
+        "odoo.addons.quicksol_estate.services.upload_stream", upload_stream
+    )
     return obs_tracer
 
 